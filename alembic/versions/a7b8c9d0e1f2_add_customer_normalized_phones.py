@@ -0,0 +1,137 @@
+"""add_customer_normalized_phones
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18
+
+This migration adds digits-only copies of the customer phones, which the
+application keeps in sync on every write, and backfills existing rows.
+Phone lookups (duplicate checks, customer search, warranty checks) compare
+these columns, so they become index seeks instead of scans over
+ILIKE '%...%' or replace(phone, ' ', '').
+
+On PostgreSQL the indexes use text_pattern_ops so prefix searches can use
+them, and reverse() expression indexes serve lookups by the final digits.
+"""
+import re
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PHONE_COLUMNS = ('phone', 'phone_secondary')
+BATCH_SIZE = 1000
+
+# Normalization as of this revision, frozen so the backfill does not depend
+# on the application code or its settings
+COUNTRY_CODE = '54'
+INTERNATIONAL_MOBILE_PREFIX = '9'
+
+
+def _normalize_phone(phone: Union[str, None]) -> Union[str, None]:
+    """Reduce a phone to its national number's digits (app.utils.phone)."""
+    if not phone:
+        return None
+
+    phone = phone.strip()
+    digits = re.sub(r'\D', '', phone)
+    international = phone.startswith('+') or digits.startswith('00')
+    if digits.startswith('00'):
+        digits = digits[2:]
+
+    if international:
+        if not digits.startswith(COUNTRY_CODE):
+            return digits or None
+        digits = digits[len(COUNTRY_CODE):].removeprefix(INTERNATIONAL_MOBILE_PREFIX)
+
+    return digits.lstrip('0') or None
+
+
+def _backfill() -> None:
+    """Fill the normalized columns of existing customers in batches."""
+    bind = op.get_bind()
+    customers = sa.table(
+        'customers',
+        sa.column('id', sa.Integer),
+        *(sa.column(column, sa.String) for column in PHONE_COLUMNS),
+        *(sa.column(f'{column}_normalized', sa.String) for column in PHONE_COLUMNS),
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(customers.c.id, customers.c.phone, customers.c.phone_secondary)
+            .where(customers.c.id > last_id)
+            .order_by(customers.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            customers.update()
+            .where(customers.c.id == sa.bindparam('customer_id'))
+            .values(
+                phone_normalized=sa.bindparam('phone_digits'),
+                phone_secondary_normalized=sa.bindparam('phone_secondary_digits'),
+            ),
+            [
+                {
+                    'customer_id': row.id,
+                    'phone_digits': _normalize_phone(row.phone),
+                    'phone_secondary_digits': _normalize_phone(row.phone_secondary),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Add, backfill and index the normalized phone columns."""
+    for column in PHONE_COLUMNS:
+        op.add_column(
+            'customers',
+            sa.Column(f'{column}_normalized', sa.String(length=20), nullable=True),
+        )
+    _backfill()
+
+    if op.get_bind().dialect.name != 'postgresql':
+        for column in PHONE_COLUMNS:
+            op.create_index(
+                f'ix_customers_{column}_normalized',
+                'customers',
+                [f'{column}_normalized'],
+            )
+        return
+
+    for column in PHONE_COLUMNS:
+        normalized = f'{column}_normalized'
+        op.create_index(
+            f'ix_customers_{normalized}',
+            'customers',
+            [normalized],
+            postgresql_ops={normalized: 'text_pattern_ops'},
+        )
+        op.create_index(
+            f'ix_customers_{normalized}_reversed',
+            'customers',
+            [sa.text(f'reverse({normalized}) text_pattern_ops')],
+        )
+
+
+def downgrade() -> None:
+    """Drop the normalized phone columns and their indexes."""
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    for column in PHONE_COLUMNS:
+        normalized = f'{column}_normalized'
+        if is_postgresql:
+            op.drop_index(f'ix_customers_{normalized}_reversed', table_name='customers')
+        op.drop_index(f'ix_customers_{normalized}', table_name='customers')
+        op.drop_column('customers', normalized)
@@ -0,0 +1,43 @@
+"""add_customer_balance_checkpoints
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18
+
+This migration adds the table holding monthly customer ledger balance
+checkpoints. Past months are filled by running
+scripts/rebuild_balance_checkpoints.py --live after upgrading; until then
+opening balances are summed from the whole ledger.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create customer_balance_checkpoints table."""
+    op.create_table('customer_balance_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('as_of', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('balance', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record creation timestamp'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record last update timestamp'),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('customer_id', 'as_of', name='uq_balance_checkpoint')
+    )
+
+
+def downgrade() -> None:
+    """Drop customer_balance_checkpoints table."""
+    op.drop_table('customer_balance_checkpoints')
@@ -0,0 +1,40 @@
+"""add_document_sequences_table
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-18
+
+This migration adds the counter table used to allocate invoice, repair and
+receipt numbers. Counters are seeded lazily from the highest existing number
+the first time each prefix and year is used.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create document_sequences table."""
+    op.create_table('document_sequences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=20), nullable=False, comment='Document family prefix'),
+    sa.Column('period', sa.Integer(), nullable=False, comment='Year of the counter, 0 when it never resets'),
+    sa.Column('last_value', sa.Integer(), nullable=False, comment='Last number issued'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record creation timestamp'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record last update timestamp'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('key', 'period', name='uq_document_sequence_key_period')
+    )
+
+
+def downgrade() -> None:
+    """Drop document_sequences table."""
+    op.drop_table('document_sequences')
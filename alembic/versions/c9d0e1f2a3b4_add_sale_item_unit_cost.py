@@ -0,0 +1,39 @@
+"""add_sale_item_unit_cost
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18
+
+This migration adds the product purchase price at time of sale to sale
+items, so the income statement values sold goods at what they cost when
+they were sold. Costs of past sales were never recorded; existing rows are
+backfilled with the products' current purchase price, which is what the
+income statement used until now.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add sale_items.unit_cost and backfill it."""
+    op.add_column('sale_items', sa.Column('unit_cost', sa.DECIMAL(precision=10, scale=2), nullable=True, comment='Product purchase price at time of sale'))
+    op.execute(
+        'UPDATE sale_items SET unit_cost = '
+        '(SELECT products.purchase_price FROM products '
+        'WHERE products.id = sale_items.product_id) '
+        'WHERE unit_cost IS NULL'
+    )
+
+
+def downgrade() -> None:
+    """Drop sale_items.unit_cost."""
+    op.drop_column('sale_items', 'unit_cost')
@@ -0,0 +1,67 @@
+"""add_sales_rollups
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18
+
+This migration adds the daily and hourly sales analytics rollup tables.
+Past sales are rolled up by running scripts/rebuild_sales_rollups.py --live
+after upgrading; new sales and voids are added as they are flushed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create sales_daily_rollups and sales_hourly_rollups tables."""
+    op.create_table('sales_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('business_date', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('payment_method', sa.String(length=20), nullable=False),
+    sa.Column('sales_lines', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('discount', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('tax', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record creation timestamp'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record last update timestamp'),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('business_date', 'product_id', 'user_id', 'payment_method', name='uq_sales_daily_rollup')
+    )
+    op.create_index(op.f('ix_sales_daily_rollups_business_date'), 'sales_daily_rollups', ['business_date'], unique=False)
+    op.create_table('sales_hourly_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('business_date', sa.Date(), nullable=False),
+    sa.Column('hour', sa.Integer(), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('discount', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('tax', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record creation timestamp'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record last update timestamp'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('business_date', 'hour', name='uq_sales_hourly_rollup')
+    )
+
+
+def downgrade() -> None:
+    """Drop sales rollup tables."""
+    op.drop_table('sales_hourly_rollups')
+    op.drop_index(op.f('ix_sales_daily_rollups_business_date'), table_name='sales_daily_rollups')
+    op.drop_table('sales_daily_rollups')
@@ -0,0 +1,58 @@
+"""add_daily_register_totals_table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18
+
+This migration adds the table holding materialized daily cash register
+totals. Existing days are filled by running
+scripts/rebuild_daily_register_totals.py --live after upgrading; until then
+the daily summary falls back to aggregating the source tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create daily_register_totals table."""
+    op.create_table('daily_register_totals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('business_date', sa.Date(), nullable=False, comment='Local business day'),
+    sa.Column('total_sales', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.Column('sales_cash', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_transfer', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_credit', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_mixed', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_mixed_cash', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_mixed_transfer', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('sales_mixed_card', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('repairs_delivered_count', sa.Integer(), nullable=False),
+    sa.Column('repairs_total', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('total_expenses', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('expenses_count', sa.Integer(), nullable=False),
+    sa.Column('expenses_cash', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('expenses_transfer', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('expenses_card', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('debt_payments_cash', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('debt_payments_transfer', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('debt_payments_card', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record creation timestamp'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Record last update timestamp'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('business_date')
+    )
+
+
+def downgrade() -> None:
+    """Drop daily_register_totals table."""
+    op.drop_table('daily_register_totals')
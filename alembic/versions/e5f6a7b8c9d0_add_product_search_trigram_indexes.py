@@ -0,0 +1,48 @@
+"""add_product_search_trigram_indexes
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18
+
+This migration enables pg_trgm and adds trigram GIN indexes so product
+searches (ILIKE '%term%' and the similarity operator) no longer scan the
+products table. SQLite has no equivalent; there the application uses an
+in-process search index instead, so this migration does nothing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('name', 'sku', 'barcode', 'brand', 'model')
+
+
+def upgrade() -> None:
+    """Create pg_trgm extension and trigram indexes on searchable columns."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_products_{column}_trgm',
+            'products',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Drop trigram indexes (the extension is left installed)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f'ix_products_{column}_trgm', table_name='products')
@@ -0,0 +1,45 @@
+"""add_customer_lookup_indexes
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18
+
+This migration adds a prefix-search index for the customer type-ahead
+lookup: lower(name) for name prefixes (partial, active customers only).
+text_pattern_ops lets PostgreSQL use it for LIKE 'term%' regardless of the
+database collation. Phone prefixes are served by the normalized phone
+indexes of a7b8c9d0e1f2. SQLite plans its own LIKE handling, so this
+migration does nothing there.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the prefix index on customer names."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.create_index(
+        'ix_customers_lookup_name',
+        'customers',
+        [sa.text('lower(name) text_pattern_ops')],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the customer lookup index."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_customers_lookup_name', table_name='customers')
@@ -0,0 +1,14 @@
+"""Reproducible performance benchmarks for TechStore.
+
+``dataset`` generates a seeded, scale-parameterized store history and
+``scenarios`` times the service entry points against it. Run with
+``python -m benchmarks``; see ``benchmarks/README.md``.
+"""
+
+import sys
+from pathlib import Path
+
+# Benchmarks import the application the way the scripts do
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
@@ -0,0 +1,160 @@
+"""Generate a dataset and benchmark the service entry points.
+
+Examples:
+    python -m benchmarks
+    python -m benchmarks --scale 0.2 --years 1 --scenarios search_products
+    python -m benchmarks --output before.json
+    python -m benchmarks --compare before.json
+    python -m benchmarks --database-url postgresql://localhost/bench --migrate
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from benchmarks.dataset import (
+    DatasetSpec,
+    create_schema,
+    drop_schema,
+    generate,
+    is_empty,
+)
+from benchmarks.runner import environment, format_table, load, run, save
+from benchmarks.scenarios import SCENARIOS
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark TechStore services on a generated dataset",
+    )
+    data = parser.add_argument_group("dataset")
+    data.add_argument(
+        "--scale", type=float, default=1.0, help="Volume multiplier (default: 1)"
+    )
+    data.add_argument(
+        "--years", type=float, default=2.0, help="Years of history (default: 2)"
+    )
+    data.add_argument("--seed", type=int, default=42, help="Random seed")
+    data.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        help="Last day of history, YYYY-MM-DD (default: yesterday)",
+    )
+
+    database = parser.add_argument_group("database")
+    database.add_argument(
+        "--database-url",
+        help="Scratch database (default: temporary SQLite file)",
+    )
+    database.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Create the schema with the Alembic migrations (use on PostgreSQL)",
+    )
+    existing = database.add_mutually_exclusive_group()
+    existing.add_argument(
+        "--reuse",
+        action="store_true",
+        help="Benchmark the data already in the database",
+    )
+    existing.add_argument(
+        "--reset",
+        action="store_true",
+        help="Drop every table of the database and generate new data",
+    )
+
+    runs = parser.add_argument_group("runs")
+    runs.add_argument(
+        "--scenarios",
+        help=f"Comma separated scenarios (default: all of {', '.join(SCENARIOS)})",
+    )
+    runs.add_argument(
+        "--iterations", type=int, help="Timed calls per scenario (default: varies)"
+    )
+    runs.add_argument(
+        "--warmup", type=int, default=3, help="Untimed calls per scenario"
+    )
+    runs.add_argument("--output", type=Path, help="Save the results as JSON")
+    runs.add_argument(
+        "--compare", type=Path, help="Saved results to show the changes against"
+    )
+    return parser
+
+
+def _dataset_key(env: dict) -> dict | None:
+    """What identifies the dataset of a run; generation time does not."""
+    dataset = env.get("dataset")
+    return {k: v for k, v in dataset.items() if k != "seconds"} if dataset else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks from the command line."""
+    args = _parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    names = args.scenarios.split(",") if args.scenarios else None
+    unknown = set(names or ()) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.database_url or f"sqlite:///{tmp}/bench.db")
+        dataset = None
+        if not is_empty(engine) and not args.reuse:
+            if not args.reset:
+                print(
+                    "The database has data; pass --reuse to benchmark it or "
+                    "--reset to drop it and generate new data",
+                    file=sys.stderr,
+                )
+                return 2
+            drop_schema(engine)
+
+        if args.reuse and not is_empty(engine):
+            print("Reusing the data in the database")
+        else:
+            spec = DatasetSpec(
+                scale=args.scale, years=args.years, seed=args.seed, end=args.end
+            )
+            print(f"Generating {spec} ...")
+            create_schema(engine, migrate=args.migrate)
+            dataset = generate(engine, spec)
+            rows = ", ".join(
+                f"{table} {count}" for table, count in dataset.rows.items()
+            )
+            print(
+                f"Generated {dataset.start} to {dataset.end} in "
+                f"{dataset.seconds:.1f}s: {rows}"
+            )
+
+        results = run(
+            engine,
+            names,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            seed=args.seed,
+        )
+        env = environment(engine, dataset)
+        engine.dispose()
+
+    baseline = load(args.compare) if args.compare else None
+    print()
+    print(format_table(results, baseline))
+    if baseline is not None:
+        print(f"\nBaseline: commit {baseline['environment']['commit'] or '?'}")
+        if _dataset_key(baseline["environment"]) != _dataset_key(env):
+            print("Warning: the baseline was measured on a different dataset")
+    if args.output:
+        save(args.output, env, results)
+        print(f"\nSaved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
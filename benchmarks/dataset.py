@@ -0,0 +1,845 @@
+"""Seeded synthetic store history for the benchmarks.
+
+``generate`` fills an empty database with a product catalog, customers with
+accounts, and ``years`` of sales, debt payments, voids, repairs and
+expenses ending yesterday. Every random choice comes from one
+``random.Random(seed)``, so equal specs produce equal rows, and ``scale``
+multiplies every volume.
+
+Rows are bulk inserted with explicit IDs, and the customer ledger is
+written alongside them in the shape the services write it: a ``SALE`` for
+every sale, a ``PAYMENT`` for every payment and a ``VOID_SALE`` for every
+void, with balances chained in date order. The derived tables (daily
+register totals, sales rollups and balance checkpoints) are then rebuilt
+with the application's own ``rebuild`` methods, so the benchmarked services
+read what they would read in production.
+"""
+
+import heapq
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config import settings
+from app.crud.customer_balance_checkpoint import customer_balance_checkpoint_crud
+from app.crud.daily_register_totals import daily_register_totals
+from app.crud.sales_rollup import sales_rollup_crud
+from app.models import *  # noqa: F401, F403
+from app.models.base import Base
+from app.models.customer import Customer
+from app.models.customer_account import (
+    CustomerAccount,
+    CustomerTransaction,
+    TransactionType,
+)
+from app.models.expense import Expense, ExpenseCategory
+from app.models.payment import Payment, PaymentType
+from app.models.product import Category, Product
+from app.models.repair import Repair
+from app.models.sale import Sale, SaleItem
+from app.models.user import User
+from app.utils.timezone import get_local_today, local_to_utc
+from sqlalchemy import func, insert, inspect, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Rows buffered per table before a bulk insert
+BATCH_SIZE = 5000
+
+# Volumes at scale 1
+PRODUCTS = 1500
+CUSTOMERS = 400
+SALES_PER_DAY = 60
+REPAIRS_PER_DAY = 6
+EXPENSES_PER_DAY = 2
+
+# Share of sales made to registered customers (the rest are walk-in), and
+# of those, the share sold fully and partly on credit
+REGISTERED_SHARE = 0.3
+CREDIT_SHARE = 0.25
+PARTIAL_SHARE = 0.15
+
+# Share of credit sales voided the same day
+VOID_SHARE = 0.04
+
+# Chance that a customer who owes money pays some of it on a given day
+DAILY_PAYMENT_CHANCE = 0.05
+
+# Relative volume per weekday, Monday first
+WEEKDAY_VOLUME = (1.0, 1.0, 1.0, 1.05, 1.2, 1.3, 0.3)
+
+# Opening hours and the relative volume of each (local time)
+HOUR_VOLUME = {
+    9: 3,
+    10: 6,
+    11: 9,
+    12: 10,
+    13: 7,
+    14: 5,
+    15: 6,
+    16: 8,
+    17: 10,
+    18: 11,
+    19: 9,
+    20: 4,
+}
+
+CATEGORIES = [
+    "Fundas",
+    "Cargadores",
+    "Cables",
+    "Protectores",
+    "Audio",
+    "Baterías",
+    "Repuestos",
+    "Soportes",
+    "Memorias",
+    "Accesorios",
+    "Celulares",
+    "Servicios",
+]
+KINDS = [
+    "Funda",
+    "Cargador",
+    "Cable",
+    "Vidrio templado",
+    "Auriculares",
+    "Batería",
+    "Pantalla",
+    "Soporte",
+    "Parlante",
+    "Memoria",
+]
+BRANDS = ["Samsung", "Apple", "Motorola", "Xiaomi", "Huawei", "Lenovo", "Sony"]
+COLORS = ["negro", "blanco", "azul", "rojo", "transparente", "dorado"]
+FIRST_NAMES = [
+    "Juan",
+    "María",
+    "Carlos",
+    "Ana",
+    "Luis",
+    "Laura",
+    "Jorge",
+    "Sofía",
+    "Diego",
+    "Lucía",
+    "Martín",
+    "Valentina",
+    "Pablo",
+    "Camila",
+]
+LAST_NAMES = [
+    "García",
+    "Rodríguez",
+    "González",
+    "Fernández",
+    "López",
+    "Martínez",
+    "Pérez",
+    "Gómez",
+    "Díaz",
+    "Romero",
+    "Sosa",
+    "Álvarez",
+]
+DEVICE_TYPES = ["Celular", "Tablet", "Notebook", "Consola", "Smartwatch"]
+PROBLEMS = [
+    "Pantalla rota",
+    "No carga",
+    "Batería se descarga rápido",
+    "No enciende",
+    "Se mojó",
+    "Falla el audio",
+    "Cámara no enfoca",
+]
+OPEN_STATUSES = ["received", "diagnosing", "approved", "repairing", "testing", "ready"]
+EXPENSE_CATEGORIES = [
+    "Alquiler",
+    "Servicios",
+    "Proveedores",
+    "Sueldos",
+    "Impuestos",
+    "Varios",
+]
+
+CENTS = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+# Tables in foreign key order; buffered rows are inserted in this order
+_MODELS = (
+    User,
+    Category,
+    Product,
+    Customer,
+    CustomerAccount,
+    ExpenseCategory,
+    Sale,
+    SaleItem,
+    Payment,
+    CustomerTransaction,
+    Repair,
+    Expense,
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and seed of a generated dataset.
+
+    Attributes:
+        scale: Multiplier of every volume. At 1.0: 1,500 products, 400
+            customers and about 60 sales, 6 repairs and 2 expenses a day.
+        years: Length of the history.
+        seed: Random seed; equal specs generate equal rows.
+        end: Last day of the history (default: yesterday).
+    """
+
+    scale: float = 1.0
+    years: float = 2.0
+    seed: int = 42
+    end: Optional[date] = None
+
+    def count(self, base: int) -> int:
+        """Scale a fixed volume, keeping at least one row."""
+        return max(1, round(base * self.scale))
+
+
+@dataclass
+class Dataset:
+    """What ``generate`` wrote.
+
+    Attributes:
+        spec: Spec the dataset was generated from.
+        start: First day of the history.
+        end: Last day of the history.
+        rows: Rows inserted per table.
+        seconds: Generation time, derived tables included.
+    """
+
+    spec: DatasetSpec
+    start: date
+    end: date
+    rows: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(CENTS)
+
+
+@dataclass
+class _Account:
+    """Running state of one customer's account while generating."""
+
+    balance: Decimal = ZERO
+    total_sales: Decimal = ZERO
+    total_payments: Decimal = ZERO
+    count: int = 0
+    last_transaction: Optional[datetime] = None
+    last_payment: Optional[datetime] = None
+
+
+class _Store:
+    """Generates the rows of a store's history and bulk inserts them."""
+
+    def __init__(self, db: Session, spec: DatasetSpec, end: date):
+        self.db = db
+        self.spec = spec
+        self.end = end
+        self.rng = random.Random(spec.seed)
+        self.buffers: dict[type, list[dict[str, Any]]] = {m: [] for m in _MODELS}
+        self.next_ids: Counter = Counter()
+        self.rows: Counter = Counter()
+        self.sequences: Counter = Counter()
+        self.accounts: dict[int, _Account] = {}
+        self.debtors: set[int] = set()
+
+    # Buffering
+
+    def add(self, entity: type, /, **row: Any) -> int:
+        """Buffer a row with the next ID of its table and return the ID."""
+        self.next_ids[entity] += 1
+        row["id"] = self.next_ids[entity]
+        buffer = self.buffers[entity]
+        buffer.append(row)
+        if len(buffer) >= BATCH_SIZE:
+            self.flush()
+        return row["id"]
+
+    def flush(self) -> None:
+        """Insert every buffered row, parents before children."""
+        for model in _MODELS:
+            buffer = self.buffers[model]
+            if buffer:
+                self.db.execute(insert(model), buffer)
+                self.rows[model.__tablename__] += len(buffer)
+                buffer.clear()
+
+    def number(self, prefix: str, at: datetime) -> str:
+        """Next document number of a family, yearly like the services."""
+        self.sequences[(prefix, at.year)] += 1
+        return f"{prefix}-{at.year}-{self.sequences[(prefix, at.year)]:05d}"
+
+    def volume(self, per_day: int, day: date) -> int:
+        """Randomized count of events on a day around a scaled mean."""
+        expected = (
+            per_day
+            * self.spec.scale
+            * WEEKDAY_VOLUME[day.weekday()]
+            * self.rng.uniform(0.7, 1.3)
+        )
+        count = int(expected)
+        return count + (1 if self.rng.random() < expected - count else 0)
+
+    def moment(self, day: date) -> datetime:
+        """Random UTC instant within the opening hours of a local day."""
+        hour = self.rng.choices(self.hours, weights=self.hour_weights)[0]
+        local = datetime(
+            day.year,
+            day.month,
+            day.day,
+            hour,
+            self.rng.randrange(60),
+            self.rng.randrange(60),
+        )
+        return local_to_utc(local)
+
+    # Reference data
+
+    def populate_reference(self) -> None:
+        """Users, catalog, customers and their (empty) accounts."""
+        rng = self.rng
+        self.hours = list(HOUR_VOLUME)
+        self.hour_weights = list(HOUR_VOLUME.values())
+
+        self.admin_id = self.add(
+            User,
+            email="admin@bench.local",
+            password_hash="-",
+            full_name="Benchmark Admin",
+            role="admin",
+            is_active=True,
+        )
+        self.cashier_id = self.add(
+            User,
+            email="cashier@bench.local",
+            password_hash="-",
+            full_name="Benchmark Cashier",
+            role="cashier",
+            is_active=True,
+        )
+        self.technician_id = self.add(
+            User,
+            email="technician@bench.local",
+            password_hash="-",
+            full_name="Benchmark Technician",
+            role="technician",
+            is_active=True,
+        )
+
+        category_ids = [
+            self.add(Category, name=name, is_active=True) for name in CATEGORIES
+        ]
+
+        # Popularity falls off with rank, as in real catalogs
+        self.products: list[tuple[int, Decimal, Decimal]] = []
+        for index in range(self.spec.count(PRODUCTS)):
+            brand = rng.choice(BRANDS)
+            model = f"{brand[:3].upper()}{rng.randint(1, 400)}"
+            cost = _money(rng.uniform(2, 300))
+            price = (cost * Decimal(str(rng.uniform(1.4, 2.2)))).quantize(CENTS)
+            product_id = self.add(
+                Product,
+                sku=f"BENCH-{index:07d}",
+                name=f"{rng.choice(KINDS)} {brand} {model} {rng.choice(COLORS)}",
+                brand=brand,
+                model=model,
+                barcode=f"779{index:010d}",
+                category_id=rng.choice(category_ids),
+                purchase_price=cost,
+                first_sale_price=price,
+                second_sale_price=(price * Decimal("0.95")).quantize(CENTS),
+                third_sale_price=(price * Decimal("0.9")).quantize(CENTS),
+                tax_rate=ZERO,
+                current_stock=rng.randint(0, 120),
+                minimum_stock=5,
+                is_active=rng.random() > 0.03,
+                is_service=False,
+                created_by=self.admin_id,
+            )
+            self.products.append((product_id, price, cost))
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(self.products))]
+        self.product_weights = [sum(weights[: i + 1]) for i in range(len(weights))]
+
+        self.walk_in_id = self._customer("Consumidor Final", "0000000000", 0)
+        self.customer_ids = [
+            self._customer(
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                f"11{rng.randrange(10**8):08d}",
+                rng.choice((0, 50000, 100000, 200000)),
+            )
+            for _ in range(self.spec.count(CUSTOMERS))
+        ]
+
+        self.expense_category_ids = [
+            self.add(ExpenseCategory, name=name, is_active=True)
+            for name in EXPENSE_CATEGORIES
+        ]
+
+    def _customer(self, name: str, phone: str, credit_limit: int) -> int:
+        """Add a customer and its account, sharing one ID."""
+        rng = self.rng
+        customer_id = self.add(
+            Customer,
+            name=name,
+            phone=phone,
+            phone_normalized=phone,
+            email=(
+                f"cliente{self.next_ids[Customer] + 1}@example.com"
+                if rng.random() < 0.6
+                else None
+            ),
+            is_active=True,
+            created_by_id=self.admin_id,
+        )
+        self.add(
+            CustomerAccount,
+            customer_id=customer_id,
+            credit_limit=Decimal(credit_limit),
+            available_credit=ZERO,
+            account_balance=ZERO,
+            total_sales=ZERO,
+            total_payments=ZERO,
+            total_credit_notes=ZERO,
+            total_debit_notes=ZERO,
+            transaction_count=0,
+            is_active=True,
+            created_by_id=self.admin_id,
+        )
+        self.accounts[customer_id] = _Account()
+        return customer_id
+
+    # Ledger
+
+    def post(
+        self,
+        customer_id: int,
+        change: Decimal,
+        kind: TransactionType,
+        amount: Decimal,
+        reference: tuple[str, int],
+        description: str,
+        at: datetime,
+    ) -> None:
+        """Add a ledger transaction and move the customer's balance."""
+        account = self.accounts[customer_id]
+        before = account.balance
+        account.balance += change
+        account.count += 1
+        account.last_transaction = at
+        if account.balance > 0 and customer_id != self.walk_in_id:
+            self.debtors.add(customer_id)
+        else:
+            self.debtors.discard(customer_id)
+
+        self.add(
+            CustomerTransaction,
+            customer_id=customer_id,
+            account_id=customer_id,
+            transaction_type=kind,
+            amount=amount,
+            balance_before=before,
+            balance_after=account.balance,
+            reference_type=reference[0],
+            reference_id=reference[1],
+            description=description,
+            transaction_date=at,
+            created_by_id=self.cashier_id,
+        )
+
+    def pay(
+        self,
+        customer_id: int,
+        amount: Decimal,
+        method: str,
+        at: datetime,
+        sale_id: Optional[int] = None,
+        split: tuple[Optional[Decimal], Optional[Decimal]] = (None, None),
+    ) -> None:
+        """Add a payment and its ledger credit."""
+        receipt = self.number("PAY", at)
+        payment_id = self.add(
+            Payment,
+            customer_id=customer_id,
+            sale_id=sale_id,
+            amount=amount,
+            payment_method=method,
+            payment_type=PaymentType.payment,
+            cash_amount=split[0],
+            transfer_amount=split[1],
+            card_amount=None,
+            receipt_number=receipt,
+            received_by_id=self.cashier_id,
+            voided=False,
+            created_at=at,
+            updated_at=at,
+        )
+        account = self.accounts[customer_id]
+        account.total_payments += amount
+        account.last_payment = at
+        self.post(
+            customer_id,
+            -amount,
+            TransactionType.PAYMENT,
+            amount,
+            ("payment", payment_id),
+            f"Payment received - {receipt}",
+            at,
+        )
+
+    # History
+
+    def populate_day(self, day: date) -> None:
+        """Sales, debt payments and voids in time order, then repairs and expenses."""
+        rng = self.rng
+        events: list[tuple[datetime, int, str, Any]] = []
+        sequence = 0
+        for _ in range(self.volume(SALES_PER_DAY, day)):
+            sequence += 1
+            events.append((self.moment(day), sequence, "sale", None))
+        payments = sum(
+            1 for _ in range(len(self.debtors)) if rng.random() < DAILY_PAYMENT_CHANCE
+        )
+        for _ in range(payments):
+            sequence += 1
+            events.append((self.moment(day), sequence, "payment", None))
+        heapq.heapify(events)
+
+        while events:
+            at, _, kind, payload = heapq.heappop(events)
+            if kind == "sale":
+                void = self.sale(at)
+                if void is not None:
+                    sequence += 1
+                    voided_at = at + timedelta(minutes=rng.randint(5, 90))
+                    heapq.heappush(events, (voided_at, sequence, "void", void))
+            elif kind == "void":
+                customer_id, sale_id, invoice, total = payload
+                self.post(
+                    customer_id,
+                    -total,
+                    TransactionType.VOID_SALE,
+                    total,
+                    ("sale", sale_id),
+                    f"Sale {invoice} voided",
+                    at,
+                )
+            elif self.debtors:
+                customer_id = rng.choice(sorted(self.debtors))
+                balance = self.accounts[customer_id].balance
+                amount = min(balance, _money(float(balance) * rng.uniform(0.4, 1.0)))
+                method = rng.choice(("cash", "cash", "transfer", "card"))
+                self.pay(customer_id, amount, method, at)
+
+        for _ in range(self.volume(REPAIRS_PER_DAY, day)):
+            self.repair(day)
+        for _ in range(self.volume(EXPENSES_PER_DAY, day)):
+            self.expense(day)
+
+    def sale(self, at: datetime) -> Optional[tuple]:
+        """Add a sale with its items, payment and ledger rows.
+
+        Returns:
+            What the void needs when the sale is to be voided, else None.
+        """
+        rng = self.rng
+        registered = rng.random() < REGISTERED_SHARE
+        customer_id = rng.choice(self.customer_ids) if registered else self.walk_in_id
+
+        size = rng.choices((1, 2, 3, 4), weights=(50, 30, 15, 5))[0]
+        picked = rng.choices(self.products, cum_weights=self.product_weights, k=size)
+        lines = []
+        for product_id, price, cost in dict.fromkeys(picked):
+            quantity = rng.choices((1, 2, 3), weights=(80, 15, 5))[0]
+            lines.append((product_id, quantity, price, cost, price * quantity))
+        total = sum((line[4] for line in lines), ZERO)
+
+        draw = rng.random() if registered else 1.0
+        cash = transfer = None
+        if draw < CREDIT_SHARE:
+            method, paid = "account_credit", ZERO
+        elif draw < CREDIT_SHARE + PARTIAL_SHARE:
+            method, paid = "cash", _money(float(total) * rng.uniform(0.3, 0.7))
+        else:
+            method = rng.choices(
+                ("cash", "transfer", "card", "mixed"), (50, 25, 12, 13)
+            )[0]
+            paid = total
+            if method == "mixed":
+                cash = _money(float(total) * rng.uniform(0.3, 0.7))
+                transfer = total - cash
+        status = "paid" if paid >= total else "partial" if paid > 0 else "pending"
+        voided = method == "account_credit" and rng.random() < VOID_SHARE
+
+        invoice = self.number("INV", at)
+        sale_id = self.add(
+            Sale,
+            invoice_number=invoice,
+            customer_id=customer_id,
+            user_id=self.cashier_id,
+            sale_date=at,
+            subtotal=total,
+            discount_amount=ZERO,
+            tax_amount=ZERO,
+            total_amount=total,
+            paid_amount=paid,
+            change_amount=ZERO,
+            payment_status=status,
+            payment_method=method,
+            cash_amount=cash,
+            transfer_amount=transfer,
+            card_amount=None,
+            credit_amount=None,
+            notes=None,
+            is_voided=voided,
+            void_reason="Error de carga" if voided else None,
+            created_at=at,
+            updated_at=at,
+        )
+        for product_id, quantity, price, cost, line_total in lines:
+            self.add(
+                SaleItem,
+                sale_id=sale_id,
+                product_id=product_id,
+                quantity=quantity,
+                unit_price=price,
+                unit_cost=cost,
+                discount_percentage=ZERO,
+                discount_amount=ZERO,
+                total_price=line_total,
+                is_custom_price=False,
+            )
+
+        self.accounts[customer_id].total_sales += total
+        self.post(
+            customer_id,
+            total,
+            TransactionType.SALE,
+            total,
+            ("sale", sale_id),
+            f"Sale {invoice}",
+            at,
+        )
+        if paid > 0:
+            self.pay(customer_id, paid, method, at, sale_id, (cash, transfer))
+        return (customer_id, sale_id, invoice, total) if voided else None
+
+    def repair(self, day: date) -> None:
+        """Add a repair, delivered or still open depending on its age."""
+        rng = self.rng
+        received = self.moment(day)
+        cost = _money(rng.uniform(20, 400))
+        takes = timedelta(days=rng.randint(1, 14), hours=rng.randint(0, 6))
+        finished = received + takes <= local_to_utc(
+            datetime.combine(self.end, datetime.max.time())
+        )
+        cancelled = finished and rng.random() < 0.05
+
+        if finished and not cancelled:
+            status = "delivered"
+            delivered = received + takes
+            parts = (cost * Decimal(str(rng.uniform(0.1, 0.5)))).quantize(CENTS)
+            costs = {
+                "final_cost": cost,
+                "labor_cost": cost - parts,
+                "parts_cost": parts,
+            }
+        else:
+            status = "cancelled" if cancelled else rng.choice(OPEN_STATUSES)
+            delivered = None
+            costs = {"final_cost": None, "labor_cost": None, "parts_cost": None}
+
+        self.add(
+            Repair,
+            repair_number=self.number("REP", received),
+            customer_id=rng.choice(self.customer_ids),
+            device_type=rng.choice(DEVICE_TYPES),
+            device_brand=rng.choice(BRANDS),
+            device_model=f"M{rng.randint(1, 60)}",
+            problem_description=rng.choice(PROBLEMS),
+            status=status,
+            estimated_cost=cost,
+            received_date=received,
+            estimated_completion=(received + takes).date(),
+            completed_date=delivered - timedelta(hours=4) if delivered else None,
+            delivered_date=delivered,
+            warranty_days=30,
+            warranty_expires=(delivered + timedelta(days=30)).date()
+            if delivered
+            else None,
+            assigned_technician=self.technician_id,
+            received_by=self.cashier_id,
+            delivered_by=self.cashier_id if delivered else None,
+            is_express=rng.random() < 0.1,
+            customer_approved=status not in ("received", "diagnosing"),
+            created_at=received,
+            updated_at=delivered or received,
+            **costs,
+        )
+
+    def expense(self, day: date) -> None:
+        """Add an expense of the day."""
+        rng = self.rng
+        self.add(
+            Expense,
+            category_id=rng.choice(self.expense_category_ids),
+            amount=_money(rng.uniform(10, 800)),
+            description=f"Gasto {self.next_ids[Expense] + 1}",
+            expense_date=day,
+            payment_method=rng.choice(("cash", "cash", "transfer", "card")),
+            receipt_number=None,
+            supplier_name=None,
+            receipt_file_path=None,
+            created_by=self.admin_id,
+            is_editable=False,
+        )
+
+    def close_accounts(self) -> None:
+        """Store the final account balances and totals."""
+        self.db.execute(
+            update(CustomerAccount),
+            [
+                {
+                    "id": customer_id,
+                    "account_balance": account.balance,
+                    "total_sales": account.total_sales,
+                    "total_payments": account.total_payments,
+                    "transaction_count": account.count,
+                    "last_transaction_date": account.last_transaction,
+                    "last_payment_date": account.last_payment,
+                }
+                for customer_id, account in self.accounts.items()
+            ],
+        )
+
+
+def _months(start: date, end: date):
+    """Yield (first, last) days of each month overlapping a range."""
+    month_start = start.replace(day=1)
+    while month_start <= end:
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        yield max(month_start, start), min(next_month - timedelta(days=1), end)
+        month_start = next_month
+
+
+def rebuild_derived(db: Session, start: date, end: date) -> None:
+    """Recompute the tables the services maintain on write. Does not commit.
+
+    Args:
+        db: Database session
+        start: First day with history
+        end: Last day with history
+    """
+    day = start
+    while day <= end:
+        daily_register_totals.rebuild(db, business_date=day)
+        day += timedelta(days=1)
+    for month_start, month_end in _months(start, end):
+        sales_rollup_crud.rebuild(db, start=month_start, end=month_end)
+    customer_balance_checkpoint_crud.rebuild(db)
+
+
+def _reset_sequences(db: Session) -> None:
+    """Move PostgreSQL ID sequences past the explicitly inserted IDs."""
+    for model in _MODELS:
+        table = model.__tablename__
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"
+            )
+        )
+
+
+def is_empty(engine: Engine) -> bool:
+    """Whether the database has no sales (or no tables at all)."""
+    if not inspect(engine).has_table(Sale.__tablename__):
+        return True
+    with Session(engine) as db:
+        return not db.scalar(select(func.count(Sale.id)))
+
+
+def generate(engine: Engine, spec: DatasetSpec) -> Dataset:
+    """Fill an empty database with a generated store history.
+
+    Args:
+        engine: Engine of a database whose schema exists and has no data
+        spec: Size and seed of the dataset
+
+    Returns:
+        The date range and row counts written
+    """
+    started = time.perf_counter()
+    end = spec.end or get_local_today() - timedelta(days=1)
+    start = end - timedelta(days=max(1, round(spec.years * 365)) - 1)
+
+    with Session(engine) as db:
+        store = _Store(db, spec, end)
+        store.populate_reference()
+        day = start
+        while day <= end:
+            store.populate_day(day)
+            day += timedelta(days=1)
+        store.flush()
+        store.close_accounts()
+        if engine.dialect.name == "postgresql":
+            _reset_sequences(db)
+        db.commit()
+
+        rebuild_derived(db, start, end)
+        db.commit()
+
+    return Dataset(
+        spec=spec,
+        start=start,
+        end=end,
+        rows=dict(store.rows),
+        seconds=time.perf_counter() - started,
+    )
+
+
+def create_schema(engine: Engine, migrate: bool = False) -> None:
+    """Create the schema on an empty database.
+
+    Args:
+        engine: Engine of the database
+        migrate: Run the Alembic migrations instead of creating the tables
+            from the models, for the indexes and extensions only the
+            migrations create (e.g. trigram search on PostgreSQL)
+    """
+    if not migrate:
+        Base.metadata.create_all(engine)
+        return
+
+    from alembic import command
+    from alembic.config import Config
+
+    # env.py reads the URL from the settings
+    settings.DATABASE_URL = engine.url.render_as_string(hide_password=False)
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+def drop_schema(engine: Engine) -> None:
+    """Drop every table of the models and the migration history."""
+    Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
@@ -0,0 +1,260 @@
+"""Time benchmark scenarios and report results comparable across commits.
+
+Every call is timed on its own session and profiled with the application's
+request profiler, so results carry the statements issued and the time
+spent in the database along with latency and throughput. Results are saved
+as JSON with the commit, database and dataset they were measured on, and
+a saved run can be given as the baseline of a later one.
+"""
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import sqlalchemy
+from app.core.profiling import finish_profile, instrument_engine, start_profile
+from app.core.user_cache import user_cache
+from app.crud.product_catalog import product_catalog
+from app.crud.product_search import product_search
+from app.crud.receivables_aging import receivables_aging
+from app.services.dashboard_service import dashboard_service
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.dataset import ROOT, Dataset
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+
+@dataclass
+class Result:
+    """Timings of one scenario.
+
+    Attributes:
+        scenario: Scenario name.
+        iterations: Timed calls.
+        p50_ms: Median latency.
+        p95_ms: 95th percentile latency.
+        max_ms: Slowest call.
+        per_second: Calls per second, one after another.
+        queries: Statements per call.
+        db_ms: Time in the database per call.
+    """
+
+    scenario: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    per_second: float
+    queries: float
+    db_ms: float
+
+
+def _clear_caches() -> None:
+    """Drop in-process caches so each scenario starts cold."""
+    product_search.index.clear()
+    product_catalog.clear()
+    dashboard_service.invalidate()
+    receivables_aging.invalidate()
+    user_cache.clear()
+
+
+def _percentile(timings: list[float], percent: int) -> float:
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[percent - 1]
+
+
+def run_scenario(
+    engine: Engine,
+    scenario: Scenario,
+    *,
+    iterations: Optional[int] = None,
+    warmup: int = 3,
+    seed: int = 42,
+) -> Result:
+    """Time a scenario.
+
+    Args:
+        engine: Engine of the benchmark database
+        scenario: Scenario to run
+        iterations: Timed calls (default: the scenario's own)
+        warmup: Untimed calls first, to load caches and indexes
+        seed: Seed of the scenario's inputs
+
+    Returns:
+        Latency, throughput and statement counts of the timed calls
+    """
+    instrument_engine(engine)
+    session_factory = sessionmaker(bind=engine)
+    iterations = iterations or scenario.iterations
+    _clear_caches()
+
+    with session_factory() as db:
+        operation = scenario.setup(db, random.Random(seed))
+
+    timings: list[float] = []
+    queries = 0
+    db_seconds = 0.0
+    for index in range(warmup + iterations):
+        db = session_factory()
+        profile, token = start_profile("BENCH", scenario.name)
+        started = time.perf_counter()
+        try:
+            operation(db, index)
+        finally:
+            elapsed = time.perf_counter() - started
+            finish_profile(token)
+            db.close()
+        if index >= warmup:
+            timings.append(elapsed)
+            queries += profile.query_count
+            db_seconds += profile.db_seconds
+
+    return Result(
+        scenario=scenario.name,
+        iterations=iterations,
+        p50_ms=_percentile(timings, 50) * 1000,
+        p95_ms=_percentile(timings, 95) * 1000,
+        max_ms=max(timings) * 1000,
+        per_second=iterations / sum(timings),
+        queries=queries / iterations,
+        db_ms=db_seconds * 1000 / iterations,
+    )
+
+
+def run(
+    engine: Engine,
+    names: Optional[list[str]] = None,
+    *,
+    iterations: Optional[int] = None,
+    warmup: int = 3,
+    seed: int = 42,
+) -> list[Result]:
+    """Run scenarios, those that write data last.
+
+    Args:
+        engine: Engine of the benchmark database
+        names: Scenarios to run (default: all)
+        iterations: Timed calls per scenario (default: each scenario's own)
+        warmup: Untimed calls per scenario
+        seed: Seed of the scenarios' inputs
+
+    Returns:
+        One result per scenario, in the order run
+
+    Raises:
+        KeyError: If a scenario name is unknown.
+    """
+    scenarios = [SCENARIOS[name] for name in names or SCENARIOS]
+    scenarios.sort(key=lambda scenario: scenario.writes)
+    return [
+        run_scenario(engine, scenario, iterations=iterations, warmup=warmup, seed=seed)
+        for scenario in scenarios
+    ]
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def environment(engine: Engine, dataset: Optional[Dataset]) -> dict[str, Any]:
+    """Describe where results were measured.
+
+    Args:
+        engine: Engine of the benchmark database
+        dataset: Dataset generated for the run, or None when reused
+
+    Returns:
+        Commit, database, dataset and interpreter of the run
+    """
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+        "database": engine.dialect.name,
+        "database_version": ".".join(
+            str(part) for part in engine.dialect.server_version_info or ()
+        ),
+        "dataset": (
+            {
+                **asdict(dataset.spec),
+                "end": dataset.end.isoformat(),
+                "start": dataset.start.isoformat(),
+                "rows": dataset.rows,
+                "seconds": round(dataset.seconds, 1),
+            }
+            if dataset
+            else None
+        ),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def save(path: Path, env: dict[str, Any], results: list[Result]) -> None:
+    """Write results and their environment as JSON."""
+    path.write_text(
+        json.dumps(
+            {"environment": env, "results": [asdict(r) for r in results]},
+            indent=2,
+        )
+    )
+
+
+def load(path: Path) -> dict[str, Any]:
+    """Read results written by ``save``."""
+    return json.loads(path.read_text())
+
+
+def format_table(
+    results: list[Result], baseline: Optional[dict[str, Any]] = None
+) -> str:
+    """Format results as a text table.
+
+    Args:
+        results: Results to show
+        baseline: Saved results to compare with; adds the change of the
+            median latency and of the statements per call
+
+    Returns:
+        The table, one scenario per line
+    """
+    previous = {r["scenario"]: r for r in (baseline or {}).get("results", [])}
+    header = (
+        f"{'scenario':<20} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'max ms':>9} {'ops/s':>8} {'queries':>8} {'db ms':>8}"
+    )
+    if baseline is not None:
+        header += f" {'p50 Δ':>8} {'queries Δ':>10}"
+    lines = [header, "-" * len(header)]
+
+    for result in results:
+        line = (
+            f"{result.scenario:<20} {result.iterations:>5} {result.p50_ms:>9.2f} "
+            f"{result.p95_ms:>9.2f} {result.max_ms:>9.2f} {result.per_second:>8.1f} "
+            f"{result.queries:>8.1f} {result.db_ms:>8.2f}"
+        )
+        if baseline is not None:
+            before = previous.get(result.scenario)
+            if before and before["p50_ms"]:
+                change = (result.p50_ms / before["p50_ms"] - 1) * 100
+                line += (
+                    f" {change:>+7.1f}% {result.queries - before['queries']:>+10.1f}"
+                )
+            else:
+                line += f" {'-':>8} {'-':>10}"
+        lines.append(line)
+    return "\n".join(lines)
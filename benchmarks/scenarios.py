@@ -0,0 +1,280 @@
+"""Benchmark scenarios: the service entry points behind the busiest pages.
+
+A scenario's setup runs once against the generated data and returns the
+operation to time. Each call of the operation gets a fresh session, as a
+request does, and an index used to cycle through inputs drawn up front
+from the seeded generator, so every run times the same calls.
+"""
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from app.crud.cash_closing import cash_closing
+from app.crud.sale import sale_crud
+from app.models.customer_account import CustomerTransaction
+from app.models.product import Category, Product
+from app.models.sale import Sale
+from app.models.user import User
+from app.schemas.filters import (
+    ProductFilter,
+    ProductListParams,
+    SortField,
+    SortOrder,
+    StockStatus,
+)
+from app.schemas.sale import SaleCreate, SaleItemCreate
+from app.services.customer_account_service import customer_account_service
+from app.services.dashboard_service import dashboard_service
+from app.services.product_service import ProductService
+from app.services.report_service import report_service
+from app.utils.timezone import (
+    get_cash_register_business_day,
+    local_date_to_utc_range,
+    utc_to_local,
+)
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from benchmarks.dataset import BRANDS, KINDS
+
+Operation = Callable[[Session, int], Any]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A timed service call.
+
+    Attributes:
+        name: Short name used on the command line and in results.
+        description: What is timed.
+        setup: Builds the operation from the data, given a seeded generator.
+        iterations: Timed calls by default.
+        writes: Whether the operation changes data; such scenarios run last.
+    """
+
+    name: str
+    description: str
+    setup: Callable[[Session, random.Random], Operation]
+    iterations: int = 100
+    writes: bool = False
+
+
+SCENARIOS: dict[str, Scenario] = {}
+
+
+def scenario(
+    name: str, description: str, iterations: int = 100, writes: bool = False
+) -> Callable:
+    """Register a scenario setup function under ``name``."""
+
+    def register(setup: Callable[[Session, random.Random], Operation]):
+        SCENARIOS[name] = Scenario(name, description, setup, iterations, writes)
+        return setup
+
+    return register
+
+
+def _history(db: Session) -> tuple[date, date]:
+    """First and last local day with sales."""
+    first, last = db.execute(
+        select(func.min(Sale.sale_date), func.max(Sale.sale_date))
+    ).one()
+    return utc_to_local(first).date(), utc_to_local(last).date()
+
+
+def _search_terms(rng: random.Random, count: int, samples: int) -> list[str]:
+    """Terms as typed at the POS: prefixes, substrings, typos and barcodes."""
+    terms = []
+    for _ in range(samples):
+        kind = rng.choice(KINDS).split()[0].lower()
+        brand = rng.choice(BRANDS).lower()
+        terms.append(
+            rng.choice(
+                [
+                    kind[:3],
+                    brand[: rng.randint(2, len(brand))],
+                    f"{kind} {brand}",
+                    brand[1:],
+                    f"{kind[:-1]}x {brand}",
+                    f"779{rng.randrange(count):010d}",
+                ]
+            )
+        )
+    return terms
+
+
+@scenario(
+    "checkout",
+    "POS checkout of a 1-4 item cart (SaleCRUD._create_sale_internal)",
+    iterations=100,
+    writes=True,
+)
+def _checkout(db: Session, rng: random.Random) -> Operation:
+    cashier_id = db.scalar(select(User.id).order_by(User.role != "cashier", User.id))
+    product_ids = db.scalars(
+        select(Product.id)
+        .where(
+            Product.is_active.is_(True),
+            Product.is_service.is_(False),
+            Product.current_stock >= 20,
+        )
+        .order_by(Product.id)
+    ).all()
+    customer_ids = db.scalars(
+        select(CustomerTransaction.customer_id)
+        .group_by(CustomerTransaction.customer_id)
+        .order_by(CustomerTransaction.customer_id)
+    ).all()
+    # Sales are refused until the cashier opens the day's register
+    if cash_closing.get_unfinalized_register(db) is None:
+        cash_closing.open_cash_register(
+            db,
+            target_date=get_cash_register_business_day(),
+            opening_balance=Decimal("0.00"),
+            opened_by=cashier_id,
+        )
+
+    carts = [
+        SaleCreate(
+            customer_id=rng.choice(customer_ids),
+            payment_method=rng.choice(("cash", "transfer", "card")),
+            items=[
+                SaleItemCreate(product_id=product_id, quantity=1)
+                for product_id in rng.sample(product_ids, rng.randint(1, 4))
+            ],
+        )
+        for _ in range(50)
+    ]
+
+    def checkout(db: Session, index: int):
+        cart = carts[index % len(carts)].model_copy(deep=True)
+        return sale_crud._create_sale_internal(db, sale_in=cart, user_id=cashier_id)
+
+    return checkout
+
+
+@scenario("search_products", "POS product search as typed (SaleCRUD.search_products)")
+def _search_products(db: Session, rng: random.Random) -> Operation:
+    count = db.scalar(select(func.count(Product.id)))
+    terms = _search_terms(rng, count, 200)
+
+    def search(db: Session, index: int):
+        return sale_crud.search_products(db, query=terms[index % len(terms)])
+
+    return search
+
+
+@scenario(
+    "daily_summary",
+    "Cash register summary of a past day (CRUDCashClosing.get_daily_summary)",
+)
+def _daily_summary(db: Session, rng: random.Random) -> Operation:
+    first, last = _history(db)
+    days = [
+        first + timedelta(days=rng.randint(0, (last - first).days)) for _ in range(100)
+    ]
+
+    def summary(db: Session, index: int):
+        return cash_closing.get_daily_summary(db, target_date=days[index % len(days)])
+
+    return summary
+
+
+@scenario(
+    "dashboard_stats",
+    "Dashboard statistics, uncached (DashboardService.get_dashboard_stats)",
+)
+def _dashboard_stats(db: Session, rng: random.Random) -> Operation:
+    def stats(db: Session, index: int):
+        dashboard_service.invalidate()
+        return dashboard_service.get_dashboard_stats(db)
+
+    return stats
+
+
+@scenario(
+    "product_list",
+    "Product list page with filters and sorts (ProductService.get_product_list)",
+)
+def _product_list(db: Session, rng: random.Random) -> Operation:
+    category_ids = db.scalars(select(Category.id)).all()
+    terms = _search_terms(rng, 1, 20)
+    params = [
+        ProductListParams(),
+        ProductListParams(include_total=True),
+        ProductListParams(sort_by=SortField.PRICE, sort_order=SortOrder.DESC),
+        ProductListParams(sort_by=SortField.CATEGORY, page_size=50),
+        ProductListParams(filters=ProductFilter(stock_status=StockStatus.LOW_STOCK)),
+        *(
+            ProductListParams(filters=ProductFilter(category_ids=[category_id]))
+            for category_id in rng.sample(category_ids, min(5, len(category_ids)))
+        ),
+        *(
+            ProductListParams(filters=ProductFilter(search=term), include_total=True)
+            for term in terms[:5]
+        ),
+    ]
+    # The service exposes a coroutine that runs this in the database pool
+    get_product_list = ProductService.get_product_list.__wrapped__
+
+    def product_list(db: Session, index: int):
+        return get_product_list(ProductService(db), params[index % len(params)])
+
+    return product_list
+
+
+@scenario(
+    "customer_statement",
+    "90-day account statement of active customers "
+    "(CustomerAccountService.get_statement)",
+)
+def _customer_statement(db: Session, rng: random.Random) -> Operation:
+    _, last = _history(db)
+    customer_ids = db.scalars(
+        select(CustomerTransaction.customer_id)
+        .group_by(CustomerTransaction.customer_id)
+        .order_by(func.count().desc(), CustomerTransaction.customer_id)
+        .limit(20)
+    ).all()
+    calls = [
+        (
+            rng.choice(customer_ids),
+            local_date_to_utc_range(last - timedelta(days=rng.randint(0, 180)))[1],
+        )
+        for _ in range(50)
+    ]
+
+    def statement(db: Session, index: int):
+        customer_id, end = calls[index % len(calls)]
+        return customer_account_service.get_statement(
+            db,
+            customer_id,
+            start_date=end - timedelta(days=90),
+            end_date=end,
+        )
+
+    return statement
+
+
+@scenario(
+    "monthly_report",
+    "Monthly income statement PDF " "(ReportService.generate_monthly_financial_report)",
+    iterations=20,
+)
+def _monthly_report(db: Session, rng: random.Random) -> Operation:
+    first, last = _history(db)
+    months = []
+    month = last.replace(day=1)
+    while month >= first.replace(day=1) and len(months) < 12:
+        months.append((month.year, month.month))
+        month = (month - timedelta(days=1)).replace(day=1)
+
+    def report(db: Session, index: int):
+        year, month = months[index % len(months)]
+        return report_service.generate_monthly_financial_report(db, year, month)
+
+    return report
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark POS product search latency against catalog size.
+
+Fills a scratch database with generated products and times the searches a
+cashier types (word prefixes, substrings, multi-word terms, misspellings and
+scanned barcodes) through ``product_search`` and, for comparison, the old
+``ILIKE '%term%'`` query. Prints p50/p95 latency per catalog size.
+
+By default each size runs on a temporary SQLite file. Pass --database-url to
+benchmark PostgreSQL (trigram indexes); it must point to an empty scratch
+database because the products tables are created and filled there.
+
+Example:
+    python scripts/benchmark_product_search.py --sizes 10000,100000,1000000
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.crud.product_search import product_search
+from app.models import *  # noqa: F401, F403
+from app.models.base import Base
+from app.models.product import Category, Product
+from app.models.user import User
+
+KINDS = [
+    "Funda",
+    "Cargador",
+    "Cable",
+    "Vidrio templado",
+    "Auriculares",
+    "Batería",
+    "Pantalla",
+    "Soporte",
+    "Parlante",
+    "Memoria",
+]
+BRANDS = ["Samsung", "Apple", "Motorola", "Xiaomi", "Huawei", "Lenovo", "Sony"]
+COLORS = ["negro", "blanco", "azul", "rojo", "transparente", "dorado"]
+
+
+def _product_rows(count: int, category_id: int, user_id: int, rng: random.Random):
+    """Yield product rows with realistic, partly repeated names."""
+    for index in range(count):
+        brand = rng.choice(BRANDS)
+        model = f"{brand[:3].upper()}{rng.randint(1, 400)}"
+        yield {
+            "sku": f"BENCH-{index:07d}",
+            "name": f"{rng.choice(KINDS)} {brand} {model} {rng.choice(COLORS)}",
+            "brand": brand,
+            "model": model,
+            "barcode": f"779{index:010d}",
+            "category_id": category_id,
+            "purchase_price": 1,
+            "first_sale_price": 2,
+            "second_sale_price": 2,
+            "third_sale_price": 2,
+            "tax_rate": 0,
+            "current_stock": rng.randint(0, 50),
+            "minimum_stock": 5,
+            "is_active": True,
+            "is_service": False,
+            "created_by": user_id,
+        }
+
+
+def _populate(engine, count: int, rng: random.Random) -> None:
+    """Create the schema and insert ``count`` products in batches."""
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(
+            email="bench@example.com",
+            password_hash="-",
+            full_name="Benchmark",
+            role="admin",
+        )
+        category = Category(name="Benchmark")
+        db.add_all([user, category])
+        db.commit()
+
+        batch = []
+        for row in _product_rows(count, category.id, user.id, rng):
+            batch.append(row)
+            if len(batch) == 10000:
+                db.execute(insert(Product), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Product), batch)
+        db.commit()
+
+
+def _terms(count: int, samples: int, rng: random.Random) -> list[str]:
+    """Build a mix of search terms typed at the POS."""
+    terms = []
+    for _ in range(samples):
+        kind = rng.choice(KINDS).split()[0].lower()
+        brand = rng.choice(BRANDS).lower()
+        terms.append(
+            rng.choice(
+                [
+                    kind[:3],
+                    brand[: rng.randint(2, len(brand))],
+                    f"{kind} {brand}",
+                    brand[1:],
+                    f"{kind[:-1]}x {brand}",
+                    f"779{rng.randrange(count):010d}",
+                ]
+            )
+        )
+    return terms
+
+
+def _percentiles(timings: list[float]) -> tuple[float, float]:
+    """Get p50 and p95 in milliseconds."""
+    quantiles = statistics.quantiles(timings, n=100)
+    return quantiles[49] * 1000, quantiles[94] * 1000
+
+
+def _time_searches(db: Session, terms: list[str], search) -> list[float]:
+    timings = []
+    for term in terms:
+        started = time.perf_counter()
+        search(db, term)
+        timings.append(time.perf_counter() - started)
+        db.expunge_all()
+    return timings
+
+
+def _legacy_search(db: Session, term: str) -> list[Product]:
+    """The previous per-keystroke query: ILIKE over three columns."""
+    pattern = f"%{term}%"
+    return list(
+        db.scalars(
+            select(Product)
+            .join(Product.category)
+            .where(
+                Product.is_active.is_(True),
+                or_(
+                    Product.name.ilike(pattern),
+                    Product.sku.ilike(pattern),
+                    Product.barcode.ilike(pattern),
+                ),
+            )
+            .limit(10)
+        )
+    )
+
+
+def benchmark(sizes: list[int], samples: int, database_url: str | None) -> None:
+    """Run the benchmark for every catalog size and print a table.
+
+    Args:
+        sizes: Catalog sizes to generate.
+        samples: Searches timed per size.
+        database_url: Scratch database to use instead of temporary SQLite.
+    """
+    rng = random.Random(42)
+    print(
+        f"{'products':>10} {'index load':>11} {'search p50':>11} "
+        f"{'search p95':>11} {'ILIKE p50':>10} {'ILIKE p95':>10}"
+    )
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = database_url or f"sqlite:///{tmp}/bench.db"
+            engine = create_engine(url)
+            if database_url:
+                Base.metadata.drop_all(engine)
+            _populate(engine, size, rng)
+            terms = _terms(size, samples, rng)
+
+            with Session(engine) as db:
+                product_search.index.clear()
+                started = time.perf_counter()
+                product_search.search(db, "warmup")
+                load_ms = (time.perf_counter() - started) * 1000
+
+                search_p50, search_p95 = _percentiles(
+                    _time_searches(
+                        db, terms, lambda db, term: product_search.search(db, term)
+                    )
+                )
+                legacy_p50, legacy_p95 = _percentiles(
+                    _time_searches(db, terms, _legacy_search)
+                )
+
+            print(
+                f"{size:>10} {load_ms:>9.0f}ms {search_p50:>9.2f}ms "
+                f"{search_p95:>9.2f}ms {legacy_p50:>8.2f}ms {legacy_p95:>8.2f}ms"
+            )
+            product_search.index.clear()
+            if database_url:
+                Base.metadata.drop_all(engine)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark POS product search latency by catalog size"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,1000000",
+        help="Comma separated catalog sizes (default: 10000,100000,1000000)",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=200, help="Searches timed per size"
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Empty scratch database URL (default: temporary SQLite file)",
+    )
+    args = parser.parse_args()
+
+    benchmark(
+        [int(size) for size in args.sizes.split(",")],
+        args.samples,
+        args.database_url,
+    )
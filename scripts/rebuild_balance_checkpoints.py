@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Verify customer ledgers and rebuild their balance checkpoints.
+
+Reports customers whose account balance differs from their transaction
+chain, whose chain has broken balance_before/balance_after links, or whose
+stored checkpoints no longer match the ledger. Run with --live once after
+the customer_balance_checkpoints migration, and after manual SQL fixes on
+customer transactions, to recompute the checkpoints.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import logging
+
+from app.crud.customer_balance_checkpoint import customer_balance_checkpoint_crud
+from app.database import SessionLocal
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild_balance_checkpoints(
+    customer_id: int | None = None, dry_run: bool = True
+) -> int:
+    """Report ledger drift and optionally rebuild checkpoints.
+
+    Args:
+        customer_id: Only check this customer (default: all).
+        dry_run: If True, only report drift.
+
+    Returns:
+        Number of customers with drift.
+    """
+    db = SessionLocal()
+
+    try:
+        logger.info(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
+
+        drifts = customer_balance_checkpoint_crud.verify(db, customer_id=customer_id)
+        for drift in drifts:
+            logger.info(
+                f"  Customer {drift.customer_id}: account "
+                f"{drift.account_balance}, ledger {drift.ledger_balance}, "
+                f"{drift.broken_links} broken link(s), "
+                f"{drift.stale_checkpoints} stale checkpoint(s)"
+            )
+        logger.info(f"{len(drifts)} customer(s) with drift")
+
+        if not dry_run:
+            written = customer_balance_checkpoint_crud.rebuild(
+                db, customer_id=customer_id
+            )
+            db.commit()
+            logger.info(f"Rebuilt {written} checkpoint(s)")
+
+        return len(drifts)
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error during rebuild: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Verify customer ledgers and rebuild balance checkpoints"
+    )
+    parser.add_argument("--customer", type=int, help="Customer ID")
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Actually rebuild the checkpoints (default is dry run)",
+    )
+    args = parser.parse_args()
+
+    try:
+        rebuild_balance_checkpoints(args.customer, dry_run=not args.live)
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Failed: {e}")
+        sys.exit(1)
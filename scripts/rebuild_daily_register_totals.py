@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Rebuild daily register totals from the source tables.
+
+Run once after the daily_register_totals migration to materialize past days,
+and whenever stored totals need to be reconciled (e.g. after a manual SQL
+fix on sales, payments, expenses or repairs).
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import logging
+
+from sqlalchemy import func
+
+from app.crud.daily_register_totals import daily_register_totals
+from app.database import SessionLocal
+from app.models.expense import Expense
+from app.models.sale import Sale
+from app.utils.timezone import get_local_today, utc_to_local
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _first_activity_date(db) -> date:
+    """Get the local date of the oldest sale or expense."""
+    first_sale = db.query(func.min(Sale.sale_date)).scalar()
+    first_expense = db.query(func.min(Expense.expense_date)).scalar()
+
+    candidates = [get_local_today()]
+    if first_sale:
+        candidates.append(utc_to_local(first_sale).date())
+    if first_expense:
+        candidates.append(first_expense)
+    return min(candidates)
+
+
+def rebuild_daily_register_totals(
+    start: date | None = None, end: date | None = None, dry_run: bool = True
+) -> int:
+    """Recompute stored totals for every day in a range.
+
+    Args:
+        start: First day to rebuild (default: first day with activity).
+        end: Last day to rebuild (default: today).
+        dry_run: If True, only report days whose stored totals differ.
+
+    Returns:
+        Number of days whose stored totals were out of date.
+    """
+    db = SessionLocal()
+
+    try:
+        start = start or _first_activity_date(db)
+        end = end or get_local_today()
+        logger.info(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
+        logger.info(f"Rebuilding {start} to {end}")
+
+        mismatched = 0
+        day = start
+        while day <= end:
+            stored = daily_register_totals.get_totals(db, business_date=day)
+            computed = daily_register_totals.compute(db, business_date=day)
+            if stored != computed:
+                mismatched += 1
+                differences = {
+                    column: (stored[column], computed[column])
+                    for column in computed
+                    if stored[column] != computed[column]
+                }
+                logger.info(f"  {day}: {differences}")
+
+            if not dry_run and any(computed.values()):
+                daily_register_totals.rebuild(db, business_date=day)
+            day += timedelta(days=1)
+
+        if not dry_run:
+            db.commit()
+
+        logger.info(f"{mismatched} day(s) out of date")
+        return mismatched
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error during rebuild: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild daily register totals from sales, payments, "
+        "expenses and repairs"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Actually store the totals (default is dry run)",
+    )
+    args = parser.parse_args()
+
+    try:
+        rebuild_daily_register_totals(args.start, args.end, dry_run=not args.live)
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Rebuild the sales analytics rollups from sales and sale items.
+
+Run once after the sales_rollups migration to roll up past sales, and
+whenever the rollups need to be reconciled (e.g. after a manual SQL fix on
+sales or sale items).
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import logging
+
+from sqlalchemy import func
+
+from app.crud.sales_rollup import sales_rollup_crud
+from app.database import SessionLocal
+from app.models.sale import Sale
+from app.utils.timezone import get_local_today, utc_to_local
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _months(start: date, end: date):
+    """Yield (first, last) local dates of each month overlapping a range."""
+    first = start
+    while first <= end:
+        following = (first.replace(day=1) + timedelta(days=32)).replace(day=1)
+        yield first, min(following - timedelta(days=1), end)
+        first = following
+
+
+def rebuild_sales_rollups(
+    start: date | None = None, end: date | None = None, dry_run: bool = True
+) -> int:
+    """Recompute the rollups of a date range, one month at a time.
+
+    Args:
+        start: First day to rebuild (default: day of the first sale).
+        end: Last day to rebuild (default: today).
+        dry_run: If True, only report months whose stored rollups differ.
+
+    Returns:
+        Number of months whose stored rollups were out of date.
+    """
+    db = SessionLocal()
+
+    try:
+        first_sale = db.query(func.min(Sale.sale_date)).scalar()
+        start = start or (
+            utc_to_local(first_sale).date() if first_sale else get_local_today()
+        )
+        end = end or get_local_today()
+        logger.info(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
+        logger.info(f"Rebuilding {start} to {end}")
+
+        mismatched = 0
+        for month_start, month_end in _months(start, end):
+            computed = sales_rollup_crud.compute(db, start=month_start, end=month_end)
+            stored = sales_rollup_crud.get_stored(db, start=month_start, end=month_end)
+            if stored != computed:
+                mismatched += 1
+                logger.info(
+                    f"  {month_start:%Y-%m}: {len(stored[0])} stored / "
+                    f"{len(computed[0])} computed daily rows"
+                )
+                if not dry_run:
+                    sales_rollup_crud.rebuild(db, start=month_start, end=month_end)
+                    db.commit()
+
+        logger.info(f"{mismatched} month(s) out of date")
+        return mismatched
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error during rebuild: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild sales analytics rollups from sales and sale items"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Actually store the rollups (default is dry run)",
+    )
+    args = parser.parse_args()
+
+    try:
+        rebuild_sales_rollups(args.start, args.end, dry_run=not args.live)
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,153 @@
+"""Sales analytics API endpoints, served from the sales rollups."""
+
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.auth import get_current_user
+from app.core.concurrency import run_in_db_thread
+from app.crud.sales_rollup import GROUPINGS, sales_rollup_crud
+from app.database import get_async_session as get_db
+from app.models.user import User
+from app.schemas.analytics import (
+    CategoryTrendPoint,
+    HourlyHeatmap,
+    SalesSummary,
+    SalesTotal,
+)
+from app.schemas.base import ResponseSchema
+from app.utils.timezone import get_local_today
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# Days covered when no start date is given
+DEFAULT_RANGE_DAYS = 30
+
+# Longest range accepted by a single request
+MAX_RANGE_DAYS = 366 * 3
+
+
+def require_admin_or_manager(current_user: User = Depends(get_current_user)) -> User:
+    """Require Admin or Manager role for sales analytics."""
+    if current_user.role not in ["admin", "manager"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only Admin and Manager roles can access sales analytics",
+        )
+    return current_user
+
+
+def date_range(
+    start: Optional[date] = Query(
+        None, description="First day (default: 29 days before end)"
+    ),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+) -> tuple[date, date]:
+    """Resolve and validate the requested date range."""
+    end = end or get_local_today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {MAX_RANGE_DAYS} days",
+        )
+    return start, end
+
+
+@router.get("/summary", response_model=ResponseSchema)
+async def get_sales_summary(
+    group_by: str = Query("day", description=f"One of: {', '.join(GROUPINGS)}"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    dates: tuple[date, date] = Depends(date_range),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_manager),
+) -> ResponseSchema:
+    """Get sales totals grouped by day, product, category, user or method."""
+    if group_by not in GROUPINGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of: {', '.join(GROUPINGS)}",
+        )
+    start, end = dates
+    groups = await run_in_db_thread(
+        sales_rollup_crud.totals,
+        db,
+        start=start,
+        end=end,
+        group_by=group_by,
+        limit=limit,
+    )
+    summary = SalesSummary(
+        start=start,
+        end=end,
+        group_by=group_by,
+        groups=[SalesTotal(**group) for group in groups],
+    )
+    return ResponseSchema(success=True, data=summary.model_dump())
+
+
+@router.get("/top-products", response_model=ResponseSchema)
+async def get_top_products(
+    limit: int = Query(10, ge=1, le=100),
+    dates: tuple[date, date] = Depends(date_range),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_manager),
+) -> ResponseSchema:
+    """Get the best-selling products by revenue."""
+    start, end = dates
+    groups = await run_in_db_thread(
+        sales_rollup_crud.totals,
+        db,
+        start=start,
+        end=end,
+        group_by="product",
+        limit=limit,
+    )
+    return ResponseSchema(
+        success=True,
+        data=[SalesTotal(**group).model_dump() for group in groups],
+    )
+
+
+@router.get("/hourly", response_model=ResponseSchema)
+async def get_hourly_heatmap(
+    dates: tuple[date, date] = Depends(date_range),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_manager),
+) -> ResponseSchema:
+    """Get sales count and revenue by weekday and hour."""
+    start, end = dates
+    heatmap = await run_in_db_thread(
+        sales_rollup_crud.hourly_heatmap, db, start=start, end=end
+    )
+    return ResponseSchema(
+        success=True,
+        data=HourlyHeatmap(start=start, end=end, **heatmap).model_dump(),
+    )
+
+
+@router.get("/category-trend", response_model=ResponseSchema)
+async def get_category_trend(
+    period: str = Query("day", pattern="^(day|week|month)$"),
+    dates: tuple[date, date] = Depends(date_range),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_manager),
+) -> ResponseSchema:
+    """Get revenue per category and day, week or month."""
+    start, end = dates
+    points = await run_in_db_thread(
+        sales_rollup_crud.category_trend, db, start=start, end=end, period=period
+    )
+    return ResponseSchema(
+        success=True,
+        data=[CategoryTrendPoint(**point).model_dump() for point in points],
+    )
@@ -9,6 +9,7 @@ from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.api.v1.auth import get_current_user
+from app.core.concurrency import run_in_db_thread
 from app.database import get_async_session as get_db
 from app.models.user import User
 from app.schemas.base import ResponseSchema
@@ -49,8 +50,11 @@ async def start_daily_closing(
     try:
         target_date = closing_date or date.today()
 
-        daily_summary, opening_balance = cash_closing_service.start_daily_closing(
-            db=db, closing_date=target_date, user_id=current_user.id
+        daily_summary, opening_balance = await run_in_db_thread(
+            cash_closing_service.start_daily_closing,
+            db=db,
+            closing_date=target_date,
+            user_id=current_user.id,
         )
 
         return ResponseSchema(
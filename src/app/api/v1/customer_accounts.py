@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_db
 from app.crud.customer_account import customer_account_crud
+from app.crud.pagination import InvalidCursorError
 from app.models.customer_account import TransactionType
 from app.models.user import User
 from app.schemas.customer_account import (
@@ -159,10 +160,17 @@ def get_customer_statement(
     end_date: Optional[datetime] = Query(
         None, description="End date for statement period"
     ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor of the transactions page (next_cursor/prev_cursor)"
+    ),
+    limit: int = Query(100, ge=1, le=500, description="Transactions per page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> AccountStatement:
-    """Generate customer account statement."""
+    """Generate customer account statement.
+
+    Totals cover the whole period; transactions are paginated with cursors.
+    """
     # Default to last 30 days if dates not provided
     if not end_date:
         end_date = datetime.utcnow()
@@ -171,9 +179,11 @@ def get_customer_statement(
 
     try:
         statement = customer_account_service.get_statement(
-            db, customer_id, start_date, end_date
+            db, customer_id, start_date, end_date, cursor=cursor, limit=limit
         )
         return statement
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
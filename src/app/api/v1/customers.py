@@ -5,14 +5,17 @@ from __future__ import annotations
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.v1.auth import get_current_user
+from app.crud.customer import LOOKUP_MAX_RESULTS
 from app.dependencies import get_db
 from app.models.user import User
 from app.schemas.customer import CustomerCreate, CustomerResponse
 from app.services.customer import customer_service
+from app.utils.http_cache import with_etag
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +136,49 @@ async def get_customer_balance(
     }
 
 
+@router.get("/lookup")
+async def lookup_customers(
+    request: Request,
+    q: Annotated[str, Query(min_length=1)],
+    limit: Annotated[int, Query(ge=1, le=LOOKUP_MAX_RESULTS)] = 10,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Type-ahead customer lookup by name or phone prefix.
+
+    Responses carry an ETag; clients sending it back in ``If-None-Match``
+    get an empty 304 while the results are unchanged.
+
+    Args:
+        request: Incoming request.
+        q: Text typed so far.
+        limit: Maximum number of results.
+        db: Database session.
+        current_user: Currently authenticated user.
+
+    Returns:
+        JSON with the matching customers.
+    """
+    customers = customer_service.lookup_customers(db=db, term=q, limit=limit)
+
+    return with_etag(
+        request,
+        JSONResponse(
+            {
+                "results": [
+                    {
+                        "id": c.id,
+                        "name": c.name,
+                        "phone": c.phone,
+                        "phone_secondary": c.phone_secondary,
+                    }
+                    for c in customers
+                ]
+            }
+        ),
+    )
+
+
 @router.get("/search")
 async def search_customers(
     q: Annotated[str, Query(min_length=1)],
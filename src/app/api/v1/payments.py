@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.v1.auth import get_current_user
 from app.crud.customer import customer_crud
+from app.crud.pagination import InvalidCursorError
 from app.crud.payment import payment_crud
 from app.crud.sale import sale_crud
 from app.dependencies import get_db
@@ -120,9 +121,10 @@ async def get_customer_payments(
     customer_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
     include_voided: bool = Query(False),
+    include_total: bool = Query(False),
 ) -> PaymentListResponse:
     """Get all payments for a customer.
 
@@ -130,15 +132,16 @@ async def get_customer_payments(
         customer_id: ID of the customer.
         current_user: Currently authenticated user.
         db: Database session.
-        skip: Number of records to skip.
+        cursor: Cursor of the page to get, from a previous response.
         limit: Maximum number of records to return.
         include_voided: Whether to include voided payments.
+        include_total: Whether to count all the customer's payments.
 
     Returns:
-        List of customer payments.
+        Page of customer payments.
 
     Raises:
-        HTTPException: If customer not found.
+        HTTPException: If customer not found or the cursor is invalid.
     """
     # Verify customer exists
     customer = customer_crud.get(db, customer_id)
@@ -146,19 +149,17 @@ async def get_customer_payments(
         raise HTTPException(status_code=404, detail="Customer not found")
 
     # Get payments
-    payments = payment_crud.list_payments(
-        db=db,
-        customer_id=customer_id,
-        skip=skip,
-        limit=limit,
-        include_voided=include_voided,
-    )
-
-    total = payment_crud.count_payments(
-        db=db,
-        customer_id=customer_id,
-        include_voided=include_voided,
-    )
+    try:
+        page = payment_crud.list_payments(
+            db=db,
+            customer_id=customer_id,
+            cursor=cursor,
+            limit=limit,
+            include_voided=include_voided,
+            with_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
     # Convert to response format
     items = [
@@ -182,15 +183,15 @@ async def get_customer_payments(
             voided_by=payment.voided_by.full_name if payment.voided_by else None,
             voided_at=payment.voided_at,
         )
-        for payment in payments
+        for payment in page.items
     ]
 
     return PaymentListResponse(
         items=items,
-        total=total,
-        page=skip // limit + 1,
         size=limit,
-        pages=(total + limit - 1) // limit,
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor,
+        total=page.total,
     )
 
 
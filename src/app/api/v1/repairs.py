@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.v1.auth import get_current_user
+from app.crud.pagination import InvalidCursorError
 from app.database import get_async_session as get_db
 from app.models.user import User
 from app.schemas.base import ResponseSchema
@@ -78,8 +79,9 @@ async def search_repairs(
     device_type: Optional[str] = Query(None, description="Filter by device type"),
     device_brand: Optional[str] = Query(None, description="Filter by device brand"),
     is_express: Optional[bool] = Query(None, description="Filter express repairs"),
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Page cursor"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(False, description="Count all matching repairs"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> ResponseSchema:
@@ -91,20 +93,25 @@ async def search_repairs(
         device_type=device_type,
         device_brand=device_brand,
         is_express=is_express,
-        page=page,
+        cursor=cursor,
         page_size=page_size,
+        include_total=include_total,
     )
 
-    repairs, total = repair_service.search_repairs(db=db, params=params)
+    try:
+        page = repair_service.search_repairs(db=db, params=params)
+    except InvalidCursorError as e:
+        # ``status`` is shadowed by the status filter here
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
     return ResponseSchema(
         success=True,
         data={
-            "repairs": [repair.model_dump() for repair in repairs],
-            "total": total,
-            "page": page,
+            "repairs": [repair.model_dump() for repair in page.items],
+            "total": page.total,
             "page_size": page_size,
-            "total_pages": (total + page_size - 1) // page_size,
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor,
         },
     )
 
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.v1.auth import get_current_user
+from app.crud.pagination import InvalidCursorError
 from app.crud.sale import sale_crud
 from app.database import get_async_session as get_db
 from app.models.user import User
@@ -92,8 +93,9 @@ async def create_sale(
 
 @router.get("/", response_model=ResponseSchema)
 async def list_sales(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
     customer_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -107,8 +109,9 @@ async def list_sales(
 ) -> ResponseSchema:
     """Get list of sales with filters.
 
-    - **skip**: Number of records to skip
+    - **cursor**: Page cursor (``next_cursor``/``prev_cursor`` of a response)
     - **limit**: Number of records to return
+    - **include_total**: Count all matching sales (one extra query)
     - **customer_id**: Filter by customer
     - **start_date**: Filter by start date
     - **end_date**: Filter by end date
@@ -116,17 +119,24 @@ async def list_sales(
     - **payment_method**: Filter by payment method
     - **is_voided**: Filter voided/active sales
     """
-    sales, total = sale_crud.get_multi_with_filters(
-        db,
-        skip=skip,
-        limit=limit,
-        customer_id=customer_id,
-        start_date=start_date,
-        end_date=end_date,
-        payment_status=payment_status,
-        payment_method=payment_method,
-        is_voided=is_voided,
-    )
+    try:
+        page = sale_crud.get_multi_with_filters(
+            db,
+            cursor=cursor,
+            limit=limit,
+            with_total=include_total,
+            customer_id=customer_id,
+            start_date=start_date,
+            end_date=end_date,
+            payment_status=payment_status,
+            payment_method=payment_method,
+            is_voided=is_voided,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
 
     sales_list = [
         SaleListResponse(
@@ -139,16 +149,16 @@ async def list_sales(
             payment_method=sale.payment_method,
             is_voided=sale.is_voided,
         )
-        for sale in sales
+        for sale in page.items
     ]
 
     return ResponseSchema(
         success=True,
         data={
             "items": [sale.model_dump() for sale in sales_list],
-            "total": total,
-            "page": skip // limit + 1,
-            "pages": (total + limit - 1) // limit,
+            "total": page.total,
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor,
         },
     )
 
@@ -199,7 +209,7 @@ async def search_products(
             barcode=product.barcode,
             price=product.first_sale_price,
             stock=product.current_stock,
-            category=product.category.name,
+            category=product.category_name,
         )
         for product in products
     ]
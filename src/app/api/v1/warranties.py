@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_db
+from app.crud.pagination import InvalidCursorError
 from app.models.user import User
 from app.schemas.base import ResponseSchema
 from app.schemas.warranty import (
@@ -118,18 +119,25 @@ def search_warranties(
     logger.info(f"User {current_user.id} searching warranties with params: {params}")
 
     try:
-        warranties, total = warranty_service.search_warranties(db, params=params)
+        page = warranty_service.search_warranties(db, params=params)
+        found = page.total if page.total is not None else len(page.items)
 
         return ResponseSchema(
             success=True,
-            data=warranties,
-            message=f"Se han encontrado {total} garantías",
+            data=page.items,
+            message=f"Se han encontrado {found} garantías",
             meta={
-                "total": total,
-                "page": params.page,
+                "total": page.total,
                 "page_size": params.page_size,
+                "next_cursor": page.next_cursor,
+                "prev_cursor": page.prev_cursor,
             },
         )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
     except Exception as e:
         logger.error(f"Error searching warranties: {e}")
         raise HTTPException(
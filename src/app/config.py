@@ -38,6 +38,95 @@ class Settings(BaseSettings):
         default=7, description="JWT refresh token expiration in days"
     )
 
+    # Database worker threads for blocking session work
+    DB_THREAD_POOL_SIZE: int = Field(
+        default=10,
+        description="Concurrent threads running blocking database work",
+    )
+
+    # Authenticated user cache
+    USER_CACHE_MAX_SIZE: int = Field(
+        default=512, description="Maximum cached user identities per process"
+    )
+    USER_CACHE_TTL_SECONDS: int = Field(
+        default=60, description="Seconds a cached user identity stays valid"
+    )
+
+    # Dashboard statistics cache
+    DASHBOARD_CACHE_TTL_SECONDS: int = Field(
+        default=5, description="Seconds dashboard statistics are reused"
+    )
+
+    # Request profiling
+    SQL_ECHO: bool = Field(
+        default=False, description="Log every SQL statement (very verbose)"
+    )
+    PROFILING_ENABLED: bool = Field(
+        default=True, description="Record query counts and latency per route"
+    )
+    PROFILING_HISTORY_SIZE: int = Field(
+        default=500, description="Recent request profiles kept in memory"
+    )
+    PROFILING_SLOW_STATEMENTS: int = Field(
+        default=5, description="Slowest statements kept per route"
+    )
+    SERVER_TIMING_ENABLED: bool = Field(
+        default=True, description="Send Server-Timing headers with DB time"
+    )
+
+    # Accounts receivable aging cache
+    AGING_CACHE_TTL_SECONDS: int = Field(
+        default=300, description="Seconds a computed receivables aging is reused"
+    )
+
+    # Background PDF report jobs
+    REPORT_WORKERS: int = Field(
+        default=2, description="Reports generated concurrently in the background"
+    )
+    REPORT_ARTIFACT_TTL_SECONDS: int = Field(
+        default=300,
+        description="Seconds a generated report is kept and served again",
+    )
+    REPORT_ARTIFACT_DIR: str | None = Field(
+        default=None,
+        description="Directory for generated reports (default: a temp directory)",
+    )
+
+    # Scheduled maintenance sweeps
+    MAINTENANCE_ENABLED: bool = Field(
+        default=True, description="Run scheduled maintenance sweeps in-process"
+    )
+    MAINTENANCE_POLL_SECONDS: int = Field(
+        default=60, description="Seconds between checks for due maintenance tasks"
+    )
+    MAINTENANCE_HISTORY_SIZE: int = Field(
+        default=200, description="Maintenance runs kept for the admin view"
+    )
+
+    # Product search
+    PRODUCT_SEARCH_SYNC_SECONDS: int = Field(
+        default=60,
+        description="Seconds between checks for products changed by other "
+        "processes (in-process search index, used on SQLite only)",
+    )
+
+    # Product catalog snapshot
+    CATALOG_MAX_PRODUCTS: int = Field(
+        default=5000,
+        description="Maximum products kept in the in-process POS catalog",
+    )
+    CATALOG_TTL_SECONDS: int = Field(
+        default=30,
+        description="Seconds a cached catalog product stays valid; bounds "
+        "staleness for changes made by other processes (0 disables caching)",
+    )
+
+    # Customers
+    PHONE_COUNTRY_CODE: str = Field(
+        default="54",
+        description="Country calling code stripped when normalizing phones",
+    )
+
     # Password Security
     BCRYPT_ROUNDS: int = Field(default=12, description="Bcrypt hashing rounds")
 
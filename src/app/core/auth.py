@@ -11,6 +11,7 @@ from app.core.security import (
     get_password_hash,
     verify_password,
 )
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.auth import TokenResponse, UserCreate
 
@@ -175,6 +176,7 @@ class AuthService:
         # Update password
         user.password_hash = get_password_hash(new_password)
         self.db.commit()
+        user_cache.invalidate(user.id)
 
         return True
 
@@ -186,6 +188,7 @@ class AuthService:
         """
         user.is_active = False
         self.db.commit()
+        user_cache.invalidate(user.id)
 
     def activate_user(self, user: User) -> None:
         """Activate a user account.
@@ -195,3 +198,4 @@ class AuthService:
         """
         user.is_active = True
         self.db.commit()
+        user_cache.invalidate(user.id)
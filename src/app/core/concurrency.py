@@ -0,0 +1,67 @@
+"""Run blocking database work off the event loop.
+
+Route handlers are ``async def`` but the ORM session is synchronous, so a slow
+query or report would otherwise block every other request on the worker.
+Blocking work is dispatched to worker threads, bounded by a limiter sized to
+the database connection pool so threads never queue for connections.
+"""
+
+import functools
+import weakref
+from asyncio import AbstractEventLoop, get_running_loop
+from collections.abc import Awaitable, Callable
+from typing import ParamSpec, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+
+from app.config import settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# One limiter per event loop: anyio limiters are bound to the loop they run on
+_limiters: "weakref.WeakKeyDictionary[AbstractEventLoop, CapacityLimiter]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_db_limiter() -> CapacityLimiter:
+    """Get the limiter bounding concurrent database threads on this loop."""
+    loop = get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = CapacityLimiter(settings.DB_THREAD_POOL_SIZE)
+        _limiters[loop] = limiter
+    return limiter
+
+
+async def run_in_db_thread(
+    func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run a blocking function in the database thread pool.
+
+    Args:
+        func: Synchronous callable doing database or CPU-bound work.
+        *args: Positional arguments for ``func``.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        Whatever ``func`` returns. Exceptions propagate unchanged.
+    """
+    return await to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=get_db_limiter()
+    )
+
+
+def db_offload(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
+    """Turn a blocking function into a coroutine run in the database pool.
+
+    Used on service methods that keep an ``async`` interface for callers but
+    whose bodies only do synchronous session work.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return await run_in_db_thread(func, *args, **kwargs)
+
+    return wrapper
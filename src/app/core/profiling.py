@@ -0,0 +1,302 @@
+"""Per-request SQL query and latency profiling.
+
+Each HTTP request gets a ``RequestProfile`` in a context variable, which
+worker threads running its database work inherit. Engine cursor events add
+every statement's duration to the profile of the request that issued it,
+and ``ProfilingMiddleware`` records finished profiles in
+``performance_recorder``: a bounded ring buffer of recent requests plus
+running totals per route for the admin performance page.
+
+The per-statement cost is two ``perf_counter`` calls and a context variable
+lookup, and statements outside a request are ignored, so profiling is meant
+to stay on in production. Statements are recorded as parameterized SQL;
+bound values never leave the cursor events.
+"""
+
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.timezone import get_utc_now
+
+# Longest statement text kept, in characters
+STATEMENT_MAX_LENGTH = 600
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+@dataclass
+class SlowStatement:
+    """A statement and how long it took.
+
+    Attributes:
+        seconds: Execution time.
+        statement: Parameterized SQL, truncated.
+    """
+
+    seconds: float
+    statement: str
+
+
+@dataclass
+class RequestProfile:
+    """Database activity and timing of one request.
+
+    Attributes:
+        method: HTTP method.
+        path: Request path.
+        route: Route template, set once the request is routed.
+        started_at: When the request started (UTC).
+        started: ``perf_counter`` at start.
+        query_count: Statements executed.
+        db_seconds: Time spent executing statements.
+        slowest: Slowest statements, longest first.
+        status_code: Response status.
+        response_seconds: Time until the response headers were sent.
+        total_seconds: Time until the response body was sent.
+        slow_statement_count: Statements kept in ``slowest``.
+    """
+
+    method: str
+    path: str
+    route: Optional[str] = None
+    started_at: datetime = field(default_factory=get_utc_now)
+    started: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    db_seconds: float = 0.0
+    slowest: list[SlowStatement] = field(default_factory=list)
+    status_code: Optional[int] = None
+    response_seconds: float = 0.0
+    total_seconds: float = 0.0
+    slow_statement_count: int = 3
+
+    @property
+    def name(self) -> str:
+        """Method and route template; unrouted paths share one name."""
+        return f"{self.method} {self.route or '(unmatched)'}"
+
+    def add_statement(self, seconds: float, statement: str) -> None:
+        """Count a statement and keep it if among the slowest."""
+        self.query_count += 1
+        self.db_seconds += seconds
+        if (
+            len(self.slowest) < self.slow_statement_count
+            or seconds > self.slowest[-1].seconds
+        ):
+            self.slowest.append(
+                SlowStatement(seconds, statement[:STATEMENT_MAX_LENGTH])
+            )
+            self.slowest.sort(key=lambda s: s.seconds, reverse=True)
+            del self.slowest[self.slow_statement_count :]
+
+    def server_timing(self, elapsed: float) -> str:
+        """Format the profile as a ``Server-Timing`` header value.
+
+        Args:
+            elapsed: Seconds since the request started.
+
+        Returns:
+            ``db`` (statement time and count) and ``app`` (the rest) metrics.
+        """
+        db_ms = self.db_seconds * 1000
+        app_ms = max(elapsed * 1000 - db_ms, 0.0)
+        return (
+            f'db;dur={db_ms:.1f};desc="{self.query_count} queries", '
+            f"app;dur={app_ms:.1f}"
+        )
+
+
+@dataclass
+class RouteStats:
+    """Running totals of the requests to one route.
+
+    Attributes:
+        name: Method and route template.
+        requests: Requests recorded.
+        errors: Requests answered with a 5xx status.
+        total_seconds: Summed request durations.
+        max_seconds: Slowest request.
+        db_seconds: Summed statement time.
+        queries: Summed statement count.
+        max_queries: Most statements issued by one request.
+        slowest: Slowest statements seen on the route, longest first.
+        last_seen: When the route was last requested (UTC).
+    """
+
+    name: str
+    requests: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    db_seconds: float = 0.0
+    queries: int = 0
+    max_queries: int = 0
+    slowest: list[SlowStatement] = field(default_factory=list)
+    last_seen: Optional[datetime] = None
+
+    @property
+    def average_ms(self) -> float:
+        """Mean request duration in milliseconds."""
+        return self.total_seconds * 1000 / self.requests if self.requests else 0.0
+
+    @property
+    def average_db_ms(self) -> float:
+        """Mean statement time per request in milliseconds."""
+        return self.db_seconds * 1000 / self.requests if self.requests else 0.0
+
+    @property
+    def average_queries(self) -> float:
+        """Mean statements per request."""
+        return self.queries / self.requests if self.requests else 0.0
+
+
+# Orderings offered by ``PerformanceRecorder.routes``
+ROUTE_ORDERINGS = {
+    "total": lambda stats: stats.total_seconds,
+    "average": lambda stats: stats.average_ms,
+    "max": lambda stats: stats.max_seconds,
+    "queries": lambda stats: stats.average_queries,
+    "db": lambda stats: stats.average_db_ms,
+}
+
+
+class PerformanceRecorder:
+    """Bounded in-memory record of request profiles."""
+
+    def __init__(self, history_size: int = 500, slow_statement_count: int = 5):
+        """Initialize an empty recorder.
+
+        Args:
+            history_size: Most recent requests kept.
+            slow_statement_count: Slowest statements kept per route.
+        """
+        self.slow_statement_count = slow_statement_count
+        self._history: deque[RequestProfile] = deque(maxlen=history_size)
+        self._routes: dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, profile: RequestProfile) -> None:
+        """Add a finished request to the history and its route totals."""
+        with self._lock:
+            self._history.append(profile)
+            stats = self._routes.get(profile.name)
+            if stats is None:
+                stats = self._routes[profile.name] = RouteStats(name=profile.name)
+
+            stats.requests += 1
+            stats.errors += 1 if (profile.status_code or 500) >= 500 else 0
+            stats.total_seconds += profile.total_seconds
+            stats.max_seconds = max(stats.max_seconds, profile.total_seconds)
+            stats.db_seconds += profile.db_seconds
+            stats.queries += profile.query_count
+            stats.max_queries = max(stats.max_queries, profile.query_count)
+            stats.last_seen = profile.started_at
+
+            if profile.slowest and (
+                len(stats.slowest) < self.slow_statement_count
+                or profile.slowest[0].seconds > stats.slowest[-1].seconds
+            ):
+                stats.slowest = sorted(
+                    stats.slowest + profile.slowest,
+                    key=lambda s: s.seconds,
+                    reverse=True,
+                )[: self.slow_statement_count]
+
+    def routes(self, order_by: str = "total", limit: int = 50) -> list[RouteStats]:
+        """Get route totals, worst first.
+
+        Args:
+            order_by: One of ``ROUTE_ORDERINGS``.
+            limit: Maximum number of routes.
+
+        Returns:
+            Route totals sorted by the chosen measure, descending.
+
+        Raises:
+            KeyError: If ``order_by`` is unknown.
+        """
+        key = ROUTE_ORDERINGS[order_by]
+        with self._lock:
+            routes = list(self._routes.values())
+        return sorted(routes, key=key, reverse=True)[:limit]
+
+    def recent(self, limit: int = 50) -> list[RequestProfile]:
+        """Get the most recent requests, newest first."""
+        with self._lock:
+            profiles = list(self._history)
+        profiles.reverse()
+        return profiles[:limit]
+
+    def slowest_requests(self, limit: int = 20) -> list[RequestProfile]:
+        """Get the slowest requests still in the history."""
+        with self._lock:
+            profiles = list(self._history)
+        return sorted(profiles, key=lambda p: p.total_seconds, reverse=True)[:limit]
+
+    def reset(self) -> None:
+        """Forget every recorded request."""
+        with self._lock:
+            self._history.clear()
+            self._routes.clear()
+
+
+def start_profile(method: str, path: str, slow_statement_count: int = 3):
+    """Begin profiling the current request.
+
+    Args:
+        method: HTTP method.
+        path: Request path.
+        slow_statement_count: Slowest statements kept for the request.
+
+    Returns:
+        Tuple of (profile, token resetting the context variable).
+    """
+    profile = RequestProfile(
+        method=method, path=path, slow_statement_count=slow_statement_count
+    )
+    return profile, _current_profile.set(profile)
+
+
+def finish_profile(token) -> None:
+    """Stop attributing statements to the profile started with ``token``."""
+    _current_profile.reset(token)
+
+
+def get_current_profile() -> Optional[RequestProfile]:
+    """Get the profile of the request being handled, if any."""
+    return _current_profile.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if _current_profile.get() is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    profile = _current_profile.get()
+    started = getattr(context, "_profiling_started", None)
+    if profile is not None and started is not None:
+        profile.add_statement(time.perf_counter() - started, statement)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute the statements of an engine to the requests running them."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+performance_recorder = PerformanceRecorder(
+    history_size=settings.PROFILING_HISTORY_SIZE,
+    slow_statement_count=settings.PROFILING_SLOW_STATEMENTS,
+)
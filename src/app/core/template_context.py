@@ -4,6 +4,7 @@
 from fastapi import Cookie, Request
 
 from app.core.web_auth import get_current_user_from_cookie
+from app.database import SessionLocal
 from app.models.user import User
 
 
@@ -15,6 +16,10 @@ async def get_current_user_context(
     This function attempts to get the current user from cookies.
     If the user is not authenticated or token is invalid, returns None.
 
+    The lookup uses a short-lived session from the application's shared
+    connection pool. The returned user is detached once the session closes,
+    so route dependencies can re-attach it instead of querying it again.
+
     Args:
         request: FastAPI request object
         access_token: JWT token from cookie
@@ -25,17 +30,8 @@ async def get_current_user_context(
     if not access_token:
         return None
 
+    db = SessionLocal()
     try:
-        # Create a new database session for this context
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-
-        from app.config import settings
-
-        engine = create_engine(settings.DATABASE_URL)
-        SessionLocal = sessionmaker(bind=engine)
-        db = SessionLocal()
-
         user = await get_current_user_from_cookie(request, access_token, db)
         return user
     except Exception:
@@ -43,6 +39,5 @@ async def get_current_user_context(
         # we return None to indicate no authenticated user
         return None
     finally:
-        # Always close the database session
-        if "db" in locals():
-            db.close()
+        # Always close the session so the connection returns to the pool
+        db.close()
@@ -0,0 +1,129 @@
+"""In-process cache of authenticated user identities.
+
+Cookie-authenticated requests resolve the same user on every page load. This
+module keeps a small snapshot of each recently seen user, keyed by the JWT
+subject, so most requests can rebuild the user without querying the database.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Identity fields needed to authorize a request and render templates."""
+
+    id: int
+    email: str
+    full_name: str
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        """Build a snapshot from a loaded user."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
+    def to_user(self, db: Session) -> User:
+        """Attach a user built from this snapshot to ``db`` without a query.
+
+        Fields outside the snapshot are left unloaded and are fetched lazily
+        through ``db`` if a caller needs them.
+        """
+        user = User(
+            id=self.id,
+            email=self.email,
+            full_name=self.full_name,
+            role=self.role,
+            is_active=self.is_active,
+        )
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+
+class UserIdentityCache:
+    """Bounded LRU cache of user snapshots with a time-to-live."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of users kept; least recently used go first.
+            ttl_seconds: Seconds a snapshot stays valid. Zero disables caching.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, UserSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether snapshots are stored at all."""
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, subject: str) -> UserSnapshot | None:
+        """Get a fresh snapshot for a token subject, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[subject]
+                return None
+
+            self._entries.move_to_end(subject)
+            return snapshot
+
+    def set(self, subject: str, user: User) -> None:
+        """Store a snapshot of ``user`` under a token subject."""
+        if not self.enabled:
+            return
+
+        snapshot = UserSnapshot.from_user(user)
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the snapshot of a user so the next request reloads it."""
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        """Drop every snapshot."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of snapshots currently stored, including expired ones."""
+        return len(self._entries)
+
+
+user_cache = UserIdentityCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_updated_user(mapper, connection, target: User) -> None:
+    """Invalidate a user whenever its row is updated (role edits, scripts, etc.)."""
+    user_cache.invalidate(target.id)
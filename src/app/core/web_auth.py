@@ -8,12 +8,44 @@ from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_token, verify_token_type
+from app.core.user_cache import user_cache
 from app.dependencies import get_db
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
 
+def _get_request_user(request: Request, db: Session, user_id: int) -> User | None:
+    """Get the user for this request with as few queries as possible.
+
+    ``AuthContextMiddleware`` already resolves the user for the template
+    context; when it resolved the same user ID, that instance is merged into
+    ``db``. Otherwise the user is rebuilt from the identity cache, and only on
+    a cache miss is it loaded from the database.
+
+    Args:
+        request: FastAPI request object.
+        db: Database session.
+        user_id: User ID taken from the token subject.
+
+    Returns:
+        User attached to ``db``, or None if not found.
+    """
+    resolved = getattr(request.state, "current_user", None)
+    if resolved is not None and resolved.id == user_id:
+        return db.merge(resolved, load=False)
+
+    snapshot = user_cache.get(str(user_id))
+    if snapshot is not None:
+        return snapshot.to_user(db)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        user_cache.set(str(user_id), user)
+
+    return user
+
+
 async def get_current_user_from_cookie(
     request: Request,
     access_token: Annotated[str | None, Cookie()] = None,
@@ -61,8 +93,8 @@ async def get_current_user_from_cookie(
     except JWTError:
         raise credentials_exception from None
 
-    # Get user from database
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # Get user from request context, identity cache or database
+    user = _get_request_user(request, db, int(user_id))
 
     if user is None:
         raise credentials_exception
@@ -113,8 +145,8 @@ async def get_current_user_optional(
     except JWTError:
         return None
 
-    # Get user from database
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # Get user from request context, identity cache or database
+    user = _get_request_user(request, db, int(user_id))
 
     if user is None or not user.is_active:
         return None
@@ -5,5 +5,13 @@ from .customer import CustomerCRUD
 from .payment import PaymentCRUD
 from .repair import repair_crud
 from .sale import sale_crud
+from .sales_rollup import sales_rollup_crud
 
-__all__ = ["CustomerCRUD", "PaymentCRUD", "sale_crud", "repair_crud", "cash_closing"]
+__all__ = [
+    "CustomerCRUD",
+    "PaymentCRUD",
+    "sale_crud",
+    "repair_crud",
+    "cash_closing",
+    "sales_rollup_crud",
+]
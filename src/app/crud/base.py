@@ -6,6 +6,7 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.crud.pagination import Page, keyset_paginate
 from app.models.base import BaseModel as DBBase
 
 ModelType = TypeVar("ModelType", bound=DBBase)
@@ -31,10 +32,21 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db.query(self.model).filter(self.model.id == id).first()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
-    ) -> list[ModelType]:
-        """Get multiple records."""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Page[ModelType]:
+        """Get a page of records in ID order, keyset paginated on the ID.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is not a cursor of this list.
+        """
+        return keyset_paginate(
+            db.query(self.model),
+            sort_column=self.model.id,
+            id_column=self.model.id,
+            limit=limit,
+            cursor=cursor,
+            descending=False,
+        )
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record."""
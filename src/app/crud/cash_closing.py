@@ -8,12 +8,9 @@ from sqlalchemy import and_, func
 from sqlalchemy.orm import Session, joinedload
 
 from app.crud.base import CRUDBase
+from app.crud.daily_register_totals import daily_register_totals
 from app.models.cash_closing import CashClosing
-from app.models.expense import Expense
-from app.models.payment import Payment, PaymentType
-from app.models.sale import Sale
 from app.schemas.cash_closing import CashClosingCreate, CashClosingUpdate, DailySummary
-from app.utils.timezone import local_date_to_utc_range
 
 
 class CRUDCashClosing(CRUDBase[CashClosing, CashClosingCreate, CashClosingUpdate]):
@@ -113,190 +110,12 @@ class CRUDCashClosing(CRUDBase[CashClosing, CashClosingCreate, CashClosingUpdate
         )
 
     def get_daily_summary(self, db: Session, *, target_date: date) -> DailySummary:
-        """Aggregate sales and expenses for a date."""
-        # Convert local date to UTC range for querying
-        utc_start, utc_end = local_date_to_utc_range(target_date)
-
-        # Get sales summary for the date (sale_date is stored in UTC)
-        sales_result = (
-            db.query(
-                func.coalesce(func.sum(Sale.total_amount), 0).label("total_sales"),
-                func.count(Sale.id).label("sales_count"),
-            )
-            .filter(Sale.sale_date >= utc_start)
-            .filter(Sale.sale_date <= utc_end)
-            .filter(Sale.is_voided == False)  # noqa: E712
-            .first()
-        )
+        """Get sales, repairs, expenses and debt payments for a date.
 
-        # Get sales breakdown - we need PAID amounts, not TOTAL amounts
-        # For cash closing:
-        # - Efectivo = sum of paid_amount where payment_method = 'cash'
-        # - Transferencia = sum of paid_amount where payment_method = 'transfer'
-        # - Cuenta Corriente (CC) = sum of (total_amount - paid_amount) = unpaid portion
-        sales_by_method = (
-            db.query(
-                Sale.payment_method,
-                func.sum(Sale.paid_amount).label(
-                    "paid"
-                ),  # Actual cash/transfer received
-                func.sum(Sale.total_amount - Sale.paid_amount).label(
-                    "credit"
-                ),  # Unpaid = CC
-                func.sum(Sale.cash_amount).label("cash_portion"),
-                func.sum(Sale.transfer_amount).label("transfer_portion"),
-                func.sum(Sale.card_amount).label("card_portion"),
-            )
-            .filter(Sale.sale_date >= utc_start)
-            .filter(Sale.sale_date <= utc_end)
-            .filter(Sale.is_voided == False)  # noqa: E712
-            .group_by(Sale.payment_method)
-            .all()
-        )
-
-        # Process sales breakdown by payment method
-        # NOTE: We use PAID amount for cash/transfer, and calculate CC as unpaid portion
-        sales_cash = Decimal("0.00")
-        sales_transfer = Decimal("0.00")
-        sales_credit = Decimal("0.00")  # Total unpaid across all sales
-        sales_mixed = Decimal("0.00")
-        sales_mixed_cash = Decimal("0.00")
-        sales_mixed_transfer = Decimal("0.00")
-        sales_mixed_card = Decimal("0.00")
-
-        for row in sales_by_method:
-            paid = Decimal(str(row.paid)) if row.paid else Decimal("0.00")
-            credit = Decimal(str(row.credit)) if row.credit else Decimal("0.00")
-
-            if row.payment_method == "cash":
-                sales_cash = paid  # Only count what was actually paid in cash
-                sales_credit += credit  # Add unpaid portion to CC
-            elif row.payment_method == "transfer":
-                sales_transfer = paid  # Only count what was actually paid by transfer
-                sales_credit += credit  # Add unpaid portion to CC
-            elif row.payment_method == "credit":
-                # Full credit sale - everything goes to CC
-                sales_credit += paid + credit
-            elif row.payment_method == "mixed":
-                # Mixed payments - use the specific portions
-                sales_mixed = paid
-                sales_mixed_cash = (
-                    Decimal(str(row.cash_portion))
-                    if row.cash_portion
-                    else Decimal("0.00")
-                )
-                sales_mixed_transfer = (
-                    Decimal(str(row.transfer_portion))
-                    if row.transfer_portion
-                    else Decimal("0.00")
-                )
-                sales_mixed_card = (
-                    Decimal(str(row.card_portion))
-                    if row.card_portion
-                    else Decimal("0.00")
-                )
-                sales_credit += credit  # Add unpaid portion to CC
-
-        # Get repair payments summary for the date (tracked separately, not as sales)
-        from app.models.repair import Repair
-
-        repairs_delivered_result = (
-            db.query(
-                func.count(Repair.id).label("repairs_count"),
-                func.coalesce(func.sum(Repair.final_cost), 0).label("repairs_total"),
-            )
-            .filter(Repair.delivered_date >= utc_start)
-            .filter(Repair.delivered_date <= utc_end)
-            .filter(Repair.final_cost.isnot(None))
-            .first()
-        )
-
-        # Get expenses summary for the date
-        expenses_result = (
-            db.query(
-                func.coalesce(func.sum(Expense.amount), 0).label("total_expenses"),
-                func.count(Expense.id).label("expenses_count"),
-            )
-            .filter(Expense.expense_date == target_date)
-            .first()
-        )
-
-        # Get expenses by payment method
-        expenses_by_method = (
-            db.query(Expense.payment_method, func.sum(Expense.amount).label("amount"))
-            .filter(Expense.expense_date == target_date)
-            .group_by(Expense.payment_method)
-            .all()
-        )
-
-        expenses_cash = Decimal("0.00")
-        expenses_transfer = Decimal("0.00")
-        expenses_card = Decimal("0.00")
-
-        for row in expenses_by_method:
-            if row.payment_method == "cash":
-                expenses_cash = row.amount or Decimal("0.00")
-            elif row.payment_method == "transfer":
-                expenses_transfer = row.amount or Decimal("0.00")
-            elif row.payment_method == "card":
-                expenses_card = row.amount or Decimal("0.00")
-
-        total_expenses = expenses_result.total_expenses or Decimal("0.00")
-        expenses_count = expenses_result.expenses_count or 0
-
-        # Calculate debt payments separately (pagos de cuentas corrientes)
-        # IMPORTANT: Only count payments for PREVIOUS debts, not payments for same-day sales
-        # Payments with sale_id = NULL are standalone debt payments
-        # Payments with sale_id != NULL are payments for sales (already counted in sales)
-        debt_payments_by_method = (
-            db.query(Payment.payment_method, func.sum(Payment.amount).label("amount"))
-            .filter(Payment.created_at >= utc_start)
-            .filter(Payment.created_at <= utc_end)
-            .filter(Payment.payment_type == PaymentType.payment)
-            .filter(Payment.voided == False)  # noqa: E712
-            .filter(
-                Payment.sale_id.is_(None)
-            )  # Only standalone debt payments, not sale payments
-            .group_by(Payment.payment_method)
-            .all()
-        )
-
-        debt_payments_cash = Decimal("0.00")
-        debt_payments_transfer = Decimal("0.00")
-        debt_payments_card = Decimal("0.00")
-
-        for row in debt_payments_by_method:
-            amount = Decimal(str(row.amount)) if row.amount else Decimal("0.00")
-            if row.payment_method == "cash":
-                debt_payments_cash = amount
-            elif row.payment_method == "transfer":
-                debt_payments_transfer = amount
-            elif row.payment_method == "card":
-                debt_payments_card = amount
-
-        # Handle mixed debt payments separately - aggregate their breakdown columns
-        mixed_debt_payments = (
-            db.query(Payment)
-            .filter(Payment.created_at >= utc_start)
-            .filter(Payment.created_at <= utc_end)
-            .filter(Payment.payment_type == PaymentType.payment)
-            .filter(Payment.voided == False)  # noqa: E712
-            .filter(Payment.sale_id.is_(None))
-            .filter(Payment.payment_method == "mixed")
-            .all()
-        )
-
-        for payment in mixed_debt_payments:
-            if payment.cash_amount:
-                debt_payments_cash += payment.cash_amount
-            if payment.transfer_amount:
-                debt_payments_transfer += payment.transfer_amount
-            if payment.card_amount:
-                debt_payments_card += payment.card_amount
-
-        debt_payments_total = (
-            debt_payments_cash + debt_payments_transfer + debt_payments_card
-        )
+        Totals are read from the day's ``daily_register_totals`` row, which is
+        kept current by every write to the source tables.
+        """
+        totals = daily_register_totals.get_totals(db, business_date=target_date)
 
         # Check if closing exists
         has_closing = self.check_closing_exists(db, closing_date=target_date)
@@ -304,32 +123,13 @@ class CRUDCashClosing(CRUDBase[CashClosing, CashClosingCreate, CashClosingUpdate
         # Sales and repairs are tracked separately
         return DailySummary(
             date=target_date,
-            total_sales=sales_result.total_sales or Decimal("0.00"),
-            total_expenses=total_expenses,
-            sales_count=sales_result.sales_count or 0,
-            expenses_count=expenses_count,
             has_closing=has_closing,
-            repairs_delivered_count=repairs_delivered_result.repairs_count
-            if repairs_delivered_result
-            else 0,
-            repairs_total=repairs_delivered_result.repairs_total
-            if repairs_delivered_result
-            else Decimal("0.00"),
-            # Payment method breakdowns
-            sales_cash=sales_cash,
-            sales_credit=sales_credit,
-            sales_transfer=sales_transfer,
-            sales_mixed=sales_mixed,
-            sales_mixed_cash=sales_mixed_cash,
-            sales_mixed_transfer=sales_mixed_transfer,
-            sales_mixed_card=sales_mixed_card,
-            expenses_cash=expenses_cash,
-            expenses_transfer=expenses_transfer,
-            expenses_card=expenses_card,
-            debt_payments_cash=debt_payments_cash,
-            debt_payments_transfer=debt_payments_transfer,
-            debt_payments_card=debt_payments_card,
-            debt_payments_total=debt_payments_total,
+            debt_payments_total=(
+                totals["debt_payments_cash"]
+                + totals["debt_payments_transfer"]
+                + totals["debt_payments_card"]
+            ),
+            **totals,
         )
 
     def get_finalized_closings(
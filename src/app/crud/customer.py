@@ -2,11 +2,98 @@
 
 from __future__ import annotations
 
-from sqlalchemy import func, or_
+import re
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, func, or_
 from sqlalchemy.orm import Session
 
 from app.models.customer import Customer
 from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.utils.phone import normalize_phone
+
+# Maximum customers returned by a type-ahead lookup
+LOOKUP_MAX_RESULTS = 25
+
+# Terms made only of these characters are looked up as phone numbers
+_PHONE_TERM = re.compile(r"^[\d\s()+-]+$")
+
+# Shortest digit string matched against the end of phone numbers
+PHONE_SUFFIX_MIN_DIGITS = 4
+
+
+def phone_filter(
+    db: Session, phone: str, *, prefix: bool = False, suffix: bool = False
+) -> ColumnElement[bool] | None:
+    """Build a condition matching customers by normalized phone.
+
+    Matches the primary and secondary phone exactly. Staff searches can also
+    match by prefix (type-ahead input) and by the ending (a number typed
+    without its area code); a few digits then match many customers, so
+    unauthenticated checks keep to exact matches. All comparisons run on
+    the normalized columns, so they are index seeks: PostgreSQL serves
+    suffixes from the ``reverse()`` indexes of migration a7b8c9d0e1f2;
+    other databases compare the ending directly.
+
+    Args:
+        db: Database session, used to pick the suffix comparison.
+        phone: Phone number or part of one, in any format.
+        prefix: Whether numbers starting with ``phone`` also match.
+        suffix: Whether numbers ending with ``phone`` (at least
+            ``PHONE_SUFFIX_MIN_DIGITS`` digits) also match.
+
+    Returns:
+        The condition, or None if ``phone`` has no digits.
+    """
+    digits = normalize_phone(phone)
+    if not digits:
+        return None
+
+    use_reverse = db.get_bind().dialect.name == "postgresql"
+    conditions = []
+    for column in (Customer.phone_normalized, Customer.phone_secondary_normalized):
+        conditions.append(column == digits)
+        if prefix:
+            conditions.append(column.startswith(digits, autoescape=True))
+        if suffix and len(digits) >= PHONE_SUFFIX_MIN_DIGITS:
+            if use_reverse:
+                conditions.append(
+                    func.reverse(column).startswith(digits[::-1], autoescape=True)
+                )
+            else:
+                conditions.append(column.endswith(digits, autoescape=True))
+    return or_(*conditions)
+
+
+def phone_term_filter(db: Session, term: str) -> ColumnElement[bool] | None:
+    """Build the phone condition of a free-text search term.
+
+    Only terms that look like a phone number are matched against phones:
+    the digits of "iPhone 11" or "juan2020@mail.com" would otherwise match
+    every number starting or ending with them.
+
+    Args:
+        db: Database session.
+        term: Text typed by the user.
+
+    Returns:
+        The prefix and suffix ``phone_filter`` condition, or None if the
+        term is not a phone number.
+    """
+    if not _PHONE_TERM.match(term.strip()):
+        return None
+    return phone_filter(db, term, prefix=True, suffix=True)
+
+
+def _balance_info(balance: Decimal) -> dict:
+    """Balance fields shown next to a customer in lists."""
+    return {
+        "current_balance": float(balance),
+        "has_debt": balance > 0,
+        "has_credit": balance < 0,
+        "status": "debt" if balance > 0 else "credit" if balance < 0 else "clear",
+        "formatted": f"${abs(balance):,.2f}",
+    }
 
 
 class CustomerCRUD:
@@ -28,10 +115,13 @@ class CustomerCRUD:
         Raises:
             ValueError: If customer with phone already exists.
         """
-        # Check for duplicate phone
+        # Check for duplicate phone, whatever its formatting
         existing = (
             db.query(Customer)
-            .filter(Customer.phone == customer.phone, Customer.is_active.is_(True))
+            .filter(
+                Customer.phone_normalized == normalize_phone(customer.phone),
+                Customer.is_active.is_(True),
+            )
             .first()
         )
 
@@ -63,6 +153,9 @@ class CustomerCRUD:
     def get_by_phone(self, db: Session, phone: str) -> Customer | None:
         """Get customer by phone number.
 
+        Numbers are compared normalized, so formatting and the country
+        prefix do not matter.
+
         Args:
             db: Database session.
             phone: Phone number to search.
@@ -70,10 +163,16 @@ class CustomerCRUD:
         Returns:
             Customer instance if found, None otherwise.
         """
+        digits = normalize_phone(phone)
+        if not digits:
+            return None
         return (
             db.query(Customer)
             .filter(
-                or_(Customer.phone == phone, Customer.phone_secondary == phone),
+                or_(
+                    Customer.phone_normalized == digits,
+                    Customer.phone_secondary_normalized == digits,
+                ),
                 Customer.is_active.is_(True),
             )
             .first()
@@ -87,7 +186,11 @@ class CustomerCRUD:
         skip: int = 0,
         limit: int = 20,
     ) -> list[Customer]:
-        """Search customers by name or phone.
+        """Search customers by name, email or phone.
+
+        Name and email match anywhere; queries that look like a phone number
+        also match phones by normalized prefix or ending (see
+        ``phone_term_filter``).
 
         Args:
             db: Database session.
@@ -99,24 +202,80 @@ class CustomerCRUD:
         Returns:
             List of matching customers.
         """
-        search_query = f"%{query}%"
-
         q = db.query(Customer)
 
         if not include_inactive:
             q = q.filter(Customer.is_active.is_(True))
 
-        q = q.filter(
-            or_(
-                Customer.name.ilike(search_query),
-                Customer.phone.like(search_query),
-                Customer.phone_secondary.like(search_query),
-                Customer.email.ilike(search_query),
-            )
-        )
+        q = q.filter(self._search_condition(db, query))
 
         return q.offset(skip).limit(limit).all()
 
+    def _search_condition(self, db: Session, query: str) -> ColumnElement[bool]:
+        """Condition shared by ``search`` and ``list_with_balances``."""
+        search_query = f"%{query}%"
+        conditions = [
+            Customer.name.ilike(search_query),
+            Customer.email.ilike(search_query),
+        ]
+        phone_condition = phone_term_filter(db, query)
+        if phone_condition is not None:
+            conditions.append(phone_condition)
+        return or_(*conditions)
+
+    def lookup(self, db: Session, term: str, *, limit: int = 10) -> list[Customer]:
+        """Type-ahead lookup of active customers by name or phone prefix.
+
+        Terms that look like a phone number match customers by normalized
+        phone (see ``phone_filter``); other terms match names starting with
+        the term, served by the index from migration f6a7b8c9d0e1. Only when
+        a name prefix finds fewer than ``limit`` customers are names with a
+        later word starting with the term added (e.g. a surname).
+
+        Args:
+            db: Database session.
+            term: Text typed by the user.
+            limit: Maximum number of results, capped at ``LOOKUP_MAX_RESULTS``.
+
+        Returns:
+            Matching customers, name prefix matches first.
+        """
+        term = term.strip()
+        limit = min(limit, LOOKUP_MAX_RESULTS)
+        if not term or limit < 1:
+            return []
+
+        query = db.query(Customer).filter(Customer.is_active.is_(True))
+
+        if _PHONE_TERM.match(term):
+            phone_condition = phone_term_filter(db, term)
+            if phone_condition is None:
+                return []
+            return (
+                query.filter(phone_condition)
+                .order_by(Customer.name, Customer.id)
+                .limit(limit)
+                .all()
+            )
+
+        name = func.lower(Customer.name)
+        prefix = term.lower()
+        customers = (
+            query.filter(name.startswith(prefix, autoescape=True))
+            .order_by(name, Customer.id)
+            .limit(limit)
+            .all()
+        )
+        if len(customers) < limit:
+            customers += (
+                query.filter(name.contains(f" {prefix}", autoescape=True))
+                .filter(Customer.id.notin_([c.id for c in customers]))
+                .order_by(name, Customer.id)
+                .limit(limit - len(customers))
+                .all()
+            )
+        return customers
+
     def update(
         self, db: Session, customer_id: int, customer_update: CustomerUpdate
     ) -> Customer | None:
@@ -144,7 +303,7 @@ class CustomerCRUD:
             existing = (
                 db.query(Customer)
                 .filter(
-                    Customer.phone == update_data["phone"],
+                    Customer.phone_normalized == normalize_phone(update_data["phone"]),
                     Customer.id != customer_id,
                     Customer.is_active.is_(True),
                 )
@@ -252,57 +411,70 @@ class CustomerCRUD:
         return {**customer.to_dict(), **balance_info}
 
     def list_with_balances(
-        self, db: Session, skip: int = 0, limit: int = 20
-    ) -> list[dict]:
-        """Get customers with their balances using a single JOIN query.
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 20,
+        search: str | None = None,
+    ) -> tuple[list[dict], int]:
+        """Get a page of active customers with their balances, and the total.
+
+        Browsing and searching share this single query: customers are
+        joined with their account, only the listed columns are read and a
+        ``count(*) OVER ()`` window returns the number of matches along
+        with the page, so each page is one round trip.
 
         Args:
             db: Database session.
             skip: Number of records to skip.
             limit: Maximum number of records to return.
+            search: Optional name, email or phone search (see ``search``).
 
         Returns:
-            List of customer dicts with balance information.
+            Tuple of (customer dicts with balance information, total matches).
         """
         from app.models.customer_account import CustomerAccount
 
-        # Single query with LEFT JOIN to get customers and their accounts
-        customers_with_accounts = (
-            db.query(Customer, CustomerAccount)
+        query = (
+            db.query(
+                Customer.id,
+                Customer.name,
+                Customer.phone,
+                Customer.phone_secondary,
+                Customer.email,
+                CustomerAccount.account_balance,
+                func.count().over().label("total"),
+            )
             .outerjoin(CustomerAccount, Customer.id == CustomerAccount.customer_id)
             .filter(Customer.is_active.is_(True))
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        if search:
+            query = query.filter(self._search_condition(db, search))
 
-        result = []
-        for customer, account in customers_with_accounts:
-            if account:
-                balance_info = {
-                    "current_balance": float(account.account_balance),
-                    "has_debt": account.has_debt,
-                    "has_credit": account.has_credit,
-                    "status": "debt"
-                    if account.has_debt
-                    else "credit"
-                    if account.has_credit
-                    else "clear",
-                    "formatted": f"${abs(account.account_balance):,.2f}",
-                }
-            else:
-                # Customer without account (legacy) - show zero balance
-                balance_info = {
-                    "current_balance": 0.0,
-                    "has_debt": False,
-                    "has_credit": False,
-                    "status": "clear",
-                    "formatted": "$0.00",
-                }
-
-            result.append({**customer.to_dict(), **balance_info})
-
-        return result
+        rows = (
+            query.order_by(Customer.name, Customer.id).offset(skip).limit(limit).all()
+        )
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Past the last page: the window had no rows to report on
+            total = query.with_entities(func.count(Customer.id)).scalar()
+        else:
+            total = 0
+
+        customers = [
+            {
+                "id": row.id,
+                "name": row.name,
+                "phone": row.phone,
+                "phone_secondary": row.phone_secondary,
+                "email": row.email,
+                # Customers without account (legacy) show a zero balance
+                **_balance_info(row.account_balance or Decimal("0")),
+            }
+            for row in rows
+        ]
+        return customers, total
 
     def get_customers_with_balance(self, db: Session) -> list[dict]:
         """Get all customers with their balance information using JOIN.
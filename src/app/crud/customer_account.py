@@ -1,13 +1,16 @@
 """CRUD operations for customer accounts."""
 
 import logging
+from collections.abc import Iterator
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, case, desc, func, select
 from sqlalchemy.orm import Session, joinedload
 
+from app.crud.customer_balance_checkpoint import customer_balance_checkpoint_crud
+from app.crud.pagination import Page, keyset_paginate
 from app.models.customer_account import (
     CustomerAccount,
     CustomerTransaction,
@@ -17,6 +20,13 @@ from app.schemas.customer_account import CustomerAccountCreate
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming a statement
+STATEMENT_FETCH_SIZE = 500
+
+# Transaction types that increase / reduce the customer's debt
+_DEBIT_TYPES = (TransactionType.SALE, TransactionType.DEBIT_NOTE)
+_CREDIT_TYPES = (TransactionType.PAYMENT, TransactionType.CREDIT_NOTE)
+
 
 class CustomerAccountCRUD:
     """CRUD operations for customer accounts."""
@@ -323,74 +333,165 @@ class CustomerAccountCRUD:
             .all()
         )
 
-    def get_opening_balance(
-        self, db: Session, *, customer_id: int, before_date: datetime
-    ) -> Decimal:
-        """Get account balance before a specific date."""
-        # Get the last transaction before the date
-        last_transaction = (
+    def _statement_window(
+        self,
+        customer_id: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> list:
+        """Conditions selecting a customer's transactions in a date window."""
+        conditions = [CustomerTransaction.customer_id == customer_id]
+        if start_date:
+            conditions.append(CustomerTransaction.transaction_date >= start_date)
+        if end_date:
+            conditions.append(CustomerTransaction.transaction_date <= end_date)
+        return conditions
+
+    def get_statement_page(
+        self,
+        db: Session,
+        *,
+        customer_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        descending: bool = True,
+        with_total: bool = False,
+    ) -> Page[CustomerTransaction]:
+        """Get one page of a customer's statement, newest first by default.
+
+        Keyset paginated on ``(transaction_date, id)``, which the
+        ``idx_customer_trans_date`` index serves, so every page costs the
+        same however long the ledger is.
+
+        Raises:
+            InvalidCursorError: If the cursor is not a statement cursor.
+        """
+        query = (
             db.query(CustomerTransaction)
-            .filter(
-                and_(
-                    CustomerTransaction.customer_id == customer_id,
-                    CustomerTransaction.transaction_date < before_date,
-                )
+            .options(joinedload(CustomerTransaction.created_by))
+            .filter(*self._statement_window(customer_id, start_date, end_date))
+        )
+        return keyset_paginate(
+            query,
+            sort_column=CustomerTransaction.transaction_date,
+            id_column=CustomerTransaction.id,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+            with_total=with_total,
+        )
+
+    def iter_statement_transactions(
+        self,
+        db: Session,
+        *,
+        customer_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[CustomerTransaction]:
+        """Stream a customer's statement, newest first.
+
+        Rows are fetched ``STATEMENT_FETCH_SIZE`` at a time, so exports of
+        long ledgers never hold every transaction in memory.
+        """
+        yield from db.scalars(
+            select(CustomerTransaction)
+            .options(joinedload(CustomerTransaction.created_by))
+            .where(*self._statement_window(customer_id, start_date, end_date))
+            .order_by(
+                desc(CustomerTransaction.transaction_date),
+                desc(CustomerTransaction.id),
             )
-            .order_by(desc(CustomerTransaction.transaction_date))
-            .first()
+            .execution_options(yield_per=STATEMENT_FETCH_SIZE)
+        )
+
+    def get_statement_totals(
+        self,
+        db: Session,
+        *,
+        customer_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> tuple[int, Decimal, Decimal]:
+        """Count and sum a statement window in one aggregate query.
+
+        Returns:
+            Tuple of (transaction count, total debits, total credits).
+        """
+        query = db.query(
+            func.count(CustomerTransaction.id),
+            func.coalesce(
+                func.sum(
+                    case(
+                        (
+                            CustomerTransaction.transaction_type.in_(_DEBIT_TYPES),
+                            CustomerTransaction.amount,
+                        ),
+                        else_=0,
+                    )
+                ),
+                0,
+            ),
+            func.coalesce(
+                func.sum(
+                    case(
+                        (
+                            CustomerTransaction.transaction_type.in_(_CREDIT_TYPES),
+                            CustomerTransaction.amount,
+                        ),
+                        else_=0,
+                    )
+                ),
+                0,
+            ),
+        ).filter(*self._statement_window(customer_id, start_date, end_date))
+
+        count, debits, credits = query.one()
+        cents = Decimal("0.01")
+        return (
+            count,
+            Decimal(str(debits)).quantize(cents),
+            Decimal(str(credits)).quantize(cents),
         )
 
-        if last_transaction:
-            return last_transaction.balance_after
+    def get_opening_balance(
+        self, db: Session, *, customer_id: int, before_date: datetime
+    ) -> Decimal:
+        """Get account balance before a specific date.
 
-        return Decimal("0.00")
+        Served from the latest balance checkpoint plus the transactions
+        after it (see ``customer_balance_checkpoint_crud``).
+        """
+        return customer_balance_checkpoint_crud.balance_at(
+            db, customer_id=customer_id, at=before_date
+        )
 
     def get_account_summary(self, db: Session) -> dict:
         """Get overall accounts summary."""
+        balance = CustomerAccount.account_balance
         result = (
             db.query(
                 func.count(CustomerAccount.id).label("total_accounts"),
-                func.sum(
-                    func.case([(CustomerAccount.account_balance > 0, 1)], else_=0)
-                ).label("accounts_with_debt"),
-                func.sum(
-                    func.case([(CustomerAccount.account_balance < 0, 1)], else_=0)
-                ).label("accounts_with_credit"),
-                func.sum(
-                    func.case(
-                        [
-                            (
-                                CustomerAccount.account_balance > 0,
-                                CustomerAccount.account_balance,
-                            )
-                        ],
-                        else_=0,
-                    )
-                ).label("total_debt"),
-                func.sum(
-                    func.case(
-                        [
-                            (
-                                CustomerAccount.account_balance < 0,
-                                func.abs(CustomerAccount.account_balance),
-                            )
-                        ],
-                        else_=0,
-                    )
-                ).label("total_credit"),
+                func.sum(case((balance > 0, 1), else_=0)).label("accounts_with_debt"),
+                func.sum(case((balance < 0, 1), else_=0)).label("accounts_with_credit"),
+                func.sum(case((balance > 0, balance), else_=0)).label("total_debt"),
+                func.sum(case((balance < 0, -balance), else_=0)).label("total_credit"),
             )
             .filter(CustomerAccount.is_active.is_(True))
             .first()
         )
 
+        total_debt = Decimal(str(result.total_debt or 0)).quantize(Decimal("0.01"))
+        total_credit = Decimal(str(result.total_credit or 0)).quantize(Decimal("0.01"))
         return {
             "total_accounts": result.total_accounts or 0,
             "accounts_with_debt": result.accounts_with_debt or 0,
             "accounts_with_credit": result.accounts_with_credit or 0,
-            "total_debt": result.total_debt or Decimal("0.00"),
-            "total_credit": result.total_credit or Decimal("0.00"),
-            "net_receivable": (result.total_debt or Decimal("0.00"))
-            - (result.total_credit or Decimal("0.00")),
+            "total_debt": total_debt,
+            "total_credit": total_credit,
+            "net_receivable": total_debt - total_credit,
         }
 
 
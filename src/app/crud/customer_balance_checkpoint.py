@@ -0,0 +1,374 @@
+"""CRUD operations for customer ledger balance checkpoints.
+
+The balance of a customer's ledger at some instant used to be found by
+scanning for the last transaction before it, and account balances could
+only be checked against the ledger by replaying it from the beginning.
+Checkpoints store the ledger balance at the start of each month with
+activity, so the balance at any instant is the latest checkpoint plus the
+transactions after it, at most one month of them.
+
+Every balance here is a sum of transaction deltas (``balance_after -
+balance_before``), so it does not depend on the order rows were written in.
+``extend`` adds checkpoints for months closed since the last run, ``rebuild``
+recomputes them from scratch and ``verify`` reports accounts whose stored
+balance drifted from their transaction chain.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, delete, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.customer_account import CustomerAccount, CustomerTransaction
+from app.models.customer_balance_checkpoint import CustomerBalanceCheckpoint
+from app.utils.timezone import get_utc_now, local_date_to_utc_range, utc_to_local
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip when replaying the ledger
+CHECKPOINT_FETCH_SIZE = 1000
+
+_DELTA = CustomerTransaction.balance_after - CustomerTransaction.balance_before
+
+
+@dataclass
+class LedgerDrift:
+    """A customer whose stored balances disagree with the transaction chain.
+
+    Attributes:
+        customer_id: Customer ID.
+        account_balance: ``CustomerAccount.account_balance`` (None: no account).
+        ledger_balance: Sum of all transaction deltas.
+        broken_links: Transactions whose ``balance_before`` differs from the
+            previous transaction's ``balance_after``.
+        stale_checkpoints: Checkpoints that no longer match the ledger.
+    """
+
+    customer_id: int
+    account_balance: Optional[Decimal]
+    ledger_balance: Decimal
+    broken_links: int = 0
+    stale_checkpoints: int = 0
+
+
+def _to_cents(value) -> Decimal:
+    """Convert an aggregated amount (float on some databases) to cents."""
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+def _checkpoint_row(
+    customer_id: int, as_of: datetime, balance: Decimal, count: int
+) -> dict:
+    """Values of a checkpoint row to insert."""
+    return {
+        "customer_id": customer_id,
+        "as_of": as_of,
+        "balance": balance,
+        "transaction_count": count,
+    }
+
+
+def month_start(moment: datetime) -> datetime:
+    """Get the start (UTC) of the local month containing ``moment``."""
+    first_day = utc_to_local(moment).date().replace(day=1)
+    return local_date_to_utc_range(first_day)[0]
+
+
+def next_month_start(moment: datetime) -> datetime:
+    """Get the start (UTC) of the local month after the one of ``moment``."""
+    first_day = utc_to_local(moment).date().replace(day=1)
+    return local_date_to_utc_range((first_day + timedelta(days=32)).replace(day=1))[0]
+
+
+class CustomerBalanceCheckpointCRUD:
+    """CRUD operations for customer balance checkpoints."""
+
+    def get_latest(
+        self, db: Session, *, customer_id: int, at: datetime
+    ) -> Optional[CustomerBalanceCheckpoint]:
+        """Get the customer's latest checkpoint at or before ``at``."""
+        return db.scalar(
+            select(CustomerBalanceCheckpoint)
+            .where(
+                CustomerBalanceCheckpoint.customer_id == customer_id,
+                CustomerBalanceCheckpoint.as_of <= at,
+            )
+            .order_by(CustomerBalanceCheckpoint.as_of.desc())
+            .limit(1)
+        )
+
+    def balance_at(self, db: Session, *, customer_id: int, at: datetime) -> Decimal:
+        """Get the ledger balance of a customer just before ``at``.
+
+        Args:
+            db: Database session.
+            customer_id: Customer ID.
+            at: Instant; transactions dated at or after it are excluded.
+
+        Returns:
+            Latest checkpoint plus the deltas of the transactions after it.
+        """
+        checkpoint = self.get_latest(db, customer_id=customer_id, at=at)
+        conditions = [
+            CustomerTransaction.customer_id == customer_id,
+            CustomerTransaction.transaction_date < at,
+        ]
+        if checkpoint:
+            conditions.append(CustomerTransaction.transaction_date >= checkpoint.as_of)
+
+        delta = db.scalar(select(func.coalesce(func.sum(_DELTA), 0)).where(*conditions))
+        start = checkpoint.balance if checkpoint else Decimal("0.00")
+        return start + _to_cents(delta)
+
+    def extend(
+        self,
+        db: Session,
+        *,
+        customer_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """Add checkpoints for the months closed since each customer's latest.
+
+        Only transactions after a customer's latest checkpoint are read, so
+        running this regularly (e.g. monthly) is cheap. Does not commit.
+
+        Args:
+            db: Database session.
+            customer_id: Only extend this customer (default: all).
+            until: Latest checkpoint instant (default: start of this month).
+
+        Returns:
+            Number of checkpoints added.
+        """
+        until = until or month_start(get_utc_now())
+
+        latest = (
+            select(
+                CustomerBalanceCheckpoint.customer_id,
+                func.max(CustomerBalanceCheckpoint.as_of).label("as_of"),
+            )
+            .group_by(CustomerBalanceCheckpoint.customer_id)
+            .subquery()
+        )
+        starts_query = select(CustomerBalanceCheckpoint).join(
+            latest,
+            and_(
+                latest.c.customer_id == CustomerBalanceCheckpoint.customer_id,
+                latest.c.as_of == CustomerBalanceCheckpoint.as_of,
+            ),
+        )
+        transactions_query = (
+            select(
+                CustomerTransaction.customer_id,
+                CustomerTransaction.transaction_date,
+                CustomerTransaction.balance_before,
+                CustomerTransaction.balance_after,
+            )
+            .outerjoin(latest, latest.c.customer_id == CustomerTransaction.customer_id)
+            .where(
+                CustomerTransaction.transaction_date < until,
+                (latest.c.as_of.is_(None))
+                | (CustomerTransaction.transaction_date >= latest.c.as_of),
+            )
+            .order_by(
+                CustomerTransaction.customer_id,
+                CustomerTransaction.transaction_date,
+                CustomerTransaction.id,
+            )
+            .execution_options(yield_per=CHECKPOINT_FETCH_SIZE)
+        )
+        if customer_id is not None:
+            starts_query = starts_query.where(
+                CustomerBalanceCheckpoint.customer_id == customer_id
+            )
+            transactions_query = transactions_query.where(
+                CustomerTransaction.customer_id == customer_id
+            )
+
+        starts = {
+            checkpoint.customer_id: (checkpoint.balance, checkpoint.transaction_count)
+            for checkpoint in db.scalars(starts_query)
+        }
+
+        added = []
+        current, balance, count, boundary = None, Decimal("0.00"), 0, None
+        rows = db.execute(transactions_query)
+        for row_customer, transaction_date, before, after in rows:
+            transaction_date = utc_to_local(transaction_date)
+            # A new customer or a later month closes the previous row's month
+            if boundary is not None and (
+                row_customer != current or transaction_date >= boundary
+            ):
+                added.append(_checkpoint_row(current, boundary, balance, count))
+            if row_customer != current:
+                current = row_customer
+                balance, count = starts.get(current, (Decimal("0.00"), 0))
+
+            balance += after - before
+            count += 1
+            boundary = next_month_start(transaction_date)
+        if boundary is not None:
+            added.append(_checkpoint_row(current, boundary, balance, count))
+
+        if added:
+            db.execute(CustomerBalanceCheckpoint.__table__.insert(), added)
+        logger.info(f"Added {len(added)} balance checkpoint(s)")
+        return len(added)
+
+    def rebuild(
+        self,
+        db: Session,
+        *,
+        customer_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """Recompute checkpoints from the whole ledger. Does not commit.
+
+        Args:
+            db: Database session.
+            customer_id: Only rebuild this customer (default: all).
+            until: Latest checkpoint instant (default: start of this month).
+
+        Returns:
+            Number of checkpoints written.
+        """
+        statement = delete(CustomerBalanceCheckpoint)
+        if customer_id is not None:
+            statement = statement.where(
+                CustomerBalanceCheckpoint.customer_id == customer_id
+            )
+        db.execute(statement)
+        return self.extend(db, customer_id=customer_id, until=until)
+
+    def verify(
+        self, db: Session, *, customer_id: Optional[int] = None
+    ) -> list[LedgerDrift]:
+        """Compare accounts and checkpoints with the transaction chain.
+
+        Args:
+            db: Database session.
+            customer_id: Only verify this customer (default: all).
+
+        Returns:
+            Customers with an account balance that differs from the ledger,
+            a broken ``balance_before``/``balance_after`` chain or stale
+            checkpoints. Empty when everything matches.
+        """
+        drifts: dict[int, LedgerDrift] = {}
+
+        # Chain links and ledger totals, in the order transactions were written
+        previous_customer, previous_after = None, None
+        ledger: dict[int, Decimal] = {}
+        chain_query = (
+            select(
+                CustomerTransaction.customer_id,
+                CustomerTransaction.balance_before,
+                CustomerTransaction.balance_after,
+            )
+            .order_by(CustomerTransaction.customer_id, CustomerTransaction.id)
+            .execution_options(yield_per=CHECKPOINT_FETCH_SIZE)
+        )
+        accounts_query = select(
+            CustomerAccount.customer_id, CustomerAccount.account_balance
+        )
+        if customer_id is not None:
+            chain_query = chain_query.where(
+                CustomerTransaction.customer_id == customer_id
+            )
+            accounts_query = accounts_query.where(
+                CustomerAccount.customer_id == customer_id
+            )
+
+        broken: dict[int, int] = {}
+        for row_customer, before, after in db.execute(chain_query):
+            if row_customer == previous_customer and before != previous_after:
+                broken[row_customer] = broken.get(row_customer, 0) + 1
+            ledger[row_customer] = ledger.get(row_customer, Decimal("0")) + (
+                after - before
+            )
+            previous_customer, previous_after = row_customer, after
+
+        accounts = dict(db.execute(accounts_query).all())
+
+        for checked_id in sorted(set(ledger) | set(accounts)):
+            ledger_balance = ledger.get(checked_id, Decimal("0.00"))
+            account_balance = accounts.get(checked_id)
+            if broken.get(checked_id) or account_balance != ledger_balance:
+                drifts[checked_id] = LedgerDrift(
+                    customer_id=checked_id,
+                    account_balance=account_balance,
+                    ledger_balance=ledger_balance,
+                    broken_links=broken.get(checked_id, 0),
+                )
+
+        # Checkpoints: recompute each one from the ledger in one grouped query
+        checkpoint_query = (
+            select(
+                CustomerBalanceCheckpoint.customer_id,
+                CustomerBalanceCheckpoint.balance,
+                CustomerBalanceCheckpoint.transaction_count,
+                func.coalesce(func.sum(_DELTA), 0),
+                func.count(CustomerTransaction.id),
+            )
+            .outerjoin(
+                CustomerTransaction,
+                and_(
+                    CustomerTransaction.customer_id
+                    == CustomerBalanceCheckpoint.customer_id,
+                    CustomerTransaction.transaction_date
+                    < CustomerBalanceCheckpoint.as_of,
+                ),
+            )
+            .group_by(CustomerBalanceCheckpoint.id)
+        )
+        if customer_id is not None:
+            checkpoint_query = checkpoint_query.where(
+                CustomerBalanceCheckpoint.customer_id == customer_id
+            )
+        for row_customer, balance, count, delta, real_count in db.execute(
+            checkpoint_query
+        ):
+            if balance == _to_cents(delta) and count == real_count:
+                continue
+            drift = drifts.setdefault(
+                row_customer,
+                LedgerDrift(
+                    customer_id=row_customer,
+                    account_balance=accounts.get(row_customer),
+                    ledger_balance=ledger.get(row_customer, Decimal("0.00")),
+                ),
+            )
+            drift.stale_checkpoints += 1
+
+        return [drifts[key] for key in sorted(drifts)]
+
+
+@event.listens_for(Session, "after_flush")
+def _discard_overtaken_checkpoints(session: Session, flush_context) -> None:
+    """Drop checkpoints that a backdated transaction falls before."""
+    earliest: dict[int, datetime] = {}
+    for obj in session.new:
+        if not isinstance(obj, CustomerTransaction):
+            continue
+        # Rows dated by the database default are never before a checkpoint
+        transaction_date = inspect(obj).dict.get("transaction_date")
+        if transaction_date is None:
+            continue
+        current = earliest.get(obj.customer_id)
+        if current is None or transaction_date < current:
+            earliest[obj.customer_id] = transaction_date
+
+    for customer_id, transaction_date in earliest.items():
+        session.execute(
+            delete(CustomerBalanceCheckpoint).where(
+                CustomerBalanceCheckpoint.customer_id == customer_id,
+                CustomerBalanceCheckpoint.as_of > transaction_date,
+            )
+        )
+
+
+customer_balance_checkpoint_crud = CustomerBalanceCheckpointCRUD()
@@ -0,0 +1,494 @@
+"""CRUD operations for materialized daily register totals.
+
+Sales, payments, expenses and repairs all feed the daily cash summary. Rather
+than aggregating those tables on every visit to the register screens, each
+flush that touches them computes how much the affected days' totals change
+and applies the difference to ``daily_register_totals`` in the same
+transaction. ``rebuild`` recomputes a day from the source tables to
+reconcile it.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from sqlalchemy import event, func, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.daily_register_totals import DailyRegisterTotals
+from app.models.expense import Expense
+from app.models.payment import Payment, PaymentType
+from app.models.repair import Repair
+from app.models.sale import Sale
+from app.utils.timezone import local_date_to_utc_range, utc_to_local
+
+logger = logging.getLogger(__name__)
+
+_totals = DailyRegisterTotals.__table__
+
+TOTAL_COLUMNS = tuple(
+    column.name
+    for column in _totals.columns
+    if column.name not in ("id", "business_date", "created_at", "updated_at")
+)
+
+# Pending changes of the current flush, keyed by business date
+Changes = dict[date, dict[str, Any]]
+
+_PREVIOUS_KEY = "daily_register_totals_previous"
+
+
+class CRUDDailyRegisterTotals:
+    """CRUD operations for daily register totals."""
+
+    def get_totals(self, db: Session, *, business_date: date) -> dict[str, Any]:
+        """Get the totals of a day.
+
+        Days without a row yet (no activity since the table was introduced)
+        are aggregated from the source tables without being stored.
+
+        Args:
+            db: Database session
+            business_date: Local date
+
+        Returns:
+            Mapping of each column in ``TOTAL_COLUMNS`` to its value
+        """
+        row = (
+            db.query(*(_totals.c[column] for column in TOTAL_COLUMNS))
+            .filter(_totals.c.business_date == business_date)
+            .first()
+        )
+        if row is None:
+            return self.compute(db, business_date=business_date)
+        return dict(row._mapping)
+
+    def compute(self, db: Session, *, business_date: date) -> dict[str, Any]:
+        """Aggregate the totals of a day from the source tables.
+
+        Args:
+            db: Database session
+            business_date: Local date
+
+        Returns:
+            Mapping of each column in ``TOTAL_COLUMNS`` to its value
+        """
+        utc_start, utc_end = local_date_to_utc_range(business_date)
+        totals = dict.fromkeys(TOTAL_COLUMNS, Decimal("0.00"))
+
+        sales_result = (
+            db.query(
+                func.coalesce(func.sum(Sale.total_amount), 0).label("total_sales"),
+                func.count(Sale.id).label("sales_count"),
+            )
+            .filter(Sale.sale_date >= utc_start)
+            .filter(Sale.sale_date <= utc_end)
+            .filter(Sale.is_voided == False)  # noqa: E712
+            .first()
+        )
+        totals["total_sales"] = sales_result.total_sales or Decimal("0.00")
+        totals["sales_count"] = sales_result.sales_count or 0
+
+        # Cash and transfer count the PAID amount; the unpaid portion of every
+        # sale goes to Cuenta Corriente (sales_credit)
+        sales_by_method = (
+            db.query(
+                Sale.payment_method,
+                func.sum(Sale.paid_amount).label("paid"),
+                func.sum(Sale.total_amount - Sale.paid_amount).label("credit"),
+                func.sum(Sale.cash_amount).label("cash_portion"),
+                func.sum(Sale.transfer_amount).label("transfer_portion"),
+                func.sum(Sale.card_amount).label("card_portion"),
+            )
+            .filter(Sale.sale_date >= utc_start)
+            .filter(Sale.sale_date <= utc_end)
+            .filter(Sale.is_voided == False)  # noqa: E712
+            .group_by(Sale.payment_method)
+            .all()
+        )
+        for row in sales_by_method:
+            for column, amount in _sale_method_totals(
+                row.payment_method,
+                _decimal(row.paid),
+                _decimal(row.credit),
+                _decimal(row.cash_portion),
+                _decimal(row.transfer_portion),
+                _decimal(row.card_portion),
+            ).items():
+                totals[column] += amount
+
+        repairs_result = (
+            db.query(
+                func.count(Repair.id).label("repairs_count"),
+                func.coalesce(func.sum(Repair.final_cost), 0).label("repairs_total"),
+            )
+            .filter(Repair.delivered_date >= utc_start)
+            .filter(Repair.delivered_date <= utc_end)
+            .filter(Repair.final_cost.isnot(None))
+            .first()
+        )
+        totals["repairs_delivered_count"] = repairs_result.repairs_count or 0
+        totals["repairs_total"] = repairs_result.repairs_total or Decimal("0.00")
+
+        expenses_by_method = (
+            db.query(
+                Expense.payment_method,
+                func.sum(Expense.amount).label("amount"),
+                func.count(Expense.id).label("count"),
+            )
+            .filter(Expense.expense_date == business_date)
+            .group_by(Expense.payment_method)
+            .all()
+        )
+        totals["expenses_count"] = 0
+        for row in expenses_by_method:
+            for column, amount in _expense_method_totals(
+                row.payment_method, _decimal(row.amount)
+            ).items():
+                totals[column] += amount
+            totals["expenses_count"] += row.count
+
+        # Only standalone debt payments; payments with a sale_id are already
+        # counted in the sales
+        debt_payments = (
+            db.query(
+                Payment.payment_method,
+                func.sum(Payment.amount).label("amount"),
+                func.sum(Payment.cash_amount).label("cash_portion"),
+                func.sum(Payment.transfer_amount).label("transfer_portion"),
+                func.sum(Payment.card_amount).label("card_portion"),
+            )
+            .filter(Payment.created_at >= utc_start)
+            .filter(Payment.created_at <= utc_end)
+            .filter(Payment.payment_type == PaymentType.payment)
+            .filter(Payment.voided == False)  # noqa: E712
+            .filter(Payment.sale_id.is_(None))
+            .group_by(Payment.payment_method)
+            .all()
+        )
+        for row in debt_payments:
+            for column, amount in _debt_payment_method_totals(
+                row.payment_method,
+                _decimal(row.amount),
+                _decimal(row.cash_portion),
+                _decimal(row.transfer_portion),
+                _decimal(row.card_portion),
+            ).items():
+                totals[column] += amount
+
+        return totals
+
+    def rebuild(self, db: Session, *, business_date: date) -> dict[str, Any]:
+        """Recompute a day from the source tables and store the result.
+
+        Args:
+            db: Database session
+            business_date: Local date
+
+        Returns:
+            The stored totals
+        """
+        totals = self.compute(db, business_date=business_date)
+        _upsert(
+            db, business_date, totals, {column: totals[column] for column in totals}
+        )
+        logger.info(f"Rebuilt daily register totals for {business_date}")
+        return totals
+
+    def apply_changes(self, db: Session, changes: Changes) -> None:
+        """Add per-day differences to the stored totals.
+
+        A day without a row is seeded from the source tables, which already
+        include the flushed changes, so the differences are not added again.
+
+        Args:
+            db: Database session
+            changes: Amount to add to each column, per business date
+        """
+        for business_date, deltas in changes.items():
+            deltas = {column: value for column, value in deltas.items() if value}
+            if not deltas:
+                continue
+
+            stmt = (
+                update(_totals)
+                .where(_totals.c.business_date == business_date)
+                .values(
+                    {
+                        column: _totals.c[column] + value
+                        for column, value in deltas.items()
+                    }
+                )
+            )
+            if db.execute(stmt).rowcount:
+                continue
+
+            seed = self.compute(db, business_date=business_date)
+            _upsert(
+                db,
+                business_date,
+                seed,
+                {column: _totals.c[column] + value for column, value in deltas.items()},
+            )
+
+
+def _upsert(
+    db: Session, business_date: date, values: dict[str, Any], on_conflict: dict
+) -> None:
+    """Insert a day's row, or apply ``on_conflict`` if it already exists."""
+    dialect = db.get_bind().dialect.name
+    row = {"business_date": business_date, **values}
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(_totals).values(**row)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[_totals.c.business_date], set_=on_conflict
+            )
+        )
+        return
+
+    try:
+        with db.begin_nested():
+            db.execute(_totals.insert().values(**row))
+    except IntegrityError:
+        db.execute(
+            update(_totals)
+            .where(_totals.c.business_date == business_date)
+            .values(on_conflict)
+        )
+
+
+def _decimal(value: Any) -> Decimal:
+    """Convert an aggregate or column value to Decimal, treating None as 0."""
+    return Decimal(str(value)) if value else Decimal("0.00")
+
+
+def _local_date(value: date | datetime) -> date:
+    """Get the local business date of a stored UTC timestamp."""
+    if isinstance(value, datetime):
+        return utc_to_local(value).date()
+    return value
+
+
+def _sale_method_totals(
+    method: Optional[str],
+    paid: Decimal,
+    credit: Decimal,
+    cash: Decimal,
+    transfer: Decimal,
+    card: Decimal,
+) -> dict[str, Decimal]:
+    """Split sales of one payment method into summary columns."""
+    if method == "cash":
+        return {"sales_cash": paid, "sales_credit": credit}
+    if method == "transfer":
+        return {"sales_transfer": paid, "sales_credit": credit}
+    if method == "credit":
+        # Full credit sale - everything goes to CC
+        return {"sales_credit": paid + credit}
+    if method == "mixed":
+        return {
+            "sales_mixed": paid,
+            "sales_mixed_cash": cash,
+            "sales_mixed_transfer": transfer,
+            "sales_mixed_card": card,
+            "sales_credit": credit,
+        }
+    return {}
+
+
+def _expense_method_totals(method: str, amount: Decimal) -> dict[str, Decimal]:
+    """Split expenses of one payment method into summary columns."""
+    totals = {"total_expenses": amount}
+    if method in ("cash", "transfer", "card"):
+        totals[f"expenses_{method}"] = amount
+    return totals
+
+
+def _debt_payment_method_totals(
+    method: str, amount: Decimal, cash: Decimal, transfer: Decimal, card: Decimal
+) -> dict[str, Decimal]:
+    """Split debt payments of one payment method into summary columns."""
+    if method in ("cash", "transfer", "card"):
+        return {f"debt_payments_{method}": amount}
+    if method == "mixed":
+        return {
+            "debt_payments_cash": cash,
+            "debt_payments_transfer": transfer,
+            "debt_payments_card": card,
+        }
+    return {}
+
+
+# How each tracked row contributes to its day: the attributes read, and a
+# function returning (business_date, {column: amount}) or None.
+Value = Callable[[str], Any]
+
+
+def _sale_contribution(value: Value):
+    if value("is_voided") or value("sale_date") is None:
+        return None
+
+    total = _decimal(value("total_amount"))
+    paid = _decimal(value("paid_amount"))
+    totals = _sale_method_totals(
+        value("payment_method"),
+        paid,
+        total - paid,
+        _decimal(value("cash_amount")),
+        _decimal(value("transfer_amount")),
+        _decimal(value("card_amount")),
+    )
+    totals.update(total_sales=total, sales_count=1)
+    return _local_date(value("sale_date")), totals
+
+
+def _payment_contribution(value: Value):
+    if (
+        value("voided") is not False
+        or value("payment_type") not in (PaymentType.payment, "payment")
+        or value("sale_id") is not None
+        or value("created_at") is None
+    ):
+        return None
+
+    totals = _debt_payment_method_totals(
+        value("payment_method"),
+        _decimal(value("amount")),
+        _decimal(value("cash_amount")),
+        _decimal(value("transfer_amount")),
+        _decimal(value("card_amount")),
+    )
+    return _local_date(value("created_at")), totals
+
+
+def _expense_contribution(value: Value):
+    if value("expense_date") is None:
+        return None
+
+    totals = _expense_method_totals(value("payment_method"), _decimal(value("amount")))
+    totals["expenses_count"] = 1
+    return _local_date(value("expense_date")), totals
+
+
+def _repair_contribution(value: Value):
+    if value("delivered_date") is None or value("final_cost") is None:
+        return None
+
+    totals = {
+        "repairs_delivered_count": 1,
+        "repairs_total": _decimal(value("final_cost")),
+    }
+    return _local_date(value("delivered_date")), totals
+
+
+_TRACKED = {
+    Sale: (
+        (
+            "sale_date",
+            "total_amount",
+            "paid_amount",
+            "payment_method",
+            "cash_amount",
+            "transfer_amount",
+            "card_amount",
+            "is_voided",
+        ),
+        _sale_contribution,
+    ),
+    Payment: (
+        (
+            "created_at",
+            "amount",
+            "payment_method",
+            "payment_type",
+            "voided",
+            "sale_id",
+            "cash_amount",
+            "transfer_amount",
+            "card_amount",
+        ),
+        _payment_contribution,
+    ),
+    Expense: (("expense_date", "amount", "payment_method"), _expense_contribution),
+    Repair: (("delivered_date", "final_cost"), _repair_contribution),
+}
+
+
+def _current_value(obj: Any) -> Value:
+    return lambda key: getattr(obj, key)
+
+
+def _previous_value(obj: Any) -> Value:
+    """Read attributes as they were before the pending changes."""
+    attrs = inspect(obj).attrs
+
+    def value(key: str):
+        history = attrs[key].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.unchanged:
+            return history.unchanged[0]
+        # Untouched and not loaded: the stored value is still current
+        return getattr(obj, key)
+
+    return value
+
+
+def _add(changes: Changes, contribution, sign: int) -> None:
+    if contribution is None:
+        return
+    business_date, totals = contribution
+    day = changes.setdefault(business_date, defaultdict(int))
+    for column, amount in totals.items():
+        day[column] += sign * amount
+
+
+def _keep_previous_values(*args, **kwargs) -> None:
+    """No-op listener enabling active history on tracked attributes."""
+
+
+for _model, (_attributes, _) in _TRACKED.items():
+    for _attribute in _attributes:
+        event.listen(
+            getattr(_model, _attribute),
+            "set",
+            _keep_previous_values,
+            active_history=True,
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_previous_totals(session: Session, flush_context, instances) -> None:
+    """Subtract what changed or deleted rows contributed before this flush."""
+    changes: Changes = {}
+    for obj in set(session.dirty) | set(session.deleted):
+        tracked = _TRACKED.get(type(obj))
+        if tracked is None or not inspect(obj).persistent:
+            continue
+        _add(changes, tracked[1](_previous_value(obj)), -1)
+    session.info[_PREVIOUS_KEY] = changes
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_register_totals(session: Session, flush_context) -> None:
+    """Add what new and changed rows contribute now, and store the result."""
+    changes: Changes = session.info.pop(_PREVIOUS_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        tracked = _TRACKED.get(type(obj))
+        if tracked is None or obj in session.deleted:
+            continue
+        _add(changes, tracked[1](_current_value(obj)), 1)
+
+    if changes:
+        daily_register_totals.apply_changes(session, changes)
+
+
+daily_register_totals = CRUDDailyRegisterTotals()
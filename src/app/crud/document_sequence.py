@@ -0,0 +1,161 @@
+"""CRUD operations for document number sequences."""
+
+import logging
+import re
+from collections.abc import Callable
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.models.document_sequence import DocumentSequence
+
+logger = logging.getLogger(__name__)
+
+_sequences = DocumentSequence.__table__
+_trailing_digits = re.compile(r"(\d+)$")
+
+
+class DocumentSequenceCRUD:
+    """Allocate invoice, repair and receipt numbers from counter rows.
+
+    A number is taken with a single ``UPDATE ... RETURNING`` on the counter
+    row for its key and period. The row stays locked until the caller's
+    transaction ends, so concurrent checkouts queue instead of colliding, and
+    a rolled back transaction gives its number back, keeping the series free
+    of gaps.
+    """
+
+    def next_number(
+        self,
+        db: Session,
+        key: str,
+        *,
+        period: int = 0,
+        seed: Optional[Callable[[], int]] = None,
+    ) -> int:
+        """Take the next number of a sequence.
+
+        Args:
+            db: Database session
+            key: Document family, e.g. 'INV'
+            period: Year the sequence belongs to, 0 if it never resets
+            seed: Returns the last number already issued. Only called the
+                first time a key and period is used, to continue from
+                documents created before the counter existed.
+
+        Returns:
+            The allocated number
+        """
+        return self._advance(db, key, period, 1, seed)
+
+    def allocate_block(
+        self,
+        db: Session,
+        key: str,
+        size: int,
+        *,
+        period: int = 0,
+        seed: Optional[Callable[[], int]] = None,
+    ) -> range:
+        """Reserve a contiguous block of numbers in one statement.
+
+        Meant for high-volume terminals that hand out numbers locally. Any
+        numbers of the block left unused remain as gaps in the series.
+
+        Args:
+            db: Database session
+            key: Document family, e.g. 'INV'
+            size: How many numbers to reserve
+            period: Year the sequence belongs to, 0 if it never resets
+            seed: See ``next_number``
+
+        Returns:
+            The reserved numbers, in order
+
+        Raises:
+            ValueError: If size is not positive
+        """
+        if size < 1:
+            raise ValueError("Block size must be positive")
+
+        last = self._advance(db, key, period, size, seed)
+        return range(last - size + 1, last + 1)
+
+    def max_issued_number(
+        self, db: Session, column: InstrumentedAttribute, prefix: str
+    ) -> int:
+        """Get the highest number issued in a column under a prefix.
+
+        Args:
+            db: Database session
+            column: Column holding formatted numbers, e.g. Sale.invoice_number
+            prefix: Prefix the numbers start with, e.g. 'INV-2026-'
+
+        Returns:
+            The trailing number of the greatest value, or 0 if none exist
+        """
+        # Numbers outgrow their zero padding ("-99999" < "-100000" as text),
+        # so longer values are greater
+        last = (
+            db.query(column)
+            .filter(column.like(f"{prefix}%"))
+            .order_by(func.length(column).desc(), column.desc())
+            .limit(1)
+            .scalar()
+        )
+        match = _trailing_digits.search(last or "")
+        return int(match.group(1)) if match else 0
+
+    def _advance(
+        self,
+        db: Session,
+        key: str,
+        period: int,
+        step: int,
+        seed: Optional[Callable[[], int]],
+    ) -> int:
+        """Increment a counter by ``step`` and return its new value."""
+        last = self._increment(db, key, period, step)
+        if last is not None:
+            return last
+
+        start = seed() if seed else 0
+        logger.info(f"Starting sequence {key}/{period} after {start}")
+        return self._create(db, key, period, start + step, step)
+
+    def _increment(self, db: Session, key: str, period: int, step: int):
+        """Increment an existing counter, returning None if it is missing."""
+        stmt = (
+            update(_sequences)
+            .where(_sequences.c.key == key, _sequences.c.period == period)
+            .values(last_value=_sequences.c.last_value + step)
+            .returning(_sequences.c.last_value)
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+    def _create(self, db: Session, key: str, period: int, value: int, step: int):
+        """Insert a counter, incrementing it instead if another one won the race."""
+        dialect = db.get_bind().dialect.name
+        values = {"key": key, "period": period, "last_value": value}
+
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = insert(_sequences).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[_sequences.c.key, _sequences.c.period],
+                set_={"last_value": _sequences.c.last_value + step},
+            ).returning(_sequences.c.last_value)
+            return db.execute(stmt).scalar_one()
+
+        try:
+            with db.begin_nested():
+                db.execute(_sequences.insert().values(**values))
+            return value
+        except IntegrityError:
+            return self._increment(db, key, period, step)
+
+
+document_sequence_crud = DocumentSequenceCRUD()
@@ -3,7 +3,7 @@
 from datetime import date, timedelta
 from decimal import Decimal
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, update
 from sqlalchemy.orm import Session, joinedload
 
 from app.crud.base import CRUDBase
@@ -184,25 +184,26 @@ class CRUDExpense(CRUDBase[Expense, ExpenseCreate, ExpenseUpdate]):
         return True
 
     def update_editability_status(self, db: Session) -> int:
-        """Update is_editable flag for expenses older than today."""
-        # This could be run as a daily job
-        yesterday = date.today() - timedelta(days=1)
+        """Update is_editable flag for expenses older than today.
 
-        stmt = select(Expense).where(
-            and_(Expense.is_editable.is_(True), Expense.created_at < yesterday)
-        )
+        Runs as a single ``UPDATE`` (see the maintenance scheduler).
 
-        expenses_to_update = db.execute(stmt).scalars().all()
-        count = 0
+        Returns:
+            Number of expenses locked.
+        """
+        yesterday = date.today() - timedelta(days=1)
 
-        for expense in expenses_to_update:
-            expense.is_editable = False
-            count += 1
+        result = db.execute(
+            update(Expense)
+            .where(Expense.is_editable.is_(True), Expense.created_at < yesterday)
+            .values(is_editable=False)
+            .execution_options(synchronize_session=False)
+        )
 
-        if count > 0:
+        if result.rowcount > 0:
             db.commit()
 
-        return count
+        return result.rowcount
 
     def get_expense_user(self, db: Session, *, expense_id: int) -> User | None:
         """Get the user who created an expense."""
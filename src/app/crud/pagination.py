@@ -0,0 +1,202 @@
+"""Keyset (cursor) pagination for list queries.
+
+``OFFSET n`` makes the database read and discard ``n`` rows, so deep pages
+of long lists get slower page after page. Keyset pagination remembers the
+sort key of the last row shown, ``(sort value, id)``, and asks for the rows
+after it, which an index on the sort column serves directly: page 500
+costs the same as page 1.
+
+Cursors are opaque URL-safe strings. They also record the sort they were
+made for, so a cursor from one ordering is rejected by another.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import ColumnElement, literal, tuple_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or made for another sort."""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results.
+
+    Attributes:
+        items: Rows of this page.
+        next_cursor: Cursor of the following page, or None on the last page.
+        prev_cursor: Cursor of the previous page, or None on the first page.
+        total: Number of matching rows, only when requested.
+    """
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    total: int | None = None
+
+    @property
+    def has_next(self) -> bool:
+        """Whether there is a following page."""
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        """Whether there is a previous page."""
+        return self.prev_cursor is not None
+
+
+def _dump_value(value: Any) -> Any:
+    """Convert a sort value to a JSON-safe, type-tagged form."""
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    """Reverse ``_dump_value``."""
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+        raise ValueError(f"Unknown cursor value: {value}")
+    return value
+
+
+def encode_cursor(sort_key: str, values: tuple, *, backward: bool = False) -> str:
+    """Build an opaque cursor.
+
+    Args:
+        sort_key: Name of the ordering the cursor belongs to.
+        values: Sort key ``(sort value, id)`` of the boundary row.
+        backward: Whether the cursor points to the rows before the boundary.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    payload = {"s": sort_key, "v": [_dump_value(value) for value in values]}
+    if backward:
+        payload["b"] = 1
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple[tuple, bool]:
+    """Read a cursor built by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string.
+        sort_key: Name of the ordering in use.
+
+    Returns:
+        Tuple of (boundary sort key values, backward flag).
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or made for another
+            ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = tuple(_load_value(value) for value in payload["v"])
+        matches_sort = payload["s"] == sort_key
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    if not matches_sort or len(values) != 2:
+        raise InvalidCursorError("Pagination cursor does not match this list")
+    return values, bool(payload.get("b"))
+
+
+def keyset_paginate(
+    query: Query,
+    *,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    limit: int,
+    cursor: str | None = None,
+    descending: bool = True,
+    with_total: bool = False,
+) -> Page:
+    """Get one page of a query ordered by ``(sort_column, id_column)``.
+
+    The query must not be ordered or limited yet. ``id_column`` breaks ties
+    so rows sharing a sort value are neither skipped nor repeated.
+
+    Args:
+        query: Filtered query of the listed entity.
+        sort_column: Non-null column the list is ordered by.
+        id_column: Primary key of the listed entity.
+        limit: Page size.
+        cursor: Cursor from a previous page; None for the first page.
+        descending: Whether the list is ordered newest/highest first.
+        with_total: Whether to count all matching rows (one extra query).
+
+    Returns:
+        The page of entities.
+
+    Raises:
+        InvalidCursorError: If ``cursor`` is invalid for this ordering.
+    """
+    sort_key = f"{sort_column}:{'desc' if descending else 'asc'}"
+    total = query.order_by(None).count() if with_total else None
+
+    backward = False
+    key = tuple_(sort_column, id_column)
+    if cursor:
+        values, backward = decode_cursor(cursor, sort_key)
+        after = tuple_(
+            literal(values[0], sort_column.type), literal(values[1], id_column.type)
+        )
+        # Reading backwards walks the list in the opposite direction
+        query = query.filter(key < after if descending != backward else key > after)
+
+    if descending != backward:
+        ordering = (sort_column.desc(), id_column.desc())
+    else:
+        ordering = (sort_column.asc(), id_column.asc())
+
+    rows = (
+        query.add_columns(sort_column, id_column)
+        .order_by(*ordering)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    page = Page(items=[row[0] for row in rows], total=total)
+    if not rows:
+        return page
+
+    first = tuple(rows[0][1:])
+    last = tuple(rows[-1][1:])
+    if backward:
+        # A backward page was reached from a later one
+        page.next_cursor = encode_cursor(sort_key, last)
+        if has_more:
+            page.prev_cursor = encode_cursor(sort_key, first, backward=True)
+    else:
+        if has_more:
+            page.next_cursor = encode_cursor(sort_key, last)
+        if cursor:
+            page.prev_cursor = encode_cursor(sort_key, first, backward=True)
+    return page
@@ -3,6 +3,8 @@
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
+from app.crud.document_sequence import document_sequence_crud
+from app.crud.pagination import Page, keyset_paginate
 from app.models.payment import Payment
 from app.schemas.payment import PaymentCreate
 from app.utils.timezone import get_utc_now
@@ -50,17 +52,16 @@ class PaymentCRUD:
     def generate_receipt_number(self, db: Session) -> str:
         """Generate unique receipt number: PAY-YYYY-NNNNN."""
         year = get_utc_now().year
-        prefix = f"PAY-{year}"
-
-        # Get count of payments this year
-        count = (
-            db.query(func.count(Payment.id))
-            .filter(Payment.receipt_number.like(f"{prefix}%"))
-            .scalar()
-            or 0
+        prefix = f"PAY-{year}-"
+        number = document_sequence_crud.next_number(
+            db,
+            "PAY",
+            period=year,
+            seed=lambda: document_sequence_crud.max_issued_number(
+                db, Payment.receipt_number, prefix
+            ),
         )
-
-        return f"{prefix}-{str(count + 1).zfill(5)}"
+        return f"{prefix}{number:05d}"
 
     def get(self, db: Session, payment_id: int) -> Payment | None:
         """Get payment by ID."""
@@ -151,12 +152,19 @@ class PaymentCRUD:
     def list_payments(
         self,
         db: Session,
-        skip: int = 0,
+        cursor: str | None = None,
         limit: int = 20,
         include_voided: bool = False,
         customer_id: int | None = None,
-    ) -> list[Payment]:
-        """List payments with pagination."""
+        with_total: bool = False,
+    ) -> Page[Payment]:
+        """List a page of payments, newest first.
+
+        Keyset paginated on ``(created_at, id)``.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is not a payments list cursor.
+        """
         query = db.query(Payment)
 
         if customer_id:
@@ -165,7 +173,14 @@ class PaymentCRUD:
         if not include_voided:
             query = query.filter(Payment.voided.is_(False))
 
-        return query.order_by(Payment.created_at.desc()).offset(skip).limit(limit).all()
+        return keyset_paginate(
+            query,
+            sort_column=Payment.created_at,
+            id_column=Payment.id,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     def count_payments(
         self,
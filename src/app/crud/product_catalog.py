@@ -0,0 +1,325 @@
+"""In-process snapshot of the product catalog for POS lookups.
+
+Adding to the cart, showing search results and looking up prices read the
+same few hundred products over and over. ``ProductCatalog`` keeps compact
+``CatalogProduct`` records of recently used products, found by ID, SKU or
+barcode, so those lookups are answered from memory.
+
+Records are invalidated by a versioning hook: every commit that wrote
+products (product edits, stock updates, sales and voids) bumps the catalog
+version and drops the written products. A load that started before a bump
+is not stored, so a slow reader cannot put back an outdated row. Records
+also expire after ``CATALOG_TTL_SECONDS`` to pick up writes made by other
+processes.
+
+The snapshot is for display and cart building only. Checkout locks and
+re-reads the product rows, so stock and prices stay authoritative at
+commit.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.product import Category, Product
+
+# Session.info key holding IDs of products written in the open transaction
+_CHANGED_KEY = "product_catalog_changed"
+
+# Callbacks run with the IDs of products written by each commit
+_change_listeners: list[Callable[[set[int]], None]] = []
+
+
+class CatalogProduct:
+    """Read-only snapshot of the product fields used at the POS."""
+
+    __slots__ = (
+        "id",
+        "sku",
+        "barcode",
+        "name",
+        "category_name",
+        "first_sale_price",
+        "second_sale_price",
+        "third_sale_price",
+        "tax_rate",
+        "is_service",
+        "is_active",
+        "current_stock",
+        "minimum_stock",
+        "loaded_at",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        sku: str,
+        barcode: str | None,
+        name: str,
+        category_name: str | None,
+        first_sale_price: Decimal,
+        second_sale_price: Decimal,
+        third_sale_price: Decimal,
+        tax_rate: Decimal,
+        is_service: bool,
+        is_active: bool,
+        current_stock: int,
+        minimum_stock: int,
+        loaded_at: float,
+    ):
+        """Initialize a record from a product row."""
+        self.id = id
+        self.sku = sku
+        self.barcode = barcode
+        self.name = name
+        self.category_name = category_name
+        self.first_sale_price = first_sale_price
+        self.second_sale_price = second_sale_price
+        self.third_sale_price = third_sale_price
+        self.tax_rate = tax_rate
+        self.is_service = is_service
+        self.is_active = is_active
+        self.current_stock = current_stock
+        self.minimum_stock = minimum_stock
+        self.loaded_at = loaded_at
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<CatalogProduct {self.sku}: {self.name}>"
+
+
+_COLUMNS = (
+    Product.id,
+    Product.sku,
+    Product.barcode,
+    Product.name,
+    Category.name,
+    Product.first_sale_price,
+    Product.second_sale_price,
+    Product.third_sale_price,
+    Product.tax_rate,
+    Product.is_service,
+    Product.is_active,
+    Product.current_stock,
+    Product.minimum_stock,
+)
+
+
+class ProductCatalog:
+    """Bounded LRU cache of product records keyed by ID, SKU and barcode."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """Initialize an empty catalog.
+
+        Args:
+            max_size: Maximum number of products kept; least recently used
+                go first.
+            ttl_seconds: Seconds a record stays valid. Zero disables caching.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._products: OrderedDict[int, CatalogProduct] = OrderedDict()
+        self._codes: dict[str, tuple[int, ...]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever committed product writes invalidate records."""
+        return self._version
+
+    def get(self, db: Session, product_id: int) -> CatalogProduct | None:
+        """Get a product by ID, loading it on a miss.
+
+        Args:
+            db: Database session used on a miss.
+            product_id: Product ID.
+
+        Returns:
+            The product record, or None if the product does not exist.
+        """
+        return self.get_many(db, [product_id]).get(product_id)
+
+    def get_many(
+        self, db: Session, product_ids: Iterable[int]
+    ) -> dict[int, CatalogProduct]:
+        """Get several products, loading all misses in one query.
+
+        Args:
+            db: Database session used on misses.
+            product_ids: Product IDs.
+
+        Returns:
+            Records keyed by ID; missing products are left out.
+        """
+        found: dict[int, CatalogProduct] = {}
+        missing = []
+        with self._lock:
+            now = time.monotonic()
+            for product_id in product_ids:
+                record = self._fresh(product_id, now)
+                if record is None:
+                    missing.append(product_id)
+                else:
+                    found[product_id] = record
+
+        if missing:
+            found.update(
+                (record.id, record)
+                for record in self._load(db, Product.id.in_(missing))
+            )
+        return found
+
+    def get_by_code(self, db: Session, code: str) -> list[CatalogProduct]:
+        """Get active products whose SKU or barcode equals ``code``.
+
+        Codes that matched nothing are remembered too, so typing a name in
+        the POS search does not query the SKU and barcode indexes on every
+        keystroke.
+
+        Args:
+            db: Database session used on a miss.
+            code: Scanned or typed barcode or SKU.
+
+        Returns:
+            Matching active products, SKU matches first.
+        """
+        with self._lock:
+            product_ids = self._codes.get(code)
+            if product_ids is not None:
+                now = time.monotonic()
+                records = [self._fresh(product_id, now) for product_id in product_ids]
+                if all(records):
+                    return records
+
+        records = self._load(
+            db,
+            Product.is_active.is_(True),
+            or_(Product.sku == code, Product.barcode == code),
+            order_by=((Product.sku == code).desc(), Product.id),
+            code=code,
+        )
+        return records
+
+    def invalidate(self, product_ids: Iterable[int] | None = None) -> None:
+        """Drop records and bump the version.
+
+        Args:
+            product_ids: Products to drop; None drops everything.
+        """
+        with self._lock:
+            self._version += 1
+            self._codes.clear()
+            if product_ids is None:
+                self._products.clear()
+                return
+            for product_id in product_ids:
+                self._products.pop(product_id, None)
+
+    def clear(self) -> None:
+        """Drop every record."""
+        self.invalidate()
+
+    def __len__(self) -> int:
+        """Number of records currently stored, including expired ones."""
+        return len(self._products)
+
+    def _fresh(self, product_id: int, now: float) -> CatalogProduct | None:
+        """Get a stored, unexpired record. Must be called with the lock held."""
+        record = self._products.get(product_id)
+        if record is None:
+            return None
+        if now - record.loaded_at >= self.ttl_seconds:
+            del self._products[product_id]
+            return None
+        self._products.move_to_end(product_id)
+        return record
+
+    def _load(
+        self,
+        db: Session,
+        *conditions,
+        order_by: tuple = (),
+        code: str | None = None,
+    ) -> list[CatalogProduct]:
+        """Query products and store them unless the catalog changed meanwhile.
+
+        Rows read by a session holding uncommitted product writes are
+        returned but never stored.
+        """
+        version = self._version
+        loaded_at = time.monotonic()
+        records = [
+            CatalogProduct(*row, loaded_at=loaded_at)
+            for row in db.execute(
+                select(*_COLUMNS)
+                .outerjoin(Category, Category.id == Product.category_id)
+                .where(*conditions)
+                .order_by(*order_by)
+            )
+        ]
+
+        if self.max_size <= 0 or self.ttl_seconds <= 0 or db.info.get(_CHANGED_KEY):
+            return records
+
+        with self._lock:
+            if version != self._version:
+                return records
+            for record in records:
+                self._products[record.id] = record
+                self._products.move_to_end(record.id)
+            if code is not None:
+                self._codes[code] = tuple(record.id for record in records)
+            while len(self._products) > self.max_size:
+                self._products.popitem(last=False)
+        return records
+
+
+product_catalog = ProductCatalog(
+    max_size=settings.CATALOG_MAX_PRODUCTS,
+    ttl_seconds=settings.CATALOG_TTL_SECONDS,
+)
+
+
+def on_products_committed(callback: Callable[[set[int]], None]) -> None:
+    """Register a callback run with the IDs of products written by a commit.
+
+    Used by other in-process product caches (e.g. the search index) to
+    share the catalog's invalidation hook.
+    """
+    _change_listeners.append(callback)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_products(session: Session, flush_context) -> None:
+    """Remember products written in this transaction."""
+    changed = {
+        obj.id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Product) and obj.id is not None
+    }
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_products(session: Session) -> None:
+    """Invalidate committed product writes in every in-process cache."""
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if not changed:
+        return
+    product_catalog.invalidate(changed)
+    for callback in _change_listeners:
+        callback(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_products(session: Session) -> None:
+    """Discard writes that were rolled back."""
+    session.info.pop(_CHANGED_KEY, None)
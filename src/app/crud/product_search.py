@@ -0,0 +1,472 @@
+"""Product search for the POS and product listings.
+
+The POS search box queries on every keystroke, so a search must not scan
+the products table. Searches go through three steps:
+
+1. A scanned or typed barcode/SKU is looked up by equality, hitting the
+   unique SKU index or the barcode index, and returned on its own.
+2. On PostgreSQL, names, SKUs and barcodes are matched with ``ILIKE`` and
+   the ``pg_trgm`` similarity operator, both served by the trigram GIN
+   indexes created in migration e5f6a7b8c9d0.
+3. Other databases (SQLite in development and tests) have no trigram
+   indexes, so an in-process ``ProductSearchIndex`` of product words picks
+   the candidates.
+
+Matches are returned as ``CatalogProduct`` records from ``product_catalog``,
+so repeated lookups of the same products are served from memory.
+
+Results are ranked by match quality: names starting with the search term
+first, then names whose words start with every search word, then any
+substring match, then similar (misspelled) names.
+"""
+
+import heapq
+import logging
+import re
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.product_catalog import (
+    CatalogProduct,
+    on_products_committed,
+    product_catalog,
+)
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+# Columns matched by listing searches
+SEARCH_COLUMNS = (Product.name, Product.sku, Product.barcode)
+
+# Minimum pg_trgm-style similarity for a misspelled name to match
+SIMILARITY_THRESHOLD = 0.3
+
+# Rank of each kind of match; lower ranks are listed first
+RANK_EXACT_CODE = 0
+RANK_NAME_PREFIX = 1
+RANK_WORD_PREFIX = 2
+RANK_SUBSTRING = 3
+RANK_SIMILAR = 4
+
+_WORD_SPLIT = re.compile(r"[^\w]+")
+
+
+def normalize(text: str | None) -> str:
+    """Lowercase text and strip accents so "Cargador Rápido" matches "rapido"."""
+    if not text:
+        return ""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _words(text: str) -> list[str]:
+    """Split normalized text into words."""
+    return [word for word in _WORD_SPLIT.split(text) if word]
+
+
+def _trigrams(text: str) -> set[str]:
+    """Get the three-character substrings of a normalized text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards in user input."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_condition(
+    term: str, columns: Iterable[ColumnElement] = SEARCH_COLUMNS
+) -> ColumnElement[bool]:
+    """Build a filter matching products whose columns contain a search term.
+
+    On PostgreSQL the ``ILIKE`` comparisons use the trigram indexes.
+
+    Args:
+        term: Text typed by the user.
+        columns: Product columns to search.
+
+    Returns:
+        SQL condition for use in ``where``/``filter``.
+    """
+    pattern = f"%{_escape_like(term.strip())}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+class ProductSearchIndex:
+    """In-process word index of active products.
+
+    Every distinct word of the product names, brands, models and SKUs maps
+    to the products containing it. A sorted vocabulary serves prefix
+    lookups and a trigram index over name words serves substring and
+    misspelling lookups, so a search only touches the postings of the
+    matching words. Barcodes are left out; scans go through the exact
+    lookup in ``ProductSearch.find_by_code``.
+
+    The index is loaded on first use. Products changed through an ORM
+    session in this process are reloaded after commit, and every
+    ``sync_seconds`` products whose ``updated_at`` moved (changes made by
+    other processes) are reloaded too.
+    """
+
+    def __init__(self, sync_seconds: float):
+        """Initialize an empty index.
+
+        Args:
+            sync_seconds: Seconds between checks for products changed
+                outside this process.
+        """
+        self.sync_seconds = sync_seconds
+        self._names: dict[int, str] = {}
+        self._product_words: dict[int, tuple[str, ...]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+        self._word_trigrams: dict[str, set[str]] = {}
+        self._loaded = False
+        self._watermark: datetime | None = None
+        self._synced_until = 0.0
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+
+    def search(self, db: Session, term: str, limit: int) -> list[tuple[int, int]]:
+        """Find the best matching product IDs.
+
+        Every search word must match a word of the product. Word prefixes
+        are tried first; substrings and then misspellings are only looked
+        up while fewer than ``limit`` products have matched.
+
+        Args:
+            db: Database session used to load or refresh the index.
+            term: Text typed by the user.
+            limit: Maximum number of results.
+
+        Returns:
+            ``(rank, product_id)`` pairs, best match first.
+        """
+        query = normalize(term).strip()
+        tokens = list(dict.fromkeys(_words(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            self._refresh(db)
+
+            matches = [self._matching(self._prefixed(token)) for token in tokens]
+            word_prefix = _intersect(matches)
+            candidates = word_prefix
+            substring: set[int] = set()
+
+            if len(candidates) < limit:
+                for token_matches, token in zip(matches, tokens, strict=True):
+                    token_matches |= self._matching(self._containing(token))
+                substring = _intersect(matches)
+                candidates = substring
+
+            if len(candidates) < limit:
+                for token_matches, token in zip(matches, tokens, strict=True):
+                    token_matches |= self._matching(self._similar(token))
+                candidates = _intersect(matches)
+
+            def rank(product_id: int) -> int:
+                if self._names[product_id].startswith(query):
+                    return RANK_NAME_PREFIX
+                if product_id in word_prefix:
+                    return RANK_WORD_PREFIX
+                if product_id in substring:
+                    return RANK_SUBSTRING
+                return RANK_SIMILAR
+
+            ranked = heapq.nsmallest(
+                limit,
+                ((rank(product_id), product_id) for product_id in candidates),
+                key=lambda item: (
+                    item[0],
+                    len(self._names[item[1]]),
+                    self._names[item[1]],
+                ),
+            )
+            return ranked
+
+    def mark_stale(self, product_ids: Iterable[int]) -> None:
+        """Queue products to be reloaded before the next search."""
+        with self._lock:
+            self._pending.update(product_ids)
+
+    def clear(self) -> None:
+        """Drop the whole index so the next search reloads it."""
+        with self._lock:
+            self._names.clear()
+            self._product_words.clear()
+            self._postings.clear()
+            self._vocabulary.clear()
+            self._word_trigrams.clear()
+            self._pending.clear()
+            self._loaded = False
+            self._watermark = None
+            self._synced_until = 0.0
+
+    def __len__(self) -> int:
+        """Number of indexed products."""
+        return len(self._names)
+
+    def _matching(self, words: Iterable[str]) -> set[int]:
+        """Get the products containing any of ``words``."""
+        return set().union(*(self._postings[word] for word in words))
+
+    def _prefixed(self, prefix: str) -> list[str]:
+        """Get vocabulary words starting with ``prefix``."""
+        words = []
+        index = bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(
+            prefix
+        ):
+            words.append(self._vocabulary[index])
+            index += 1
+        return words
+
+    def _containing(self, token: str) -> list[str]:
+        """Get name words containing ``token`` (three characters or more)."""
+        if len(token) < 3:
+            return []
+        postings = [self._word_trigrams.get(gram, set()) for gram in _trigrams(token)]
+        postings.sort(key=len)
+        return [
+            word for word in postings[0].intersection(*postings[1:]) if token in word
+        ]
+
+    def _similar(self, token: str) -> list[str]:
+        """Get name words sharing enough trigrams with ``token``."""
+        grams = _trigrams(token)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._word_trigrams.get(gram, ()))
+
+        return [
+            word
+            for word, count in shared.items()
+            if count / (len(grams) + len(_trigrams(word)) - count)
+            >= SIMILARITY_THRESHOLD
+        ]
+
+    def _refresh(self, db: Session) -> None:
+        """Load the index on first use, then reload changed products."""
+        now = time.monotonic()
+        if not self._loaded:
+            started = time.perf_counter()
+            self._watermark = db.scalar(select(func.max(Product.updated_at)))
+            self._load(db, Product.is_active.is_(True))
+            self._vocabulary.sort()
+            self._loaded = True
+            self._synced_until = now + self.sync_seconds
+            logger.info(
+                f"Product search index loaded: {len(self._names)} products in "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            return
+
+        if now >= self._synced_until and self._watermark is not None:
+            watermark = db.scalar(select(func.max(Product.updated_at)))
+            self._pending.update(
+                db.scalars(
+                    select(Product.id).where(Product.updated_at >= self._watermark)
+                )
+            )
+            self._watermark = watermark
+            self._synced_until = now + self.sync_seconds
+
+        if self._pending:
+            pending = list(self._pending)
+            self._pending.clear()
+            for product_id in pending:
+                self._remove(product_id)
+            for start in range(0, len(pending), 500):
+                self._load(
+                    db,
+                    Product.is_active.is_(True),
+                    Product.id.in_(pending[start : start + 500]),
+                    keep_sorted=True,
+                )
+
+    def _load(self, db: Session, *conditions, keep_sorted: bool = False) -> None:
+        """Add the products matching ``conditions`` to the index."""
+        rows = db.execute(
+            select(
+                Product.id,
+                Product.name,
+                Product.brand,
+                Product.model,
+                Product.sku,
+            )
+            .where(*conditions)
+            .execution_options(yield_per=5000)
+        )
+        for product_id, name, brand, model, sku in rows:
+            name = normalize(name)
+            name_words = set(
+                _words(" ".join([name, normalize(brand), normalize(model)]))
+            )
+            words = tuple(name_words.union(_words(normalize(sku))))
+
+            self._names[product_id] = name
+            self._product_words[product_id] = words
+            for word in words:
+                postings = self._postings.get(word)
+                if postings is None:
+                    word = sys.intern(word)
+                    postings = self._postings[word] = set()
+                    if keep_sorted:
+                        insort(self._vocabulary, word)
+                    else:
+                        self._vocabulary.append(word)
+                    if word in name_words:
+                        for gram in _trigrams(word):
+                            self._word_trigrams.setdefault(gram, set()).add(word)
+                postings.add(product_id)
+
+    def _remove(self, product_id: int) -> None:
+        """Remove a product from the index, if present."""
+        self._names.pop(product_id, None)
+        for word in self._product_words.pop(product_id, ()):
+            postings = self._postings[word]
+            postings.discard(product_id)
+            if postings:
+                continue
+
+            del self._postings[word]
+            index = bisect_left(self._vocabulary, word)
+            del self._vocabulary[index]
+            for gram in _trigrams(word):
+                grams = self._word_trigrams.get(gram)
+                if grams is not None:
+                    grams.discard(word)
+                    if not grams:
+                        del self._word_trigrams[gram]
+
+
+def _intersect(sets: list[set[int]]) -> set[int]:
+    """Intersect sets, starting from the smallest."""
+    ordered = sorted(sets, key=len)
+    return ordered[0].intersection(*ordered[1:])
+
+
+class ProductSearch:
+    """Ranked product search with a barcode/SKU fast path."""
+
+    def __init__(self, index: ProductSearchIndex):
+        """Initialize the search.
+
+        Args:
+            index: In-process index used on databases without pg_trgm.
+        """
+        self.index = index
+
+    def search(
+        self, db: Session, term: str, *, limit: int = 10
+    ) -> list[CatalogProduct]:
+        """Search active products by name, brand, model, SKU or barcode.
+
+        Args:
+            db: Database session.
+            term: Text typed or scanned by the user.
+            limit: Maximum number of results.
+
+        Returns:
+            Matching products, best match first.
+        """
+        term = term.strip()
+        if not term:
+            return []
+
+        exact = self.find_by_code(db, term)
+        if exact:
+            return exact[:limit]
+
+        if db.get_bind().dialect.name == "postgresql":
+            ids = self._search_trigram(db, term, limit)
+        else:
+            ids = [product_id for _, product_id in self.index.search(db, term, limit)]
+        if not ids:
+            return []
+
+        products = product_catalog.get_many(db, ids)
+        return [
+            products[product_id]
+            for product_id in ids
+            if product_id in products and products[product_id].is_active
+        ]
+
+    def find_by_code(self, db: Session, code: str) -> list[CatalogProduct]:
+        """Get active products whose SKU or barcode equals ``code``.
+
+        Uses the unique SKU index and the barcode index through the product
+        catalog. Scanners send the full code, so a scan needs at most one
+        query, and none when the code was looked up recently.
+
+        Args:
+            db: Database session.
+            code: Scanned or typed barcode or SKU.
+
+        Returns:
+            Matching products, SKU matches first.
+        """
+        return product_catalog.get_by_code(db, code)
+
+    def _search_trigram(self, db: Session, term: str, limit: int) -> list[int]:
+        """Get matching product IDs with the pg_trgm indexes on PostgreSQL."""
+        tokens = term.split()
+        columns = (*SEARCH_COLUMNS, Product.brand, Product.model)
+        contains_tokens = and_(*(search_condition(token, columns) for token in tokens))
+        lowered = func.lower(Product.name)
+        rank = case(
+            (lowered.startswith(term.lower(), autoescape=True), RANK_NAME_PREFIX),
+            (
+                and_(
+                    *(
+                        or_(
+                            lowered.startswith(token.lower(), autoescape=True),
+                            lowered.contains(f" {token.lower()}", autoescape=True),
+                        )
+                        for token in tokens
+                    )
+                ),
+                RANK_WORD_PREFIX,
+            ),
+            (contains_tokens, RANK_SUBSTRING),
+            else_=RANK_SIMILAR,
+        )
+        matches = or_(contains_tokens, Product.name.op("%")(term))
+
+        return list(
+            db.scalars(
+                select(Product.id)
+                .where(Product.is_active.is_(True), matches)
+                .order_by(
+                    rank,
+                    func.similarity(Product.name, term).desc(),
+                    func.length(Product.name),
+                    Product.name,
+                )
+                .limit(limit)
+            )
+        )
+
+
+product_search = ProductSearch(
+    ProductSearchIndex(sync_seconds=settings.PRODUCT_SEARCH_SYNC_SECONDS)
+)
+
+# Reload products written through ORM sessions in this process after commit
+on_products_committed(product_search.index.mark_stale)
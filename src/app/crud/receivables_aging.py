@@ -0,0 +1,342 @@
+"""Accounts receivable aging computed from the customer ledger.
+
+Each customer's payments and other credits are applied to their charges
+oldest first (FIFO), and whatever is left open of each charge is aged by
+its date into 0-30, 31-60, 61-90 and over-90-day buckets. Allocation,
+aging and the per-customer totals run as one SQL statement: a running sum
+of charges per customer, taken in date order, is compared with the
+customer's total credits, so the open part of a charge is
+``clamp(running total - credits, 0, charge)``. No row is fetched until the
+final per-customer totals.
+
+A voided sale is settled by its own ``VOID_SALE`` reversal instead of
+taking part in FIFO, so voiding a recent sale does not age older ones.
+
+Results are cached per as-of date until the next commit that writes ledger
+transactions, and for at most ``AGING_CACHE_TTL_SECONDS`` to pick up writes
+made by other processes.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, case, event, exists, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.models.customer import Customer
+from app.models.customer_account import CustomerTransaction, TransactionType
+from app.utils.timezone import get_local_today, local_date_to_utc_range
+
+logger = logging.getLogger(__name__)
+
+# Upper bound (days, inclusive) of each bucket but the last
+AGING_BUCKET_DAYS = (30, 60, 90)
+
+# Cached (as_of, customer_id) results kept per process
+AGING_CACHE_SIZE = 32
+
+# Session.info key marking a transaction that wrote ledger rows
+_CHANGED_KEY = "receivables_aging_changed"
+
+_DELTA = CustomerTransaction.balance_after - CustomerTransaction.balance_before
+
+ZERO = Decimal("0.00")
+
+
+@dataclass(frozen=True)
+class AgingBalance:
+    """Open receivables of one customer by age.
+
+    Attributes:
+        customer_id: Customer ID.
+        customer_name: Customer name.
+        total_outstanding: Open amount of all charges.
+        current: Open amount of charges 0-30 days old.
+        days_31_60: Open amount of charges 31-60 days old.
+        days_61_90: Open amount of charges 61-90 days old.
+        over_90_days: Open amount of charges older than 90 days.
+        oldest_invoice_date: Date of the oldest charge still open.
+    """
+
+    customer_id: int
+    customer_name: str
+    total_outstanding: Decimal
+    current: Decimal
+    days_31_60: Decimal
+    days_61_90: Decimal
+    over_90_days: Decimal
+    oldest_invoice_date: Optional[datetime]
+
+
+def _to_cents(value) -> Decimal:
+    """Convert an aggregated amount (float on some databases) to cents."""
+    return Decimal(str(value)).quantize(Decimal("0.01")) if value else ZERO
+
+
+def _aging_query(as_of: date, customer_id: Optional[int]):
+    """Build the statement allocating credits FIFO and bucketing what is open.
+
+    Args:
+        as_of: Local date the ages are measured at; later transactions are
+            ignored.
+        customer_id: Only this customer (default: all).
+
+    Returns:
+        Select of one row per customer with open charges.
+    """
+    _, as_of_end = local_date_to_utc_range(as_of)
+    bucket_starts = [
+        local_date_to_utc_range(as_of - timedelta(days=days))[0]
+        for days in AGING_BUCKET_DAYS
+    ]
+
+    txn = CustomerTransaction
+    in_scope = [txn.transaction_date <= as_of_end]
+    if customer_id is not None:
+        in_scope.append(txn.customer_id == customer_id)
+
+    # Reversals of sales that are on the ledger settle their own sale
+    sale = aliased(CustomerTransaction)
+    void = aliased(CustomerTransaction)
+    is_sale_reversal = and_(
+        txn.transaction_type == TransactionType.VOID_SALE,
+        txn.reference_type == "sale",
+        exists().where(
+            sale.customer_id == txn.customer_id,
+            sale.transaction_type == TransactionType.SALE,
+            sale.reference_type == "sale",
+            sale.reference_id == txn.reference_id,
+        ),
+    )
+    reversed_amount = (
+        select(func.coalesce(func.sum(void.balance_before - void.balance_after), 0))
+        .where(
+            void.customer_id == txn.customer_id,
+            void.transaction_type == TransactionType.VOID_SALE,
+            void.reference_type == "sale",
+            void.reference_id == txn.reference_id,
+            void.transaction_date <= as_of_end,
+        )
+        .scalar_subquery()
+    )
+    charge_amount = case(
+        (
+            and_(
+                txn.transaction_type == TransactionType.SALE,
+                txn.reference_type == "sale",
+            ),
+            _DELTA - reversed_amount,
+        ),
+        else_=_DELTA,
+    )
+
+    charges = (
+        select(
+            txn.id,
+            txn.customer_id,
+            txn.transaction_date,
+            charge_amount.label("amount"),
+        )
+        .where(_DELTA > 0, *in_scope)
+        .subquery("charges")
+    )
+    credits = (
+        select(txn.customer_id, func.sum(-_DELTA).label("paid"))
+        .where(_DELTA < 0, ~is_sale_reversal, *in_scope)
+        .group_by(txn.customer_id)
+        .subquery("credits")
+    )
+    running = (
+        select(
+            charges.c.customer_id,
+            charges.c.transaction_date,
+            charges.c.amount,
+            (
+                func.sum(charges.c.amount).over(
+                    partition_by=charges.c.customer_id,
+                    order_by=(charges.c.transaction_date, charges.c.id),
+                )
+                - func.coalesce(credits.c.paid, 0)
+            ).label("unpaid"),
+        )
+        .outerjoin(credits, credits.c.customer_id == charges.c.customer_id)
+        .where(charges.c.amount > 0)
+        .subquery("running")
+    )
+
+    # Credits cover charges oldest first: whatever of the running total
+    # they do not reach is open, up to the charge itself
+    open_amount = case(
+        (running.c.unpaid <= 0, 0),
+        (running.c.unpaid >= running.c.amount, running.c.amount),
+        else_=running.c.unpaid,
+    )
+    allocated = select(
+        running.c.customer_id,
+        running.c.transaction_date,
+        open_amount.label("open_amount"),
+    ).subquery("allocated")
+
+    charged_at = allocated.c.transaction_date
+    open_amount = allocated.c.open_amount
+    in_buckets = [
+        (charged_at >= bucket_starts[0], "current"),
+        (
+            and_(charged_at < bucket_starts[0], charged_at >= bucket_starts[1]),
+            "days_31_60",
+        ),
+        (
+            and_(charged_at < bucket_starts[1], charged_at >= bucket_starts[2]),
+            "days_61_90",
+        ),
+        (charged_at < bucket_starts[2], "over_90_days"),
+    ]
+    total = func.sum(open_amount)
+    return (
+        select(
+            allocated.c.customer_id,
+            Customer.name.label("customer_name"),
+            total.label("total_outstanding"),
+            *(
+                func.sum(case((condition, open_amount), else_=0)).label(name)
+                for condition, name in in_buckets
+            ),
+            func.min(case((open_amount > 0, charged_at))).label("oldest_invoice_date"),
+        )
+        .join(Customer, Customer.id == allocated.c.customer_id)
+        .group_by(allocated.c.customer_id, Customer.name)
+        .having(total > 0)
+        .order_by(total.desc(), allocated.c.customer_id)
+    )
+
+
+class ReceivablesAgingCRUD:
+    """Accounts receivable aging with a per-day result cache."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._cache: dict[tuple, tuple[float, list[AgingBalance]]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def compute(
+        self, db: Session, *, as_of: date, customer_id: Optional[int] = None
+    ) -> list[AgingBalance]:
+        """Compute aging balances with a single query, bypassing the cache.
+
+        Args:
+            db: Database session
+            as_of: Local date the ages are measured at
+            customer_id: Only this customer (default: all)
+
+        Returns:
+            Customers with open charges, largest balance first
+        """
+        rows = db.execute(_aging_query(as_of, customer_id)).all()
+        return [
+            AgingBalance(
+                customer_id=row.customer_id,
+                customer_name=row.customer_name,
+                total_outstanding=_to_cents(row.total_outstanding),
+                current=_to_cents(row.current),
+                days_31_60=_to_cents(row.days_31_60),
+                days_61_90=_to_cents(row.days_61_90),
+                over_90_days=_to_cents(row.over_90_days),
+                oldest_invoice_date=row.oldest_invoice_date,
+            )
+            for row in rows
+        ]
+
+    def get(
+        self,
+        db: Session,
+        *,
+        as_of: Optional[date] = None,
+        customer_id: Optional[int] = None,
+    ) -> list[AgingBalance]:
+        """Get aging balances, from the cache when still valid.
+
+        Args:
+            db: Database session
+            as_of: Local date the ages are measured at (default: today)
+            customer_id: Only this customer (default: all)
+
+        Returns:
+            Customers with open charges, largest balance first
+        """
+        key = (as_of or get_local_today(), customer_id)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+            version = self._version
+
+        balances = self.compute(db, as_of=key[0], customer_id=customer_id)
+
+        with self._lock:
+            # A commit during the query may have changed the result
+            if version == self._version:
+                if len(self._cache) >= AGING_CACHE_SIZE:
+                    self._cache.pop(next(iter(self._cache)))
+                expires = time.monotonic() + settings.AGING_CACHE_TTL_SECONDS
+                self._cache[key] = (expires, balances)
+        return balances
+
+    def invalidate(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._version += 1
+            self._cache.clear()
+
+    @staticmethod
+    def totals(balances: list[AgingBalance]) -> dict[str, Decimal]:
+        """Sum aging balances per bucket.
+
+        Args:
+            balances: Aging balances of several customers
+
+        Returns:
+            ``total_outstanding`` and each bucket summed
+        """
+        columns = (
+            "total_outstanding",
+            "current",
+            "days_31_60",
+            "days_61_90",
+            "over_90_days",
+        )
+        return {
+            column: sum((getattr(b, column) for b in balances), ZERO)
+            for column in columns
+        }
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_ledger_writes(session: Session, flush_context) -> None:
+    """Remember that this transaction wrote customer ledger rows."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, CustomerTransaction):
+            session.info[_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_aging(session: Session) -> None:
+    """Drop cached aging once ledger changes are visible to other sessions."""
+    if session.info.pop(_CHANGED_KEY, False):
+        receivables_aging.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_ledger_writes(session: Session) -> None:
+    """Rolled back ledger writes leave the cached aging valid."""
+    session.info.pop(_CHANGED_KEY, None)
+
+
+receivables_aging = ReceivablesAgingCRUD()
@@ -4,9 +4,12 @@ from datetime import timedelta
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.crud.customer import phone_term_filter
+from app.crud.document_sequence import document_sequence_crud
+from app.crud.pagination import Page, keyset_paginate
 from app.models.customer import Customer
 from app.models.repair import Repair, RepairPart, RepairPhoto, RepairStatusHistory
 from app.schemas.repair import (
@@ -28,25 +31,18 @@ class RepairCRUD:
     """CRUD operations for repairs."""
 
     def generate_repair_number(self, db: Session) -> str:
-        """Generate unique repair number."""
+        """Generate unique repair number: REP-YYYY-NNNNN."""
         current_year = get_utc_now().year
-
-        # Get the last repair number for current year
-        last_repair = (
-            db.query(Repair)
-            .filter(Repair.repair_number.like(f"REP-{current_year}-%"))
-            .order_by(desc(Repair.id))
-            .first()
+        prefix = f"REP-{current_year}-"
+        number = document_sequence_crud.next_number(
+            db,
+            "REP",
+            period=current_year,
+            seed=lambda: document_sequence_crud.max_issued_number(
+                db, Repair.repair_number, prefix
+            ),
         )
-
-        if last_repair:
-            # Extract number and increment
-            last_number = int(last_repair.repair_number.split("-")[-1])
-            new_number = last_number + 1
-        else:
-            new_number = 1
-
-        return f"REP-{current_year}-{new_number:05d}"
+        return f"{prefix}{number:05d}"
 
     def create_repair(
         self, db: Session, *, repair_in: RepairCreate, received_by_id: int
@@ -131,8 +127,14 @@ class RepairCRUD:
 
     def search_repairs(
         self, db: Session, *, params: RepairSearchParams
-    ) -> tuple[list[Repair], int]:
-        """Search repairs with filters and pagination."""
+    ) -> Page[Repair]:
+        """Search repairs with filters, newest first.
+
+        Keyset paginated on ``(received_date, id)`` with ``params.cursor``.
+
+        Raises:
+            InvalidCursorError: If the cursor is not a repairs list cursor.
+        """
         query = db.query(Repair).options(
             joinedload(Repair.customer),
             joinedload(Repair.technician),
@@ -141,16 +143,17 @@ class RepairCRUD:
         # Text search
         if params.q:
             search_term = f"%{params.q}%"
-            query = query.join(Customer).filter(
-                or_(
-                    Repair.repair_number.ilike(search_term),
-                    Customer.name.ilike(search_term),
-                    Customer.phone.ilike(search_term),
-                    Repair.device_brand.ilike(search_term),
-                    Repair.device_model.ilike(search_term),
-                    Repair.serial_number.ilike(search_term),
-                )
-            )
+            conditions = [
+                Repair.repair_number.ilike(search_term),
+                Customer.name.ilike(search_term),
+                Repair.device_brand.ilike(search_term),
+                Repair.device_model.ilike(search_term),
+                Repair.serial_number.ilike(search_term),
+            ]
+            phone_condition = phone_term_filter(db, params.q)
+            if phone_condition is not None:
+                conditions.append(phone_condition)
+            query = query.join(Customer).filter(or_(*conditions))
 
         # Status filter
         if params.status:
@@ -178,19 +181,15 @@ class RepairCRUD:
         if params.is_express is not None:
             query = query.filter(Repair.is_express == params.is_express)
 
-        # Get total count
-        total = query.count()
-
-        # Apply pagination and ordering
-        repairs = (
-            query.order_by(desc(Repair.received_date))
-            .offset(params.offset)
-            .limit(params.page_size)
-            .all()
+        return keyset_paginate(
+            query,
+            sort_column=Repair.received_date,
+            id_column=Repair.id,
+            limit=params.page_size,
+            cursor=params.cursor,
+            with_total=params.include_total,
         )
 
-        return repairs, total
-
     def update_repair(
         self, db: Session, *, repair_id: int, repair_in: RepairUpdate
     ) -> Optional[Repair]:
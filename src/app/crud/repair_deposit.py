@@ -9,6 +9,7 @@ from sqlalchemy import and_, func
 from sqlalchemy.orm import Session, joinedload
 
 from app.crud.base import CRUDBase
+from app.crud.document_sequence import document_sequence_crud
 from app.models.repair_deposit import DepositStatus, RepairDeposit
 from app.schemas.repair_deposit import DepositCreate, DepositListParams, DepositUpdate
 
@@ -433,18 +434,13 @@ class CRUDRepairDeposit(CRUDBase[RepairDeposit, DepositCreate, DepositUpdate]):
         Returns:
             Generated receipt number
         """
-        # Get the last receipt number
-        last_deposit = db.query(RepairDeposit).order_by(RepairDeposit.id.desc()).first()
-
-        if last_deposit and last_deposit.receipt_number.startswith("DEP"):
-            try:
-                last_number = int(last_deposit.receipt_number[3:])
-                next_number = last_number + 1
-            except ValueError:
-                next_number = 1
-        else:
-            next_number = 1
-
+        next_number = document_sequence_crud.next_number(
+            db,
+            "DEP",
+            seed=lambda: document_sequence_crud.max_issued_number(
+                db, RepairDeposit.receipt_number, "DEP"
+            ),
+        )
         return f"DEP{next_number:06d}"
 
 
@@ -1,14 +1,19 @@
 """CRUD operations for sales management."""
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import and_, case, desc, func, or_
+from sqlalchemy import case, func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.crud.document_sequence import document_sequence_crud
+from app.crud.pagination import Page, keyset_paginate
+from app.crud.product_catalog import CatalogProduct
+from app.crud.product_search import product_search
 from app.models.product import Product
 from app.models.sale import Sale, SaleItem
 from app.schemas.sale import SaleCreate
@@ -17,29 +22,58 @@ from app.utils.timezone import get_utc_now
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class LinePricing:
+    """Pricing of one cart line, computed once per checkout.
+
+    Attributes:
+        product: Locked product row for the line.
+        quantity: Units sold.
+        unit_price: Price per unit actually charged.
+        is_custom_price: Whether the cashier overrode the price.
+        discount_percentage: Line discount percentage.
+        discount_amount: Line discount amount.
+        total: Line total after line discounts, before sale discount and tax.
+    """
+
+    product: Product
+    quantity: int
+    unit_price: Decimal
+    is_custom_price: bool
+    discount_percentage: Decimal
+    discount_amount: Decimal
+    total: Decimal
+
+
 class SaleCRUD:
     """CRUD operations for sales."""
 
     def generate_invoice_number(self, db: Session) -> str:
-        """Generate unique invoice number."""
-        current_year = get_utc_now().year
+        """Generate unique invoice number: INV-YYYY-NNNNN."""
+        return self.reserve_invoice_numbers(db, 1)[0]
 
-        # Get the last invoice number for current year
-        last_sale = (
-            db.query(Sale)
-            .filter(Sale.invoice_number.like(f"INV-{current_year}-%"))
-            .order_by(desc(Sale.id))
-            .first()
-        )
+    def reserve_invoice_numbers(self, db: Session, count: int) -> list[str]:
+        """Reserve a block of consecutive invoice numbers for a terminal.
 
-        if last_sale:
-            # Extract number and increment
-            last_number = int(last_sale.invoice_number.split("-")[-1])
-            new_number = last_number + 1
-        else:
-            new_number = 1
+        Args:
+            db: Database session
+            count: How many invoice numbers to reserve
 
-        return f"INV-{current_year}-{new_number:05d}"
+        Returns:
+            The reserved invoice numbers, in order
+        """
+        current_year = get_utc_now().year
+        prefix = f"INV-{current_year}-"
+        numbers = document_sequence_crud.allocate_block(
+            db,
+            "INV",
+            count,
+            period=current_year,
+            seed=lambda: document_sequence_crud.max_issued_number(
+                db, Sale.invoice_number, prefix
+            ),
+        )
+        return [f"{prefix}{number:05d}" for number in numbers]
 
     def create_sale(self, db: Session, *, sale_in: SaleCreate, user_id: int) -> Sale:
         """Create new sale with items and update inventory.
@@ -83,78 +117,26 @@ class SaleCRUD:
             # Generate invoice number
             invoice_number = self.generate_invoice_number(db)
 
-            # Calculate totals
-            subtotal = Decimal("0")
-            tax_amount = Decimal("0")
-
-            # Validate products and calculate totals
-            for item in sale_in.items:
-                product = (
-                    db.query(Product).filter(Product.id == item.product_id).first()
-                )
-                if not product:
-                    raise ValueError(f"Product {item.product_id} not found")
-
-                # Only check stock for physical products, not services
-                if not product.is_service and product.current_stock < item.quantity:
-                    raise ValueError(
-                        f"Insufficient stock for {product.name}. "
-                        f"Available: {product.current_stock}, Requested: {item.quantity}"
-                    )
-
-                # Use custom price if specified, otherwise use product's first sale price
-                if item.is_custom_price and item.unit_price is not None:
-                    unit_price = item.unit_price
-                elif item.unit_price is not None:
-                    # Price was explicitly set (selected from the three options)
-                    unit_price = item.unit_price
-                else:
-                    # Default to first sale price if no price specified
-                    unit_price = product.first_sale_price
-                    # Update item with the product price for later use
-                    item.unit_price = unit_price
-
-                # Calculate item total
-                item_subtotal = unit_price * item.quantity
-                item_discount = (
-                    item_subtotal * item.discount_percentage / 100
-                ) + item.discount_amount
-                item_total = item_subtotal - item_discount
+            # Load and lock every cart product in one round trip, then price
+            # each line once for totals, tax, sale items and stock updates
+            products = self._lock_products(db, sale_in)
+            lines = self._price_lines(sale_in, products)
 
-                subtotal += item_total
+            # Calculate totals
+            subtotal = sum((line.total for line in lines), Decimal("0"))
 
             # Apply sale-level discount first
             subtotal_after_discount = subtotal - sale_in.discount_amount
 
             # Calculate tax on final discounted amount
-            for item in sale_in.items:
-                product = (
-                    db.query(Product).filter(Product.id == item.product_id).first()
-                )
-
-                # Use same price determination as above
-                if item.is_custom_price and item.unit_price is not None:
-                    unit_price = item.unit_price
-                elif item.unit_price is not None:
-                    # Price was explicitly set (selected from the three options)
-                    unit_price = item.unit_price
-                else:
-                    # Default to first sale price if no price specified
-                    unit_price = product.first_sale_price
-
-                # Calculate proportional tax for each item after sale discount
-                item_subtotal = unit_price * item.quantity
-                item_discount = (
-                    item_subtotal * item.discount_percentage / 100
-                ) + item.discount_amount
-                item_total = item_subtotal - item_discount
-
+            tax_amount = Decimal("0")
+            for line in lines:
                 # Proportional discount allocation
-                item_proportion = item_total / subtotal if subtotal > 0 else 0
+                item_proportion = line.total / subtotal if subtotal > 0 else 0
                 item_share_of_sale_discount = sale_in.discount_amount * item_proportion
-                item_final_price = item_total - item_share_of_sale_discount
+                item_final_price = line.total - item_share_of_sale_discount
 
-                tax_amount += item_final_price * product.tax_rate / 100
+                tax_amount += item_final_price * line.product.tax_rate / 100
 
             total_amount = subtotal_after_discount + tax_amount
 
@@ -218,48 +200,24 @@ class SaleCRUD:
             db.flush()  # Get sale.id without committing
 
             # Create sale items and update inventory
-            for item in sale_in.items:
-                product = (
-                    db.query(Product).filter(Product.id == item.product_id).first()
-                )
-
-                # Use custom price if specified, otherwise use the selected price
-                if item.is_custom_price and item.unit_price is not None:
-                    unit_price = item.unit_price
-                    is_custom_price = True
-                elif item.unit_price is not None:
-                    # Price was explicitly set (selected from the three options)
-                    unit_price = item.unit_price
-                    is_custom_price = False
-                else:
-                    # Default to first sale price if no price specified
-                    unit_price = product.first_sale_price
-                    is_custom_price = False
-
-                # Calculate item totals
-                item_subtotal = unit_price * item.quantity
-                item_discount = (
-                    item_subtotal * item.discount_percentage / 100
-                ) + item.discount_amount
-                item_total = item_subtotal - item_discount
-
-                # Create sale item
-                sale_item = SaleItem(
-                    sale_id=sale.id,
-                    product_id=item.product_id,
-                    quantity=item.quantity,
-                    unit_price=unit_price,
-                    discount_percentage=item.discount_percentage,
-                    discount_amount=item.discount_amount,
-                    total_price=item_total,
-                    is_custom_price=is_custom_price,
+            for line in lines:
+                db.add(
+                    SaleItem(
+                        sale_id=sale.id,
+                        product_id=line.product.id,
+                        quantity=line.quantity,
+                        unit_price=line.unit_price,
+                        unit_cost=line.product.purchase_price,
+                        discount_percentage=line.discount_percentage,
+                        discount_amount=line.discount_amount,
+                        total_price=line.total,
+                        is_custom_price=line.is_custom_price,
+                    )
                 )
-                db.add(sale_item)
 
                 # Update inventory (only for physical products, not services)
-                if not product.is_service:
-                    product.current_stock -= item.quantity
-                    db.add(product)
+                if not line.product.is_service:
+                    line.product.current_stock -= line.quantity
 
             # Update sale with actual paid amount
             sale.paid_amount = amount_paid
@@ -291,8 +249,8 @@ class SaleCRUD:
                         f"from sale {invoice_number}"
                     )
 
+            sale_id = sale.id
             db.commit()
-            db.refresh(sale)
 
             # Load relationships
             sale = (
@@ -302,7 +260,7 @@ class SaleCRUD:
                     joinedload(Sale.user),
                     selectinload(Sale.items).joinedload(SaleItem.product),
                 )
-                .filter(Sale.id == sale.id)
+                .filter(Sale.id == sale_id)
                 .first()
             )
 
@@ -315,6 +273,102 @@ class SaleCRUD:
             db.rollback()
             raise
 
+    def _lock_products(self, db: Session, sale_in: SaleCreate) -> dict[int, Product]:
+        """Load all products of a cart with one ``SELECT ... FOR UPDATE``.
+
+        Rows are locked in ID order so concurrent checkouts sharing products
+        cannot deadlock, and stock checks stay valid until commit.
+
+        Args:
+            db: Database session.
+            sale_in: Sale data with the cart items.
+
+        Returns:
+            Products keyed by ID.
+
+        Raises:
+            ValueError: If a product does not exist or stock is insufficient.
+        """
+        product_ids = {item.product_id for item in sale_in.items}
+        products = {
+            product.id: product
+            for product in db.query(Product)
+            .filter(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update()
+        }
+
+        requested: dict[int, int] = {}
+        for item in sale_in.items:
+            if item.product_id not in products:
+                raise ValueError(f"Product {item.product_id} not found")
+            requested[item.product_id] = (
+                requested.get(item.product_id, 0) + item.quantity
+            )
+
+        # Only check stock for physical products, not services. Quantities
+        # are summed so repeated lines of one product cannot oversell it.
+        for product_id, quantity in requested.items():
+            product = products[product_id]
+            if not product.is_service and product.current_stock < quantity:
+                raise ValueError(
+                    f"Insufficient stock for {product.name}. "
+                    f"Available: {product.current_stock}, Requested: {quantity}"
+                )
+
+        return products
+
+    def _price_lines(
+        self, sale_in: SaleCreate, products: dict[int, Product]
+    ) -> list[LinePricing]:
+        """Price every cart line once.
+
+        Args:
+            sale_in: Sale data with the cart items.
+            products: Cart products keyed by ID.
+
+        Returns:
+            Pricing for each line, in cart order.
+        """
+        lines = []
+        for item in sale_in.items:
+            product = products[item.product_id]
+
+            # Use custom price if specified, otherwise use product's first sale price
+            if item.is_custom_price and item.unit_price is not None:
+                unit_price = item.unit_price
+                is_custom_price = True
+            elif item.unit_price is not None:
+                # Price was explicitly set (selected from the three options)
+                unit_price = item.unit_price
+                is_custom_price = False
+            else:
+                # Default to first sale price if no price specified
+                unit_price = product.first_sale_price
+                is_custom_price = False
+                # Update item with the product price for later use
+                item.unit_price = unit_price
+
+            # Calculate item total
+            item_subtotal = unit_price * item.quantity
+            item_discount = (
+                item_subtotal * item.discount_percentage / 100
+            ) + item.discount_amount
+
+            lines.append(
+                LinePricing(
+                    product=product,
+                    quantity=item.quantity,
+                    unit_price=unit_price,
+                    is_custom_price=is_custom_price,
+                    discount_percentage=item.discount_percentage,
+                    discount_amount=item.discount_amount,
+                    total=item_subtotal - item_discount,
+                )
+            )
+
+        return lines
+
     def get_with_details(self, db: Session, id: int) -> Optional[Sale]:
         """Get sale with all details."""
         return (
@@ -333,8 +387,9 @@ class SaleCRUD:
         self,
         db: Session,
         *,
-        skip: int = 0,
+        cursor: Optional[str] = None,
         limit: int = 100,
+        with_total: bool = False,
         customer_id: Optional[int] = None,
         customer_search: Optional[str] = None,
         start_date: Optional[datetime] = None,
@@ -342,8 +397,16 @@ class SaleCRUD:
         payment_status: Optional[str] = None,
         payment_method: Optional[str] = None,
         is_voided: Optional[bool] = None,
-    ) -> tuple[list[Sale], int]:
-        """Get sales with filters and total count."""
+    ) -> Page[Sale]:
+        """Get a page of sales with filters, newest first.
+
+        Pages are keyset paginated on ``(sale_date, id)``; pass the
+        ``next_cursor``/``prev_cursor`` of a page to move through the list.
+        The total is only counted when ``with_total`` is set.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is not a sales list cursor.
+        """
         from app.models.customer import Customer
 
         query = db.query(Sale).options(
@@ -374,36 +437,24 @@ class SaleCRUD:
         if is_voided is not None:
             query = query.filter(Sale.is_voided == is_voided)
 
-        # Get total count
-        total = query.count()
-
-        # Get paginated results
-        sales = query.order_by(desc(Sale.sale_date)).offset(skip).limit(limit).all()
-
-        return sales, total
+        return keyset_paginate(
+            query,
+            sort_column=Sale.sale_date,
+            id_column=Sale.id,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     def search_products(
         self, db: Session, *, query: str, limit: int = 10
-    ) -> list[Product]:
-        """Search products for POS."""
-        search_term = f"%{query}%"
+    ) -> list[CatalogProduct]:
+        """Search products for POS.
 
-        return (
-            db.query(Product)
-            .join(Product.category)
-            .filter(
-                and_(
-                    Product.is_active.is_(True),
-                    or_(
-                        Product.name.ilike(search_term),
-                        Product.sku.ilike(search_term),
-                        Product.barcode.ilike(search_term),
-                    ),
-                )
-            )
-            .limit(limit)
-            .all()
-        )
+        Delegates to ``product_search``: exact barcode/SKU lookups first,
+        then an indexed name search ranked by match quality.
+        """
+        return product_search.search(db, query, limit=limit)
 
     def void_sale(
         self, db: Session, *, sale_id: int, reason: str, user_id: int
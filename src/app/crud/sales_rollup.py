@@ -0,0 +1,597 @@
+"""CRUD operations for pre-aggregated sales analytics.
+
+Answering "what sold best this year" or "which hours are busiest" from
+``sales`` and ``sale_items`` means scanning every line of the period.
+Instead, each flush that creates sale items or voids (or restores) a sale
+adds its lines to two rollup tables in the same transaction:
+
+- ``sales_daily_rollups``: per day, product, user and payment method.
+- ``sales_hourly_rollups``: per day and local hour, with the sale count.
+
+Analytics then read a few rows per day. Sale-level discount and tax are
+shared out among a sale's lines in proportion to their totals. ``rebuild``
+recomputes a date range from the source tables to backfill or reconcile it.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.product import Category, Product
+from app.models.sale import Sale, SaleItem
+from app.models.sales_rollup import SalesDailyRollup, SalesHourlyRollup
+from app.models.user import User
+from app.utils.timezone import local_date_to_utc_range, utc_to_local
+
+logger = logging.getLogger(__name__)
+
+_daily = SalesDailyRollup.__table__
+_hourly = SalesHourlyRollup.__table__
+
+DAILY_KEY = ("business_date", "product_id", "user_id", "payment_method")
+HOURLY_KEY = ("business_date", "hour")
+AMOUNT_COLUMNS = ("units", "revenue", "discount", "tax")
+
+# Dimensions the daily rollup can be grouped by
+GROUPINGS = ("day", "product", "category", "user", "payment_method")
+
+# Stored for sales without a payment method, so the row key has no NULLs
+UNKNOWN_METHOD = "unknown"
+
+# Rows fetched per round trip when rebuilding from the source tables
+REBUILD_FETCH_SIZE = 1000
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+# Pending changes: row key -> {column: amount to add}
+Changes = dict[tuple, dict[str, Any]]
+
+
+def _decimal(value: Any) -> Decimal:
+    """Convert an aggregate or column value to Decimal, treating None as 0."""
+    return Decimal(str(value)) if value else ZERO
+
+
+def _line_query(*conditions) -> Select:
+    """Select sale lines with what their rollup contribution needs.
+
+    ``lines_total`` is the sum of all line totals of the sale, so conditions
+    must select whole sales.
+    """
+    return (
+        select(
+            SaleItem.id,
+            SaleItem.sale_id,
+            SaleItem.product_id,
+            SaleItem.quantity,
+            SaleItem.total_price,
+            SaleItem.discount_amount,
+            func.sum(SaleItem.total_price)
+            .over(partition_by=SaleItem.sale_id)
+            .label("lines_total"),
+            Product.category_id,
+            Sale.user_id,
+            Sale.payment_method,
+            Sale.sale_date,
+            Sale.discount_amount.label("sale_discount"),
+            Sale.tax_amount,
+            Sale.is_voided,
+        )
+        .join(Sale, Sale.id == SaleItem.sale_id)
+        .join(Product, Product.id == SaleItem.product_id)
+        .where(*conditions)
+    )
+
+
+def _add(changes: Changes, key: tuple, amounts: dict[str, Any], sign: int) -> None:
+    row = changes.setdefault(key, defaultdict(int))
+    for column, amount in amounts.items():
+        row[column] += sign * amount
+
+
+def _add_line(
+    row: Any, sign: int, daily: Changes, hourly: Changes, categories: dict
+) -> None:
+    """Add (or subtract) one sale line to the pending rollup changes."""
+    local = utc_to_local(row.sale_date)
+    total = _decimal(row.total_price)
+    lines_total = _decimal(row.lines_total)
+    share = total / lines_total if lines_total else ZERO
+    sale_discount = (_decimal(row.sale_discount) * share).quantize(CENT)
+
+    amounts = {
+        "units": row.quantity,
+        "revenue": total - sale_discount,
+        "discount": _decimal(row.discount_amount) + sale_discount,
+        "tax": (_decimal(row.tax_amount) * share).quantize(CENT),
+    }
+    key = (
+        local.date(),
+        row.product_id,
+        row.user_id,
+        row.payment_method or UNKNOWN_METHOD,
+    )
+    categories.setdefault(key, row.category_id)
+    _add(daily, key, {**amounts, "sales_lines": 1}, sign)
+    _add(hourly, (local.date(), local.hour), amounts, sign)
+
+
+def _upsert_add(
+    db: Session, table, key_columns: tuple, amount_columns: tuple, rows: list[dict]
+) -> None:
+    """Insert rollup rows, or add their amounts to the existing ones.
+
+    On PostgreSQL and SQLite all rows go in one batched upsert, so the round
+    trips of a checkout do not grow with the number of products sold.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c[column] for column in key_columns],
+                set_={
+                    column: table.c[column] + stmt.excluded[column]
+                    for column in amount_columns
+                },
+            ),
+            rows,
+        )
+        return
+
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(table.insert().values(**row))
+        except IntegrityError:
+            db.execute(
+                update(table)
+                .where(*(table.c[column] == row[column] for column in key_columns))
+                .values(
+                    {column: table.c[column] + row[column] for column in amount_columns}
+                )
+            )
+
+
+class CRUDSalesRollup:
+    """CRUD operations for sales analytics rollups."""
+
+    def apply_sales(
+        self,
+        db: Session,
+        *,
+        new_item_ids: set[int],
+        changed_sales: dict[int, int],
+        counted_sales: dict[int, int],
+    ) -> None:
+        """Add flushed sale changes to the rollups.
+
+        Args:
+            db: Database session
+            new_item_ids: Sale items inserted in the flush
+            changed_sales: Sales voided (-1) or restored (+1) in the flush
+            counted_sales: Sales whose hourly sale count changes, with the
+                amount to add
+        """
+        daily: Changes = {}
+        hourly: Changes = {}
+        categories: dict[tuple, int | None] = {}
+
+        sale_ids = set(changed_sales)
+        if new_item_ids:
+            sale_ids.update(
+                db.scalars(
+                    select(SaleItem.sale_id).where(SaleItem.id.in_(new_item_ids))
+                )
+            )
+
+        if sale_ids:
+            for row in db.execute(_line_query(SaleItem.sale_id.in_(sale_ids))):
+                if row.id in new_item_ids:
+                    # Lines of voided sales are never counted
+                    sign = 0 if row.is_voided else 1
+                else:
+                    sign = changed_sales.get(row.sale_id, 0)
+                if sign:
+                    _add_line(row, sign, daily, hourly, categories)
+
+        if counted_sales:
+            for sale_id, sale_date in db.execute(
+                select(Sale.id, Sale.sale_date).where(Sale.id.in_(counted_sales))
+            ):
+                local = utc_to_local(sale_date)
+                _add(
+                    hourly,
+                    (local.date(), local.hour),
+                    {"sales_count": 1},
+                    counted_sales[sale_id],
+                )
+
+        self._store(db, daily, hourly, categories)
+
+    def compute(self, db: Session, *, start: date, end: date) -> tuple[dict, dict]:
+        """Aggregate the rollups of a date range from the source tables.
+
+        Args:
+            db: Database session
+            start: First local date
+            end: Last local date
+
+        Returns:
+            Tuple of (daily, hourly) rollup rows keyed by ``DAILY_KEY`` and
+            ``HOURLY_KEY`` values
+        """
+        utc_start, _ = local_date_to_utc_range(start)
+        _, utc_end = local_date_to_utc_range(end)
+        in_range = (
+            Sale.sale_date >= utc_start,
+            Sale.sale_date <= utc_end,
+            Sale.is_voided == False,  # noqa: E712
+        )
+
+        daily: Changes = {}
+        hourly: Changes = {}
+        categories: dict[tuple, int | None] = {}
+        lines = db.execute(
+            _line_query(*in_range).execution_options(yield_per=REBUILD_FETCH_SIZE)
+        )
+        for row in lines:
+            _add_line(row, 1, daily, hourly, categories)
+
+        sale_dates = db.scalars(
+            select(Sale.sale_date)
+            .where(*in_range)
+            .execution_options(yield_per=REBUILD_FETCH_SIZE)
+        )
+        for sale_date in sale_dates:
+            local = utc_to_local(sale_date)
+            _add(hourly, (local.date(), local.hour), {"sales_count": 1}, 1)
+
+        daily = {
+            key: {
+                "category_id": categories[key],
+                "sales_lines": row["sales_lines"],
+                **{column: row[column] for column in AMOUNT_COLUMNS},
+            }
+            for key, row in daily.items()
+        }
+        # Sales without items only have a sale count
+        hourly = {
+            key: {
+                "sales_count": row["sales_count"],
+                **{column: row[column] for column in AMOUNT_COLUMNS},
+            }
+            for key, row in hourly.items()
+        }
+        return daily, hourly
+
+    def rebuild(self, db: Session, *, start: date, end: date) -> int:
+        """Recompute the rollups of a date range and store them. Does not commit.
+
+        Args:
+            db: Database session
+            start: First local date
+            end: Last local date
+
+        Returns:
+            Number of daily rollup rows written
+        """
+        daily, hourly = self.compute(db, start=start, end=end)
+        for table in (_daily, _hourly):
+            db.execute(
+                delete(table).where(
+                    table.c.business_date >= start, table.c.business_date <= end
+                )
+            )
+
+        rows = [
+            dict(zip(DAILY_KEY, key, strict=True), **values)
+            for key, values in daily.items()
+        ]
+        if rows:
+            db.execute(_daily.insert(), rows)
+        hourly_rows = [
+            dict(zip(HOURLY_KEY, key, strict=True), **values)
+            for key, values in hourly.items()
+        ]
+        if hourly_rows:
+            db.execute(_hourly.insert(), hourly_rows)
+
+        logger.info(f"Rebuilt sales rollups from {start} to {end}: {len(rows)} rows")
+        return len(rows)
+
+    def get_stored(self, db: Session, *, start: date, end: date) -> tuple[dict, dict]:
+        """Get the stored rollups of a date range, shaped like ``compute``.
+
+        Rows emptied by voids are left out, as ``compute`` has no such rows.
+        """
+        daily = {}
+        for row in db.execute(
+            select(_daily).where(
+                _daily.c.business_date >= start,
+                _daily.c.business_date <= end,
+                _daily.c.sales_lines != 0,
+            )
+        ):
+            values = row._asdict()
+            key = tuple(values[column] for column in DAILY_KEY)
+            daily[key] = {
+                "category_id": values["category_id"],
+                "sales_lines": values["sales_lines"],
+                **{column: values[column] for column in AMOUNT_COLUMNS},
+            }
+
+        hourly = {}
+        for row in db.execute(
+            select(_hourly).where(
+                _hourly.c.business_date >= start,
+                _hourly.c.business_date <= end,
+                _hourly.c.sales_count != 0,
+            )
+        ):
+            values = row._asdict()
+            key = tuple(values[column] for column in HOURLY_KEY)
+            hourly[key] = {
+                "sales_count": values["sales_count"],
+                **{column: values[column] for column in AMOUNT_COLUMNS},
+            }
+        return daily, hourly
+
+    def totals(
+        self,
+        db: Session,
+        *,
+        start: date,
+        end: date,
+        group_by: str,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get sales totals of a date range grouped by one dimension.
+
+        Args:
+            db: Database session
+            start: First local date
+            end: Last local date
+            group_by: One of ``GROUPINGS``
+            limit: Maximum number of groups
+
+        Returns:
+            One dict per group with ``key``, ``label``, ``sales_lines``,
+            ``units``, ``revenue``, ``discount`` and ``tax``. Days are in
+            date order, other groupings by revenue, highest first.
+
+        Raises:
+            ValueError: If ``group_by`` is not a known dimension.
+        """
+        rollup = SalesDailyRollup
+        if group_by == "day":
+            key, label, joins = rollup.business_date, rollup.business_date, ()
+        elif group_by == "product":
+            key, label = rollup.product_id, Product.name
+            joins = ((Product, Product.id == rollup.product_id),)
+        elif group_by == "category":
+            key, label = rollup.category_id, Category.name
+            joins = ((Category, Category.id == rollup.category_id),)
+        elif group_by == "user":
+            key, label = rollup.user_id, User.full_name
+            joins = ((User, User.id == rollup.user_id),)
+        elif group_by == "payment_method":
+            key, label, joins = rollup.payment_method, rollup.payment_method, ()
+        else:
+            raise ValueError(f"Unknown grouping: {group_by}")
+
+        revenue = func.sum(rollup.revenue)
+        query = select(
+            key.label("key"),
+            label.label("label"),
+            func.sum(rollup.sales_lines).label("sales_lines"),
+            func.sum(rollup.units).label("units"),
+            revenue.label("revenue"),
+            func.sum(rollup.discount).label("discount"),
+            func.sum(rollup.tax).label("tax"),
+        )
+        for target, on in joins:
+            query = query.outerjoin(target, on)
+        query = (
+            query.where(rollup.business_date >= start, rollup.business_date <= end)
+            .group_by(key, label)
+            .having(func.sum(rollup.sales_lines) > 0)
+            .order_by(key if group_by == "day" else revenue.desc())
+        )
+        if limit:
+            query = query.limit(limit)
+
+        return [
+            {
+                "key": row.key,
+                "label": row.label
+                if row.label is not None
+                else ("Sin categoría" if group_by == "category" else str(row.key)),
+                "sales_lines": row.sales_lines,
+                "units": row.units,
+                "revenue": _decimal(row.revenue).quantize(CENT),
+                "discount": _decimal(row.discount).quantize(CENT),
+                "tax": _decimal(row.tax).quantize(CENT),
+            }
+            for row in db.execute(query)
+        ]
+
+    def hourly_heatmap(self, db: Session, *, start: date, end: date) -> dict:
+        """Get sales by weekday and hour of a date range.
+
+        Args:
+            db: Database session
+            start: First local date
+            end: Last local date
+
+        Returns:
+            Dict with ``sales_count`` and ``revenue`` matrices indexed by
+            weekday (0 = Monday) and hour (0-23)
+        """
+        counts = [[0] * 24 for _ in range(7)]
+        revenue = [[ZERO] * 24 for _ in range(7)]
+        for business_date, hour, sales_count, amount in db.execute(
+            select(
+                SalesHourlyRollup.business_date,
+                SalesHourlyRollup.hour,
+                SalesHourlyRollup.sales_count,
+                SalesHourlyRollup.revenue,
+            ).where(
+                SalesHourlyRollup.business_date >= start,
+                SalesHourlyRollup.business_date <= end,
+            )
+        ):
+            weekday = business_date.weekday()
+            counts[weekday][hour] += sales_count
+            revenue[weekday][hour] += _decimal(amount)
+        return {"sales_count": counts, "revenue": revenue}
+
+    def category_trend(
+        self, db: Session, *, start: date, end: date, period: str = "month"
+    ) -> list[dict[str, Any]]:
+        """Get revenue per category and period.
+
+        Args:
+            db: Database session
+            start: First local date
+            end: Last local date
+            period: "day", "week" (starting Monday) or "month"
+
+        Returns:
+            One dict per period and category with ``period`` (first day),
+            ``category_id``, ``category``, ``units`` and ``revenue``, in
+            period order
+
+        Raises:
+            ValueError: If ``period`` is unknown.
+        """
+        if period == "day":
+            period_start = lambda day: day  # noqa: E731
+        elif period == "week":
+            period_start = lambda day: day - timedelta(days=day.weekday())  # noqa: E731
+        elif period == "month":
+            period_start = lambda day: day.replace(day=1)  # noqa: E731
+        else:
+            raise ValueError(f"Unknown period: {period}")
+
+        rollup = SalesDailyRollup
+        trend: dict[tuple, dict[str, Any]] = {}
+        for business_date, category_id, name, units, revenue in db.execute(
+            select(
+                rollup.business_date,
+                rollup.category_id,
+                Category.name,
+                func.sum(rollup.units),
+                func.sum(rollup.revenue),
+            )
+            .outerjoin(Category, Category.id == rollup.category_id)
+            .where(rollup.business_date >= start, rollup.business_date <= end)
+            .group_by(rollup.business_date, rollup.category_id, Category.name)
+            .having(func.sum(rollup.sales_lines) > 0)
+        ):
+            key = (period_start(business_date), category_id)
+            entry = trend.setdefault(
+                key,
+                {
+                    "period": key[0],
+                    "category_id": category_id,
+                    "category": name or "Sin categoría",
+                    "units": 0,
+                    "revenue": ZERO,
+                },
+            )
+            entry["units"] += units or 0
+            entry["revenue"] += _decimal(revenue)
+
+        return [
+            {**entry, "revenue": entry["revenue"].quantize(CENT)}
+            for _, entry in sorted(
+                trend.items(), key=lambda item: (item[0][0], -item[1]["revenue"])
+            )
+        ]
+
+    def _store(
+        self, db: Session, daily: Changes, hourly: Changes, categories: dict
+    ) -> None:
+        """Add pending changes to the stored rollups."""
+        daily_columns = ("sales_lines", *AMOUNT_COLUMNS)
+        _upsert_add(
+            db,
+            _daily,
+            DAILY_KEY,
+            daily_columns,
+            [
+                {
+                    **dict(zip(DAILY_KEY, key, strict=True)),
+                    "category_id": categories.get(key),
+                    **{column: amounts[column] for column in daily_columns},
+                }
+                for key, amounts in daily.items()
+                if any(amounts.values())
+            ],
+        )
+
+        hourly_columns = ("sales_count", *AMOUNT_COLUMNS)
+        _upsert_add(
+            db,
+            _hourly,
+            HOURLY_KEY,
+            hourly_columns,
+            [
+                {
+                    **dict(zip(HOURLY_KEY, key, strict=True)),
+                    **{column: amounts[column] for column in hourly_columns},
+                }
+                for key, amounts in hourly.items()
+                if any(amounts.values())
+            ],
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_sales_rollups(session: Session, flush_context) -> None:
+    """Roll up sale lines created, and sales voided or restored, by a flush."""
+    new_item_ids: set[int] = set()
+    counted_sales: dict[int, int] = {}
+    changed_sales: dict[int, int] = {}
+
+    for obj in session.new:
+        if isinstance(obj, SaleItem):
+            new_item_ids.add(obj.id)
+        elif isinstance(obj, Sale) and not obj.is_voided:
+            counted_sales[obj.id] = 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, Sale) or obj in session.deleted:
+            continue
+        history = inspect(obj).attrs.is_voided.history
+        if not history.added:
+            continue
+        was_voided = bool(history.deleted[0]) if history.deleted else False
+        if bool(history.added[0]) != was_voided:
+            sign = -1 if history.added[0] else 1
+            changed_sales[obj.id] = counted_sales[obj.id] = sign
+
+    if new_item_ids or counted_sales:
+        sales_rollup_crud.apply_sales(
+            session,
+            new_item_ids=new_item_ids,
+            changed_sales=changed_sales,
+            counted_sales=counted_sales,
+        )
+
+
+sales_rollup_crud = CRUDSalesRollup()
@@ -3,10 +3,12 @@
 from datetime import timedelta
 from typing import Optional
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, or_, update
 from sqlalchemy.orm import Session, joinedload
 
 from app.crud.base import CRUDBase
+from app.crud.customer import phone_filter
+from app.crud.pagination import Page, keyset_paginate
 from app.models.repair import Repair
 from app.models.warranty import Warranty, WarrantyClaim, WarrantyStatus
 from app.schemas.warranty import (
@@ -113,8 +115,14 @@ class CRUDWarranty(CRUDBase[Warranty, WarrantyCreate, WarrantyUpdate]):
         db: Session,
         *,
         params: WarrantySearchParams,
-    ) -> tuple[list[Warranty], int]:
-        """Search warranties with filters."""
+    ) -> Page[Warranty]:
+        """Search warranties with filters, newest first.
+
+        Keyset paginated on ``(created_at, id)`` with ``params.cursor``.
+
+        Raises:
+            InvalidCursorError: If the cursor is not a warranties list cursor.
+        """
         query = (
             db.query(Warranty)
             .join(Repair, Warranty.repair_id == Repair.id)
@@ -157,13 +165,14 @@ class CRUDWarranty(CRUDBase[Warranty, WarrantyCreate, WarrantyUpdate]):
                     )
                 )
 
-        # Get total count
-        total = query.count()
-
-        # Apply pagination
-        warranties = query.offset(params.offset).limit(params.page_size).all()
-
-        return warranties, total
+        return keyset_paginate(
+            query,
+            sort_column=Warranty.created_at,
+            id_column=Warranty.id,
+            limit=params.page_size,
+            cursor=params.cursor,
+            with_total=params.include_total,
+        )
 
     def check_warranty(
         self,
@@ -185,35 +194,37 @@ class CRUDWarranty(CRUDBase[Warranty, WarrantyCreate, WarrantyUpdate]):
         elif repair_number:
             query = query.filter(Repair.repair_number == repair_number)
         elif customer_phone:
-            query = query.join(Repair.customer).filter(
-                func.replace(Repair.customer.property.mapper.class_.phone, " ", "")
-                == customer_phone.replace(" ", "")
-            )
+            phone_condition = phone_filter(db, customer_phone)
+            if phone_condition is None:
+                return []
+            query = query.join(Repair.customer).filter(phone_condition)
 
         return query.all()
 
     def update_expired_warranties(self, db: Session) -> int:
-        """Update status of expired warranties."""
+        """Update status of expired warranties.
+
+        Runs as a single ``UPDATE`` (see the maintenance scheduler).
+
+        Returns:
+            Number of warranties marked as expired.
+        """
         today = get_local_today()
 
-        expired_warranties = (
-            db.query(Warranty)
-            .filter(
-                and_(
-                    Warranty.status == WarrantyStatus.ACTIVE,
-                    Warranty.parts_expiry_date < today,
-                    Warranty.labor_expiry_date < today,
-                )
+        result = db.execute(
+            update(Warranty)
+            .where(
+                Warranty.status == WarrantyStatus.ACTIVE,
+                Warranty.parts_expiry_date < today,
+                Warranty.labor_expiry_date < today,
             )
-            .all()
+            .values(status=WarrantyStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
         )
 
-        for warranty in expired_warranties:
-            warranty.status = WarrantyStatus.EXPIRED
-
         db.commit()
 
-        return len(expired_warranties)
+        return result.rowcount
 
     def get_statistics(self, db: Session) -> dict:
         """Get warranty statistics."""
@@ -4,15 +4,20 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.core.profiling import instrument_engine
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.debug,  # Log SQL queries in debug mode
+    echo=settings.SQL_ECHO,
 )
 
+# Attribute query counts and time to the requests issuing them
+if settings.PROFILING_ENABLED:
+    instrument_engine(engine)
+
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -26,7 +31,8 @@ def get_db():
         db.close()
 
 
-# Alias for compatibility
+# Alias for compatibility. Sessions are synchronous: async handlers should
+# dispatch heavy work with app.core.concurrency.run_in_db_thread.
 get_async_session = get_db
 
 
@@ -12,6 +12,7 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.api.v1 import analytics as analytics_api
 from app.api.v1 import auth as auth_api
 from app.api.v1 import cash_closings as cash_closings_api
 from app.api.v1 import customer_accounts as customer_accounts_api
@@ -23,7 +24,9 @@ from app.api.v1 import repairs as repairs_api
 from app.api.v1 import sales as sales_api
 from app.api.v1 import temp_setup  # TEMPORARY - DELETE AFTER USE
 from app.api.v1 import warranties as warranties_api
+from app.config import settings
 from app.middleware.auth_context import AuthContextMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 
 # Import all models to ensure they're registered with SQLAlchemy
 # This prevents "NoReferencedTableError" for foreign keys
@@ -105,6 +108,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Query and latency profiling (added last so it wraps every other layer)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Static files
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
 
@@ -114,6 +121,24 @@ from app.utils.templates import create_templates
 templates = create_templates()
 
 
+@app.on_event("startup")
+async def start_maintenance_scheduler():
+    """Start the scheduled maintenance sweeps."""
+    from app.config import settings
+    from app.services.maintenance import maintenance_scheduler
+
+    if settings.MAINTENANCE_ENABLED:
+        maintenance_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_maintenance_scheduler():
+    """Stop the scheduled maintenance sweeps."""
+    from app.services.maintenance import maintenance_scheduler
+
+    await maintenance_scheduler.stop()
+
+
 # Root redirect to login
 @app.get("/")
 async def root():
@@ -144,6 +169,7 @@ app.include_router(
 app.include_router(
     expenses_api.router, prefix="/api/v1", tags=["expenses"]
 )  # Expense API endpoints
+app.include_router(analytics_api.router, prefix="/api/v1")  # Sales analytics API
 app.include_router(temp_setup.router, prefix="/api/v1")  # TEMPORARY - DELETE AFTER USE
 
 # Auth routes (HTMX)
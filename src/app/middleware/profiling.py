@@ -0,0 +1,100 @@
+"""ASGI middleware profiling the queries and latency of each request."""
+
+import time
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.profiling import (
+    PerformanceRecorder,
+    finish_profile,
+    performance_recorder,
+    start_profile,
+)
+
+# Paths not worth profiling: static assets issue no queries
+EXCLUDED_PREFIXES = ("/static/",)
+
+
+def _route_template(scope: Scope) -> str | None:
+    """Get the path template of the route that handled a request.
+
+    The router stores the matched endpoint in the (shared) scope; the route
+    owning it gives the template, so "/customers/12" and "/customers/13"
+    are recorded under "/customers/{customer_id}".
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return None
+
+    templates: dict[Any, str] | None = getattr(app.state, "route_templates", None)
+    if templates is None or endpoint not in templates:
+        templates = {}
+        for route in getattr(app, "routes", ()):
+            target = getattr(route, "endpoint", None) or getattr(route, "app", None)
+            if target is not None:
+                templates.setdefault(target, route.path)
+        app.state.route_templates = templates
+    return templates.get(endpoint)
+
+
+class ProfilingMiddleware:
+    """Record query count, database time and latency of every HTTP request.
+
+    Adds a ``Server-Timing`` header with database and application time, so
+    browser developer tools show where a page's time went.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        recorder: PerformanceRecorder | None = None,
+        server_timing: bool | None = None,
+    ):
+        """Wrap an ASGI application.
+
+        Args:
+            app: Application to profile.
+            recorder: Where finished profiles go (default:
+                ``performance_recorder``).
+            server_timing: Send ``Server-Timing`` headers (default:
+                ``settings.SERVER_TIMING_ENABLED``).
+        """
+        self.app = app
+        self.recorder = recorder or performance_recorder
+        self.server_timing = (
+            settings.SERVER_TIMING_ENABLED if server_timing is None else server_timing
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profile HTTP requests; pass anything else through."""
+        if scope["type"] != "http" or scope["path"].startswith(EXCLUDED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(
+            scope["method"], scope["path"], settings.PROFILING_SLOW_STATEMENTS
+        )
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - profile.started
+                profile.status_code = message["status"]
+                profile.response_seconds = elapsed
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (b"server-timing", profile.server_timing(elapsed).encode())
+                    )
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish_profile(token)
+            profile.total_seconds = time.perf_counter() - profile.started
+            profile.route = _route_template(scope)
+            self.recorder.record(profile)
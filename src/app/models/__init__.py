@@ -4,12 +4,16 @@ from .base import Base, BaseModel, TimestampMixin
 from .cash_closing import CashClosing
 from .customer import Customer
 from .customer_account import CustomerAccount, CustomerTransaction, TransactionType
+from .customer_balance_checkpoint import CustomerBalanceCheckpoint
+from .daily_register_totals import DailyRegisterTotals
+from .document_sequence import DocumentSequence
 from .expense import Expense, ExpenseCategory
 from .payment import Payment
 from .product import Category, Product, ProductImage, ProductSupplier
 from .repair import Repair, RepairPart, RepairPhoto, RepairStatusHistory
 from .repair_deposit import DepositStatus, PaymentMethod, RepairDeposit
 from .sale import Sale, SaleItem
+from .sales_rollup import SalesDailyRollup, SalesHourlyRollup
 from .supplier import Supplier
 from .system_config import SystemConfig
 from .user import User
@@ -23,7 +27,10 @@ __all__ = [
     "Customer",
     "CustomerAccount",
     "CustomerTransaction",
+    "CustomerBalanceCheckpoint",
     "TransactionType",
+    "DocumentSequence",
+    "DailyRegisterTotals",
     "Payment",
     "Category",
     "Product",
@@ -32,6 +39,8 @@ __all__ = [
     "Supplier",
     "Sale",
     "SaleItem",
+    "SalesDailyRollup",
+    "SalesHourlyRollup",
     "Repair",
     "RepairStatusHistory",
     "RepairPart",
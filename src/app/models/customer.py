@@ -1,9 +1,10 @@
 """Customer model for TechStore SaaS."""
 
 from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from app.models.base import BaseModel
+from app.utils.phone import normalize_phone
 
 
 class Customer(BaseModel):
@@ -13,6 +14,8 @@ class Customer(BaseModel):
         name: Customer's full name.
         phone: Primary phone number (required).
         phone_secondary: Secondary phone number (optional).
+        phone_normalized: Digits of ``phone`` used for lookups, kept in sync.
+        phone_secondary_normalized: Digits of ``phone_secondary``, kept in sync.
         email: Customer's email address (optional).
         address: Customer's physical address (optional).
         notes: Additional notes about the customer (optional).
@@ -30,6 +33,8 @@ class Customer(BaseModel):
     name = Column(String(100), nullable=False)
     phone = Column(String(20), nullable=False, index=True)
     phone_secondary = Column(String(20), nullable=True, index=True)
+    phone_normalized = Column(String(20), nullable=True, index=True)
+    phone_secondary_normalized = Column(String(20), nullable=True, index=True)
     email = Column(String(100), nullable=True, index=True)
     address = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
@@ -53,6 +58,12 @@ class Customer(BaseModel):
         Index("idx_customer_active_name", "is_active", "name"),
     )
 
+    @validates("phone", "phone_secondary")
+    def _normalize_phone(self, key: str, value: str | None) -> str | None:
+        """Keep the normalized copy of a phone in sync with every write."""
+        setattr(self, f"{key}_normalized", normalize_phone(value))
+        return value
+
     def __repr__(self):
         """String representation of Customer."""
         return f"<Customer {self.name} - {self.phone}>"
@@ -0,0 +1,47 @@
+"""Periodic snapshots of customer ledger balances."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class CustomerBalanceCheckpoint(BaseModel):
+    """Balance of a customer's ledger at the start of a month.
+
+    A checkpoint sums every ``CustomerTransaction`` of the customer dated
+    before ``as_of``, so the balance at any instant is the latest checkpoint
+    plus the few transactions after it. Checkpoints are written for months
+    that had activity; they are derived data and can always be rebuilt from
+    the ledger.
+
+    Attributes:
+        customer_id: Customer the checkpoint belongs to.
+        as_of: Start of the month (UTC); transactions before it are included.
+        balance: Ledger balance at ``as_of`` (positive = customer owes).
+        transaction_count: Number of ledger transactions before ``as_of``.
+    """
+
+    __tablename__ = "customer_balance_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    customer_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("customers.id"), nullable=False
+    )
+    as_of: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    balance: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=False)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("customer_id", "as_of", name="uq_balance_checkpoint"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<CustomerBalanceCheckpoint customer={self.customer_id} "
+            f"{self.as_of:%Y-%m}: {self.balance}>"
+        )
@@ -0,0 +1,109 @@
+"""Materialized daily totals for the cash register."""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Date, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class DailyRegisterTotals(BaseModel):
+    """Running totals of one business day, as shown in the daily summary.
+
+    Rows are kept up to date in the same transaction as the sales, payments,
+    expenses and repairs that change them, so the cash register screens read
+    a single row instead of aggregating the source tables. Column names
+    match the fields of ``DailySummary``.
+
+    Attributes:
+        business_date: Local date the totals belong to.
+        total_sales: Total of non-voided sales.
+        sales_count: Number of non-voided sales.
+        sales_cash: Amount paid in cash on cash sales.
+        sales_transfer: Amount paid by transfer on transfer sales.
+        sales_credit: Unpaid amount of sales (customer account).
+        sales_mixed: Amount paid on mixed sales.
+        sales_mixed_cash: Cash portion of mixed sales.
+        sales_mixed_transfer: Transfer portion of mixed sales.
+        sales_mixed_card: Card portion of mixed sales.
+        repairs_delivered_count: Number of repairs delivered with a final cost.
+        repairs_total: Final cost of delivered repairs.
+        total_expenses: Total expenses.
+        expenses_count: Number of expenses.
+        expenses_cash: Expenses paid in cash.
+        expenses_transfer: Expenses paid by transfer.
+        expenses_card: Expenses paid by card.
+        debt_payments_cash: Cash received on standalone debt payments.
+        debt_payments_transfer: Transfers received on standalone debt payments.
+        debt_payments_card: Card payments received on standalone debt payments.
+    """
+
+    __tablename__ = "daily_register_totals"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    business_date: Mapped[date] = mapped_column(
+        Date, nullable=False, unique=True, comment="Local business day"
+    )
+
+    total_sales: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sales_cash: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_transfer: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_credit: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_mixed: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_mixed_cash: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_mixed_transfer: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    sales_mixed_card: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+
+    repairs_delivered_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    repairs_total: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+
+    total_expenses: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    expenses_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expenses_cash: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    expenses_transfer: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    expenses_card: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+
+    debt_payments_cash: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    debt_payments_transfer: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    debt_payments_card: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<DailyRegisterTotals {self.business_date}: {self.total_sales}>"
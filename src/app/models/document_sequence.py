@@ -0,0 +1,45 @@
+"""Document sequence model for invoice, repair and receipt numbering."""
+
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class DocumentSequence(BaseModel):
+    """Counter for one family of document numbers in one period.
+
+    Each row holds the last number issued for a key (e.g. ``INV``) and a
+    period (the year, or 0 for numbers that never reset). Numbers are taken
+    by incrementing the row inside the caller's transaction, so the row lock
+    serializes concurrent allocations and a rollback returns the number.
+
+    Attributes:
+        key: Document family, e.g. 'INV', 'REP', 'PAY' or 'DEP'
+        period: Year the counter applies to, 0 for non-resetting counters
+        last_value: Last number handed out for this key and period
+    """
+
+    __tablename__ = "document_sequences"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[str] = mapped_column(
+        String(20), nullable=False, comment="Document family prefix"
+    )
+    period: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Year of the counter, 0 when it never resets",
+    )
+    last_value: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Last number issued"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("key", "period", name="uq_document_sequence_key_period"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<DocumentSequence {self.key}/{self.period}={self.last_value}>"
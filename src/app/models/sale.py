@@ -155,6 +155,7 @@ class SaleItem(BaseModel):
         product_id: ID of product sold.
         quantity: Quantity sold.
         unit_price: Price per unit at time of sale.
+        unit_cost: Product purchase price per unit at time of sale.
         discount_percentage: Discount percentage applied.
         discount_amount: Discount amount applied.
         total_price: Final price for this line item.
@@ -173,6 +174,11 @@ class SaleItem(BaseModel):
     )
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     unit_price: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
+    unit_cost: Mapped[Optional[Decimal]] = mapped_column(
+        DECIMAL(10, 2),
+        nullable=True,
+        comment="Product purchase price at time of sale",
+    )
     discount_percentage: Mapped[Decimal] = mapped_column(
         DECIMAL(5, 2), nullable=False, default=Decimal("0.00")
     )
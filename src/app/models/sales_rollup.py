@@ -0,0 +1,121 @@
+"""Pre-aggregated sales analytics."""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import (
+    DECIMAL,
+    Date,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class SalesDailyRollup(BaseModel):
+    """Sales of one product by one user and payment method on one day.
+
+    Rows are kept up to date in the same transaction as sale creation and
+    voiding, so analytics over long periods read a few rows per day instead
+    of every sale and sale item. Sale-level discount and tax are shared out
+    among the sale's lines in proportion to their totals.
+
+    Attributes:
+        business_date: Local date of the sales.
+        product_id: Product sold.
+        category_id: Category of the product when the row was created.
+        user_id: User who processed the sales.
+        payment_method: Payment method of the sales ("unknown" if unset).
+        sales_lines: Number of sale items.
+        units: Units sold.
+        revenue: Net sales before tax, after line and sale discounts.
+        discount: Line discounts plus the lines' share of sale discounts.
+        tax: The lines' share of sale tax.
+    """
+
+    __tablename__ = "sales_daily_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    business_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id"), nullable=False
+    )
+    category_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("categories.id"), nullable=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=False
+    )
+    payment_method: Mapped[str] = mapped_column(String(20), nullable=False)
+    sales_lines: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    discount: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    tax: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "business_date",
+            "product_id",
+            "user_id",
+            "payment_method",
+            name="uq_sales_daily_rollup",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<SalesDailyRollup {self.business_date} product={self.product_id}: "
+            f"{self.revenue}>"
+        )
+
+
+class SalesHourlyRollup(BaseModel):
+    """Sales totals of one local hour.
+
+    Attributes:
+        business_date: Local date.
+        hour: Local hour of the day (0-23).
+        sales_count: Number of non-voided sales.
+        units: Units sold.
+        revenue: Net sales before tax.
+        discount: Line and sale discounts.
+        tax: Sale tax.
+    """
+
+    __tablename__ = "sales_hourly_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    business_date: Mapped[date] = mapped_column(Date, nullable=False)
+    hour: Mapped[int] = mapped_column(Integer, nullable=False)
+    sales_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    discount: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+    tax: Mapped[Decimal] = mapped_column(
+        DECIMAL(12, 2), nullable=False, default=Decimal("0.00")
+    )
+
+    __table_args__ = (
+        UniqueConstraint("business_date", "hour", name="uq_sales_hourly_rollup"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<SalesHourlyRollup {self.business_date} {self.hour:02d}h>"
@@ -0,0 +1,47 @@
+"""Sales analytics schemas."""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Union
+
+from pydantic import BaseModel
+
+
+class SalesTotal(BaseModel):
+    """Sales totals of one group (day, product, category, user or method)."""
+
+    key: Optional[Union[date, int, str]] = None
+    label: str
+    sales_lines: int
+    units: int
+    revenue: Decimal
+    discount: Decimal
+    tax: Decimal
+
+
+class SalesSummary(BaseModel):
+    """Sales totals of a date range grouped by one dimension."""
+
+    start: date
+    end: date
+    group_by: str
+    groups: list[SalesTotal]
+
+
+class HourlyHeatmap(BaseModel):
+    """Sales by weekday (0 = Monday) and local hour of a date range."""
+
+    start: date
+    end: date
+    sales_count: list[list[int]]
+    revenue: list[list[Decimal]]
+
+
+class CategoryTrendPoint(BaseModel):
+    """Revenue of one category in one period."""
+
+    period: date
+    category_id: Optional[int] = None
+    category: str
+    units: int
+    revenue: Decimal
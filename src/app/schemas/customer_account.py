@@ -168,6 +168,8 @@ class AccountStatement(BaseModel):
     # Transaction summary
     transaction_count: int
     transactions: list[CustomerTransactionResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     # Current status
     current_balance: Decimal
@@ -62,8 +62,9 @@ class ProductListParams(BaseModel):
     filters: ProductFilter = Field(default_factory=ProductFilter)
     sort_by: SortField = SortField.NAME
     sort_order: SortOrder = SortOrder.ASC
-    page: int = Field(default=1, ge=1)
+    cursor: Optional[str] = None
     page_size: int = Field(default=25, ge=10, le=100)
+    include_total: bool = False
     view_mode: ViewMode = ViewMode.TABLE
 
 
@@ -131,7 +131,7 @@ class PaymentListResponse(BaseModel):
     """Schema for listing payments."""
 
     items: list[PaymentResponse]
-    total: int
-    page: int
     size: int
-    pages: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    total: int | None = None
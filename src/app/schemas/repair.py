@@ -239,13 +239,11 @@ class RepairSearchParams(BaseSchema):
     date_from: Optional[date] = None
     date_to: Optional[date] = None
     is_express: Optional[bool] = None
-    page: int = Field(default=1, ge=1)
+    cursor: Optional[str] = Field(None, description="Pagination cursor")
     page_size: int = Field(default=20, ge=1, le=100)
-
-    @property
-    def offset(self) -> int:
-        """Calculate offset for pagination."""
-        return (self.page - 1) * self.page_size
+    include_total: bool = Field(
+        default=False, description="Count all matching rows (one extra query)"
+    )
 
 
 class RepairStatistics(BaseSchema):
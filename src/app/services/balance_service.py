@@ -3,7 +3,7 @@
 from datetime import UTC
 from decimal import Decimal
 
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.crud.payment import payment_crud
@@ -159,39 +159,86 @@ class BalanceService:
     def get_customers_with_debt(
         self, db: Session, limit: int | None = None
     ) -> list[dict]:
-        """Get list of customers with outstanding debt."""
+        """Get list of customers with outstanding debt.
+
+        Balances are computed for all customers at once with grouped sums over
+        sales and payments (same rules as ``calculate_balance``), and the
+        filtering, ordering and ``limit`` run in the database, so the number
+        of queries does not grow with the number of customers.
+
+        Args:
+            db: Database session.
+            limit: Maximum number of customers to return.
+
+        Returns:
+            List of dicts with the customer, balance and formatted balance,
+            most debt first.
+        """
         from app.models.customer import Customer
+        from app.models.payment import Payment, PaymentType
 
-        # Get all customers with any sales
-        customers_with_sales = (
-            db.query(Customer)
-            .join(Sale, Customer.id == Sale.customer_id)
-            .filter(
-                Sale.is_voided.is_(False),
-                Customer.is_active.is_(True),
+        sales_totals = (
+            select(
+                Sale.customer_id.label("customer_id"),
+                func.sum(Sale.total_amount).label("total"),
             )
-            .distinct()
-            .all()
+            .where(Sale.customer_id.is_not(None), Sale.is_voided.is_(False))
+            .group_by(Sale.customer_id)
+            .subquery()
         )
 
-        customers_with_debt = []
-
-        for customer in customers_with_sales:
-            balance = self.calculate_balance(db, customer.id)
-            if balance > 0:  # Customer owes money (positive balance = debt)
-                customers_with_debt.append(
-                    {
-                        "customer": customer,
-                        "balance": balance,
-                        "formatted_balance": self.format_balance(balance),
-                    }
-                )
+        payment_totals = (
+            select(
+                Payment.customer_id.label("customer_id"),
+                func.sum(
+                    case(
+                        (
+                            Payment.payment_type
+                            == PaymentType.credit_application.value,
+                            -Payment.amount,
+                        ),
+                        (
+                            Payment.payment_type.in_(
+                                [
+                                    PaymentType.payment.value,
+                                    PaymentType.advance_payment.value,
+                                ]
+                            ),
+                            Payment.amount,
+                        ),
+                        else_=0,
+                    )
+                ).label("total"),
+            )
+            .where(Payment.voided.is_(False))
+            .group_by(Payment.customer_id)
+            .subquery()
+        )
 
-        # Sort by debt amount (most debt first - highest positive balance)
-        customers_with_debt.sort(key=lambda x: x["balance"], reverse=True)
+        balance = (
+            sales_totals.c.total - func.coalesce(payment_totals.c.total, 0)
+        ).label("balance")
 
+        query = (
+            select(Customer, balance)
+            .join(sales_totals, sales_totals.c.customer_id == Customer.id)
+            .outerjoin(payment_totals, payment_totals.c.customer_id == Customer.id)
+            .where(Customer.is_active.is_(True), balance > 0)
+            .order_by(balance.desc(), Customer.id)
+        )
         if limit:
-            customers_with_debt = customers_with_debt[:limit]
+            query = query.limit(limit)
+
+        customers_with_debt = []
+        for customer, amount in db.execute(query).all():
+            amount = Decimal(str(amount))
+            customers_with_debt.append(
+                {
+                    "customer": customer,
+                    "balance": amount,
+                    "formatted_balance": self.format_balance(amount),
+                }
+            )
 
         return customers_with_debt
 
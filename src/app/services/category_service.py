@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import db_offload
 from app.models.product import Category, Product
 from app.schemas.category import (
     CategoryCreate,
@@ -29,7 +30,8 @@ class EnhancedCategoryService:
         self.db = db
         self.max_depth = 3
 
-    async def get_category(self, category_id: int) -> Optional[Category]:
+    @db_offload
+    def get_category(self, category_id: int) -> Optional[Category]:
         """Get a single category by ID.
 
         Args:
@@ -40,9 +42,8 @@ class EnhancedCategoryService:
         """
         return self.db.query(Category).filter(Category.id == category_id).first()
 
-    async def get_categories_flat(
-        self, include_inactive: bool = False
-    ) -> list[Category]:
+    @db_offload
+    def get_categories_flat(self, include_inactive: bool = False) -> list[Category]:
         """Get all categories in a flat list ordered for display.
 
         Args:
@@ -57,9 +58,8 @@ class EnhancedCategoryService:
 
         return query.order_by(Category.full_path).all()
 
-    async def get_category_tree(
-        self, include_inactive: bool = False
-    ) -> list[CategoryNode]:
+    @db_offload
+    def get_category_tree(self, include_inactive: bool = False) -> list[CategoryNode]:
         """Get all categories organized in tree structure.
 
         Args:
@@ -301,7 +301,8 @@ class EnhancedCategoryService:
         self.db.commit()
         return True
 
-    async def get_category_stats(self) -> CategoryStats:
+    @db_offload
+    def get_category_stats(self) -> CategoryStats:
         """Get category statistics.
 
         Returns:
@@ -338,7 +339,8 @@ class EnhancedCategoryService:
             max_depth_used=max_depth,
         )
 
-    async def search_categories(
+    @db_offload
+    def search_categories(
         self, query: str, include_inactive: bool = False
     ) -> list[Category]:
         """Search categories by name or description.
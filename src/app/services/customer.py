@@ -110,6 +110,21 @@ class CustomerService:
             db, query=query, include_inactive=include_inactive, limit=limit
         )
 
+    def lookup_customers(
+        self, db: Session, term: str, limit: int = 10
+    ) -> list[Customer]:
+        """Type-ahead lookup of active customers by name or phone prefix.
+
+        Args:
+            db: Database session.
+            term: Text typed so far.
+            limit: Maximum results to return.
+
+        Returns:
+            List of matching customers.
+        """
+        return customer_crud.lookup(db, term, limit=limit)
+
     def update_customer(
         self, db: Session, customer_id: int, customer_update: CustomerUpdate
     ) -> Customer | None:
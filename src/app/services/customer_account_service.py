@@ -1,13 +1,17 @@
 """Service layer for customer account management."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import func
+from sqlalchemy import case, func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.crud.customer_account import customer_account_crud
+from app.crud.receivables_aging import receivables_aging
 from app.models.customer import Customer
 from app.models.customer_account import (
     CustomerAccount,
@@ -144,8 +148,16 @@ class CustomerAccountService:
                 customer_id=customer_id,
                 created_by_id=created_by_id,
             )
-            db.add(account)
-            db.flush()
+            try:
+                with db.begin_nested():
+                    db.add(account)
+            except IntegrityError:
+                # A concurrent request created it first
+                account = (
+                    db.query(CustomerAccount)
+                    .filter(CustomerAccount.customer_id == customer_id)
+                    .one()
+                )
 
         return account
 
@@ -255,9 +267,14 @@ class CustomerAccountService:
         # Payment will be recorded separately as a credit
         sale_amount = sale.total_amount
 
-        # Create transaction
-        balance_before = account.account_balance
-        balance_after = balance_before + sale_amount
+        balance_before, balance_after = self._post_to_account(
+            db,
+            account,
+            sale_amount,
+            updated_by_id=created_by_id,
+            increments={"total_sales": sale_amount},
+            values={"last_transaction_date": sale.sale_date},
+        )
 
         transaction = CustomerTransaction(
             customer_id=sale.customer_id,
@@ -274,20 +291,6 @@ class CustomerAccountService:
         )
 
         db.add(transaction)
-
-        # Update account
-        account.account_balance = balance_after
-        account.total_sales += sale.total_amount
-        account.last_transaction_date = transaction.transaction_date
-        account.transaction_count += 1
-        account.updated_by_id = created_by_id
-        account.updated_at = func.now()
-
-        # Update available credit (negative balance = credit available)
-        account.available_credit = (
-            abs(balance_after) if balance_after < 0 else Decimal("0.00")
-        )
-
         db.flush()
 
         logger.info(
@@ -347,17 +350,24 @@ class CustomerAccountService:
             transaction_type = TransactionType.PAYMENT
             description = f"Payment received - {payment.receipt_number}"
 
-        # Create transaction
-        balance_before = account.account_balance
-
         # For credit applications, we're using existing credit (making balance less negative/more positive)
         # For regular payments, we're reducing debt (making balance more negative/less positive)
         if payment.payment_type == "credit_application":
-            balance_after = (
-                balance_before + payment.amount
-            )  # Using credit increases balance
+            change = payment.amount  # Using credit increases balance
         else:
-            balance_after = balance_before - payment.amount  # Payments reduce debt
+            change = -payment.amount  # Payments reduce debt
+
+        balance_before, balance_after = self._post_to_account(
+            db,
+            account,
+            change,
+            updated_by_id=created_by_id,
+            increments={"total_payments": payment.amount},
+            values={
+                "last_transaction_date": payment.created_at,
+                "last_payment_date": payment.created_at,
+            },
+        )
 
         transaction = CustomerTransaction(
             customer_id=payment.customer_id,
@@ -375,22 +385,6 @@ class CustomerAccountService:
         )
 
         db.add(transaction)
-
-        # Update account
-        account.account_balance = balance_after
-        account.total_payments += payment.amount
-        account.last_transaction_date = transaction.transaction_date
-        account.last_payment_date = transaction.transaction_date
-        account.transaction_count += 1
-        account.updated_by_id = created_by_id
-        account.updated_at = func.now()
-
-        # Update available credit if payment creates credit balance
-        if balance_after < 0:
-            account.available_credit = abs(balance_after)
-        else:
-            account.available_credit = Decimal("0.00")
-
         db.flush()
 
         logger.info(
@@ -446,8 +440,9 @@ class CustomerAccountService:
             )
 
         # Create VOID_SALE transaction to reverse the debt
-        balance_before = account.account_balance
-        balance_after = balance_before - sale.total_amount  # Void reduces debt
+        balance_before, balance_after = self._post_to_account(
+            db, account, -sale.total_amount
+        )
 
         transaction = CustomerTransaction(
             customer_id=sale.customer_id,
@@ -464,18 +459,6 @@ class CustomerAccountService:
         )
 
         db.add(transaction)
-
-        # Update account
-        account.account_balance = balance_after
-        account.transaction_count += 1
-        account.updated_at = func.now()
-
-        # Update available credit if void creates credit balance
-        if balance_after < 0:
-            account.available_credit = abs(balance_after)
-        else:
-            account.available_credit = Decimal("0.00")
-
         db.flush()
 
         logger.info(
@@ -553,8 +536,15 @@ class CustomerAccountService:
 
         # Create INFORMATIONAL transaction (balance does NOT change)
         # The credit was already consumed when the SALE was recorded
-        balance_before = account.account_balance
-        balance_after = balance_before  # NO CHANGE - this is informational only
+        transaction_date = get_utc_now()
+        balance_before, balance_after = self._post_to_account(
+            db,
+            account,
+            Decimal("0.00"),
+            updated_by_id=created_by_id,
+            values={"last_transaction_date": transaction_date},
+            refresh_available_credit=False,
+        )
 
         transaction = CustomerTransaction(
             customer_id=customer_id,
@@ -567,18 +557,11 @@ class CustomerAccountService:
             reference_id=sale_id,
             description=f"Credit used for sale {sale.invoice_number}",
             notes=notes,
-            transaction_date=get_utc_now(),
+            transaction_date=transaction_date,
             created_by_id=created_by_id,
         )
 
         db.add(transaction)
-
-        # Update account metadata (but NOT the balance)
-        account.last_transaction_date = transaction.transaction_date
-        account.transaction_count += 1
-        account.updated_by_id = created_by_id
-        account.updated_at = func.now()
-
         db.flush()
 
         logger.info(
@@ -617,9 +600,14 @@ class CustomerAccountService:
         # Get or create account
         account = self.get_or_create_account(db, customer_id, created_by_id)
 
-        # Create transaction
-        balance_before = account.account_balance
-        balance_after = balance_before + amount
+        transaction_date = get_utc_now()
+        balance_before, balance_after = self._post_to_account(
+            db,
+            account,
+            amount,
+            updated_by_id=created_by_id,
+            values={"last_transaction_date": transaction_date},
+        )
 
         transaction = CustomerTransaction(
             customer_id=customer_id,
@@ -632,25 +620,11 @@ class CustomerAccountService:
             reference_id=reference_id,
             description=description,
             notes=notes,
-            transaction_date=get_utc_now(),
+            transaction_date=transaction_date,
             created_by_id=created_by_id,
         )
 
         db.add(transaction)
-
-        # Update account
-        account.account_balance = balance_after
-        account.last_transaction_date = transaction.transaction_date
-        account.transaction_count += 1
-        account.updated_by_id = created_by_id
-        account.updated_at = func.now()
-
-        # Update available credit if balance is negative
-        if balance_after < 0:
-            account.available_credit = abs(balance_after)
-        else:
-            account.available_credit = Decimal("0.00")
-
         db.flush()
 
         logger.info(
@@ -699,17 +673,28 @@ class CustomerAccountService:
         customer_id: int,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
     ) -> AccountStatement:
         """Generate account statement for customer.
 
+        Totals cover the whole period and come from one aggregate query;
+        the transactions are one keyset page of the period, in date order.
+
         Args:
             db: Database session
             customer_id: Customer ID
             start_date: Period start (default: 30 days ago)
             end_date: Period end (default: today)
+            cursor: Cursor of the transactions page (default: first page)
+            limit: Transactions per page
 
         Returns:
             Account statement
+
+        Raises:
+            ValueError: If the customer does not exist.
+            InvalidCursorError: If the cursor is invalid.
         """
         # Default date range
         if not end_date:
@@ -724,42 +709,24 @@ class CustomerAccountService:
 
         account = self.get_or_create_account(db, customer_id, 1)  # System user
 
-        # Get opening balance
-        opening_balance_query = (
-            db.query(CustomerTransaction)
-            .filter(
-                CustomerTransaction.customer_id == customer_id,
-                CustomerTransaction.transaction_date < start_date,
-            )
-            .order_by(CustomerTransaction.transaction_date.desc())
-            .first()
+        opening_balance = customer_account_crud.get_opening_balance(
+            db, customer_id=customer_id, before_date=start_date
         )
 
-        opening_balance = (
-            opening_balance_query.balance_after
-            if opening_balance_query
-            else Decimal("0.00")
-        )
-
-        # Get transactions in period
-        transactions = (
-            db.query(CustomerTransaction)
-            .filter(
-                CustomerTransaction.customer_id == customer_id,
-                CustomerTransaction.transaction_date >= start_date,
-                CustomerTransaction.transaction_date <= end_date,
-            )
-            .order_by(CustomerTransaction.transaction_date)
-            .all()
+        period = {
+            "customer_id": customer_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        totals = customer_account_crud.get_statement_totals(db, **period)
+        transaction_count, total_debits, total_credits = totals
+        page = customer_account_crud.get_statement_page(
+            db, **period, cursor=cursor, limit=limit, descending=False
         )
 
-        # Calculate totals
-        total_debits = sum(t.amount for t in transactions if t.is_debit)
-        total_credits = sum(t.amount for t in transactions if t.is_credit)
-
         # Format transactions
         transaction_list = [
-            self._format_transaction_response(db, t) for t in transactions
+            self._format_transaction_response(db, t) for t in page.items
         ]
 
         return AccountStatement(
@@ -772,28 +739,102 @@ class CustomerAccountService:
             closing_balance=account.account_balance,
             total_debits=total_debits,
             total_credits=total_credits,
-            transaction_count=len(transactions),
+            transaction_count=transaction_count,
             transactions=transaction_list,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
             current_balance=account.account_balance,
             credit_limit=account.credit_limit,
             available_credit=account.total_available_credit,
         )
 
     def get_aging_report(
-        self, db: Session, customer_id: Optional[int] = None
+        self,
+        db: Session,
+        customer_id: Optional[int] = None,
+        as_of: Optional[date] = None,
     ) -> list[AccountsReceivableAging]:
         """Generate accounts receivable aging report.
 
+        Credits are applied to each customer's charges oldest first and the
+        open remainder is aged in 30-day buckets, in a single query whose
+        result is cached for the day until the ledger changes.
+
         Args:
             db: Database session
             customer_id: Optional specific customer
+            as_of: Local date the ages are measured at (default: today)
+
+        Returns:
+            List of aging entries, largest outstanding balance first
+        """
+        balances = receivables_aging.get(db, as_of=as_of, customer_id=customer_id)
+        return [AccountsReceivableAging.model_validate(balance) for balance in balances]
+
+    def _post_to_account(
+        self,
+        db: Session,
+        account: CustomerAccount,
+        amount: Decimal,
+        *,
+        updated_by_id: Optional[int] = None,
+        increments: Optional[dict[str, Decimal]] = None,
+        values: Optional[dict] = None,
+        refresh_available_credit: bool = True,
+    ) -> tuple[Decimal, Decimal]:
+        """Atomically add an amount to an account balance.
+
+        The balance is changed with a single ``UPDATE ... RETURNING``, which
+        locks the account row until the transaction ends. Concurrent writes
+        to the same account, typically the walk-in customer, queue on that
+        lock instead of overwriting each other, and each ledger entry sees
+        the balance left by the previous one.
+
+        Args:
+            db: Database session
+            account: Account to update, kept in sync with the new values
+            amount: Signed change to the balance (+ = more debt)
+            updated_by_id: User making the change
+            increments: Running totals to increase, e.g. {"total_sales": x}
+            values: Columns to set as-is, e.g. {"last_transaction_date": d}
+            refresh_available_credit: Recompute available credit from the
+                new balance
 
         Returns:
-            List of aging entries
+            Tuple of (balance_before, balance_after)
         """
-        # This would need to be implemented based on unpaid sales
-        # For now, returning empty list
-        return []
+        table = CustomerAccount.__table__
+        new_balance = table.c.account_balance + amount
+
+        assignments = {
+            "account_balance": new_balance,
+            "transaction_count": table.c.transaction_count + 1,
+            "updated_at": func.now(),
+        }
+        if refresh_available_credit:
+            # Negative balance = credit available
+            assignments["available_credit"] = case(
+                (new_balance < 0, -new_balance), else_=Decimal("0.00")
+            )
+        for column, increment in (increments or {}).items():
+            assignments[column] = table.c[column] + increment
+        if updated_by_id is not None:
+            assignments["updated_by_id"] = updated_by_id
+        assignments.update(values or {})
+
+        stmt = (
+            update(table)
+            .where(table.c.id == account.id)
+            .values(assignments)
+            .returning(*(table.c[column] for column in assignments))
+        )
+        row = db.execute(stmt).one()
+
+        for column, value in zip(assignments, row, strict=True):
+            set_committed_value(account, column, value)
+
+        balance_after = row.account_balance
+        return balance_after - amount, balance_after
 
     def _format_account_response(
         self, db: Session, account: CustomerAccount
@@ -1,12 +1,16 @@
 """Dashboard service for aggregating business statistics and alerts."""
 
 import logging
+import threading
+import time
 from decimal import Decimal
+from typing import Optional
 
-from sqlalchemy import func
+from sqlalchemy import Select, event, func, select
 from sqlalchemy.orm import Session
 
-from app.models.customer_account import CustomerAccount
+from app.config import settings
+from app.models.customer_account import CustomerAccount, CustomerTransaction
 from app.models.product import Product
 from app.models.repair import Repair
 from app.models.sale import Sale
@@ -21,6 +25,13 @@ REPAIRS_RECEIVED_ALERT_THRESHOLD = 5  # Alert if repairs received > this value
 LOW_STOCK_ALERT_THRESHOLD = 30  # Alert if low stock products > this value
 CUSTOMER_DEBT_ALERT_THRESHOLD = Decimal("1500000")  # Alert if total debt > this value
 
+# Writes to these models change the statistics and drop the cached result.
+# Balance updates run as plain UPDATEs, so customer debt changes are seen
+# through the ledger transaction recorded with them.
+_INVALIDATING_MODELS = (Sale, Repair, Product, CustomerAccount, CustomerTransaction)
+
+_INVALIDATE_KEY = "dashboard_stats_invalidate"
+
 
 class DashboardService:
     """Service for retrieving dashboard statistics and alerts.
@@ -30,8 +41,18 @@ class DashboardService:
     - Inventory alerts (low stock, out of stock)
     - Customer debt totals
     - Daily sales totals
+
+    All metrics are loaded in a single round trip and reused for
+    ``DASHBOARD_CACHE_TTL_SECONDS``, so dashboards polling with HTMX do not
+    query the database on every refresh.
     """
 
+    def __init__(self):
+        """Initialize the service with an empty statistics cache."""
+        self._cached_stats: Optional[dict] = None
+        self._cached_until = 0.0
+        self._lock = threading.Lock()
+
     def get_dashboard_stats(self, db: Session) -> dict:
         """Get all dashboard statistics and alerts.
 
@@ -49,13 +70,33 @@ class DashboardService:
             - debt_alert: True if total > 5000
             - today_sales_total: Sum of today's non-voided sales
         """
+        started = time.perf_counter()
+        with self._lock:
+            if self._cached_stats is not None and time.monotonic() < self._cached_until:
+                stats = dict(self._cached_stats)
+                logger.debug(
+                    f"Dashboard stats served from cache in "
+                    f"{(time.perf_counter() - started) * 1000:.1f} ms"
+                )
+                return stats
+
         logger.info("Fetching dashboard statistics")
 
-        repairs_received = self._count_repairs_received(db)
-        low_stock_count = self._count_low_stock_products(db)
-        out_of_stock_count = self._count_out_of_stock_products(db)
-        customer_debt_total = self._sum_customer_debt(db)
-        today_sales_total = self._get_today_sales_total(db)
+        row = db.execute(
+            select(
+                self._repairs_received_query().scalar_subquery().label("repairs"),
+                self._low_stock_query().scalar_subquery().label("low_stock"),
+                self._out_of_stock_query().scalar_subquery().label("out_of_stock"),
+                self._customer_debt_query().scalar_subquery().label("debt"),
+                self._today_sales_query().scalar_subquery().label("today_sales"),
+            )
+        ).one()
+
+        repairs_received = row.repairs or 0
+        low_stock_count = row.low_stock or 0
+        out_of_stock_count = row.out_of_stock or 0
+        customer_debt_total = row.debt or Decimal("0.00")
+        today_sales_total = row.today_sales or Decimal("0.00")
 
         stats = {
             "repairs_received": repairs_received,
@@ -69,14 +110,24 @@ class DashboardService:
             "today_sales_total": today_sales_total,
         }
 
+        with self._lock:
+            self._cached_stats = dict(stats)
+            self._cached_until = time.monotonic() + settings.DASHBOARD_CACHE_TTL_SECONDS
+
         logger.info(
             f"Dashboard stats: repairs_received={repairs_received}, "
             f"low_stock={low_stock_count}, out_of_stock={out_of_stock_count}, "
-            f"debt=${customer_debt_total}, today_sales=${today_sales_total}"
+            f"debt=${customer_debt_total}, today_sales=${today_sales_total} "
+            f"({(time.perf_counter() - started) * 1000:.1f} ms)"
         )
 
         return stats
 
+    def invalidate(self) -> None:
+        """Drop the cached statistics so the next load queries the database."""
+        with self._lock:
+            self._cached_stats = None
+
     def _count_repairs_received(self, db: Session) -> int:
         """Count repairs with status='received'.
 
@@ -86,63 +137,33 @@ class DashboardService:
         Returns:
             Count of repairs in received status.
         """
-        count = (
-            db.query(func.count(Repair.id)).filter(Repair.status == "received").scalar()
-        )
+        count = db.execute(self._repairs_received_query()).scalar()
         logger.debug(f"Repairs in received status: {count}")
         return count or 0
 
     def _count_low_stock_products(self, db: Session) -> int:
         """Count products with low stock levels.
 
-        Criteria:
-        - current_stock <= minimum_stock
-        - current_stock > 0 (not completely out of stock)
-        - is_active = True
-        - is_service = False (only physical products)
-
         Args:
             db: Database session.
 
         Returns:
             Count of products with low stock.
         """
-        count = (
-            db.query(func.count(Product.id))
-            .filter(
-                Product.current_stock <= Product.minimum_stock,
-                Product.current_stock > 0,
-                Product.is_active == True,  # noqa: E712
-                Product.is_service == False,  # noqa: E712
-            )
-            .scalar()
-        )
+        count = db.execute(self._low_stock_query()).scalar()
         logger.debug(f"Products with low stock: {count}")
         return count or 0
 
     def _count_out_of_stock_products(self, db: Session) -> int:
         """Count products that are completely out of stock.
 
-        Criteria:
-        - current_stock = 0
-        - is_active = True
-        - is_service = False (only physical products)
-
         Args:
             db: Database session.
 
         Returns:
             Count of products out of stock.
         """
-        count = (
-            db.query(func.count(Product.id))
-            .filter(
-                Product.current_stock == 0,
-                Product.is_active == True,  # noqa: E712
-                Product.is_service == False,  # noqa: E712
-            )
-            .scalar()
-        )
+        count = db.execute(self._out_of_stock_query()).scalar()
         logger.debug(f"Products out of stock: {count}")
         return count or 0
 
@@ -155,11 +176,7 @@ class DashboardService:
         Returns:
             Total customer debt amount.
         """
-        total = (
-            db.query(func.sum(CustomerAccount.account_balance))
-            .filter(CustomerAccount.account_balance > 0)
-            .scalar()
-        )
+        total = db.execute(self._customer_debt_query()).scalar()
         result = total or Decimal("0.00")
         logger.debug(f"Total customer debt: ${result}")
         return result
@@ -167,29 +184,85 @@ class DashboardService:
     def _get_today_sales_total(self, db: Session) -> Decimal:
         """Sum of total_amount from today's non-voided sales.
 
-        Uses local timezone to determine "today" and converts to UTC range
-        for correct database comparison.
-
         Args:
             db: Database session.
 
         Returns:
             Total sales amount for today.
         """
-        today = get_local_today()
-        utc_start, utc_end = local_date_to_utc_range(today)
-        total = (
-            db.query(func.sum(Sale.total_amount))
-            .filter(
-                Sale.sale_date >= utc_start,
-                Sale.sale_date <= utc_end,
-                Sale.is_voided == False,  # noqa: E712
-            )
-            .scalar()
-        )
+        total = db.execute(self._today_sales_query()).scalar()
         result = total or Decimal("0.00")
-        logger.debug(f"Today's sales total ({today}): ${result}")
+        logger.debug(f"Today's sales total: ${result}")
         return result
 
+    def _repairs_received_query(self) -> Select:
+        """Count repairs with status='received'."""
+        return select(func.count(Repair.id)).where(Repair.status == "received")
+
+    def _low_stock_query(self) -> Select:
+        """Count products with low stock levels.
+
+        Criteria:
+        - current_stock <= minimum_stock
+        - current_stock > 0 (not completely out of stock)
+        - is_active = True
+        - is_service = False (only physical products)
+        """
+        return select(func.count(Product.id)).where(
+            Product.current_stock <= Product.minimum_stock,
+            Product.current_stock > 0,
+            Product.is_active == True,  # noqa: E712
+            Product.is_service == False,  # noqa: E712
+        )
+
+    def _out_of_stock_query(self) -> Select:
+        """Count products that are completely out of stock.
+
+        Criteria:
+        - current_stock = 0
+        - is_active = True
+        - is_service = False (only physical products)
+        """
+        return select(func.count(Product.id)).where(
+            Product.current_stock == 0,
+            Product.is_active == True,  # noqa: E712
+            Product.is_service == False,  # noqa: E712
+        )
+
+    def _customer_debt_query(self) -> Select:
+        """Sum all positive customer account balances."""
+        return select(func.sum(CustomerAccount.account_balance)).where(
+            CustomerAccount.account_balance > 0
+        )
+
+    def _today_sales_query(self) -> Select:
+        """Sum of total_amount from today's non-voided sales.
+
+        Uses local timezone to determine "today" and converts to UTC range
+        for correct database comparison.
+        """
+        utc_start, utc_end = local_date_to_utc_range(get_local_today())
+        return select(func.sum(Sale.total_amount)).where(
+            Sale.sale_date >= utc_start,
+            Sale.sale_date <= utc_end,
+            Sale.is_voided == False,  # noqa: E712
+        )
+
 
 dashboard_service = DashboardService()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dashboard_writes(session: Session, flush_context) -> None:
+    """Remember that this transaction changed data shown on the dashboard."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _INVALIDATING_MODELS):
+            session.info[_INVALIDATE_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dashboard_stats(session: Session) -> None:
+    """Drop cached statistics once the changes are visible to other sessions."""
+    if session.info.pop(_INVALIDATE_KEY, False):
+        dashboard_service.invalidate()
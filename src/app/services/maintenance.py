@@ -0,0 +1,389 @@
+"""Scheduled maintenance sweeps.
+
+Locking old expenses, expiring warranties and adding ledger balance
+checkpoints are housekeeping that used to run inside request handlers or
+only when someone called them by hand. ``MaintenanceScheduler`` runs them
+periodically on the application's event loop, each as set-based SQL in the
+database thread pool, and keeps a bounded history of runs with their
+durations for the admin panel. Schedules live in memory, so every task runs
+on the first poll after startup; otherwise a restart would postpone a daily
+sweep by another day, and frequent deploys would keep it from ever running.
+The sweeps are idempotent, so the extra runs only repeat a cheap no-op.
+
+With several application processes only one runs the sweeps: on PostgreSQL
+the scheduler that holds a session-level advisory lock is the leader and
+the others keep polling in case it goes away. Other databases are used by
+a single process, which is always the leader.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.concurrency import run_in_db_thread
+from app.crud import warranty as warranty_crud
+from app.crud.customer_balance_checkpoint import customer_balance_checkpoint_crud
+from app.crud.expense import expense as expense_crud
+from app.utils.timezone import get_utc_now
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock key shared by every process of this application
+MAINTENANCE_LOCK_KEY = 7_301_550_112
+
+
+@dataclass
+class MaintenanceRun:
+    """One execution of a maintenance task.
+
+    Attributes:
+        task: Name of the task.
+        started_at: When the run started (UTC).
+        duration_seconds: Wall-clock duration.
+        rows: Rows the task changed, or None if it failed.
+        error: Error message if the task failed.
+        triggered_by: "schedule" or the email of the admin who ran it.
+    """
+
+    task: str
+    started_at: datetime
+    duration_seconds: float
+    rows: int | None = None
+    error: str | None = None
+    triggered_by: str = "schedule"
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the run completed without error."""
+        return self.error is None
+
+
+@dataclass
+class MaintenanceTask:
+    """A periodic maintenance sweep and its running totals.
+
+    Attributes:
+        name: Unique task name.
+        description: What the task does, shown in the admin panel.
+        interval_seconds: Seconds between scheduled runs.
+        run: Callable doing the work on a session; returns rows changed.
+        runs: Completed and failed runs since startup.
+        failures: Failed runs since startup.
+        total_seconds: Summed duration of every run.
+        max_seconds: Longest run.
+        last_run: Most recent run.
+        next_due: Monotonic time of the next scheduled run.
+    """
+
+    name: str
+    description: str
+    interval_seconds: float
+    run: Callable[[Session], int]
+    runs: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_run: MaintenanceRun | None = None
+    next_due: float = field(default_factory=time.monotonic)
+
+    @property
+    def average_seconds(self) -> float | None:
+        """Mean run duration, or None before the first run."""
+        return self.total_seconds / self.runs if self.runs else None
+
+
+class MaintenanceScheduler:
+    """Run registered maintenance tasks on the event loop at fixed intervals."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        poll_seconds: float = 60,
+        history_size: int = 200,
+    ):
+        """Initialize a scheduler with no tasks.
+
+        Args:
+            session_factory: Callable returning a new database session
+                (default: ``app.database.SessionLocal``).
+            poll_seconds: Seconds between checks for due tasks.
+            history_size: Most recent runs kept in ``history``.
+        """
+        self._session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._tasks: dict[str, MaintenanceTask] = {}
+        self._history: deque[MaintenanceRun] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._loop_task: asyncio.Task | None = None
+        self._lock_connection: Connection | None = None
+        self._is_leader = False
+
+    @property
+    def tasks(self) -> list[MaintenanceTask]:
+        """Registered tasks in registration order."""
+        return list(self._tasks.values())
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process currently runs the scheduled tasks."""
+        return self._is_leader
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the scheduling loop is active."""
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def register(
+        self,
+        name: str,
+        description: str,
+        interval_seconds: float,
+        run: Callable[[Session], int],
+    ) -> MaintenanceTask:
+        """Add a task, first due on the scheduler's next poll.
+
+        Args:
+            name: Unique task name.
+            description: What the task does.
+            interval_seconds: Seconds between scheduled runs.
+            run: Callable doing the work on a session; returns rows changed.
+                Whatever it leaves uncommitted is committed after it returns.
+
+        Returns:
+            The registered task.
+
+        Raises:
+            ValueError: If a task with the same name exists.
+        """
+        if name in self._tasks:
+            raise ValueError(f"Maintenance task already registered: {name}")
+        task = MaintenanceTask(
+            name=name,
+            description=description,
+            interval_seconds=interval_seconds,
+            run=run,
+        )
+        self._tasks[name] = task
+        return task
+
+    def get_task(self, name: str) -> MaintenanceTask | None:
+        """Get a task by name, or None if unknown."""
+        return self._tasks.get(name)
+
+    def history(self, task: str | None = None) -> list[MaintenanceRun]:
+        """Get recent runs, newest first.
+
+        Args:
+            task: Only runs of this task (default: all).
+
+        Returns:
+            Runs still kept in the bounded history.
+        """
+        with self._lock:
+            runs = list(self._history)
+        runs.reverse()
+        if task is not None:
+            runs = [run for run in runs if run.task == task]
+        return runs
+
+    def run_task(self, name: str, triggered_by: str = "schedule") -> MaintenanceRun:
+        """Run a task now on a new session and record the run.
+
+        Blocking; call through ``run_in_db_thread`` from async code. Errors
+        are logged and recorded, not raised.
+
+        Args:
+            name: Task name.
+            triggered_by: "schedule" or the email of the admin running it.
+
+        Returns:
+            The recorded run.
+
+        Raises:
+            KeyError: If the task is unknown.
+        """
+        task = self._tasks[name]
+        started_at = get_utc_now()
+        started = time.perf_counter()
+        rows, error = None, None
+
+        db = self._new_session()
+        try:
+            rows = task.run(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Maintenance task {name} failed: {e}")
+            error = str(e)
+        finally:
+            db.close()
+
+        run = MaintenanceRun(
+            task=name,
+            started_at=started_at,
+            duration_seconds=time.perf_counter() - started,
+            rows=rows,
+            error=error,
+            triggered_by=triggered_by,
+        )
+        with self._lock:
+            task.runs += 1
+            task.failures += 0 if run.succeeded else 1
+            task.total_seconds += run.duration_seconds
+            task.max_seconds = max(task.max_seconds, run.duration_seconds)
+            task.last_run = run
+            task.next_due = time.monotonic() + task.interval_seconds
+            self._history.append(run)
+
+        if run.succeeded:
+            logger.info(
+                f"Maintenance task {name} updated {rows} row(s) in "
+                f"{run.duration_seconds:.2f} s"
+            )
+        return run
+
+    async def run_due(self) -> list[MaintenanceRun]:
+        """Run every task whose interval has elapsed, one after another.
+
+        Returns:
+            The runs made; empty when this process is not the leader.
+        """
+        if not await run_in_db_thread(self._ensure_leadership):
+            return []
+
+        now = time.monotonic()
+        runs = []
+        for task in self.tasks:
+            if task.next_due <= now:
+                runs.append(await run_in_db_thread(self.run_task, task.name))
+        return runs
+
+    def start(self) -> None:
+        """Start the scheduling loop on the running event loop."""
+        if self.is_running:
+            return
+        self._loop_task = asyncio.get_running_loop().create_task(self._run_forever())
+        logger.info(f"Maintenance scheduler started with {len(self._tasks)} task(s)")
+
+    async def stop(self) -> None:
+        """Stop the scheduling loop and give up leadership."""
+        loop_task, self._loop_task = self._loop_task, None
+        if loop_task is not None:
+            loop_task.cancel()
+            try:
+                await loop_task
+            except asyncio.CancelledError:
+                pass
+        await run_in_db_thread(self._release_leadership)
+
+    async def _run_forever(self) -> None:
+        """Check for due tasks every ``poll_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.run_due()
+            except Exception as e:
+                # Keep scheduling; the next poll retries leadership and tasks
+                logger.error(f"Maintenance scheduler error: {e}")
+
+    def _ensure_leadership(self) -> bool:
+        """Keep or try to take the advisory lock electing the leader."""
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.execute(text("SELECT 1"))
+                # Don't leave the connection idle in a transaction, where
+                # idle_in_transaction_session_timeout would close it
+                self._lock_connection.commit()
+                return True
+            except Exception as e:
+                # The lock went away with its connection
+                logger.warning(f"Maintenance scheduler lost leadership: {e}")
+                self._release_leadership()
+
+        db = self._new_session()
+        try:
+            bind = db.get_bind()
+            if bind.dialect.name != "postgresql":
+                self._is_leader = True
+                return True
+
+            connection = bind.connect()
+            acquired = connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": MAINTENANCE_LOCK_KEY},
+            )
+            # End the transaction; the lock belongs to the connection
+            connection.commit()
+            if not acquired:
+                connection.close()
+                return False
+
+            self._lock_connection = connection
+            self._is_leader = True
+            logger.info("Maintenance scheduler is the leader")
+            return True
+        finally:
+            db.close()
+
+    def _release_leadership(self) -> None:
+        """Close the connection holding the advisory lock, if any."""
+        connection, self._lock_connection = self._lock_connection, None
+        self._is_leader = False
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+            )
+            connection.commit()
+        except Exception:
+            # A dead connection has released the lock already
+            pass
+        finally:
+            connection.close()
+
+    def _new_session(self) -> Session:
+        """Open a database session for one task run."""
+        if self._session_factory is None:
+            from app.database import SessionLocal
+
+            return SessionLocal()
+        return self._session_factory()
+
+
+def _extend_balance_checkpoints(db: Session) -> int:
+    """Add ledger balance checkpoints for months closed since the last run."""
+    return customer_balance_checkpoint_crud.extend(db)
+
+
+maintenance_scheduler = MaintenanceScheduler(
+    poll_seconds=settings.MAINTENANCE_POLL_SECONDS,
+    history_size=settings.MAINTENANCE_HISTORY_SIZE,
+)
+maintenance_scheduler.register(
+    "expense-editability",
+    "Bloquea la edición de gastos de días anteriores",
+    interval_seconds=60 * 60,
+    run=expense_crud.update_editability_status,
+)
+maintenance_scheduler.register(
+    "expired-warranties",
+    "Marca como vencidas las garantías con cobertura expirada",
+    interval_seconds=6 * 60 * 60,
+    run=warranty_crud.warranty.update_expired_warranties,
+)
+maintenance_scheduler.register(
+    "balance-checkpoints",
+    "Agrega checkpoints de saldo de clientes para los meses cerrados",
+    interval_seconds=24 * 60 * 60,
+    run=_extend_balance_checkpoints,
+)
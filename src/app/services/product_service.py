@@ -3,10 +3,13 @@
 import logging
 from typing import Optional
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.concurrency import db_offload
+from app.crud.pagination import Page, keyset_paginate
+from app.crud.product_search import SEARCH_COLUMNS, search_condition
 from app.models.product import Category, Product, ProductImage, ProductSupplier
 from app.models.supplier import Supplier
 from app.schemas.filters import (
@@ -83,7 +86,8 @@ class CategoryService:
         logger.info(f"Successfully created category: {category.id}")
         return category
 
-    async def get_categories(
+    @db_offload
+    def get_categories(
         self, is_active: Optional[bool] = None, parent_id: Optional[int] = None
     ) -> list[Category]:
         """Get all categories with optional filters.
@@ -105,7 +109,8 @@ class CategoryService:
 
         return query.order_by(Category.name).all()
 
-    async def get_category(self, category_id: int) -> Optional[Category]:
+    @db_offload
+    def get_category(self, category_id: int) -> Optional[Category]:
         """Get a category by ID.
 
         Args:
@@ -262,7 +267,8 @@ class ProductService:
             logger.error(f"Database error creating product: {str(e)}")
             raise ValueError("Database constraint violation") from e
 
-    async def get_products(
+    @db_offload
+    def get_products(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -295,16 +301,12 @@ class ProductService:
             query = query.filter(Product.category_id == category_id)
 
         if search:
-            search_filter = or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%"),
-                Product.barcode.ilike(f"%{search}%"),
-            )
-            query = query.filter(search_filter)
+            query = query.filter(search_condition(search))
 
         return query.offset(skip).limit(limit).all()
 
-    async def get_product(self, product_id: int) -> Optional[Product]:
+    @db_offload
+    def get_product(self, product_id: int) -> Optional[Product]:
         """Get a product by ID.
 
         Args:
@@ -324,7 +326,8 @@ class ProductService:
             .first()
         )
 
-    async def get_product_by_sku(self, sku: str) -> Optional[Product]:
+    @db_offload
+    def get_product_by_sku(self, sku: str) -> Optional[Product]:
         """Get a product by SKU.
 
         Args:
@@ -448,7 +451,8 @@ class ProductService:
         logger.info(f"Updated stock for product {product_id}: {product.current_stock}")
         return product
 
-    async def count_products(
+    @db_offload
+    def count_products(
         self,
         is_active: Optional[bool] = None,
         category_id: Optional[int] = None,
@@ -473,25 +477,26 @@ class ProductService:
             query = query.filter(Product.category_id == category_id)
 
         if search:
-            search_filter = or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%"),
-                Product.barcode.ilike(f"%{search}%"),
-            )
-            query = query.filter(search_filter)
+            query = query.filter(search_condition(search))
 
         return query.scalar() or 0
 
-    async def get_product_list(
-        self, params: ProductListParams
-    ) -> tuple[list[ProductListItem], int]:
-        """Get paginated product list with advanced filters.
+    @db_offload
+    def get_product_list(self, params: ProductListParams) -> Page[ProductListItem]:
+        """Get a page of the product list with advanced filters.
+
+        Pages are keyset paginated on the sort column and product ID, so
+        every page costs the same; the total is only counted when
+        ``params.include_total`` is set.
 
         Args:
             params: Product list parameters including filters, sorting, and pagination.
 
         Returns:
-            Tuple of product items and total count.
+            Page of product items.
+
+        Raises:
+            InvalidCursorError: If ``params.cursor`` is not valid for the sort.
         """
         logger.info(f"Fetching product list with params: {params}")
 
@@ -512,22 +517,21 @@ class ProductService:
         # Apply filters
         query = self._apply_filters(query, params.filters)
 
-        # Get total count before pagination
-        total = query.count()
-
-        # Apply sorting
-        query = self._apply_sorting(query, params.sort_by, params.sort_order)
-
-        # Apply pagination
-        offset = (params.page - 1) * params.page_size
-        query = query.offset(offset).limit(params.page_size)
-
-        # Execute query
-        products = query.all()
+        # Apply sorting and pagination
+        query, sort_column = self._apply_sorting(query, params.sort_by)
+        page = keyset_paginate(
+            query,
+            sort_column=sort_column,
+            id_column=Product.id,
+            limit=params.page_size,
+            cursor=params.cursor,
+            descending=params.sort_order == SortOrder.DESC,
+            with_total=params.include_total,
+        )
 
         # Convert to list items
         items = []
-        for product in products:
+        for product in page.items:
             # Calculate stock status
             stock_status = self._calculate_stock_status(product)
 
@@ -586,8 +590,9 @@ class ProductService:
             )
             items.append(item)
 
-        logger.info(f"Found {total} products, returning page {params.page}")
-        return items, total
+        logger.info(f"Returning {len(items)} products")
+        page.items = items
+        return page
 
     def _apply_filters(self, query, filters: ProductFilter):
         """Apply filters to product query.
@@ -601,14 +606,10 @@ class ProductService:
         """
         # Text search
         if filters.search:
-            search_term = f"%{filters.search}%"
             query = query.filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.sku.ilike(search_term),
-                    Product.barcode.ilike(search_term),
-                    Product.brand.ilike(search_term),
-                    Product.model.ilike(search_term),
+                search_condition(
+                    filters.search,
+                    (*SEARCH_COLUMNS, Product.brand, Product.model),
                 )
             )
 
@@ -653,16 +654,16 @@ class ProductService:
 
         return query
 
-    def _apply_sorting(self, query, sort_by: SortField, order: SortOrder):
-        """Apply sorting to product query.
+    def _apply_sorting(self, query, sort_by: SortField):
+        """Get the column a product query is sorted by.
 
         Args:
             query: SQLAlchemy query object.
             sort_by: Field to sort by.
-            order: Sort order (ASC or DESC).
 
         Returns:
-            Sorted query.
+            Tuple of the query (joined with categories when sorting by
+            category) and the sort column.
         """
         # Map sort fields to model attributes
         sort_mapping = {
@@ -680,10 +681,7 @@ class ProductService:
         else:
             sort_column = sort_mapping.get(sort_by, Product.name)
 
-        if order == SortOrder.DESC:
-            return query.order_by(sort_column.desc())
-        else:
-            return query.order_by(sort_column.asc())
+        return query, sort_column
 
     def _calculate_stock_status(self, product: Product) -> str:
         """Calculate stock status for a product.
@@ -706,7 +704,8 @@ class ProductService:
         else:
             return "normal"
 
-    async def get_filter_options(self) -> dict:
+    @db_offload
+    def get_filter_options(self) -> dict:
         """Get available filter options.
 
         Returns:
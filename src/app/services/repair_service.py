@@ -7,6 +7,7 @@ from typing import Any, Optional
 from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
+from app.crud.pagination import Page
 from app.crud.repair import repair_crud
 from app.models.repair import Repair, RepairPart, RepairPhoto
 from app.models.repair_deposit import DepositStatus, RepairDeposit
@@ -77,7 +78,7 @@ class RepairService:
 
     def search_repairs(
         self, db: Session, params: RepairSearchParams
-    ) -> tuple[list[RepairListResponse], int]:
+    ) -> Page[RepairListResponse]:
         """Search repairs with filters.
 
         Args:
@@ -85,9 +86,12 @@ class RepairService:
             params: Search parameters.
 
         Returns:
-            Tuple of (repairs list, total count).
+            Page of repairs; the total is set when ``params.include_total``.
+
+        Raises:
+            InvalidCursorError: If ``params.cursor`` is invalid.
         """
-        repairs, total = repair_crud.search_repairs(db, params=params)
+        page = repair_crud.search_repairs(db, params=params)
 
         # Format list response
         repair_list = [
@@ -106,10 +110,11 @@ class RepairService:
                     repair.technician.full_name if repair.technician else None
                 ),
             )
-            for repair in repairs
+            for repair in page.items
         ]
 
-        return repair_list, total
+        page.items = repair_list
+        return page
 
     def update_repair(
         self, db: Session, repair_id: int, repair_data: RepairUpdate
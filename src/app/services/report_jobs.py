@@ -0,0 +1,311 @@
+"""Background generation of PDF reports.
+
+Reports used to be built inside the request that asked for them, holding a
+database session, a worker thread and the whole PDF in memory until the
+download finished. Report jobs run on a small in-process worker pool with
+their own sessions, write the PDF to disk and keep it for
+``REPORT_ARTIFACT_TTL_SECONDS`` so repeated downloads reuse the same file.
+Jobs being downloaded are pinned, so their file outlives the TTL until the
+response has been sent.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.report_service import report_service
+
+logger = logging.getLogger(__name__)
+
+# Report name -> download filename (formatted with the report parameters)
+REPORT_KINDS = {
+    "low-stock": "inventario_bajo_stock_{timestamp}.pdf",
+    "accounts-receivable": "cuentas_por_cobrar_{timestamp}.pdf",
+    "repairs-monthly": "reparaciones_{year}_{month:02d}.pdf",
+    "financial-monthly": "informe_financiero_{year}_{month:02d}.pdf",
+}
+
+
+class ReportJobStatus(str, Enum):
+    """Lifecycle of a report job."""
+
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+@dataclass
+class ReportJob:
+    """A requested report and, once generated, where its PDF is stored.
+
+    Attributes:
+        id: Job identifier used in status and download URLs.
+        kind: Report name, one of ``REPORT_KINDS``.
+        params: Report parameters (``year`` and ``month`` for monthly reports).
+        filename: Suggested download filename.
+        status: Current job status.
+        created_at: Wall-clock time the job was submitted.
+        finished_at: Monotonic time the job completed or failed.
+        path: PDF file path once completed.
+        error: Error message if the job failed.
+        pins: Downloads in progress; a pinned job is not evicted.
+    """
+
+    id: str
+    kind: str
+    params: dict
+    filename: str
+    status: ReportJobStatus = ReportJobStatus.pending
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    path: str | None = None
+    error: str | None = None
+    pins: int = 0
+
+    def to_dict(self) -> dict:
+        """Serialize the job for the status endpoint."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "filename": self.filename,
+            "status": self.status.value,
+            "error": self.error,
+        }
+
+
+class ReportJobQueue:
+    """In-process queue running report jobs on a bounded worker pool.
+
+    Submitting a report that is already queued, running or freshly generated
+    with the same parameters returns the existing job instead of building
+    the PDF again.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        max_workers: int = 2,
+        artifact_ttl_seconds: float = 300,
+        artifact_dir: str | None = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            session_factory: Callable returning a new database session
+                (default: ``app.database.SessionLocal``).
+            max_workers: Reports generated at the same time.
+            artifact_ttl_seconds: Seconds a generated PDF is kept and reused.
+            artifact_dir: Directory for generated PDFs (default: a temp dir).
+        """
+        self._session_factory = session_factory
+        self.max_workers = max_workers
+        self.artifact_ttl_seconds = artifact_ttl_seconds
+        self._artifact_dir = artifact_dir
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: dict[str, ReportJob] = {}
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, kind: str, *, reuse_completed: bool = True, pin: bool = False, **params
+    ) -> ReportJob:
+        """Queue a report, or reuse a matching queued or generated one.
+
+        Args:
+            kind: Report name, one of ``REPORT_KINDS``.
+            reuse_completed: Whether an already generated PDF may be reused;
+                if False only a queued or running job is shared.
+            pin: Pin the job until ``release`` is called.
+            **params: Report parameters.
+
+        Returns:
+            The job generating (or that generated) the report.
+
+        Raises:
+            ValueError: If the report kind is unknown.
+        """
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"Unknown report: {kind}")
+
+        with self._lock:
+            self._evict_expired()
+            for job in self._jobs.values():
+                if (
+                    job.kind == kind
+                    and job.params == params
+                    and job.status != ReportJobStatus.failed
+                    and (reuse_completed or job.status != ReportJobStatus.completed)
+                ):
+                    job.pins += pin
+                    return job
+
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            job = ReportJob(
+                id=uuid.uuid4().hex,
+                kind=kind,
+                params=params,
+                filename=REPORT_KINDS[kind].format(timestamp=timestamp, **params),
+                pins=int(pin),
+            )
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._get_executor().submit(self._run, job)
+
+        logger.info(f"Report job {job.id} queued: {kind} {params}")
+        return job
+
+    def get(self, job_id: str, pin: bool = False) -> ReportJob | None:
+        """Get a job by ID, or None if unknown or expired.
+
+        Args:
+            job_id: Job identifier.
+            pin: Pin the job until ``release`` is called.
+
+        Returns:
+            The job, or None if unknown or expired.
+        """
+        with self._lock:
+            self._evict_expired()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.pins += pin
+            return job
+
+    def release(self, job: ReportJob) -> None:
+        """Unpin a job pinned by ``submit`` or ``get`` once its PDF is sent."""
+        with self._lock:
+            job.pins = max(job.pins - 1, 0)
+
+    def wait(self, job: ReportJob, timeout: float | None = None) -> ReportJob:
+        """Block until a job finishes.
+
+        Args:
+            job: Job returned by ``submit``.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            The finished job.
+        """
+        future = self._futures.get(job.id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return job
+
+    async def wait_async(self, job: ReportJob) -> ReportJob:
+        """Wait for a job to finish without blocking the event loop.
+
+        Args:
+            job: Job returned by ``submit``.
+
+        Returns:
+            The finished job.
+        """
+        future = self._futures.get(job.id)
+        if future is not None:
+            await asyncio.wrap_future(future)
+        return job
+
+    def shutdown(self) -> None:
+        """Stop the workers and delete every generated PDF."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        with self._lock:
+            for job in self._jobs.values():
+                self._remove_artifact(job)
+            self._jobs.clear()
+            self._futures.clear()
+
+    def _run(self, job: ReportJob) -> None:
+        """Generate a job's PDF into the artifact directory."""
+        job.status = ReportJobStatus.running
+        started = time.perf_counter()
+        path = os.path.join(self._get_artifact_dir(), f"{job.id}.pdf")
+
+        db = self._new_session()
+        try:
+            with open(path, "wb") as output:
+                report_service.write_report(db, job.kind, output, **job.params)
+            job.path = path
+            job.status = ReportJobStatus.completed
+            logger.info(
+                f"Report job {job.id} completed in "
+                f"{time.perf_counter() - started:.2f} s"
+            )
+        except Exception as e:
+            logger.error(f"Report job {job.id} failed: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+            job.error = str(e)
+            job.status = ReportJobStatus.failed
+        finally:
+            db.close()
+            job.finished_at = time.monotonic()
+
+    def _evict_expired(self) -> None:
+        """Forget unpinned finished jobs older than the TTL and delete their PDFs.
+
+        Must be called with the lock held.
+        """
+        now = time.monotonic()
+        expired = [
+            job
+            for job in self._jobs.values()
+            if job.finished_at is not None
+            and not job.pins
+            and now - job.finished_at >= self.artifact_ttl_seconds
+        ]
+        for job in expired:
+            self._remove_artifact(job)
+            del self._jobs[job.id]
+            self._futures.pop(job.id, None)
+
+    def _remove_artifact(self, job: ReportJob) -> None:
+        """Delete a job's PDF if it is still on disk."""
+        if job.path and os.path.exists(job.path):
+            os.remove(job.path)
+        job.path = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, starting it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="report-job"
+            )
+        return self._executor
+
+    def _get_artifact_dir(self) -> str:
+        """Get the directory PDFs are written to, creating it if needed."""
+        if self._artifact_dir is None:
+            self._artifact_dir = tempfile.mkdtemp(prefix="techstore-reports-")
+        os.makedirs(self._artifact_dir, exist_ok=True)
+        return self._artifact_dir
+
+    def _new_session(self) -> Session:
+        """Open a database session for one job."""
+        if self._session_factory is None:
+            from app.database import SessionLocal
+
+            return SessionLocal()
+        return self._session_factory()
+
+
+report_jobs = ReportJobQueue(
+    max_workers=settings.REPORT_WORKERS,
+    artifact_ttl_seconds=settings.REPORT_ARTIFACT_TTL_SECONDS,
+    artifact_dir=settings.REPORT_ARTIFACT_DIR,
+)
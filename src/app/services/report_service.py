@@ -2,9 +2,10 @@
 
 import io
 import logging
+from collections.abc import Iterable
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from typing import Any, BinaryIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -17,17 +18,36 @@ from reportlab.platypus import (
     Table,
     TableStyle,
 )
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.crud.receivables_aging import receivables_aging
+from app.models.customer import Customer
 from app.models.customer_account import CustomerAccount
-from app.models.expense import Expense
+from app.models.expense import Expense, ExpenseCategory
 from app.models.product import Product
 from app.models.repair import Repair
-from app.models.sale import Sale
+from app.models.sale import Sale, SaleItem
 from app.utils.timezone import local_date_to_utc_range
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming report data
+FETCH_SIZE = 500
+
+# Long listings are split into tables of this many rows; ReportLab lays out
+# and splits one huge table far more slowly than many small ones
+TABLE_CHUNK_ROWS = 200
+
+ZERO = Decimal("0.00")
+
+
+def _to_money(value) -> Decimal:
+    """Convert an aggregated amount (None or float on some databases) to cents."""
+    if value is None:
+        return ZERO
+    return Decimal(str(value)).quantize(ZERO)
+
 
 class ReportService:
     """Service for generating PDF reports.
@@ -145,6 +165,35 @@ class ReportService:
         table.setStyle(style)
         return table
 
+    def _create_tables(
+        self,
+        header: list[str],
+        rows: Iterable[list[Any]],
+        col_widths: list[float] | None = None,
+    ) -> list[Table]:
+        """Create styled tables for a long listing, split into chunks.
+
+        Every chunk repeats the header so each table reads on its own.
+
+        Args:
+            header: Column titles.
+            rows: Data rows, consumed once.
+            col_widths: Optional column widths.
+
+        Returns:
+            List of Table objects, empty when there are no rows.
+        """
+        tables = []
+        chunk: list[list[Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == TABLE_CHUNK_ROWS:
+                tables.append(self._create_table([header, *chunk], col_widths))
+                chunk = []
+        if chunk:
+            tables.append(self._create_table([header, *chunk], col_widths))
+        return tables
+
     def _create_summary_table(self, data: dict[str, Any]) -> Table:
         """Create a key-value summary table.
 
@@ -195,9 +244,22 @@ class ReportService:
             PDF content as bytes.
         """
         buffer = io.BytesIO()
+        self._write_pdf(elements, buffer)
+
+        pdf_content = buffer.getvalue()
+        buffer.close()
+
+        return pdf_content
 
+    def _write_pdf(self, elements: list, output: BinaryIO) -> None:
+        """Lay out elements and write the PDF to a binary file object.
+
+        Args:
+            elements: List of flowable elements.
+            output: Writable binary file object.
+        """
         doc = SimpleDocTemplate(
-            buffer,
+            output,
             pagesize=letter,
             rightMargin=0.5 * inch,
             leftMargin=0.5 * inch,
@@ -207,10 +269,31 @@ class ReportService:
 
         doc.build(elements)
 
-        pdf_content = buffer.getvalue()
-        buffer.close()
+    def write_report(self, db: Session, kind: str, output: BinaryIO, **params) -> None:
+        """Generate a report straight into a file instead of memory.
 
-        return pdf_content
+        Used by background report jobs, which keep the result on disk.
+
+        Args:
+            db: Database session.
+            kind: Report name, one of ``REPORT_KINDS``.
+            output: Writable binary file object.
+            **params: Report parameters (``year`` and ``month`` for monthly
+                reports).
+
+        Raises:
+            ValueError: If the report kind is unknown.
+        """
+        builder = {
+            "low-stock": self._low_stock_elements,
+            "accounts-receivable": self._accounts_receivable_elements,
+            "repairs-monthly": self._monthly_repairs_elements,
+            "financial-monthly": self._monthly_financial_elements,
+        }.get(kind)
+        if builder is None:
+            raise ValueError(f"Unknown report: {kind}")
+
+        self._write_pdf(builder(db, **params), output)
 
     def generate_low_stock_report(self, db: Session) -> bytes:
         """Generate PDF report of products with low stock.
@@ -224,6 +307,10 @@ class ReportService:
         Returns:
             PDF content as bytes.
         """
+        return self._generate_pdf(self._low_stock_elements(db))
+
+    def _low_stock_elements(self, db: Session) -> list:
+        """Build the low stock report flowables."""
         logger.info("Generating low stock report")
 
         products = (
@@ -302,7 +389,7 @@ class ReportService:
             elements.append(summary_table)
 
         logger.info(f"Low stock report generated with {len(products)} products")
-        return self._generate_pdf(elements)
+        return elements
 
     def generate_accounts_receivable_report(self, db: Session) -> bytes:
         """Generate PDF report of customers with outstanding debt.
@@ -316,14 +403,28 @@ class ReportService:
         Returns:
             PDF content as bytes.
         """
+        return self._generate_pdf(self._accounts_receivable_elements(db))
+
+    def _accounts_receivable_elements(self, db: Session) -> list:
+        """Build the accounts receivable report flowables.
+
+        Loads the accounts with their customer in one query, the pending
+        invoices of all of them in a second one and their aging in a third.
+        """
         logger.info("Generating accounts receivable report")
 
-        accounts = (
-            db.query(CustomerAccount)
-            .filter(CustomerAccount.account_balance > 0)
+        accounts = db.execute(
+            select(
+                CustomerAccount.customer_id,
+                CustomerAccount.account_balance,
+                CustomerAccount.last_transaction_date,
+                Customer.name,
+                Customer.phone,
+            )
+            .join(Customer, Customer.id == CustomerAccount.customer_id)
+            .where(CustomerAccount.account_balance > 0)
             .order_by(CustomerAccount.account_balance.desc())
-            .all()
-        )
+        ).all()
 
         elements = self._create_header(
             title="Reporte de Cuentas por Cobrar",
@@ -348,24 +449,13 @@ class ReportService:
                 ]
             ]
 
+            pending_invoices = self._pending_invoice_numbers(db)
+
             total_debt = Decimal("0.00")
             for account in accounts:
-                customer = account.customer
-                if not customer:
-                    continue
-
                 total_debt += account.account_balance
 
-                pending_sales = (
-                    db.query(Sale.invoice_number)
-                    .filter(
-                        Sale.customer_id == customer.id,
-                        Sale.payment_status.in_(["pending", "partial"]),
-                        Sale.is_voided == False,  # noqa: E712
-                    )
-                    .all()
-                )
-                invoice_numbers = ", ".join([s.invoice_number for s in pending_sales])
+                invoice_numbers = pending_invoices.get(account.customer_id, "")
                 if len(invoice_numbers) > 25:
                     invoice_numbers = invoice_numbers[:22] + "..."
 
@@ -375,10 +465,10 @@ class ReportService:
 
                 table_data.append(
                     [
-                        customer.name[:25] + "..."
-                        if len(customer.name) > 25
-                        else customer.name,
-                        customer.phone,
+                        account.name[:25] + "..."
+                        if len(account.name) > 25
+                        else account.name,
+                        account.phone,
                         self._format_currency(account.account_balance),
                         last_activity or "-",
                         invoice_numbers or "-",
@@ -395,6 +485,8 @@ class ReportService:
             table = self._create_table(table_data, col_widths)
             elements.append(table)
 
+            elements.extend(self._aging_elements(db))
+
             elements.append(Spacer(1, 20))
 
             summary_data = {
@@ -407,7 +499,83 @@ class ReportService:
         logger.info(
             f"Accounts receivable report generated with {len(accounts)} accounts"
         )
-        return self._generate_pdf(elements)
+        return elements
+
+    def _aging_elements(self, db: Session) -> list:
+        """Build the receivables aging section of the accounts receivable report.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            Section header and a table of open balances by age per customer.
+        """
+        balances = receivables_aging.get(db)
+        if not balances:
+            return []
+
+        table_data = [["Cliente", "0-30 días", "31-60 días", "61-90 días", "+90 días"]]
+        for balance in balances:
+            name = balance.customer_name
+            table_data.append(
+                [
+                    name[:25] + "..." if len(name) > 25 else name,
+                    self._format_currency(balance.current),
+                    self._format_currency(balance.days_31_60),
+                    self._format_currency(balance.days_61_90),
+                    self._format_currency(balance.over_90_days),
+                ]
+            )
+
+        totals = receivables_aging.totals(balances)
+        table_data.append(
+            [
+                "TOTAL",
+                self._format_currency(totals["current"]),
+                self._format_currency(totals["days_31_60"]),
+                self._format_currency(totals["days_61_90"]),
+                self._format_currency(totals["over_90_days"]),
+            ]
+        )
+
+        col_widths = [2.2 * inch, 1.2 * inch, 1.2 * inch, 1.2 * inch, 1.2 * inch]
+        return [
+            Paragraph("Antigüedad de saldos", self.styles["SectionHeader"]),
+            self._create_table(table_data, col_widths),
+        ]
+
+    def _pending_invoice_numbers(self, db: Session) -> dict[int, str]:
+        """Get the pending invoice numbers of every customer in debt.
+
+        Only the start of each list is printed, so numbers stop being
+        collected once a customer's list no longer fits the column.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            Comma separated invoice numbers keyed by customer ID.
+        """
+        rows = db.execute(
+            select(Sale.customer_id, Sale.invoice_number)
+            .join(CustomerAccount, CustomerAccount.customer_id == Sale.customer_id)
+            .where(
+                CustomerAccount.account_balance > 0,
+                Sale.payment_status.in_(["pending", "partial"]),
+                Sale.is_voided == False,  # noqa: E712
+            )
+            .order_by(Sale.customer_id, Sale.id)
+            .execution_options(yield_per=FETCH_SIZE)
+        )
+
+        invoices: dict[int, str] = {}
+        for customer_id, invoice_number in rows:
+            current = invoices.get(customer_id)
+            if current is None:
+                invoices[customer_id] = invoice_number
+            elif len(current) <= 25:
+                invoices[customer_id] = f"{current}, {invoice_number}"
+        return invoices
 
     def generate_monthly_repairs_report(
         self, db: Session, year: int, month: int
@@ -425,6 +593,14 @@ class ReportService:
         Returns:
             PDF content as bytes.
         """
+        return self._generate_pdf(self._monthly_repairs_elements(db, year, month))
+
+    def _monthly_repairs_elements(self, db: Session, year: int, month: int) -> list:
+        """Build the monthly repairs report flowables.
+
+        Repairs are streamed in chunks of ``FETCH_SIZE`` rows, reading only
+        the printed columns, and turned into table rows as they arrive.
+        """
         from calendar import monthrange
         from datetime import date
 
@@ -437,14 +613,23 @@ class ReportService:
         utc_start, _ = local_date_to_utc_range(start_date)
         _, utc_end = local_date_to_utc_range(end_date)
 
-        repairs = (
-            db.query(Repair)
-            .filter(
+        repairs = db.execute(
+            select(
+                Repair.repair_number,
+                Repair.received_date,
+                Repair.status,
+                Repair.final_cost,
+                Repair.device_brand,
+                Repair.device_model,
+                Customer.name.label("customer_name"),
+            )
+            .outerjoin(Customer, Customer.id == Repair.customer_id)
+            .where(
                 Repair.received_date >= utc_start,
                 Repair.received_date <= utc_end,
             )
             .order_by(Repair.received_date.asc())
-            .all()
+            .execution_options(yield_per=FETCH_SIZE)
         )
 
         month_names = {
@@ -463,45 +648,23 @@ class ReportService:
         }
         month_name = month_names.get(month, str(month))
 
-        elements = self._create_header(
-            title="Reporte de Reparaciones del Mes",
-            subtitle=f"{month_name} {year} ({len(repairs)} reparaciones)",
-        )
-
-        if not repairs:
-            elements.append(
-                Paragraph(
-                    "No hay reparaciones registradas en este período.",
-                    self.styles["Normal"],
-                )
-            )
-        else:
-            table_data = [
-                [
-                    "N° Orden",
-                    "Fecha",
-                    "Cliente",
-                    "Dispositivo",
-                    "Estado",
-                    "Costo Final",
-                ]
-            ]
-
-            status_labels = {
-                "received": "Recibido",
-                "diagnosing": "En diagnóstico",
-                "waiting_approval": "Esperando aprobación",
-                "approved": "Aprobado",
-                "repairing": "En reparación",
-                "waiting_parts": "Esperando repuestos",
-                "completed": "Completado",
-                "delivered": "Entregado",
-                "cancelled": "Cancelado",
-            }
+        status_labels = {
+            "received": "Recibido",
+            "diagnosing": "En diagnóstico",
+            "waiting_approval": "Esperando aprobación",
+            "approved": "Aprobado",
+            "repairing": "En reparación",
+            "waiting_parts": "Esperando repuestos",
+            "completed": "Completado",
+            "delivered": "Entregado",
+            "cancelled": "Cancelado",
+        }
 
-            status_counts: dict[str, int] = {}
-            total_revenue = Decimal("0.00")
+        status_counts: dict[str, int] = {}
+        total_revenue = Decimal("0.00")
 
+        def table_rows():
+            nonlocal total_revenue
             for repair in repairs:
                 status = repair.status
                 status_counts[status] = status_counts.get(status, 0) + 1
@@ -515,33 +678,50 @@ class ReportService:
                 if len(device_info) > 20:
                     device_info = device_info[:17] + "..."
 
-                customer_name = repair.customer.name if repair.customer else "-"
+                customer_name = repair.customer_name or "-"
                 if len(customer_name) > 20:
                     customer_name = customer_name[:17] + "..."
 
-                table_data.append(
-                    [
-                        repair.repair_number,
-                        repair.received_date.strftime("%d/%m/%Y"),
-                        customer_name,
-                        device_info,
-                        status_labels.get(status, status),
-                        self._format_currency(repair.final_cost)
-                        if repair.final_cost
-                        else "-",
-                    ]
-                )
+                yield [
+                    repair.repair_number,
+                    repair.received_date.strftime("%d/%m/%Y"),
+                    customer_name,
+                    device_info,
+                    status_labels.get(status, status),
+                    self._format_currency(repair.final_cost)
+                    if repair.final_cost
+                    else "-",
+                ]
 
-            col_widths = [
-                1.1 * inch,
-                0.9 * inch,
-                1.5 * inch,
-                1.5 * inch,
-                1.3 * inch,
-                1 * inch,
-            ]
-            table = self._create_table(table_data, col_widths)
-            elements.append(table)
+        col_widths = [
+            1.1 * inch,
+            0.9 * inch,
+            1.5 * inch,
+            1.5 * inch,
+            1.3 * inch,
+            1 * inch,
+        ]
+        tables = self._create_tables(
+            ["N° Orden", "Fecha", "Cliente", "Dispositivo", "Estado", "Costo Final"],
+            table_rows(),
+            col_widths,
+        )
+        repair_count = sum(status_counts.values())
+
+        elements = self._create_header(
+            title="Reporte de Reparaciones del Mes",
+            subtitle=f"{month_name} {year} ({repair_count} reparaciones)",
+        )
+
+        if not repair_count:
+            elements.append(
+                Paragraph(
+                    "No hay reparaciones registradas en este período.",
+                    self.styles["Normal"],
+                )
+            )
+        else:
+            elements.extend(tables)
 
             elements.append(Spacer(1, 20))
             elements.append(
@@ -562,14 +742,14 @@ class ReportService:
             elements.append(Spacer(1, 20))
 
             summary_data = {
-                "Total de reparaciones:": len(repairs),
+                "Total de reparaciones:": repair_count,
                 "Ingresos por reparaciones:": self._format_currency(total_revenue),
             }
             summary_table = self._create_summary_table(summary_data)
             elements.append(summary_table)
 
-        logger.info(f"Monthly repairs report generated with {len(repairs)} repairs")
-        return self._generate_pdf(elements)
+        logger.info(f"Monthly repairs report generated with {repair_count} repairs")
+        return elements
 
     def generate_monthly_financial_report(
         self, db: Session, year: int, month: int
@@ -591,11 +771,29 @@ class ReportService:
         Returns:
             PDF content as bytes.
         """
+        return self._generate_pdf(self._monthly_financial_elements(db, year, month))
+
+    def get_income_statement(self, db: Session, year: int, month: int) -> dict:
+        """Compute the income statement figures of a month.
+
+        Every figure comes from a grouped SQL aggregate (sale items by
+        product/service, repairs, expenses by category), so the work done
+        in Python does not depend on the month's volume. Sold goods are
+        valued at the unit cost recorded on each sale item; items sold
+        before costs were recorded fall back to the current purchase price.
+
+        Args:
+            db: Database session.
+            year: Year (e.g., 2024).
+            month: Month (1-12).
+
+        Returns:
+            Dict with revenue, cost and profit totals, counts and
+            ``expense_by_category`` (category name -> amount, largest first).
+        """
         from calendar import monthrange
         from datetime import date
 
-        logger.info(f"Generating income statement for {year}-{month:02d}")
-
         start_date = date(year, month, 1)
         _, last_day = monthrange(year, month)
         end_date = date(year, month, last_day)
@@ -603,72 +801,108 @@ class ReportService:
         utc_start, _ = local_date_to_utc_range(start_date)
         _, utc_end = local_date_to_utc_range(end_date)
 
-        sales = (
-            db.query(Sale)
-            .filter(
-                Sale.sale_date >= utc_start,
-                Sale.sale_date <= utc_end,
-                Sale.is_voided == False,  # noqa: E712
-            )
-            .all()
+        sale_filters = (
+            Sale.sale_date >= utc_start,
+            Sale.sale_date <= utc_end,
+            Sale.is_voided == False,  # noqa: E712
         )
+        sales_count = db.scalar(select(func.count(Sale.id)).where(*sale_filters))
 
-        repairs = (
-            db.query(Repair)
-            .filter(
+        line_cost = SaleItem.quantity * func.coalesce(
+            SaleItem.unit_cost, Product.purchase_price
+        )
+        sold = {
+            is_service: (_to_money(revenue), _to_money(cost))
+            for is_service, revenue, cost in db.execute(
+                select(
+                    Product.is_service,
+                    func.sum(SaleItem.total_price),
+                    func.sum(line_cost),
+                )
+                .join(Sale, Sale.id == SaleItem.sale_id)
+                .join(Product, Product.id == SaleItem.product_id)
+                .where(*sale_filters)
+                .group_by(Product.is_service)
+            )
+        }
+        product_revenue, product_cogs = sold.get(False, (ZERO, ZERO))
+        service_revenue, _ = sold.get(True, (ZERO, ZERO))
+
+        repair_count, repair_revenue, repair_parts_cost = db.execute(
+            select(
+                func.count(Repair.id),
+                func.sum(Repair.final_cost),
+                func.sum(Repair.parts_cost),
+            ).where(
                 Repair.received_date >= utc_start,
                 Repair.received_date <= utc_end,
                 Repair.final_cost.isnot(None),
             )
-            .all()
-        )
+        ).one()
+        repair_revenue = _to_money(repair_revenue)
+        repair_parts_cost = _to_money(repair_parts_cost)
 
-        expenses = (
-            db.query(Expense)
-            .filter(
+        expense_count = 0
+        expense_by_category: dict[str, Decimal] = {}
+        category_name = func.coalesce(ExpenseCategory.name, "Sin categoría")
+        for name, count, amount in db.execute(
+            select(category_name, func.count(Expense.id), func.sum(Expense.amount))
+            .outerjoin(ExpenseCategory, ExpenseCategory.id == Expense.category_id)
+            .where(
                 Expense.expense_date >= start_date,
                 Expense.expense_date <= end_date,
             )
-            .all()
-        )
-
-        product_revenue = Decimal("0.00")
-        product_cogs = Decimal("0.00")
-        service_revenue = Decimal("0.00")
-
-        for sale in sales:
-            for item in sale.items:
-                if item.product and not item.product.is_service:
-                    product_revenue += item.total_price
-                    product_cogs += item.product.purchase_price * item.quantity
-                elif item.product and item.product.is_service:
-                    service_revenue += item.total_price
-
-        repair_revenue = Decimal("0.00")
-        repair_parts_cost = Decimal("0.00")
-
-        for repair in repairs:
-            if repair.final_cost:
-                repair_revenue += repair.final_cost
-            if repair.parts_cost:
-                repair_parts_cost += repair.parts_cost
+            .group_by(category_name)
+            .order_by(func.sum(Expense.amount).desc())
+        ):
+            expense_count += count
+            expense_by_category[name] = _to_money(amount)
+        total_expenses = sum(expense_by_category.values(), ZERO)
 
         total_revenue = product_revenue + service_revenue + repair_revenue
         total_cogs = product_cogs + repair_parts_cost
         gross_profit = total_revenue - total_cogs
 
-        product_gross_profit = product_revenue - product_cogs
-        repair_gross_profit = repair_revenue - repair_parts_cost
+        return {
+            "sales_count": sales_count,
+            "product_revenue": product_revenue,
+            "product_cogs": product_cogs,
+            "product_gross_profit": product_revenue - product_cogs,
+            "service_revenue": service_revenue,
+            "repair_count": repair_count,
+            "repair_revenue": repair_revenue,
+            "repair_parts_cost": repair_parts_cost,
+            "repair_gross_profit": repair_revenue - repair_parts_cost,
+            "total_revenue": total_revenue,
+            "total_cogs": total_cogs,
+            "gross_profit": gross_profit,
+            "expense_count": expense_count,
+            "expense_by_category": expense_by_category,
+            "total_expenses": total_expenses,
+            "net_profit": gross_profit - total_expenses,
+        }
 
-        total_expenses = sum(e.amount for e in expenses)
-        net_profit = gross_profit - total_expenses
+    def _monthly_financial_elements(self, db: Session, year: int, month: int) -> list:
+        """Build the income statement flowables."""
+        logger.info(f"Generating income statement for {year}-{month:02d}")
 
-        expense_by_category: dict[str, Decimal] = {}
-        for expense in expenses:
-            cat_name = expense.category.name if expense.category else "Sin categoría"
-            expense_by_category[cat_name] = (
-                expense_by_category.get(cat_name, Decimal("0.00")) + expense.amount
-            )
+        statement = self.get_income_statement(db, year, month)
+        sales_count = statement["sales_count"]
+        product_revenue = statement["product_revenue"]
+        product_cogs = statement["product_cogs"]
+        service_revenue = statement["service_revenue"]
+        repair_count = statement["repair_count"]
+        repair_revenue = statement["repair_revenue"]
+        repair_parts_cost = statement["repair_parts_cost"]
+        total_revenue = statement["total_revenue"]
+        total_cogs = statement["total_cogs"]
+        gross_profit = statement["gross_profit"]
+        product_gross_profit = statement["product_gross_profit"]
+        repair_gross_profit = statement["repair_gross_profit"]
+        expense_count = statement["expense_count"]
+        expense_by_category = statement["expense_by_category"]
+        total_expenses = statement["total_expenses"]
+        net_profit = statement["net_profit"]
 
         month_names = {
             1: "Enero",
@@ -748,9 +982,7 @@ class ReportService:
 
         if expense_by_category:
             expense_data = [["Categoría", "Monto"]]
-            for cat, amount in sorted(
-                expense_by_category.items(), key=lambda x: x[1], reverse=True
-            ):
+            for cat, amount in expense_by_category.items():
                 expense_data.append([cat, self._format_currency(amount)])
             expense_data.append(["TOTAL GASTOS", self._format_currency(total_expenses)])
 
@@ -801,9 +1033,9 @@ class ReportService:
         )
 
         final_summary = {
-            "Total de ventas realizadas:": len(sales),
-            "Total de reparaciones:": len(repairs),
-            "Total de gastos registrados:": len(expenses),
+            "Total de ventas realizadas:": sales_count,
+            "Total de reparaciones:": repair_count,
+            "Total de gastos registrados:": expense_count,
             "Margen de utilidad:": f"{margin_percentage:.1f}%",
         }
         final_table = self._create_summary_table(final_summary)
@@ -814,7 +1046,7 @@ class ReportService:
             f"cogs={total_cogs}, gross={gross_profit}, expenses={total_expenses}, "
             f"net={net_profit}"
         )
-        return self._generate_pdf(elements)
+        return elements
 
 
 report_service = ReportService()
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.crud import repair_crud
 from app.crud import warranty as warranty_crud
+from app.crud.pagination import Page
 from app.models.warranty import Warranty, WarrantyClaim
 from app.schemas.repair import RepairStatus
 from app.schemas.warranty import (
@@ -130,11 +131,15 @@ class WarrantyService:
         db: Session,
         *,
         params: WarrantySearchParams,
-    ) -> tuple[list[WarrantyListResponse], int]:
-        """Search warranties with filters."""
+    ) -> Page[WarrantyListResponse]:
+        """Search warranties with filters.
+
+        Raises:
+            InvalidCursorError: If ``params.cursor`` is invalid.
+        """
         logger.info(f"Searching warranties with params: {params}")
 
-        warranties, total = warranty_crud.warranty.search_warranties(
+        page = warranty_crud.warranty.search_warranties(
             db,
             params=params,
         )
@@ -152,10 +157,11 @@ class WarrantyService:
                 labor_expiry_date=w.labor_expiry_date,
                 is_valid=w.is_valid(),
             )
-            for w in warranties
+            for w in page.items
         ]
 
-        return responses, total
+        page.items = responses
+        return page
 
     def get_warranty_details(
         self,
@@ -0,0 +1,281 @@
+"""Rendered help-center documents and a full-text index over them.
+
+Help pages used to read their Markdown file and run it through the
+Markdown converter on every view, although the documents only change on
+deploy. ``HelpDocumentCache`` renders each document once and keeps the
+HTML until the file's modification time changes, and keeps a small
+inverted index of the rendered text for the help search.
+"""
+
+import html
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import markdown
+
+# Markdown extensions used by every help document
+MARKDOWN_EXTENSIONS = ["extra", "codehilite", "tables", "toc"]
+
+# Help documents root - relative to project root
+DOCS_PATH = Path(__file__).parent.parent.parent.parent / "docs" / "user-guide" / "es"
+
+# URL slug -> (file name, page title); None titles derive from the file name
+HELP_DOCUMENTS: dict[str, tuple[str, str | None]] = {
+    "guia-rapida": ("GUIA-RAPIDA.md", "Guía Rápida - 5 Minutos"),
+    "introduccion": ("01-introduccion.md", None),
+    "primeros-pasos": ("02-primeros-pasos.md", None),
+    "clientes": ("03-gestion-clientes.md", None),
+    "productos": ("04-gestion-productos.md", None),
+    "ventas": ("05-proceso-ventas.md", None),
+    "reparaciones": ("06-gestion-reparaciones.md", None),
+    "caja": ("07-control-caja.md", None),
+    "garantias": ("08-garantias.md", None),
+    "reportes": ("09-reportes.md", None),
+    "configuracion": ("10-configuracion.md", None),
+    "faq": ("11-preguntas-frecuentes.md", None),
+    "glosario": ("12-glosario.md", None),
+}
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+
+# Characters of context shown on each side of a search match
+SNIPPET_RADIUS = 80
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents so "garantía" matches "garantia"."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _tokens(text: str) -> list[str]:
+    """Split text into folded search terms."""
+    return _WORD.findall(_fold(text))
+
+
+@dataclass
+class HelpDocument:
+    """A help document rendered to HTML.
+
+    Attributes:
+        slug: URL slug.
+        title: Page title.
+        html: Rendered HTML body.
+        text: Plain text of the document, for search snippets.
+        modified_at: File modification time (UTC, whole seconds).
+        mtime_ns: File modification time used to detect changes.
+        terms: Term frequencies of the document text.
+    """
+
+    slug: str
+    title: str
+    html: str
+    text: str
+    modified_at: datetime
+    mtime_ns: int
+    terms: dict[str, int] = field(default_factory=dict, repr=False)
+
+
+@dataclass
+class HelpSearchResult:
+    """A help document matching a search.
+
+    Attributes:
+        slug: URL slug of the document.
+        title: Document title.
+        snippet: Text around the first match.
+        score: Number of occurrences of the search terms.
+    """
+
+    slug: str
+    title: str
+    snippet: str
+    score: int
+
+
+class HelpDocumentCache:
+    """Help documents rendered once per file version, with a search index."""
+
+    def __init__(
+        self,
+        docs_path: Path = DOCS_PATH,
+        documents: dict[str, tuple[str, str | None]] | None = None,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            docs_path: Directory holding the Markdown files.
+            documents: URL slug -> (file name, title) (default:
+                ``HELP_DOCUMENTS``).
+        """
+        self.docs_path = docs_path
+        self.documents = HELP_DOCUMENTS if documents is None else documents
+        self._rendered: dict[str, HelpDocument] = {}
+        self._index: dict[str, dict[str, int]] | None = None
+        self._lock = threading.Lock()
+
+    def get(self, slug: str) -> HelpDocument | None:
+        """Get a rendered document, rendering it if new or changed on disk.
+
+        Args:
+            slug: URL slug of the document.
+
+        Returns:
+            The rendered document, or None if the slug is unknown or its
+            file is missing.
+        """
+        entry = self.documents.get(slug)
+        if entry is None:
+            return None
+
+        path = self.docs_path / entry[0]
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._forget(slug)
+            return None
+
+        document = self._rendered.get(slug)
+        if document is not None and document.mtime_ns == mtime_ns:
+            return document
+
+        try:
+            document = self._render(slug, path, mtime_ns)
+        except FileNotFoundError:
+            self._forget(slug)
+            return None
+        with self._lock:
+            self._rendered[slug] = document
+            self._index = None
+        return document
+
+    def warm(self) -> int:
+        """Render every document that is new or changed on disk.
+
+        Returns:
+            Number of documents available.
+        """
+        return sum(1 for slug in self.documents if self.get(slug) is not None)
+
+    def search(self, query: str, limit: int = 10) -> list[HelpSearchResult]:
+        """Find documents containing every word of ``query``.
+
+        Accents and case are ignored; the last word also matches as a
+        prefix so results show up while typing.
+
+        Args:
+            query: Words to search for.
+            limit: Maximum number of results.
+
+        Returns:
+            Matching documents, most occurrences first.
+        """
+        words = _tokens(query)
+        if not words:
+            return []
+
+        self.warm()
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            index = self._index
+            rendered = dict(self._rendered)
+
+        scores: dict[str, int] | None = None
+        for position, word in enumerate(words):
+            matches: dict[str, int] = dict(index.get(word, {}))
+            if position == len(words) - 1:
+                for term, postings in index.items():
+                    if term != word and term.startswith(word):
+                        for slug, count in postings.items():
+                            matches[slug] = matches.get(slug, 0) + count
+            if scores is None:
+                scores = matches
+            else:
+                scores = {
+                    slug: score + matches[slug]
+                    for slug, score in scores.items()
+                    if slug in matches
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            HelpSearchResult(
+                slug=slug,
+                title=rendered[slug].title,
+                snippet=self._snippet(rendered[slug].text, words),
+                score=score,
+            )
+            for slug, score in ranked[:limit]
+        ]
+
+    def clear(self) -> None:
+        """Drop every rendered document."""
+        with self._lock:
+            self._rendered.clear()
+            self._index = None
+
+    def _forget(self, slug: str) -> None:
+        """Drop a document whose file went away."""
+        with self._lock:
+            if self._rendered.pop(slug, None) is not None:
+                self._index = None
+
+    def _render(self, slug: str, path: Path, mtime_ns: int) -> HelpDocument:
+        """Read and render one Markdown file."""
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+
+        # Converter instances keep state between calls, so use one per render
+        body = markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+        text = " ".join(html.unescape(_TAG.sub(" ", body)).split())
+
+        terms: dict[str, int] = {}
+        for token in _tokens(text):
+            terms[token] = terms.get(token, 0) + 1
+
+        filename, title = self.documents[slug]
+        return HelpDocument(
+            slug=slug,
+            title=title or filename.replace(".md", "").replace("-", " ").title(),
+            html=body,
+            text=text,
+            modified_at=datetime.fromtimestamp(mtime_ns // 1_000_000_000, tz=UTC),
+            mtime_ns=mtime_ns,
+            terms=terms,
+        )
+
+    def _build_index(self) -> dict[str, dict[str, int]]:
+        """Build term -> {slug: count}. Must be called with the lock held."""
+        index: dict[str, dict[str, int]] = {}
+        for slug, document in self._rendered.items():
+            for term, count in document.terms.items():
+                index.setdefault(term, {})[slug] = count
+        return index
+
+    @staticmethod
+    def _snippet(text: str, words: list[str]) -> str:
+        """Get the text around the first occurrence of a search word."""
+        # Folding strips accents without shifting positions in Spanish text
+        folded = _fold(text)
+        positions = [folded.find(word) for word in words]
+        positions = [position for position in positions if position >= 0]
+        if not positions:
+            return text[: 2 * SNIPPET_RADIUS]
+
+        start = max(min(positions) - SNIPPET_RADIUS, 0)
+        end = start + 2 * SNIPPET_RADIUS
+        snippet = text[start:end].strip()
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        return f"{prefix}{snippet}{suffix}"
+
+
+help_documents = HelpDocumentCache()
@@ -0,0 +1,60 @@
+"""HTTP validation caching (ETag / If-None-Match) for small lookup responses."""
+
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def with_etag(
+    request: Request, response: Response, last_modified: datetime | None = None
+) -> Response:
+    """Tag a rendered response with an ETag and honour ``If-None-Match``.
+
+    The ETag is a hash of the response body, so it changes exactly when the
+    content does. Browsers revalidate on every request (``no-cache``) and get
+    an empty 304 while the results are unchanged, which keeps repeated
+    type-ahead lookups cheap without ever showing stale data.
+
+    Args:
+        request: Incoming request.
+        response: Fully rendered response.
+        last_modified: When the content last changed (timezone-aware). Also
+            sent as ``Last-Modified`` and checked against
+            ``If-Modified-Since`` when the client sends no ETag.
+
+    Returns:
+        The tagged response, or a 304 response when the client's copy is
+        current.
+    """
+    etag = f'"{hashlib.sha1(response.body, usedforsecurity=False).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match:
+        # Proxies that compress responses may weaken the tag
+        tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        if etag in tags:
+            return Response(status_code=304, headers=headers)
+    elif last_modified is not None and _not_modified_since(
+        request.headers.get("if-modified-since"), last_modified
+    ):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
+
+
+def _not_modified_since(if_modified_since: str | None, last_modified: datetime) -> bool:
+    """Whether an ``If-Modified-Since`` date covers ``last_modified``."""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole-second precision
+    return since.tzinfo is not None and last_modified.replace(microsecond=0) <= since
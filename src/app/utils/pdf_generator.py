@@ -1,10 +1,12 @@
 """PDF generator utility for statements and receipts."""
 
+import itertools
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 
 
 def generate_statement_pdf(
-    customer: dict, balance_info: dict, transactions: list[dict]
+    customer: dict, balance_info: dict, transactions: Iterable[dict]
 ) -> bytes:
     """Generate a simple PDF statement.
 
@@ -14,11 +16,32 @@ def generate_statement_pdf(
     Args:
         customer: Customer dictionary with details.
         balance_info: Balance summary information.
-        transactions: List of transaction dictionaries.
+        transactions: Transaction dictionaries.
 
     Returns:
         PDF bytes (currently returns HTML as bytes for MVP).
     """
+    return "".join(iter_statement_html(customer, balance_info, transactions)).encode(
+        "utf-8"
+    )
+
+
+def iter_statement_html(
+    customer: dict, balance_info: dict, transactions: Iterable[dict]
+) -> Iterator[str]:
+    """Render a statement document chunk by chunk.
+
+    Transactions are consumed one at a time, so a streamed response of a
+    long ledger never holds all rows (or the whole document) in memory.
+
+    Args:
+        customer: Customer dictionary with details.
+        balance_info: Balance summary information.
+        transactions: Transaction dictionaries, possibly a lazy iterator.
+
+    Yields:
+        Consecutive pieces of the HTML document.
+    """
     # Generate HTML content for the statement
     html = f"""
     <!DOCTYPE html>
@@ -153,8 +176,11 @@ def generate_statement_pdf(
             <div class="section-title">Transaction History</div>
             """
 
-    if transactions:
-        html += """
+    transactions = iter(transactions)
+    first = next(transactions, None)
+    if first is not None:
+        yield html
+        yield """
             <table>
                 <thead>
                     <tr>
@@ -168,7 +194,7 @@ def generate_statement_pdf(
                 <tbody>
         """
 
-        for trans in transactions:
+        for trans in itertools.chain([first], transactions):
             date_str = (
                 trans["date"].strftime("%m/%d/%Y")
                 if hasattr(trans["date"], "strftime")
@@ -186,7 +212,7 @@ def generate_statement_pdf(
             )
             balance = f'${abs(trans["running_balance"]):,.2f}'
 
-            html += f"""
+            yield f"""
                     <tr>
                         <td>{date_str}</td>
                         <td>{trans['description']}</td>
@@ -196,7 +222,7 @@ def generate_statement_pdf(
                     </tr>
             """
 
-        html += f"""
+        html = f"""
                 </tbody>
                 <tfoot>
                     <tr style="border-top: 2px solid #333;">
@@ -232,5 +258,5 @@ def generate_statement_pdf(
     # pdf = HTML(string=html).write_pdf()
     # return pdf
 
-    # For MVP, return HTML as bytes
-    return html.encode("utf-8")
+    # For MVP, the document is HTML
+    yield html
@@ -0,0 +1,47 @@
+"""Phone number normalization for indexed lookups."""
+
+import re
+
+from app.config import settings
+
+# Digit a country writes after its code, only in international format
+_INTERNATIONAL_MOBILE_PREFIX = {"54": "9"}
+
+
+def normalize_phone(phone: str | None, country_code: str | None = None) -> str | None:
+    """Reduce a phone number to the digits used to match it.
+
+    Formatting is dropped and numbers of the store's country are reduced to
+    their national number, so "+54 9 11 4455-6677", "011 4455-6677" and
+    "11 4455 6677" are all stored as "1144556677". Foreign numbers keep
+    their country code. Local prefixes such as Argentina's "15" for mobiles
+    are left in place; suffix lookups still find those numbers.
+
+    Args:
+        phone: Phone number as typed.
+        country_code: Country calling code of the store, defaults to
+            ``settings.PHONE_COUNTRY_CODE``.
+
+    Returns:
+        Digits only, or None when the number has no digits.
+    """
+    if not phone:
+        return None
+    country_code = country_code or settings.PHONE_COUNTRY_CODE
+
+    phone = phone.strip()
+    digits = re.sub(r"\D", "", phone)
+    international = phone.startswith("+") or digits.startswith("00")
+    if digits.startswith("00"):
+        digits = digits[2:]
+
+    if international:
+        if not digits.startswith(country_code):
+            return digits or None
+        digits = digits[len(country_code) :]
+        mobile_prefix = _INTERNATIONAL_MOBILE_PREFIX.get(country_code)
+        if mobile_prefix:
+            digits = digits.removeprefix(mobile_prefix)
+
+    # National trunk prefix
+    return digits.lstrip("0") or None
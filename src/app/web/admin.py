@@ -1,18 +1,22 @@
 """Admin panel routes for system administrators."""
 
 import logging
-from datetime import datetime
-from typing import Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Optional
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse, Response
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
+from app.core.concurrency import run_in_db_thread
 from app.core.web_auth import get_current_user_from_cookie, require_web_role
 from app.database import get_async_session
 from app.models.user import User
 from app.utils.templates import create_templates
 
+if TYPE_CHECKING:
+    from app.services.report_jobs import ReportJob
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["admin"])
@@ -673,7 +677,7 @@ async def admin_statistics(
     """
     from app.services.dashboard_service import dashboard_service
 
-    stats = dashboard_service.get_dashboard_stats(db)
+    stats = await run_in_db_thread(dashboard_service.get_dashboard_stats, db)
 
     context = {
         "request": request,
@@ -718,7 +722,7 @@ async def admin_statistics_partial(
     """
     from app.services.dashboard_service import dashboard_service
 
-    stats = dashboard_service.get_dashboard_stats(db)
+    stats = await run_in_db_thread(dashboard_service.get_dashboard_stats, db)
 
     context = {
         "request": request,
@@ -729,68 +733,443 @@ async def admin_statistics_partial(
     return templates.TemplateResponse("admin/partials/statistics_content.html", context)
 
 
+def _maintenance_context(request: Request, current_user: User) -> dict:
+    """Build the template context of the maintenance panel."""
+    from app.services.maintenance import maintenance_scheduler
+
+    return {
+        "request": request,
+        "current_user": current_user,
+        "scheduler": maintenance_scheduler,
+        "tasks": maintenance_scheduler.tasks,
+        "history": maintenance_scheduler.history()[:50],
+    }
+
+
 @router.get(
-    "/reports/low-stock/pdf",
+    "/maintenance",
+    response_class=HTMLResponse,
     dependencies=[Depends(require_web_role(["admin"]))],
 )
-async def admin_report_low_stock_pdf(
+async def admin_maintenance(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+) -> HTMLResponse:
+    """Render scheduled maintenance tasks, their metrics and run history.
+
+    Args:
+        request: FastAPI request object.
+        current_user: Currently authenticated admin user.
+
+    Returns:
+        HTML response with the maintenance page.
+    """
+    context = {
+        **_maintenance_context(request, current_user),
+        "page_title": "Mantenimiento",
+        "breadcrumbs": [
+            {"name": "Admin", "url": "/admin"},
+            {"name": "Mantenimiento", "url": "/admin/maintenance", "active": True},
+        ],
+    }
+
+    if request.headers.get("HX-Request"):
+        return templates.TemplateResponse(
+            "admin/partials/maintenance_content.html", context
+        )
+
+    return templates.TemplateResponse("admin/maintenance.html", context)
+
+
+@router.get(
+    "/maintenance/content",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_maintenance_partial(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+) -> HTMLResponse:
+    """Render maintenance partial for HTMX.
+
+    Args:
+        request: FastAPI request object.
+        current_user: Currently authenticated admin user.
+
+    Returns:
+        HTML response with maintenance content partial.
+    """
+    return templates.TemplateResponse(
+        "admin/partials/maintenance_content.html",
+        _maintenance_context(request, current_user),
+    )
+
+
+@router.post(
+    "/maintenance/{task_name}/run",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_maintenance_run(
+    request: Request,
+    task_name: str,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+) -> HTMLResponse:
+    """Run a maintenance task now and re-render the panel.
+
+    Args:
+        request: FastAPI request object.
+        task_name: Name of the task to run.
+        current_user: Currently authenticated admin user.
+
+    Returns:
+        HTML response with maintenance content partial.
+    """
+    from app.services.maintenance import maintenance_scheduler
+
+    if maintenance_scheduler.get_task(task_name) is None:
+        raise HTTPException(status_code=404, detail="Tarea no encontrada")
+
+    logger.info(f"Maintenance task {task_name} run by admin: {current_user.email}")
+    await run_in_db_thread(
+        maintenance_scheduler.run_task, task_name, triggered_by=current_user.email
+    )
+
+    return templates.TemplateResponse(
+        "admin/partials/maintenance_content.html",
+        _maintenance_context(request, current_user),
+    )
+
+
+# Periods offered on the analytics page, in days
+ANALYTICS_RANGES = (7, 30, 90, 365)
+
+WEEKDAY_NAMES = ("Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom")
+
+
+def _analytics_context(
+    request: Request, current_user: User, db: Session, days: int
+) -> dict:
+    """Build the template context of the sales analytics page."""
+    from datetime import timedelta
+
+    from app.crud.sales_rollup import sales_rollup_crud
+    from app.utils.timezone import get_local_today
+
+    days = days if days in ANALYTICS_RANGES else 30
+    end = get_local_today()
+    start = end - timedelta(days=days - 1)
+
+    top_products = sales_rollup_crud.totals(
+        db, start=start, end=end, group_by="product", limit=10
+    )
+    heatmap = sales_rollup_crud.hourly_heatmap(db, start=start, end=end)
+    trend = sales_rollup_crud.category_trend(
+        db, start=start, end=end, period="week" if days > 31 else "day"
+    )
+    categories = sales_rollup_crud.totals(db, start=start, end=end, group_by="category")
+
+    # Category revenue per period, as rows of the trend table
+    periods = sorted({point["period"] for point in trend})
+    revenue = {
+        (point["category_id"], point["period"]): point["revenue"] for point in trend
+    }
+    trend_rows = [
+        {
+            "category": category["label"],
+            "cells": [revenue.get((category["key"], period)) for period in periods],
+        }
+        for category in categories
+    ]
+
+    return {
+        "request": request,
+        "current_user": current_user,
+        "days": days,
+        "ranges": ANALYTICS_RANGES,
+        "start": start,
+        "end": end,
+        "top_products": top_products,
+        "top_revenue": max((p["revenue"] for p in top_products), default=0),
+        "heatmap": heatmap,
+        "heatmap_max": max(max(row) for row in heatmap["sales_count"]),
+        "weekday_names": WEEKDAY_NAMES,
+        "periods": periods,
+        "trend_rows": trend_rows,
+        "trend_max": max((p["revenue"] for p in trend), default=0),
+    }
+
+
+@router.get(
+    "/analytics",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_analytics(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+    days: int = 30,
     db: Session = Depends(get_async_session),
-) -> Response:
-    """Generate and download low stock inventory PDF report.
+) -> HTMLResponse:
+    """Render sales analytics: top products, hourly heatmap, category trend.
 
     Args:
+        request: FastAPI request object.
         current_user: Currently authenticated admin user.
+        days: Days covered, ending today.
         db: Database session.
 
     Returns:
-        PDF file download response.
+        HTML response with the analytics page.
     """
-    from app.services.report_service import report_service
+    context = {
+        **await run_in_db_thread(_analytics_context, request, current_user, db, days),
+        "page_title": "Análisis de ventas",
+        "breadcrumbs": [
+            {"name": "Admin", "url": "/admin"},
+            {"name": "Análisis de ventas", "url": "/admin/analytics", "active": True},
+        ],
+    }
 
-    logger.info(f"Low stock report requested by admin: {current_user.email}")
+    if request.headers.get("HX-Request"):
+        return templates.TemplateResponse(
+            "admin/partials/analytics_content.html", context
+        )
 
-    pdf_content = report_service.generate_low_stock_report(db)
+    return templates.TemplateResponse("admin/analytics.html", context)
 
-    filename = f"inventario_bajo_stock_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
-    return Response(
-        content=pdf_content,
+@router.get(
+    "/analytics/content",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_analytics_partial(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+    days: int = 30,
+    db: Session = Depends(get_async_session),
+) -> HTMLResponse:
+    """Render sales analytics partial for HTMX.
+
+    Args:
+        request: FastAPI request object.
+        current_user: Currently authenticated admin user.
+        days: Days covered, ending today.
+        db: Database session.
+
+    Returns:
+        HTML response with analytics content partial.
+    """
+    return templates.TemplateResponse(
+        "admin/partials/analytics_content.html",
+        await run_in_db_thread(_analytics_context, request, current_user, db, days),
+    )
+
+
+# Route orderings offered on the performance page, with their labels
+PERFORMANCE_ORDERINGS = {
+    "total": "Tiempo total",
+    "average": "Tiempo promedio",
+    "max": "Tiempo máximo",
+    "queries": "Consultas por request",
+    "db": "Tiempo de BD promedio",
+}
+
+
+def _performance_context(request: Request, current_user: User, order: str) -> dict:
+    """Build the template context of the performance page."""
+    from app.core.profiling import performance_recorder
+
+    order = order if order in PERFORMANCE_ORDERINGS else "total"
+    return {
+        "request": request,
+        "current_user": current_user,
+        "order": order,
+        "orderings": PERFORMANCE_ORDERINGS,
+        "routes": performance_recorder.routes(order_by=order, limit=50),
+        "slowest_requests": performance_recorder.slowest_requests(limit=20),
+    }
+
+
+@router.get(
+    "/performance",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_performance(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+    order: str = "total",
+) -> HTMLResponse:
+    """Render per-route query counts and latency, worst routes first.
+
+    Args:
+        request: FastAPI request object.
+        current_user: Currently authenticated admin user.
+        order: Measure the routes are sorted by.
+
+    Returns:
+        HTML response with the performance page.
+    """
+    context = {
+        **_performance_context(request, current_user, order),
+        "page_title": "Rendimiento",
+        "breadcrumbs": [
+            {"name": "Admin", "url": "/admin"},
+            {"name": "Rendimiento", "url": "/admin/performance", "active": True},
+        ],
+    }
+
+    if request.headers.get("HX-Request"):
+        return templates.TemplateResponse(
+            "admin/partials/performance_content.html", context
+        )
+
+    return templates.TemplateResponse("admin/performance.html", context)
+
+
+@router.get(
+    "/performance/content",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_performance_partial(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+    order: str = "total",
+) -> HTMLResponse:
+    """Render performance partial for HTMX.
+
+    Args:
+        request: FastAPI request object.
+        current_user: Currently authenticated admin user.
+        order: Measure the routes are sorted by.
+
+    Returns:
+        HTML response with performance content partial.
+    """
+    return templates.TemplateResponse(
+        "admin/partials/performance_content.html",
+        _performance_context(request, current_user, order),
+    )
+
+
+@router.post(
+    "/performance/reset",
+    response_class=HTMLResponse,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_performance_reset(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+) -> HTMLResponse:
+    """Forget the recorded profiles and re-render the page.
+
+    Args:
+        request: FastAPI request object.
+        current_user: Currently authenticated admin user.
+
+    Returns:
+        HTML response with performance content partial.
+    """
+    from app.core.profiling import performance_recorder
+
+    logger.info(f"Performance profiles reset by admin: {current_user.email}")
+    performance_recorder.reset()
+
+    return templates.TemplateResponse(
+        "admin/partials/performance_content.html",
+        _performance_context(request, current_user, "total"),
+    )
+
+
+def _report_file_response(job: "ReportJob") -> FileResponse:
+    """Send a pinned job's PDF and release the job once it has been sent."""
+    from app.services.report_jobs import report_jobs
+
+    return FileResponse(
+        job.path,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        filename=job.filename,
+        background=BackgroundTask(report_jobs.release, job),
     )
 
 
+async def _download_report(kind: str, **params) -> Response:
+    """Generate a report in the background job pool and send the PDF.
+
+    Shares a matching job that is still queued or running, but never an
+    already generated PDF, so the report is as current as the request.
+
+    Args:
+        kind: Report name, one of ``REPORT_KINDS``.
+        **params: Report parameters.
+
+    Returns:
+        PDF file download response.
+
+    Raises:
+        HTTPException: If the report could not be generated.
+    """
+    from app.services.report_jobs import ReportJobStatus, report_jobs
+
+    job = report_jobs.submit(kind, reuse_completed=False, pin=True, **params)
+    try:
+        await report_jobs.wait_async(job)
+    finally:
+        if job.status != ReportJobStatus.completed:
+            report_jobs.release(job)
+    if job.status != ReportJobStatus.completed:
+        raise HTTPException(status_code=500, detail="Error al generar el reporte")
+
+    return _report_file_response(job)
+
+
+def _validate_month(month: int) -> None:
+    """Reject month numbers outside 1-12."""
+    if month < 1 or month > 12:
+        raise HTTPException(status_code=400, detail="Mes inválido (debe ser 1-12)")
+
+
+@router.get(
+    "/reports/low-stock/pdf",
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_report_low_stock_pdf(
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+) -> Response:
+    """Generate and download low stock inventory PDF report.
+
+    Args:
+        current_user: Currently authenticated admin user.
+
+    Returns:
+        PDF file download response.
+    """
+    logger.info(f"Low stock report requested by admin: {current_user.email}")
+
+    return await _download_report("low-stock")
+
+
 @router.get(
     "/reports/accounts-receivable/pdf",
     dependencies=[Depends(require_web_role(["admin"]))],
 )
 async def admin_report_accounts_receivable_pdf(
     current_user: Annotated[User, Depends(get_current_user_from_cookie)],
-    db: Session = Depends(get_async_session),
 ) -> Response:
     """Generate and download accounts receivable PDF report.
 
     Args:
         current_user: Currently authenticated admin user.
-        db: Database session.
 
     Returns:
         PDF file download response.
     """
-    from app.services.report_service import report_service
-
     logger.info(f"Accounts receivable report requested by admin: {current_user.email}")
 
-    pdf_content = report_service.generate_accounts_receivable_report(db)
-
-    filename = f"cuentas_por_cobrar_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-
-    return Response(
-        content=pdf_content,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    return await _download_report("accounts-receivable")
 
 
 @router.get(
@@ -801,7 +1180,6 @@ async def admin_report_repairs_monthly_pdf(
     current_user: Annotated[User, Depends(get_current_user_from_cookie)],
     year: int,
     month: int,
-    db: Session = Depends(get_async_session),
 ) -> Response:
     """Generate and download monthly repairs PDF report.
 
@@ -809,32 +1187,18 @@ async def admin_report_repairs_monthly_pdf(
         current_user: Currently authenticated admin user.
         year: Year to filter (e.g., 2024).
         month: Month to filter (1-12).
-        db: Database session.
 
     Returns:
         PDF file download response.
     """
-    from app.services.report_service import report_service
-
-    if month < 1 or month > 12:
-        from fastapi import HTTPException
-
-        raise HTTPException(status_code=400, detail="Mes inválido (debe ser 1-12)")
+    _validate_month(month)
 
     logger.info(
         f"Monthly repairs report requested by admin: {current_user.email} "
         f"for {year}-{month:02d}"
     )
 
-    pdf_content = report_service.generate_monthly_repairs_report(db, year, month)
-
-    filename = f"reparaciones_{year}_{month:02d}.pdf"
-
-    return Response(
-        content=pdf_content,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    return await _download_report("repairs-monthly", year=year, month=month)
 
 
 @router.get(
@@ -845,7 +1209,6 @@ async def admin_report_financial_monthly_pdf(
     current_user: Annotated[User, Depends(get_current_user_from_cookie)],
     year: int,
     month: int,
-    db: Session = Depends(get_async_session),
 ) -> Response:
     """Generate and download monthly financial PDF report.
 
@@ -853,29 +1216,112 @@ async def admin_report_financial_monthly_pdf(
         current_user: Currently authenticated admin user.
         year: Year to filter (e.g., 2024).
         month: Month to filter (1-12).
-        db: Database session.
 
     Returns:
         PDF file download response.
     """
-    from app.services.report_service import report_service
-
-    if month < 1 or month > 12:
-        from fastapi import HTTPException
-
-        raise HTTPException(status_code=400, detail="Mes inválido (debe ser 1-12)")
+    _validate_month(month)
 
     logger.info(
         f"Monthly financial report requested by admin: {current_user.email} "
         f"for {year}-{month:02d}"
     )
 
-    pdf_content = report_service.generate_monthly_financial_report(db, year, month)
+    return await _download_report("financial-monthly", year=year, month=month)
 
-    filename = f"informe_financiero_{year}_{month:02d}.pdf"
 
-    return Response(
-        content=pdf_content,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+@router.post(
+    "/reports/{kind}/jobs",
+    status_code=202,
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_report_job_create(
+    current_user: Annotated[User, Depends(get_current_user_from_cookie)],
+    kind: str,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+) -> JSONResponse:
+    """Queue a report for background generation.
+
+    Args:
+        current_user: Currently authenticated admin user.
+        kind: Report name (low-stock, accounts-receivable, repairs-monthly,
+            financial-monthly).
+        year: Year for monthly reports.
+        month: Month for monthly reports (1-12).
+
+    Returns:
+        JSON with the job status and its status and download URLs.
+    """
+    from app.services.report_jobs import REPORT_KINDS, report_jobs
+
+    if kind not in REPORT_KINDS:
+        raise HTTPException(status_code=404, detail="Reporte no encontrado")
+
+    params = {}
+    if kind.endswith("-monthly"):
+        if year is None or month is None:
+            raise HTTPException(status_code=400, detail="Año y mes son requeridos")
+        _validate_month(month)
+        params = {"year": year, "month": month}
+
+    logger.info(f"Report job {kind} {params} requested by admin: {current_user.email}")
+
+    job = report_jobs.submit(kind, **params)
+    return JSONResponse(status_code=202, content=_report_job_payload(job))
+
+
+@router.get(
+    "/reports/jobs/{job_id}",
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_report_job_status(job_id: str) -> JSONResponse:
+    """Get the status of a report job.
+
+    Args:
+        job_id: Job identifier returned when the report was queued.
+
+    Returns:
+        JSON with the job status and its status and download URLs.
+    """
+    from app.services.report_jobs import report_jobs
+
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Reporte no encontrado")
+
+    return JSONResponse(content=_report_job_payload(job))
+
+
+@router.get(
+    "/reports/jobs/{job_id}/download",
+    dependencies=[Depends(require_web_role(["admin"]))],
+)
+async def admin_report_job_download(job_id: str) -> Response:
+    """Download the PDF of a completed report job.
+
+    Args:
+        job_id: Job identifier returned when the report was queued.
+
+    Returns:
+        PDF file download response.
+    """
+    from app.services.report_jobs import ReportJobStatus, report_jobs
+
+    job = report_jobs.get(job_id, pin=True)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Reporte no encontrado")
+    if job.status != ReportJobStatus.completed:
+        report_jobs.release(job)
+        raise HTTPException(status_code=409, detail="El reporte aún no está listo")
+
+    return _report_file_response(job)
+
+
+def _report_job_payload(job: "ReportJob") -> dict:
+    """Serialize a report job with the URLs to poll and download it."""
+    return {
+        **job.to_dict(),
+        "status_url": f"/admin/reports/jobs/{job.id}",
+        "download_url": f"/admin/reports/jobs/{job.id}/download",
+    }
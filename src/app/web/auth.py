@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.core.auth import AuthService
+from app.core.concurrency import run_in_db_thread
 from app.core.web_auth import get_current_user_from_cookie
 from app.database import get_async_session
 from app.utils.templates import create_templates
@@ -103,7 +104,7 @@ async def dashboard(
         # Get dashboard statistics
         from app.services.dashboard_service import dashboard_service
 
-        stats = dashboard_service.get_dashboard_stats(db)
+        stats = await run_in_db_thread(dashboard_service.get_dashboard_stats, db)
 
         return templates.TemplateResponse(
             "dashboard.html",
@@ -9,6 +9,7 @@ from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import run_in_db_thread
 from app.core.web_auth import get_current_user_from_cookie
 from app.crud.cash_closing import cash_closing
 from app.crud.expense import expense as expense_crud
@@ -494,8 +495,8 @@ async def get_daily_summary_htmx(
         parsed_date = date.fromisoformat(target_date)
 
         # Get daily summary
-        daily_summary = cash_closing_service.calculate_daily_totals(
-            db=db, target_date=parsed_date
+        daily_summary = await run_in_db_thread(
+            cash_closing_service.calculate_daily_totals, db=db, target_date=parsed_date
         )
 
         # Get opening balance from configuration
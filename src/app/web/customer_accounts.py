@@ -12,6 +12,8 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_active_user, get_db
 from app.crud.customer import customer_crud
 from app.crud.customer_account import customer_account_crud
+from app.crud.pagination import InvalidCursorError, Page
+from app.crud.receivables_aging import receivables_aging
 from app.models.customer_account import TransactionType
 from app.models.user import User
 from app.services.customer_account_service import customer_account_service
@@ -151,6 +153,7 @@ async def generate_customer_statement(
     customer_id: int,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -180,9 +183,15 @@ async def generate_customer_statement(
 
     try:
         # Generate statement
-        statement = customer_account_service.get_statement(
-            db, customer_id, start_datetime, end_datetime
-        )
+        try:
+            statement = customer_account_service.get_statement(
+                db, customer_id, start_datetime, end_datetime, cursor=cursor
+            )
+        except InvalidCursorError:
+            # Stale or tampered link: show the first page
+            statement = customer_account_service.get_statement(
+                db, customer_id, start_datetime, end_datetime
+            )
 
         return templates.TemplateResponse(
             "accounts/statement.html",
@@ -190,6 +199,11 @@ async def generate_customer_statement(
                 "request": request,
                 "customer": customer,
                 "statement": statement,
+                "page": Page(
+                    next_cursor=statement.next_cursor,
+                    prev_cursor=statement.prev_cursor,
+                    total=statement.transaction_count,
+                ),
                 "current_user": current_user,
             },
         )
@@ -371,6 +385,9 @@ async def accounts_receivable_dashboard(
     # Get accounts with credit
     credit_accounts, _ = customer_account_crud.get_accounts_with_credit(db, limit=5)
 
+    # Get open balances by age
+    aging = customer_account_service.get_aging_report(db)
+
     return templates.TemplateResponse(
         "accounts/dashboard.html",
         {
@@ -378,6 +395,8 @@ async def accounts_receivable_dashboard(
             "summary": summary,
             "top_debtors": top_debtors,
             "credit_accounts": credit_accounts,
+            "aging": aging[:10],
+            "aging_totals": receivables_aging.totals(aging),
             "current_user": current_user,
         },
     )
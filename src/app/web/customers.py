@@ -3,27 +3,39 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import Annotated
 from urllib.parse import quote
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, status
-from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from sqlalchemy.orm import Session
 
 from app.core.web_auth import get_current_user_from_cookie
-from app.crud.customer import customer_crud
+from app.crud.customer import LOOKUP_MAX_RESULTS, customer_crud
+from app.crud.customer_account import customer_account_crud
+from app.crud.pagination import InvalidCursorError
 from app.dependencies import get_db
+from app.models.customer_account import CustomerTransaction
 from app.models.user import User
 from app.schemas.customer import CustomerCreate
 from app.services.customer import customer_service
+from app.utils.http_cache import with_etag
 from app.utils.templates import create_templates
+from app.utils.timezone import local_date_to_utc_range
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/customers", tags=["customers-web"])
 templates = create_templates()
 
+# Ledger rows per page of the statement view
+STATEMENT_PAGE_SIZE = 50
+
 
 @router.get("/", response_class=HTMLResponse)
 async def customer_list(
@@ -50,49 +62,10 @@ async def customer_list(
 
     per_page = 20
 
-    if search:
-        # Call service for search
-        from app.crud.customer_account import customer_account_crud
-
-        customers_raw = customer_service.search_customers(
-            db=db, query=search, include_inactive=False, limit=per_page
-        )
-        # Add balance info from CustomerAccount (same source as list_with_balances)
-        customers_with_balance = []
-        for customer in customers_raw:
-            account = customer_account_crud.get_by_customer_id(db, customer.id)
-            if account:
-                balance_info = {
-                    "current_balance": float(account.account_balance),
-                    "has_debt": account.has_debt,
-                    "has_credit": account.has_credit,
-                    "status": "debt"
-                    if account.has_debt
-                    else "credit"
-                    if account.has_credit
-                    else "clear",
-                    "formatted": f"${abs(account.account_balance):,.2f}",
-                }
-            else:
-                # No account exists - show zero balance
-                balance_info = {
-                    "current_balance": 0.0,
-                    "has_debt": False,
-                    "has_credit": False,
-                    "status": "clear",
-                    "formatted": "$0.00",
-                }
-            customer_dict = (
-                customer.to_dict() if hasattr(customer, "to_dict") else customer
-            )
-            customers_with_balance.append({**customer_dict, **balance_info})
-        customers = customers_with_balance
-        total = len(customers)  # For now, simple count
-    else:
-        # Get customers with balances using updated CRUD method
-        skip = (page - 1) * per_page
-        customers = customer_crud.list_with_balances(db, skip=skip, limit=per_page)
-        total = customer_service.get_customer_count(db)
+    # Browse and search share one query that also returns the total
+    customers, total = customer_crud.list_with_balances(
+        db, skip=(page - 1) * per_page, limit=per_page, search=search
+    )
 
     total_pages = (total + per_page - 1) // per_page
 
@@ -115,6 +88,25 @@ async def customer_list(
     )
 
 
+@router.get("/lookup", response_class=HTMLResponse)
+async def customer_lookup_options(
+    request: Request,
+    q: Annotated[str, Query()] = "",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_from_cookie),
+):
+    """Select options for customers matching a type-ahead term (HTMX)."""
+    customers = customer_crud.lookup(db, q, limit=LOOKUP_MAX_RESULTS)
+
+    return with_etag(
+        request,
+        templates.TemplateResponse(
+            "customers/partials/lookup_options.html",
+            {"request": request, "customers": customers, "term": q.strip()},
+        ),
+    )
+
+
 @router.get("/new", response_class=HTMLResponse)
 async def new_customer_form(
     request: Request,
@@ -217,20 +209,50 @@ async def create_customer_submit(
         )
 
 
+def _statement_row(trans: CustomerTransaction) -> dict:
+    """Format a ledger transaction for the statement and detail pages.
+
+    Amounts are signed from the customer's side: payments and credit notes
+    are positive, sales and debit notes negative.
+    """
+    return {
+        "date": trans.transaction_date,
+        "type": trans.transaction_type.value
+        if hasattr(trans.transaction_type, "value")
+        else trans.transaction_type,
+        "description": trans.description,
+        "amount": trans.amount if trans.is_credit else -trans.amount,
+        "reference": f"{trans.reference_type}_{trans.reference_id}"
+        if trans.reference_type
+        else "",
+        "running_balance": trans.balance_after,
+        "created_by": trans.created_by.full_name if trans.created_by else None,
+    }
+
+
 @router.get("/{customer_id}/statement", response_class=HTMLResponse)
 async def customer_statement(
     customer_id: int,
     request: Request,
     format: str = Query("html", pattern="^(html|pdf)$"),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    cursor: str | None = Query(None),
     current_user: User = Depends(get_current_user_from_cookie),
     db: Session = Depends(get_db),
 ):
     """View or download customer account statement.
 
+    The HTML view shows one keyset page of the ledger, newest first. The
+    download streams every transaction of the date window.
+
     Args:
         customer_id: ID of the customer.
         request: FastAPI request object.
         format: Output format (html or pdf).
+        start_date: Optional first local day of the window.
+        end_date: Optional last local day of the window.
+        cursor: Pagination cursor of the HTML view.
         current_user: Currently authenticated user.
         db: Database session.
 
@@ -247,9 +269,6 @@ async def customer_statement(
         )
 
     # Get balance and transactions from customer account service (new system)
-    from app.crud.customer_account import customer_account_crud
-    from app.models.customer_account import CustomerTransaction
-
     # Get or create account
     account = customer_account_crud.get_or_create(db, customer_id, 1)  # System user
     db.commit()
@@ -271,50 +290,43 @@ async def customer_statement(
         else "$0.00",
     }
 
-    # Get all transactions
-    transactions_query = (
-        db.query(CustomerTransaction)
-        .filter(CustomerTransaction.customer_id == customer_id)
-        .order_by(CustomerTransaction.transaction_date.desc())
-        .all()
-    )
-
-    # Format transactions
-    transactions = []
-    for trans in transactions_query:
-        transactions.append(
-            {
-                "date": trans.transaction_date,
-                "type": trans.transaction_type.value
-                if hasattr(trans.transaction_type, "value")
-                else trans.transaction_type,
-                "description": trans.description,
-                "amount": float(trans.amount)
-                if trans.is_credit
-                else -float(trans.amount),
-                "reference": f"{trans.reference_type}_{trans.reference_id}"
-                if trans.reference_type
-                else "",
-                "running_balance": float(trans.balance_after),
-            }
-        )
+    window = {
+        "customer_id": customer_id,
+        "start_date": local_date_to_utc_range(start_date)[0] if start_date else None,
+        "end_date": local_date_to_utc_range(end_date)[1] if end_date else None,
+    }
 
     if format == "pdf":
-        # Generate PDF using simple HTML to PDF approach
-        from app.utils.pdf_generator import generate_statement_pdf
+        from app.utils.pdf_generator import iter_statement_html
 
-        pdf_bytes = generate_statement_pdf(
-            customer.to_dict(), balance_info, transactions
+        # Rows are read in batches while the response is sent; the session
+        # stays open until the response completes
+        rows = (
+            _statement_row(trans)
+            for trans in customer_account_crud.iter_statement_transactions(db, **window)
         )
-
-        return Response(
-            content=pdf_bytes,
+        return StreamingResponse(
+            iter_statement_html(customer.to_dict(), balance_info, rows),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=statement_{customer.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
             },
         )
 
+    try:
+        page = customer_account_crud.get_statement_page(
+            db,
+            **window,
+            cursor=cursor,
+            limit=STATEMENT_PAGE_SIZE,
+            with_total=cursor is None,
+        )
+    except InvalidCursorError:
+        # Stale or tampered link: show the first page
+        page = customer_account_crud.get_statement_page(
+            db, **window, limit=STATEMENT_PAGE_SIZE, with_total=True
+        )
+
     # HTML view
     return templates.TemplateResponse(
         "customers/statement.html",
@@ -322,7 +334,10 @@ async def customer_statement(
             "request": request,
             "customer": customer,
             "balance_info": balance_info,
-            "transactions": transactions,
+            "transactions": [_statement_row(trans) for trans in page.items],
+            "page": page,
+            "start_date": start_date,
+            "end_date": end_date,
             "current_user": current_user,
             "generated_at": datetime.now(),
         },
@@ -352,8 +367,6 @@ async def send_balance_reminder(
         return {"error": "Cliente no encontrado"}
 
     # Get balance from customer account service (new system)
-    from app.crud.customer_account import customer_account_crud
-
     account = customer_account_crud.get_or_create(db, customer_id, current_user.id)
     db.commit()
 
@@ -406,8 +419,6 @@ async def customer_detail(
         )
 
     # Get balance info from customer account service (new system)
-    from app.crud.customer_account import customer_account_crud
-
     # Get or create account
     account = customer_account_crud.get_or_create(db, customer_id, current_user.id)
     db.commit()
@@ -429,36 +440,11 @@ async def customer_detail(
         else "$0.00",
     }
 
-    # Get recent transactions from account (last 10)
-    from app.models.customer_account import CustomerTransaction
-
-    transactions_query = (
-        db.query(CustomerTransaction)
-        .filter(CustomerTransaction.customer_id == customer_id)
-        .order_by(CustomerTransaction.transaction_date.desc())
-        .limit(10)
-        .all()
+    # Recent transactions from the account (last 10)
+    page = customer_account_crud.get_statement_page(
+        db, customer_id=customer_id, limit=10
     )
-
-    # Format transactions to match template expectations
-    transactions = []
-    for trans in transactions_query:
-        transactions.append(
-            {
-                "date": trans.transaction_date,
-                "type": trans.transaction_type.value
-                if hasattr(trans.transaction_type, "value")
-                else trans.transaction_type,
-                "description": trans.description,
-                "amount": float(trans.amount)
-                if trans.is_credit
-                else -float(trans.amount),  # Credits positive, debits negative
-                "reference": f"{trans.reference_type}_{trans.reference_id}"
-                if trans.reference_type
-                else "",
-                "running_balance": float(trans.balance_after),
-            }
-        )
+    transactions = [_statement_row(trans) for trans in page.items]
 
     return templates.TemplateResponse(
         "customers/detail.html",
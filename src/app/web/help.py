@@ -1,22 +1,18 @@
 """Help center and documentation routes."""
 
-from pathlib import Path
-
-import markdown
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse
 
 from app.core.web_auth import get_current_user_optional
 from app.models.user import User
+from app.utils.help_docs import help_documents
+from app.utils.http_cache import with_etag
 from app.utils.templates import create_templates
 
 templates = create_templates()
 
 router = APIRouter(prefix="/ayuda", tags=["help"])
 
-# Path to documentation files - relative to project root
-DOCS_PATH = Path(__file__).parent.parent.parent.parent / "docs" / "user-guide" / "es"
-
 
 @router.get("", response_class=HTMLResponse)
 async def help_center(
@@ -34,36 +30,54 @@ async def help_center(
     )
 
 
+def _render_document(
+    request: Request, slug: str, current_user: User | None, not_found: str
+) -> HTMLResponse:
+    """Render a cached help document, revalidated with ETag/Last-Modified."""
+    document = help_documents.get(slug)
+    if document is None:
+        raise HTTPException(status_code=404, detail=not_found)
+
+    response = templates.TemplateResponse(
+        "help/document.html",
+        {
+            "request": request,
+            "title": document.title,
+            "content": document.html,
+            "back_link": "/ayuda",
+            "current_user": current_user,
+        },
+    )
+    return with_etag(request, response, last_modified=document.modified_at)
+
+
 @router.get("/guia-rapida", response_class=HTMLResponse)
 async def quick_guide(
     request: Request,
     current_user: User = Depends(get_current_user_optional),
 ):
     """Display the quick start guide."""
-    try:
-        # Read the markdown file
-        guide_path = DOCS_PATH / "GUIA-RAPIDA.md"
-        with open(guide_path, encoding="utf-8") as f:
-            content = f.read()
-
-        # Convert markdown to HTML
-        html_content = markdown.markdown(
-            content,
-            extensions=["extra", "codehilite", "tables", "toc"],
-        )
-
-        return templates.TemplateResponse(
-            "help/document.html",
-            {
-                "request": request,
-                "title": "Guía Rápida - 5 Minutos",
-                "content": html_content,
-                "back_link": "/ayuda",
-                "current_user": current_user,
-            },
-        )
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Guía no encontrada")
+    return _render_document(request, "guia-rapida", current_user, "Guía no encontrada")
+
+
+@router.get("/buscar", response_class=HTMLResponse)
+async def help_search(
+    request: Request,
+    q: str = Query("", max_length=100),
+    current_user: User = Depends(get_current_user_optional),
+):
+    """Search the help documents."""
+    context = {
+        "request": request,
+        "title": "Buscar en la Ayuda",
+        "query": q,
+        "results": help_documents.search(q),
+        "current_user": current_user,
+    }
+
+    if request.headers.get("HX-Request"):
+        return templates.TemplateResponse("help/partials/search_results.html", context)
+    return templates.TemplateResponse("help/search.html", context)
 
 
 @router.get("/documento/{doc_name}", response_class=HTMLResponse)
@@ -73,51 +87,4 @@ async def help_document(
     current_user: User = Depends(get_current_user_optional),
 ):
     """Display a specific help document."""
-    # Map friendly names to actual file names
-    doc_mapping = {
-        "introduccion": "01-introduccion.md",
-        "primeros-pasos": "02-primeros-pasos.md",
-        "clientes": "03-gestion-clientes.md",
-        "productos": "04-gestion-productos.md",
-        "ventas": "05-proceso-ventas.md",
-        "reparaciones": "06-gestion-reparaciones.md",
-        "caja": "07-control-caja.md",
-        "garantias": "08-garantias.md",
-        "reportes": "09-reportes.md",
-        "configuracion": "10-configuracion.md",
-        "faq": "11-preguntas-frecuentes.md",
-        "glosario": "12-glosario.md",
-    }
-
-    # Get the actual filename
-    filename = doc_mapping.get(doc_name)
-    if not filename:
-        raise HTTPException(status_code=404, detail="Documento no encontrado")
-
-    try:
-        # Read the markdown file
-        doc_path = DOCS_PATH / filename
-        with open(doc_path, encoding="utf-8") as f:
-            content = f.read()
-
-        # Convert markdown to HTML
-        html_content = markdown.markdown(
-            content,
-            extensions=["extra", "codehilite", "tables", "toc"],
-        )
-
-        # Get title from filename
-        title = filename.replace(".md", "").replace("-", " ").title()
-
-        return templates.TemplateResponse(
-            "help/document.html",
-            {
-                "request": request,
-                "title": title,
-                "content": html_content,
-                "back_link": "/ayuda",
-                "current_user": current_user,
-            },
-        )
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Documento no encontrado")
+    return _render_document(request, doc_name, current_user, "Documento no encontrado")
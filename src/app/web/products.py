@@ -9,6 +9,7 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
 from app.core.web_auth import get_current_user_from_cookie
+from app.crud.pagination import InvalidCursorError
 from app.dependencies import get_db
 from app.models.user import User
 from app.schemas.product import ProductCreate
@@ -26,7 +27,7 @@ async def products_list(
     request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
-    page: int = 1,
+    cursor: Optional[str] = None,
     search: str = "",
     category_id: str = "",
     stock_status: str = "all",
@@ -35,7 +36,10 @@ async def products_list(
     sort_order: str = "asc",
     view: str = "table",
 ):
-    """Display the products list page with enhanced filtering."""
+    """Display the products list page with enhanced filtering.
+
+    Pages are keyset paginated; the total is only counted on the first page.
+    """
     from app.schemas.filters import (
         ProductFilter,
         ProductListParams,
@@ -94,13 +98,19 @@ async def products_list(
         filters=filters,
         sort_by=sort_field,
         sort_order=sort_ord,
-        page=page,
+        cursor=cursor,
         page_size=20,
+        include_total=cursor is None,
         view_mode=view_mode,
     )
 
-    # Get products with new method
-    products, total = await service.get_product_list(params)
+    # Get products with new method; stale cursors restart from the first page
+    try:
+        page = await service.get_product_list(params)
+    except InvalidCursorError:
+        params.cursor = None
+        params.include_total = True
+        page = await service.get_product_list(params)
 
     # Get categories for filter
     categories = await category_service.get_categories(is_active=True)
@@ -108,19 +118,14 @@ async def products_list(
     # Get filter options
     filter_options = await service.get_filter_options()
 
-    # Calculate pagination
-    total_pages = (total + params.page_size - 1) // params.page_size
-
     return templates.TemplateResponse(
         "products/list.html",
         {
             "request": request,
             "current_user": current_user,
-            "products": products,
+            "products": page.items,
             "categories": categories,
             "page": page,
-            "total_pages": total_pages,
-            "total": total,
             "search": search,
             "category_id": category_id,
             "stock_status": stock_status,
@@ -10,6 +10,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
 from app.core.web_auth import get_current_user_from_cookie
+from app.crud.pagination import InvalidCursorError
 from app.database import get_async_session as get_db
 from app.models.user import User
 from app.schemas.repair import (
@@ -33,11 +34,14 @@ async def repair_list(
     request: Request,
     q: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
 ):
-    """Render repair list page."""
+    """Render repair list page.
+
+    Pages are keyset paginated; the total is only counted on the first page.
+    """
     # Convert status string to enum if provided
     status_filter = None
     if status:
@@ -49,21 +53,24 @@ async def repair_list(
     params = RepairSearchParams(
         q=q,
         status=status_filter,
-        page=page,
+        cursor=cursor,
         page_size=20,
+        include_total=cursor is None,
     )
 
-    repairs, total = repair_service.search_repairs(db=db, params=params)
+    try:
+        page = repair_service.search_repairs(db=db, params=params)
+    except InvalidCursorError:
+        params.cursor = None
+        params.include_total = True
+        page = repair_service.search_repairs(db=db, params=params)
 
     context = {
         "request": request,
         "current_user": current_user,
         "page_title": "Repairs",
-        "repairs": repairs,
-        "total": total,
+        "repairs": page.items,
         "page": page,
-        "page_size": 20,
-        "total_pages": (total + 19) // 20,
         "search_query": q,
         "status_filter": status,
         "repair_statuses": [s.value for s in RepairStatus],
@@ -79,18 +86,14 @@ async def new_repair_form(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
 ):
-    """Render new repair form."""
+    """Render new repair form.
+
+    Customers are picked with the ``/customers/lookup`` type-ahead, so only
+    a preselected customer is loaded here.
+    """
     from app.models.customer import Customer
     from app.models.user import User as TechUser
 
-    # Get all customers for dropdown
-    customers = (
-        db.query(Customer)
-        .filter(Customer.is_active.is_(True))
-        .order_by(Customer.name)
-        .all()
-    )
-
     # Get all technicians (users)
     technicians = db.query(TechUser).filter(TechUser.is_active.is_(True)).all()
 
@@ -105,7 +108,6 @@ async def new_repair_form(
         "request": request,
         "current_user": current_user,
         "page_title": "New Repair",
-        "customers": customers,
         "technicians": technicians,
         "selected_customer": selected_customer,
     }
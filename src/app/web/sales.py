@@ -3,19 +3,25 @@
 import logging
 from datetime import datetime
 from decimal import Decimal
+from html import escape
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
+from app.core.concurrency import run_in_db_thread
 from app.core.web_auth import get_current_user_from_cookie
+from app.crud.customer import customer_crud
+from app.crud.pagination import InvalidCursorError
+from app.crud.product_catalog import product_catalog
 from app.crud.sale import sale_crud
 from app.database import get_async_session as get_db
 from app.models.user import User
 from app.schemas.sale import SaleCreate, SaleItemCreate
 from app.services.cash_closing_service import cash_closing_service
 from app.services.invoice_service import invoice_service
+from app.utils.http_cache import with_etag
 from app.utils.templates import create_templates
 
 logger = logging.getLogger(__name__)
@@ -23,6 +29,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 templates = create_templates()
 
+# Customers listed by the POS customer type-ahead
+CUSTOMER_LOOKUP_LIMIT = 20
+
 
 @router.get("/pos", response_class=HTMLResponse)
 async def pos_interface(
@@ -86,7 +95,9 @@ async def search_products_htmx(
     if len(q.strip()) < 1:
         products = []
     else:
-        products = sale_crud.search_products(db, query=q.strip(), limit=10)
+        products = await run_in_db_thread(
+            sale_crud.search_products, db, query=q.strip(), limit=10
+        )
 
     context = {
         "request": request,
@@ -204,24 +215,26 @@ async def add_repair_to_cart(
 @router.get("/pos/customers", response_class=HTMLResponse)
 async def get_customers_htmx(
     request: Request,
+    q: str = Query(default=""),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
 ):
-    """Get customer list for select dropdown."""
-    from app.models.customer import Customer
-
-    customers = (
-        db.query(Customer)
-        .filter(Customer.is_active.is_(True))
-        .order_by(Customer.name)
-        .all()
+    """Get select dropdown options for customers matching a type-ahead term.
+
+    Without a term only the walk-in option is returned; the customer table
+    is never sent whole.
+    """
+    customers = await run_in_db_thread(
+        customer_crud.lookup, db, q, limit=CUSTOMER_LOOKUP_LIMIT
     )
 
-    html = '<option value="">Walk-in Customer</option>'
-    for customer in customers:
-        html += f'<option value="{customer.id}">{customer.name}</option>'
+    options = ['<option value="">Walk-in Customer</option>']
+    options.extend(
+        f'<option value="{customer.id}">{escape(customer.name)}</option>'
+        for customer in customers
+    )
 
-    return HTMLResponse(content=html)
+    return with_etag(request, HTMLResponse(content="".join(options)))
 
 
 @router.get("/pos/customers/search", response_class=HTMLResponse)
@@ -231,24 +244,9 @@ async def search_customers_htmx(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
 ):
-    """Search customers and return HTMX partial."""
-    from sqlalchemy import or_
-
-    from app.models.customer import Customer
-
-    query = q.lower()
-    customers = (
-        db.query(Customer)
-        .filter(
-            Customer.is_active.is_(True),
-            or_(
-                Customer.name.ilike(f"%{query}%"),
-                Customer.phone.ilike(f"%{query}%"),
-                Customer.email.ilike(f"%{query}%"),
-            ),
-        )
-        .limit(20)
-        .all()
+    """Search customers by name or phone prefix and return HTMX partial."""
+    customers = await run_in_db_thread(
+        customer_crud.lookup, db, q, limit=CUSTOMER_LOOKUP_LIMIT
     )
 
     context = {
@@ -256,8 +254,11 @@ async def search_customers_htmx(
         "customers": customers,
     }
 
-    return templates.TemplateResponse(
-        "sales/partials/customer_search_results.html", context
+    return with_etag(
+        request,
+        templates.TemplateResponse(
+            "sales/partials/customer_search_results.html", context
+        ),
     )
 
 
@@ -326,11 +327,13 @@ async def add_to_cart(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
 ):
-    """Add product to cart (HTMX endpoint)."""
-    # Get product details
-    from app.models.product import Product
+    """Add product to cart (HTMX endpoint).
 
-    product = db.query(Product).filter(Product.id == product_id).first()
+    Reads the product from the in-process catalog, so adding a recently
+    viewed product does not query the database. The stock check here is
+    advisory; checkout locks the rows and checks stock again.
+    """
+    product = product_catalog.get(db, product_id)
 
     if not product:
         return HTMLResponse(
@@ -731,7 +734,9 @@ async def process_checkout(
         #   3. Creating Payment record
         #   4. Recording PAYMENT transaction in customer account
         # DO NOT create duplicate payments here!
-        sale = sale_crud.create_sale(db=db, sale_in=sale_data, user_id=current_user.id)
+        sale = await run_in_db_thread(
+            sale_crud.create_sale, db=db, sale_in=sale_data, user_id=current_user.id
+        )
 
         # Handle credit payments (account_credit or mixed with credit)
         if sale.customer_id and payment_method in ["account_credit", "mixed"]:
@@ -898,7 +903,7 @@ async def process_checkout(
 @router.get("/", response_class=HTMLResponse)
 async def sales_history(
     request: Request,
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     search: Optional[str] = None,
     customer_search: Optional[str] = Query(None),
     start_date: Optional[str] = None,
@@ -907,9 +912,11 @@ async def sales_history(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie),
 ):
-    """Display sales history."""
+    """Display sales history.
+
+    Pages are keyset paginated; the total is only counted on the first page.
+    """
     page_size = 20
-    skip = (page - 1) * page_size
 
     # Parse dates
     start_datetime = None
@@ -940,33 +947,34 @@ async def sales_history(
             except ValueError:
                 logger.warning(f"Invalid end_date format: {end_date}")
 
-    # Get sales with customer search
-    sales, total = sale_crud.get_multi_with_filters(
-        db,
-        skip=skip,
-        limit=page_size,
-        customer_search=customer_search
+    filters = {
+        "customer_search": customer_search
         if customer_search and customer_search.strip()
         else None,
-        start_date=start_datetime,
-        end_date=end_datetime,
-        payment_status=payment_status
+        "start_date": start_datetime,
+        "end_date": end_datetime,
+        "payment_status": payment_status
         if payment_status and payment_status.strip()
         else None,
-        is_voided=False,
-    )
+        "is_voided": False,
+    }
 
-    # Calculate pagination
-    total_pages = (total + page_size - 1) // page_size
+    # Get sales with customer search; stale cursors restart from the first page
+    try:
+        page = sale_crud.get_multi_with_filters(
+            db, cursor=cursor, limit=page_size, with_total=cursor is None, **filters
+        )
+    except InvalidCursorError:
+        page = sale_crud.get_multi_with_filters(
+            db, limit=page_size, with_total=True, **filters
+        )
 
     context = {
         "request": request,
         "current_user": current_user,
         "page_title": "Sales History",
-        "sales": sales,
-        "total": total,
+        "sales": page.items,
         "page": page,
-        "total_pages": total_pages,
         "search": search,
         "customer_search": customer_search,
         "start_date": start_date,
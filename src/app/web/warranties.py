@@ -8,6 +8,7 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_db
+from app.crud.pagination import InvalidCursorError
 from app.models.user import User
 from app.schemas.warranty import (
     WarrantyCheckRequest,
@@ -28,26 +29,29 @@ async def warranty_list(
     request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     q: Optional[str] = None,
 ) -> HTMLResponse:
-    """Display warranty list page."""
-    logger.info(f"User {current_user.id} viewing warranty list")
+    """Display warranty list page.
 
-    params = WarrantySearchParams(page=page, q=q)
-    warranties, total = warranty_service.search_warranties(db, params=params)
+    Pages are keyset paginated; the total is only counted on the first page.
+    """
+    logger.info(f"User {current_user.id} viewing warranty list")
 
-    # Calculate pagination
-    total_pages = (total + params.page_size - 1) // params.page_size
+    params = WarrantySearchParams(cursor=cursor, q=q, include_total=cursor is None)
+    try:
+        page = warranty_service.search_warranties(db, params=params)
+    except InvalidCursorError:
+        params.cursor = None
+        params.include_total = True
+        page = warranty_service.search_warranties(db, params=params)
 
     return templates.TemplateResponse(
         "warranties/list.html",
         {
             "request": request,
-            "warranties": warranties,
-            "current_page": page,
-            "total_pages": total_pages,
-            "total": total,
+            "warranties": page.items,
+            "page": page,
             "search_query": q or "",
             "current_user": current_user,
         },
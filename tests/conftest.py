@@ -3,6 +3,9 @@
 import os
 
 import pytest
+from app.core.user_cache import user_cache
+from app.crud.product_catalog import product_catalog
+from app.crud.product_search import product_search
 from app.database import get_db
 from app.main import app
 
@@ -10,6 +13,7 @@ from app.main import app
 from app.models import *  # noqa: F401, F403
 from app.models.base import Base
 from app.models.user import User
+from app.services.dashboard_service import dashboard_service
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -51,6 +55,12 @@ def db_session(db_engine):
     Base.metadata.drop_all(bind=db_engine)
     Base.metadata.create_all(bind=db_engine)
 
+    # Cached identities would outlive the recreated users table
+    user_cache.clear()
+    dashboard_service.invalidate()
+    product_search.index.clear()
+    product_catalog.clear()
+
     # Create a new session for the test
     session = TestingSessionLocal()
 
@@ -0,0 +1,143 @@
+"""Tests for the batched checkout pipeline in SaleCRUD."""
+
+from decimal import Decimal
+
+import pytest
+from app.crud.cash_closing import cash_closing
+from app.crud.sale import sale_crud
+from app.models.customer import Customer
+from app.models.product import Category, Product
+from app.schemas.sale import SaleCreate, SaleItemCreate
+from app.utils.timezone import get_local_today
+from sqlalchemy import event
+
+
+@pytest.fixture
+def checkout_setup(db_session, test_user):
+    """Open the register and create a walk-in customer and 30 products.
+
+    Returns the product IDs, so counting statements never touches expired rows.
+    """
+    db_session.add(Customer(id=1, name="Walk-in Customer", phone="000-0000"))
+    category = Category(name="Accessories", is_active=True)
+    db_session.add(category)
+    db_session.flush()
+
+    products = [
+        Product(
+            sku=f"SKU-{i:03d}",
+            name=f"Product {i}",
+            category_id=category.id,
+            purchase_price=Decimal("5.00"),
+            first_sale_price=Decimal("10.00"),
+            second_sale_price=Decimal("9.00"),
+            third_sale_price=Decimal("8.00"),
+            tax_rate=Decimal("21.00"),
+            current_stock=50,
+            minimum_stock=1,
+            created_by=test_user.id,
+        )
+        for i in range(30)
+    ]
+    db_session.add_all(products)
+    cash_closing.open_cash_register(
+        db_session,
+        target_date=get_local_today(),
+        opening_balance=Decimal("0.00"),
+        opened_by=test_user.id,
+    )
+    db_session.commit()
+    return [product.id for product in products]
+
+
+def _checkout(db_session, user_id, product_ids, quantity=1):
+    sale_in = SaleCreate(
+        customer_id=1,
+        payment_method="cash",
+        items=[
+            SaleItemCreate(product_id=product_id, quantity=quantity)
+            for product_id in product_ids
+        ],
+    )
+    return sale_crud._create_sale_internal(db_session, sale_in=sale_in, user_id=user_id)
+
+
+def _count_statements(db_engine, func):
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", on_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", on_execute)
+    return result, statements
+
+
+class TestBatchedCheckout:
+    """Test round trips and pricing of _create_sale_internal."""
+
+    def test_products_loaded_in_one_query(
+        self, db_session, db_engine, test_user, checkout_setup
+    ):
+        """Test cart products are selected once regardless of cart size."""
+        _, statements = _count_statements(
+            db_engine, lambda: _checkout(db_session, test_user.id, checkout_setup)
+        )
+
+        product_selects = [
+            s
+            for s in statements
+            if s.lstrip().startswith("SELECT")
+            and "FROM products" in s
+            and "sale_items" not in s
+        ]
+        assert len(product_selects) == 1
+
+    def test_round_trips_do_not_grow_with_cart_size(
+        self, db_session, db_engine, test_user, checkout_setup
+    ):
+        """Test only the item INSERTs scale with the number of cart lines.
+
+        SQLite cannot batch ORM inserts that return primary keys, so each
+        ``sale_items`` row is its own statement there; every read and update
+        must stay constant.
+        """
+        user_id = test_user.id
+        _checkout(db_session, user_id, checkout_setup[:1])
+
+        _, small = _count_statements(
+            db_engine, lambda: _checkout(db_session, user_id, checkout_setup[:2])
+        )
+        _, large = _count_statements(
+            db_engine, lambda: _checkout(db_session, user_id, checkout_setup)
+        )
+
+        def without_item_inserts(statements):
+            return [s for s in statements if "INSERT INTO sale_items" not in s]
+
+        assert len(without_item_inserts(large)) == len(without_item_inserts(small))
+
+    def test_totals_tax_and_stock(self, db_session, test_user, checkout_setup):
+        """Test pricing is computed once and applied to items and stock."""
+        sale = _checkout(db_session, test_user.id, checkout_setup[:3], quantity=2)
+
+        assert sale.subtotal == Decimal("60.00")
+        assert sale.tax_amount == Decimal("12.60")
+        assert sale.total_amount == Decimal("72.60")
+        assert [item.total_price for item in sale.items] == [Decimal("20.00")] * 3
+        for product_id in checkout_setup[:3]:
+            assert db_session.get(Product, product_id).current_stock == 48
+
+    def test_repeated_lines_cannot_oversell(
+        self, db_session, test_user, checkout_setup
+    ):
+        """Test stock is checked against the summed quantity of a product."""
+        product_id = checkout_setup[0]
+
+        with pytest.raises(ValueError, match="Insufficient stock"):
+            _checkout(db_session, test_user.id, [product_id, product_id], quantity=30)
+
+        assert db_session.get(Product, product_id).current_stock == 50
@@ -0,0 +1,191 @@
+"""Tests for customer ledger balance checkpoints."""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from app.crud.customer_account import customer_account_crud
+from app.crud.customer_balance_checkpoint import customer_balance_checkpoint_crud
+from app.models.customer_account import (
+    CustomerAccount,
+    CustomerTransaction,
+    TransactionType,
+)
+from app.models.customer_balance_checkpoint import CustomerBalanceCheckpoint
+from sqlalchemy import event
+
+START = datetime(2025, 1, 10, 15, 0, tzinfo=UTC)
+UNTIL = datetime(2025, 6, 1, 3, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def ledger(db_session, test_user, test_customer) -> list[CustomerTransaction]:
+    """Create 40 transactions four days apart: sales of 100, every fourth a payment."""
+    account = CustomerAccount(customer_id=test_customer.id, created_by_id=test_user.id)
+    db_session.add(account)
+    db_session.flush()
+
+    balance = Decimal("0")
+    transactions = []
+    for index in range(40):
+        is_payment = index % 4 == 3
+        amount = Decimal("150.00") if is_payment else Decimal("100.00")
+        after = balance - amount if is_payment else balance + amount
+        transactions.append(
+            CustomerTransaction(
+                customer_id=test_customer.id,
+                account_id=account.id,
+                transaction_type=TransactionType.PAYMENT
+                if is_payment
+                else TransactionType.SALE,
+                amount=amount,
+                balance_before=balance,
+                balance_after=after,
+                description=f"Movement {index:02d}",
+                transaction_date=START + timedelta(days=4 * index),
+                created_by_id=test_user.id,
+            )
+        )
+        balance = after
+    account.account_balance = balance
+    db_session.add_all(transactions)
+    db_session.commit()
+    return transactions
+
+
+def _naive_balance(transactions, at: datetime) -> Decimal:
+    """Sum the deltas of every transaction before ``at``."""
+    return sum(
+        (
+            t.balance_after - t.balance_before
+            for t in transactions
+            if t.transaction_date.replace(tzinfo=UTC) < at
+        ),
+        Decimal("0.00"),
+    )
+
+
+def _checkpoints(db_session, customer_id) -> list[CustomerBalanceCheckpoint]:
+    return (
+        db_session.query(CustomerBalanceCheckpoint)
+        .filter(CustomerBalanceCheckpoint.customer_id == customer_id)
+        .order_by(CustomerBalanceCheckpoint.as_of)
+        .all()
+    )
+
+
+class TestBalanceCheckpoints:
+    """Test checkpoints give opening balances without replaying the ledger."""
+
+    def test_extend_adds_monthly_checkpoints_once(
+        self, db_session, test_customer, ledger
+    ):
+        """Test one checkpoint per month with activity, and reruns add none."""
+        added = customer_balance_checkpoint_crud.extend(db_session, until=UNTIL)
+        db_session.commit()
+
+        checkpoints = _checkpoints(db_session, test_customer.id)
+        # January to May had activity; June is still open
+        assert added == len(checkpoints) == 5
+        for checkpoint in checkpoints:
+            as_of = checkpoint.as_of.replace(tzinfo=UTC)
+            assert checkpoint.balance == _naive_balance(ledger, as_of)
+            assert checkpoint.transaction_count == sum(
+                1 for t in ledger if t.transaction_date.replace(tzinfo=UTC) < as_of
+            )
+
+        assert customer_balance_checkpoint_crud.extend(db_session, until=UNTIL) == 0
+
+    def test_balance_at_matches_full_sum(
+        self, db_session, db_engine, test_customer, ledger
+    ):
+        """Test checkpoint plus delta equals summing the whole ledger."""
+        customer_balance_checkpoint_crud.extend(db_session, until=UNTIL)
+        db_session.commit()
+
+        for days in (0, 1, 17, 45, 80, 121, 200):
+            at = START + timedelta(days=days, hours=1)
+            assert customer_balance_checkpoint_crud.balance_at(
+                db_session, customer_id=test_customer.id, at=at
+            ) == _naive_balance(ledger, at)
+
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            customer_account_crud.get_opening_balance(
+                db_session,
+                customer_id=test_customer.id,
+                before_date=START + timedelta(days=100),
+            )
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        # One checkpoint lookup, then a sum bounded below by its as_of
+        assert len(statements) == 2
+        assert "customer_balance_checkpoints" in statements[0][0]
+        assert "transaction_date >=" in statements[1][0]
+
+    def test_backdated_transaction_discards_later_checkpoints(
+        self, db_session, test_user, test_customer, ledger
+    ):
+        """Test a transaction dated before checkpoints invalidates them."""
+        customer_balance_checkpoint_crud.extend(db_session, until=UNTIL)
+        db_session.commit()
+
+        backdated = START + timedelta(days=50)
+        db_session.add(
+            CustomerTransaction(
+                customer_id=test_customer.id,
+                account_id=ledger[0].account_id,
+                transaction_type=TransactionType.ADJUSTMENT,
+                amount=Decimal("25.00"),
+                balance_before=Decimal("0.00"),
+                balance_after=Decimal("25.00"),
+                description="Backdated adjustment",
+                transaction_date=backdated,
+                created_by_id=test_user.id,
+            )
+        )
+        db_session.commit()
+
+        remaining = _checkpoints(db_session, test_customer.id)
+        assert all(c.as_of.replace(tzinfo=UTC) <= backdated for c in remaining)
+        assert len(remaining) == 2
+
+        at = START + timedelta(days=120)
+        assert customer_balance_checkpoint_crud.balance_at(
+            db_session, customer_id=test_customer.id, at=at
+        ) == _naive_balance(ledger, at) + Decimal("25.00")
+
+        assert customer_balance_checkpoint_crud.extend(db_session, until=UNTIL) == 3
+
+    def test_verify_reports_drift(self, db_session, test_customer, ledger):
+        """Test verify flags balance mismatches, broken links and stale checkpoints."""
+        customer_balance_checkpoint_crud.extend(db_session, until=UNTIL)
+        db_session.commit()
+        assert customer_balance_checkpoint_crud.verify(db_session) == []
+
+        account = customer_account_crud.get_by_customer_id(
+            db_session, customer_id=test_customer.id
+        )
+        account.account_balance += Decimal("10.00")
+        ledger[5].balance_after += Decimal("1.00")
+        db_session.commit()
+
+        (drift,) = customer_balance_checkpoint_crud.verify(
+            db_session, customer_id=test_customer.id
+        )
+        assert drift.customer_id == test_customer.id
+        assert drift.account_balance == drift.ledger_balance + Decimal("9.00")
+        assert drift.broken_links == 1
+        # The edited transaction is in January, before every checkpoint
+        assert drift.stale_checkpoints == 5
+
+        customer_balance_checkpoint_crud.rebuild(db_session)
+        db_session.commit()
+        (drift,) = customer_balance_checkpoint_crud.verify(db_session)
+        assert drift.stale_checkpoints == 0
@@ -0,0 +1,96 @@
+"""Tests for the benchmark dataset generator and runner."""
+
+from dataclasses import replace
+from datetime import date
+
+import pytest
+from app.crud.customer_balance_checkpoint import customer_balance_checkpoint_crud
+from app.crud.daily_register_totals import daily_register_totals
+from app.crud.product_catalog import product_catalog
+from app.crud.product_search import product_search
+from app.crud.sales_rollup import sales_rollup_crud
+from app.models.sale import Sale
+from app.services.dashboard_service import dashboard_service
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from benchmarks.dataset import DatasetSpec, create_schema, generate, is_empty
+from benchmarks.runner import format_table, run
+from benchmarks.scenarios import SCENARIOS
+
+SPEC = DatasetSpec(scale=0.05, years=0.25, seed=7, end=date(2026, 3, 31))
+
+
+def _generate(path, spec: DatasetSpec = SPEC):
+    engine = create_engine(f"sqlite:///{path}")
+    create_schema(engine)
+    return engine, generate(engine, spec)
+
+
+@pytest.fixture
+def bench_engine(tmp_path):
+    """Engine of a small generated dataset."""
+    engine, dataset = _generate(tmp_path / "bench.db")
+    yield engine, dataset
+    engine.dispose()
+    # The runner fills process-wide caches from the benchmark database
+    product_search.index.clear()
+    product_catalog.clear()
+    dashboard_service.invalidate()
+
+
+def test_generated_history_is_consistent(bench_engine):
+    """Test ledger, register totals and rollups agree with the sales."""
+    engine, dataset = bench_engine
+
+    assert not is_empty(engine)
+    assert dataset.rows["sales"] > 0
+    assert dataset.rows["customer_transactions"] > dataset.rows["sales"]
+    with Session(engine) as db:
+        assert customer_balance_checkpoint_crud.verify(db) == []
+        for day in (dataset.start, date(2026, 2, 14), dataset.end):
+            assert daily_register_totals.get_totals(
+                db, business_date=day
+            ) == daily_register_totals.compute(db, business_date=day)
+        assert sales_rollup_crud.get_stored(
+            db, start=dataset.start, end=dataset.end
+        ) == sales_rollup_crud.compute(db, start=dataset.start, end=dataset.end)
+
+
+def test_generation_is_reproducible(tmp_path):
+    """Test equal specs generate equal data and other seeds do not."""
+
+    def totals(path, spec):
+        engine, dataset = _generate(path, spec)
+        with Session(engine) as db:
+            total = db.scalar(select(func.sum(Sale.total_amount)))
+        engine.dispose()
+        return dataset.rows, total
+
+    first = totals(tmp_path / "first.db", SPEC)
+    second = totals(tmp_path / "second.db", SPEC)
+    other = totals(tmp_path / "other.db", replace(SPEC, seed=8))
+
+    assert first == second
+    assert first != other
+
+
+def test_every_scenario_runs(bench_engine):
+    """Test each scenario completes and reports statements per call."""
+    engine, _ = bench_engine
+
+    results = run(engine, iterations=2, warmup=0)
+
+    assert [r.scenario for r in results][-1] == "checkout"
+    assert {r.scenario for r in results} == set(SCENARIOS)
+    for result in results:
+        assert result.iterations == 2
+        assert result.p50_ms > 0
+    by_name = {r.scenario: r for r in results}
+    assert by_name["checkout"].queries > 0
+    assert by_name["daily_summary"].queries > 0
+
+    baseline = {"results": [{"scenario": "checkout", "p50_ms": 1.0, "queries": 1.0}]}
+    table = format_table(results, baseline)
+    assert "p50 Δ" in table
+    assert table.count("\n") == len(results) + 1
@@ -0,0 +1,86 @@
+"""Concurrency tests for customer account ledger writes."""
+
+import threading
+from decimal import Decimal
+
+from app.models.customer import Customer
+from app.models.customer_account import CustomerAccount, CustomerTransaction
+from app.models.sale import Sale
+from app.services.customer_account_service import customer_account_service
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+SALES = 8
+
+
+def test_parallel_sales_keep_walk_in_ledger_consistent(
+    db_session, db_engine, test_user
+):
+    """Test concurrent sales on the walk-in account lose no balance updates."""
+    db_session.add(Customer(id=1, name="Walk-in Customer", phone="000-0000"))
+    sales = [
+        Sale(
+            invoice_number=f"INV-TEST-{i:05d}",
+            customer_id=1,
+            user_id=test_user.id,
+            subtotal=Decimal("10.00"),
+            tax_amount=Decimal("0.00"),
+            total_amount=Decimal("10.00"),
+            payment_method="cash",
+        )
+        for i in range(SALES)
+    ]
+    db_session.add_all(sales)
+    db_session.commit()
+    customer_account_service.get_or_create_account(db_session, 1, test_user.id)
+    db_session.commit()
+
+    sale_ids = [sale.id for sale in sales]
+    user_id = test_user.id
+    # A separate pool keeps the worker connections out of later tests
+    worker_engine = create_engine(
+        db_engine.url, connect_args={"check_same_thread": False}
+    )
+    SessionLocal = sessionmaker(bind=worker_engine)
+    barrier = threading.Barrier(SALES)
+    errors = []
+
+    def record(sale_id):
+        db = SessionLocal()
+        try:
+            sale = db.get(Sale, sale_id)
+            barrier.wait()
+            customer_account_service.record_sale(db, sale, user_id)
+            db.commit()
+        except Exception as e:
+            errors.append(e)
+            db.rollback()
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in sale_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    worker_engine.dispose()
+
+    assert errors == []
+
+    db_session.expire_all()
+    account = db_session.query(CustomerAccount).filter_by(customer_id=1).one()
+    assert account.account_balance == Decimal("10.00") * SALES
+    assert account.total_sales == Decimal("10.00") * SALES
+    assert account.transaction_count == SALES
+
+    transactions = (
+        db_session.query(CustomerTransaction)
+        .filter_by(account_id=account.id)
+        .order_by(CustomerTransaction.balance_before)
+        .all()
+    )
+    balances = [(t.balance_before, t.balance_after) for t in transactions]
+    expected = [
+        (Decimal("10.00") * i, Decimal("10.00") * (i + 1)) for i in range(SALES)
+    ]
+    assert balances == expected
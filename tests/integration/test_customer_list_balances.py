@@ -0,0 +1,97 @@
+"""Tests for the customer list with balances (browse and search)."""
+
+from decimal import Decimal
+
+import pytest
+from app.crud.customer import customer_crud
+from app.models.customer import Customer
+from app.models.customer_account import CustomerAccount
+from sqlalchemy import event
+
+
+def _count_queries(db_engine, func):
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", on_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", on_execute)
+    return result, len(statements)
+
+
+@pytest.fixture
+def customers(db_session, test_user) -> list[Customer]:
+    """Create 30 customers, the even ones with an account balance."""
+    customers = []
+    for index in range(30):
+        customer = Customer(
+            name=f"List Customer {index:02d}",
+            phone=f"351555{index:04d}",
+            created_by_id=test_user.id,
+        )
+        db_session.add(customer)
+        db_session.flush()
+        if index % 2 == 0:
+            db_session.add(
+                CustomerAccount(
+                    customer_id=customer.id,
+                    account_balance=Decimal(index - 10),
+                    created_by_id=test_user.id,
+                )
+            )
+        customers.append(customer)
+    db_session.add(Customer(name="Other Person", phone="2615550000"))
+    db_session.commit()
+    return customers
+
+
+class TestCustomerListWithBalances:
+    """Test one query returns the page, balances and the total."""
+
+    def test_browse_page_has_balances_and_total(self, db_session, customers):
+        """Test balances, ordering and the total of a browse page."""
+        page, total = customer_crud.list_with_balances(db_session, skip=0, limit=20)
+
+        assert total == 31
+        assert [c["name"] for c in page[:2]] == [
+            "List Customer 00",
+            "List Customer 01",
+        ]
+        assert page[0]["has_credit"] and page[0]["current_balance"] == -10.0
+        assert page[1]["status"] == "clear" and page[1]["formatted"] == "$0.00"
+        assert page[14]["has_debt"] and page[14]["formatted"] == "$4.00"
+
+    def test_search_total_counts_all_matches(self, db_session, customers):
+        """Test a search reports every match, not just the page size."""
+        page, total = customer_crud.list_with_balances(
+            db_session, skip=20, limit=20, search="list customer"
+        )
+        _, by_phone = customer_crud.list_with_balances(db_session, search="351 555")
+
+        assert total == 30
+        assert len(page) == 10
+        assert by_phone == 30
+
+    def test_page_past_the_end_still_counts(self, db_session, customers):
+        """Test an empty page beyond the end still returns the total."""
+        page, total = customer_crud.list_with_balances(db_session, skip=100)
+
+        assert page == []
+        assert total == 31
+
+    @pytest.mark.parametrize("search", [None, "customer"])
+    def test_one_query_per_page(self, db_session, db_engine, customers, search):
+        """Test a page costs one statement regardless of its size."""
+        (page, total), count = _count_queries(
+            db_engine,
+            lambda: customer_crud.list_with_balances(
+                db_session, limit=20, search=search
+            ),
+        )
+
+        assert len(page) == 20
+        assert count == 1
@@ -0,0 +1,160 @@
+"""Tests for paginated and streamed customer statements."""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from app.crud.customer_account import customer_account_crud
+from app.models.customer_account import (
+    CustomerAccount,
+    CustomerTransaction,
+    TransactionType,
+)
+from app.services.customer_account_service import customer_account_service
+from app.utils.pdf_generator import iter_statement_html
+from sqlalchemy import event
+
+START = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _count_queries(db_engine, func):
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", on_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", on_execute)
+    return result, len(statements)
+
+
+@pytest.fixture
+def ledger(db_session, test_user, test_customer) -> list[CustomerTransaction]:
+    """Create 30 daily transactions: sales of 100, every third a payment of 50."""
+    account = CustomerAccount(customer_id=test_customer.id, created_by_id=test_user.id)
+    db_session.add(account)
+    db_session.flush()
+
+    balance = Decimal("0")
+    transactions = []
+    for day in range(30):
+        is_payment = day % 3 == 2
+        amount = Decimal("50.00") if is_payment else Decimal("100.00")
+        after = balance - amount if is_payment else balance + amount
+        transactions.append(
+            CustomerTransaction(
+                customer_id=test_customer.id,
+                account_id=account.id,
+                transaction_type=TransactionType.PAYMENT
+                if is_payment
+                else TransactionType.SALE,
+                amount=amount,
+                balance_before=balance,
+                balance_after=after,
+                description=f"Movement {day:02d}",
+                transaction_date=START + timedelta(days=day),
+                created_by_id=test_user.id,
+            )
+        )
+        balance = after
+    account.account_balance = balance
+    db_session.add_all(transactions)
+    db_session.commit()
+    return transactions
+
+
+class TestCustomerStatement:
+    """Test statements are windowed, keyset paginated and streamed."""
+
+    def test_pages_cover_ledger_newest_first(self, db_session, test_customer, ledger):
+        """Test walking the cursors returns every transaction once."""
+        seen = []
+        cursor = None
+        while True:
+            page = customer_account_crud.get_statement_page(
+                db_session, customer_id=test_customer.id, cursor=cursor, limit=8
+            )
+            seen += [trans.description for trans in page.items]
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        assert seen == [f"Movement {day:02d}" for day in reversed(range(30))]
+
+    def test_page_loads_user_in_the_same_query(
+        self, db_session, db_engine, test_customer, ledger
+    ):
+        """Test a page and its users' names cost a single statement."""
+        customer_id = test_customer.id
+        db_session.expire_all()
+
+        def load():
+            page = customer_account_crud.get_statement_page(
+                db_session, customer_id=customer_id, limit=10
+            )
+            return [trans.created_by.full_name for trans in page.items]
+
+        names, count = _count_queries(db_engine, load)
+
+        assert names == ["Test User"] * 10
+        assert count == 1
+
+    def test_statement_totals_cover_whole_window(
+        self, db_session, test_customer, ledger
+    ):
+        """Test totals span the period while transactions are one page."""
+        statement = customer_account_service.get_statement(
+            db_session,
+            test_customer.id,
+            START + timedelta(days=3),
+            START + timedelta(days=11),
+            limit=4,
+        )
+
+        # Days 3-11: payments on days 5, 8 and 11
+        assert statement.transaction_count == 9
+        assert statement.total_debits == Decimal("600.00")
+        assert statement.total_credits == Decimal("150.00")
+        assert [t.description for t in statement.transactions] == [
+            "Movement 03",
+            "Movement 04",
+            "Movement 05",
+            "Movement 06",
+        ]
+        assert statement.transactions[0].created_by_name == "Test User"
+        assert statement.next_cursor is not None
+
+    def test_export_streams_every_row(self, db_session, test_customer, ledger):
+        """Test the export renders all rows of the window from the stream."""
+        rows = (
+            {
+                "date": trans.transaction_date,
+                "description": trans.description,
+                "amount": trans.amount if trans.is_credit else -trans.amount,
+                "running_balance": trans.balance_after,
+            }
+            for trans in customer_account_crud.iter_statement_transactions(
+                db_session,
+                customer_id=test_customer.id,
+                start_date=START + timedelta(days=20),
+            )
+        )
+        chunks = iter_statement_html(
+            {"name": test_customer.name, "phone": test_customer.phone},
+            {
+                "current_balance": Decimal("1500.00"),
+                "has_debt": True,
+                "has_credit": False,
+                "formatted": "Owes $1,500.00",
+            },
+            rows,
+        )
+
+        # The document is produced piece by piece, not as one string
+        assert "ACCOUNT STATEMENT" in next(chunks)
+        html = "".join(chunks)
+        assert html.count("<td>Movement") == 10
+        assert html.index("Movement 29") < html.index("Movement 20")
@@ -0,0 +1,117 @@
+"""Tests for listing customers with outstanding debt."""
+
+from decimal import Decimal
+
+from app.models.customer import Customer
+from app.models.payment import Payment, PaymentType
+from app.models.sale import Sale
+from app.services.balance_service import balance_service
+from app.utils.timezone import get_utc_now
+from sqlalchemy import event
+
+
+def _add_customer(db_session, user_id, index, sold, paid="0", credit_used="0"):
+    customer = Customer(name=f"Debt Customer {index}", phone=f"555-1{index:04d}")
+    db_session.add(customer)
+    db_session.flush()
+    db_session.add(
+        Sale(
+            invoice_number=f"INV-D-{index:05d}",
+            customer_id=customer.id,
+            user_id=user_id,
+            subtotal=Decimal(sold),
+            total_amount=Decimal(sold),
+            paid_amount=Decimal("0"),
+            payment_method="credit",
+            sale_date=get_utc_now(),
+        )
+    )
+    for kind, amount in (
+        (PaymentType.payment, paid),
+        (PaymentType.credit_application, credit_used),
+    ):
+        if Decimal(amount):
+            db_session.add(
+                Payment(
+                    customer_id=customer.id,
+                    amount=Decimal(amount),
+                    payment_method="cash",
+                    payment_type=kind,
+                    receipt_number=f"PAY-D-{kind.value}-{index:05d}",
+                    received_by_id=user_id,
+                )
+            )
+    return customer
+
+
+def _count_queries(db_engine, func):
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", on_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", on_execute)
+    return result, len(statements)
+
+
+class TestCustomersWithDebt:
+    """Test balances match calculate_balance and are loaded in one query."""
+
+    def test_matches_per_customer_balances(self, db_session, test_user):
+        """Test debtors, amounts and order agree with calculate_balance."""
+        owes = _add_customer(db_session, test_user.id, 1, "100", paid="30")
+        owes_more = _add_customer(
+            db_session, test_user.id, 2, "500", paid="200", credit_used="50"
+        )
+        _add_customer(db_session, test_user.id, 3, "80", paid="80")
+        _add_customer(db_session, test_user.id, 4, "40", paid="90")
+        inactive = _add_customer(db_session, test_user.id, 5, "999")
+        inactive.is_active = False
+        db_session.commit()
+
+        result = balance_service.get_customers_with_debt(db_session)
+
+        assert [row["customer"].id for row in result] == [owes_more.id, owes.id]
+        for row in result:
+            assert row["balance"] == balance_service.calculate_balance(
+                db_session, row["customer"].id
+            )
+        assert result[0]["balance"] == Decimal("350.00")
+        assert result[1]["formatted_balance"] == "Owes $70.00"
+
+    def test_limit_is_applied(self, db_session, test_user):
+        """Test only the largest debts are returned."""
+        for index in range(1, 6):
+            _add_customer(db_session, test_user.id, index, f"{index}0")
+        db_session.commit()
+
+        result = balance_service.get_customers_with_debt(db_session, limit=2)
+
+        assert [row["balance"] for row in result] == [
+            Decimal("50.00"),
+            Decimal("40.00"),
+        ]
+
+    def test_query_count_independent_of_customer_count(
+        self, db_session, db_engine, test_user
+    ):
+        """Test listing 5 or 60 debtors takes the same number of queries."""
+        counts = []
+        for total in (5, 60):
+            for index in range(len(counts) * 5, total):
+                _add_customer(db_session, test_user.id, index, "10")
+            db_session.commit()
+            db_session.expire_all()
+
+            result, count = _count_queries(
+                db_engine,
+                lambda: balance_service.get_customers_with_debt(db_session),
+            )
+            assert len(result) == total
+            counts.append(count)
+
+        assert counts[0] == counts[1] == 1
@@ -0,0 +1,140 @@
+"""Tests for scheduled maintenance sweeps."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from app.crud.expense import expense as expense_crud
+from app.models.expense import Expense, ExpenseCategory
+from app.services.maintenance import MaintenanceScheduler, maintenance_scheduler
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def scheduler(db_engine):
+    """Scheduler whose runs use their own connections."""
+    worker_engine = create_engine(
+        db_engine.url, connect_args={"check_same_thread": False}
+    )
+    yield MaintenanceScheduler(session_factory=sessionmaker(bind=worker_engine))
+    worker_engine.dispose()
+
+
+@pytest.fixture
+def old_expenses(db_session, test_user) -> list[Expense]:
+    """Create three editable expenses from last week and one from today."""
+    category = ExpenseCategory(name="Servicios", is_active=True)
+    db_session.add(category)
+    db_session.flush()
+
+    expenses = [
+        Expense(
+            category_id=category.id,
+            amount=Decimal("10.00"),
+            description=f"Expense {index}",
+            expense_date=date.today(),
+            payment_method="cash",
+            created_by=test_user.id,
+            is_editable=True,
+            created_at=datetime.now() - timedelta(days=7 if index < 3 else 0),
+        )
+        for index in range(4)
+    ]
+    db_session.add_all(expenses)
+    db_session.commit()
+    return expenses
+
+
+class TestMaintenanceScheduler:
+    """Test tasks run as recorded, set-based sweeps."""
+
+    def test_default_tasks_are_registered(self):
+        """Test the application scheduler knows every sweep."""
+        assert [task.name for task in maintenance_scheduler.tasks] == [
+            "expense-editability",
+            "expired-warranties",
+            "balance-checkpoints",
+        ]
+
+    def test_expense_sweep_is_one_update(self, db_session, db_engine, old_expenses):
+        """Test locking old expenses issues a single UPDATE statement."""
+        scheduler = MaintenanceScheduler(session_factory=sessionmaker(bind=db_engine))
+        scheduler.register(
+            "expenses", "", 60, run=expense_crud.update_editability_status
+        )
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            run = scheduler.run_task("expenses")
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert run.succeeded and run.rows == 3
+        assert [s.split()[0] for s in statements] == ["UPDATE"]
+
+        db_session.expire_all()
+        assert [e.is_editable for e in old_expenses] == [False, False, False, True]
+
+    def test_runs_are_recorded(self, scheduler):
+        """Test metrics and history cover successful and failed runs."""
+
+        def fail(db):
+            raise RuntimeError("boom")
+
+        scheduler.register("ok", "", 60, run=lambda db: 5)
+        scheduler.register("broken", "", 60, run=fail)
+
+        scheduler.run_task("ok")
+        scheduler.run_task("ok", triggered_by="admin@example.com")
+        failed = scheduler.run_task("broken")
+
+        assert failed.error == "boom" and failed.rows is None
+        ok, broken = scheduler.tasks
+        assert (ok.runs, ok.failures, ok.last_run.rows) == (2, 0, 5)
+        assert (broken.runs, broken.failures) == (1, 1)
+        assert ok.max_seconds >= ok.average_seconds > 0
+
+        history = scheduler.history()
+        assert [run.task for run in history] == ["broken", "ok", "ok"]
+        assert history[1].triggered_by == "admin@example.com"
+        assert len(scheduler.history("ok")) == 2
+
+    def test_run_due_runs_only_due_tasks(self, scheduler):
+        """Test the first poll runs every task, later ones those now due."""
+        calls = []
+        due = scheduler.register("due", "", 60, run=lambda db: calls.append("due"))
+        scheduler.register("later", "", 60, run=lambda db: calls.append("later"))
+
+        first = asyncio.run(scheduler.run_due())
+        due.next_due = 0
+        runs = asyncio.run(scheduler.run_due())
+
+        # SQLite has a single process, which always leads
+        assert scheduler.is_leader
+        assert [run.task for run in first] == ["due", "later"]
+        assert [run.task for run in runs] == ["due"]
+        assert calls == ["due", "later", "due"]
+        assert due.next_due > 0
+        assert asyncio.run(scheduler.run_due()) == []
+
+    def test_leader_heartbeat_ends_its_transaction(self, scheduler):
+        """Test the lock connection is not left idle in a transaction."""
+        connection = Mock()
+        scheduler._lock_connection = connection
+
+        assert scheduler._ensure_leadership()
+        connection.execute.assert_called_once()
+        connection.commit.assert_called_once()
+
+    def test_duplicate_task_names_are_rejected(self, scheduler):
+        """Test a task name can only be registered once."""
+        scheduler.register("task", "", 60, run=lambda db: 0)
+        with pytest.raises(ValueError):
+            scheduler.register("task", "", 60, run=lambda db: 0)
@@ -0,0 +1,166 @@
+"""Tests for accounts receivable aging."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from app.crud.receivables_aging import receivables_aging
+from app.models.customer import Customer
+from app.models.customer_account import (
+    CustomerAccount,
+    CustomerTransaction,
+    TransactionType,
+)
+from app.services.customer_account_service import customer_account_service
+from app.utils.timezone import get_local_today, get_utc_now, utc_to_local
+from sqlalchemy import event
+
+NOW = get_utc_now()
+TODAY = get_local_today()
+
+DEBITS = (TransactionType.SALE, TransactionType.DEBIT_NOTE)
+
+
+class Ledger:
+    """Post transactions to one customer's ledger with running balances."""
+
+    def __init__(self, db_session, user, customer):
+        self.db = db_session
+        self.user = user
+        self.customer = customer
+        self.account = CustomerAccount(customer_id=customer.id, created_by_id=user.id)
+        db_session.add(self.account)
+        db_session.flush()
+        self.balance = Decimal("0.00")
+
+    def post(self, kind, amount, days_ago, sale_id=None) -> CustomerTransaction:
+        amount = Decimal(amount)
+        after = self.balance + (amount if kind in DEBITS else -amount)
+        transaction = CustomerTransaction(
+            customer_id=self.customer.id,
+            account_id=self.account.id,
+            transaction_type=kind,
+            amount=amount,
+            balance_before=self.balance,
+            balance_after=after,
+            reference_type="sale" if sale_id else None,
+            reference_id=sale_id,
+            description=kind.value,
+            transaction_date=NOW - timedelta(days=days_ago),
+            created_by_id=self.user.id,
+        )
+        self.balance = after
+        self.account.account_balance = after
+        self.db.add(transaction)
+        self.db.commit()
+        return transaction
+
+
+@pytest.fixture
+def ledger(db_session, test_user, test_customer) -> Ledger:
+    """Empty ledger of the test customer."""
+    receivables_aging.invalidate()
+    return Ledger(db_session, test_user, test_customer)
+
+
+def _customer(db_session, name, phone) -> Customer:
+    customer = Customer(name=name, phone=phone)
+    db_session.add(customer)
+    db_session.flush()
+    return customer
+
+
+class TestReceivablesAging:
+    """Test credits are allocated oldest first and open charges aged."""
+
+    def test_payments_settle_oldest_charges_first(self, db_session, ledger):
+        """Test FIFO allocation spreads what is left over the age buckets."""
+        ledger.post(TransactionType.SALE, "100.00", 100, sale_id=1)
+        second = ledger.post(TransactionType.SALE, "50.00", 45, sale_id=2)
+        ledger.post(TransactionType.DEBIT_NOTE, "80.00", 5)
+        ledger.post(TransactionType.PAYMENT, "120.00", 1)
+
+        [balance] = receivables_aging.compute(db_session, as_of=TODAY)
+
+        assert balance.customer_id == ledger.customer.id
+        assert balance.total_outstanding == Decimal("110.00")
+        assert (balance.current, balance.days_31_60) == (
+            Decimal("80.00"),
+            Decimal("30.00"),
+        )
+        assert balance.days_61_90 == balance.over_90_days == Decimal("0.00")
+        assert (
+            utc_to_local(balance.oldest_invoice_date).date()
+            == utc_to_local(second.transaction_date).date()
+        )
+
+    def test_voided_sale_settles_itself(self, db_session, ledger):
+        """Test a void reverses its own sale instead of the oldest charge."""
+        ledger.post(TransactionType.SALE, "100.00", 70, sale_id=1)
+        ledger.post(TransactionType.SALE, "60.00", 2, sale_id=2)
+        ledger.post(TransactionType.VOID_SALE, "60.00", 1, sale_id=2)
+
+        [balance] = receivables_aging.compute(db_session, as_of=TODAY)
+
+        assert balance.total_outstanding == Decimal("100.00")
+        assert balance.days_61_90 == Decimal("100.00")
+        assert balance.current == Decimal("0.00")
+
+    def test_settled_and_credit_accounts_are_left_out(
+        self, db_session, test_user, ledger
+    ):
+        """Test only customers with open charges are listed, largest first."""
+        ledger.post(TransactionType.SALE, "40.00", 10, sale_id=1)
+        ledger.post(TransactionType.PAYMENT, "50.00", 3)
+
+        big = Ledger(db_session, test_user, _customer(db_session, "Big", "555-0001"))
+        big.post(TransactionType.SALE, "500.00", 200, sale_id=2)
+        small = Ledger(
+            db_session, test_user, _customer(db_session, "Small", "555-0002")
+        )
+        small.post(TransactionType.SALE, "20.00", 3, sale_id=3)
+
+        balances = receivables_aging.compute(db_session, as_of=TODAY)
+
+        assert [b.customer_name for b in balances] == ["Big", "Small"]
+        assert balances[0].over_90_days == Decimal("500.00")
+        only_small = receivables_aging.compute(
+            db_session, as_of=TODAY, customer_id=small.customer.id
+        )
+        assert [b.customer_name for b in only_small] == ["Small"]
+
+    def test_as_of_ignores_later_transactions(self, db_session, ledger):
+        """Test aging at a past date ages from that date, before later payments."""
+        ledger.post(TransactionType.SALE, "100.00", 50, sale_id=1)
+        ledger.post(TransactionType.PAYMENT, "100.00", 5)
+
+        assert receivables_aging.compute(db_session, as_of=TODAY) == []
+        [balance] = receivables_aging.compute(
+            db_session, as_of=TODAY - timedelta(days=30)
+        )
+        assert balance.current == Decimal("100.00")
+
+    def test_single_statement_and_cached_until_ledger_changes(
+        self, db_session, db_engine, ledger
+    ):
+        """Test the report is one query, reused until a ledger commit."""
+        ledger.post(TransactionType.SALE, "100.00", 10, sale_id=1)
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            first = customer_account_service.get_aging_report(db_session)
+            again = customer_account_service.get_aging_report(db_session)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert len(statements) == 1
+        assert first == again
+        assert first[0].total_outstanding == Decimal("100.00")
+
+        ledger.post(TransactionType.PAYMENT, "30.00", 0)
+        [after_payment] = customer_account_service.get_aging_report(db_session)
+        assert after_payment.total_outstanding == Decimal("70.00")
@@ -0,0 +1,300 @@
+"""Tests for background PDF report jobs."""
+
+import io
+import os
+from decimal import Decimal
+
+import pytest
+from app.models.customer_account import CustomerAccount
+from app.models.expense import Expense, ExpenseCategory
+from app.models.product import Category, Product
+from app.models.repair import Repair
+from app.models.sale import Sale, SaleItem
+from app.services.report_jobs import ReportJobQueue, ReportJobStatus
+from app.services.report_service import report_service
+from app.utils.timezone import get_local_today, get_utc_now
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+NOW = get_utc_now()
+TODAY = get_local_today()
+
+
+@pytest.fixture
+def product(db_session, test_user) -> Product:
+    """Create a product sold in the test sales."""
+    category = Category(name="Phones", is_active=True)
+    db_session.add(category)
+    db_session.flush()
+    product = Product(
+        sku="RPT-001",
+        name="Report Phone",
+        category_id=category.id,
+        purchase_price=Decimal("60.00"),
+        first_sale_price=Decimal("100.00"),
+        second_sale_price=Decimal("95.00"),
+        third_sale_price=Decimal("90.00"),
+        tax_rate=Decimal("21.00"),
+        current_stock=1,
+        minimum_stock=5,
+        created_by=test_user.id,
+    )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+def _add_sales(db_session, user_id, customer_id, product_id, count, start=0):
+    for index in range(start, start + count):
+        sale = Sale(
+            invoice_number=f"INV-R-{index:05d}",
+            customer_id=customer_id,
+            user_id=user_id,
+            subtotal=Decimal("100.00"),
+            total_amount=Decimal("100.00"),
+            paid_amount=Decimal("0.00"),
+            payment_method="credit",
+            payment_status="pending",
+            sale_date=NOW,
+        )
+        sale.items.append(
+            SaleItem(
+                product_id=product_id,
+                quantity=1,
+                unit_price=Decimal("100.00"),
+                total_price=Decimal("100.00"),
+            )
+        )
+        db_session.add(sale)
+    db_session.commit()
+
+
+@pytest.fixture
+def report_data(db_session, test_user, test_customer, product):
+    """Create sales, a repair and an account in debt for this month."""
+    _add_sales(db_session, test_user.id, test_customer.id, product.id, 3)
+    db_session.add(
+        Repair(
+            repair_number="REP-R-00001",
+            customer_id=test_customer.id,
+            device_type="Phone",
+            device_brand="Samsung",
+            device_model="Galaxy S21",
+            problem_description="Screen broken",
+            status="delivered",
+            final_cost=Decimal("80.00"),
+            parts_cost=Decimal("30.00"),
+            received_by=test_user.id,
+            received_date=NOW,
+        )
+    )
+    db_session.add(
+        CustomerAccount(
+            customer_id=test_customer.id,
+            account_balance=Decimal("300.00"),
+            created_by_id=test_user.id,
+        )
+    )
+    db_session.commit()
+
+
+@pytest.fixture
+def queue(db_engine, tmp_path):
+    """Report queue whose workers use their own connections."""
+    worker_engine = create_engine(
+        db_engine.url, connect_args={"check_same_thread": False}
+    )
+    queue = ReportJobQueue(
+        session_factory=sessionmaker(bind=worker_engine),
+        artifact_dir=str(tmp_path),
+    )
+    yield queue
+    queue.shutdown()
+    worker_engine.dispose()
+
+
+class TestReportJobQueue:
+    """Test jobs generate PDFs on disk and are reused while fresh."""
+
+    @pytest.mark.parametrize(
+        "kind,params",
+        [
+            ("low-stock", {}),
+            ("accounts-receivable", {}),
+            ("repairs-monthly", {"year": TODAY.year, "month": TODAY.month}),
+            ("financial-monthly", {"year": TODAY.year, "month": TODAY.month}),
+        ],
+    )
+    def test_generates_report(self, queue, report_data, kind, params):
+        """Test every report kind is written to an artifact file."""
+        job = queue.wait(queue.submit(kind, **params), timeout=30)
+
+        assert job.status == ReportJobStatus.completed
+        with open(job.path, "rb") as pdf:
+            assert pdf.read(4) == b"%PDF"
+
+    def test_matching_jobs_are_reused(self, queue, report_data):
+        """Test the same report and parameters share one job."""
+        first = queue.submit("repairs-monthly", year=2024, month=1)
+        again = queue.submit("repairs-monthly", year=2024, month=1)
+        other = queue.submit("repairs-monthly", year=2024, month=2)
+
+        assert again is first
+        assert other is not first
+        assert queue.get(first.id) is first
+
+    def test_failed_job_is_not_reused(self, queue, monkeypatch):
+        """Test a failing report records its error and can be retried."""
+
+        def fail(db, kind, output, **params):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(report_service, "write_report", fail)
+        job = queue.wait(queue.submit("low-stock"), timeout=30)
+
+        assert job.status == ReportJobStatus.failed
+        assert job.error == "boom"
+        assert job.path is None
+        assert queue.submit("low-stock") is not job
+
+    def test_expired_artifacts_are_removed(self, queue, report_data):
+        """Test finished jobs and their files are dropped after the TTL."""
+        queue.artifact_ttl_seconds = 0
+        job = queue.wait(queue.submit("low-stock"), timeout=30)
+        path = job.path
+
+        assert queue.get(job.id) is None
+        assert not os.path.exists(path)
+
+    def test_pinned_artifacts_outlive_the_ttl(self, queue, report_data):
+        """Test a job being downloaded keeps its file until released."""
+        queue.artifact_ttl_seconds = 0
+        job = queue.wait(queue.submit("low-stock", pin=True), timeout=30)
+        path = job.path
+
+        assert queue.get(job.id) is job
+        assert os.path.exists(path)
+
+        queue.release(job)
+        assert queue.get(job.id) is None
+        assert not os.path.exists(path)
+
+    def test_completed_jobs_can_be_skipped(self, queue, report_data):
+        """Test generated PDFs are only shared when reuse is allowed."""
+        job = queue.wait(queue.submit("low-stock"), timeout=30)
+
+        assert queue.submit("low-stock") is job
+        fresh = queue.submit("low-stock", reuse_completed=False)
+        assert fresh is not job
+
+    def test_unknown_report(self, queue):
+        """Test unknown report kinds are rejected before queueing."""
+        with pytest.raises(ValueError):
+            queue.submit("nope")
+
+
+class TestStreamingReports:
+    """Test report data is fetched in a fixed number of queries."""
+
+    def _count_statements(self, db_session, db_engine) -> int:
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        db_session.expire_all()
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            report_service.write_report(
+                db_session,
+                "financial-monthly",
+                io.BytesIO(),
+                year=TODAY.year,
+                month=TODAY.month,
+            )
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+        return len(statements)
+
+    def test_financial_report_queries_do_not_grow_with_sales(
+        self, db_session, db_engine, test_user, test_customer, product
+    ):
+        """Test 2 or 40 sales take the same number of statements."""
+        _add_sales(db_session, test_user.id, test_customer.id, product.id, 2)
+        few = self._count_statements(db_session, db_engine)
+
+        _add_sales(db_session, test_user.id, test_customer.id, product.id, 38, 2)
+        many = self._count_statements(db_session, db_engine)
+
+        assert few == many
+
+
+class TestIncomeStatement:
+    """Test the income statement is aggregated in SQL at historical cost."""
+
+    def test_cost_of_goods_uses_cost_at_sale_time(
+        self, db_session, test_user, test_customer, product, report_data
+    ):
+        """Test sold goods keep the cost recorded on the sale item."""
+        sale = db_session.query(Sale).first()
+        sale.items[0].unit_cost = Decimal("50.00")
+        # A later price change does not rewrite past sales
+        product.purchase_price = Decimal("75.00")
+
+        service = Product(
+            sku="RPT-SRV",
+            name="Setup",
+            category_id=product.category_id,
+            purchase_price=Decimal("0.00"),
+            first_sale_price=Decimal("30.00"),
+            second_sale_price=Decimal("30.00"),
+            third_sale_price=Decimal("30.00"),
+            is_service=True,
+            created_by=test_user.id,
+        )
+        db_session.add(service)
+        db_session.flush()
+        sale.items.append(
+            SaleItem(
+                product_id=service.id,
+                quantity=1,
+                unit_price=Decimal("30.00"),
+                unit_cost=Decimal("0.00"),
+                total_price=Decimal("30.00"),
+            )
+        )
+        db_session.add_all(
+            [
+                Expense(
+                    category=category,
+                    amount=amount,
+                    description="Gasto",
+                    expense_date=TODAY,
+                    payment_method="cash",
+                    created_by=test_user.id,
+                )
+                for category, amount in (
+                    (ExpenseCategory(name="Alquiler"), Decimal("200.00")),
+                    (ExpenseCategory(name="Luz"), Decimal("20.00")),
+                )
+            ]
+        )
+        db_session.commit()
+
+        statement = report_service.get_income_statement(
+            db_session, TODAY.year, TODAY.month
+        )
+
+        # Two items without a recorded cost fall back to the purchase price
+        assert statement["product_revenue"] == Decimal("300.00")
+        assert statement["product_cogs"] == Decimal("200.00")
+        assert statement["service_revenue"] == Decimal("30.00")
+        assert statement["repair_revenue"] == Decimal("80.00")
+        assert statement["repair_parts_cost"] == Decimal("30.00")
+        assert statement["gross_profit"] == Decimal("180.00")
+        assert list(statement["expense_by_category"].items()) == [
+            ("Alquiler", Decimal("200.00")),
+            ("Luz", Decimal("20.00")),
+        ]
+        assert statement["net_profit"] == Decimal("-40.00")
+        assert (statement["sales_count"], statement["expense_count"]) == (3, 2)
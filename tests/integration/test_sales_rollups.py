@@ -0,0 +1,225 @@
+"""Tests for pre-aggregated sales analytics rollups."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from app.crud.sales_rollup import sales_rollup_crud
+from app.models.product import Category, Product
+from app.models.sale import Sale, SaleItem
+from app.utils.timezone import get_local_today, get_utc_now, utc_to_local
+
+NOW = get_utc_now()
+TODAY = get_local_today()
+HOUR = utc_to_local(NOW).hour
+
+
+@pytest.fixture
+def products(db_session, test_user) -> list[Product]:
+    """Create a phone and a case in different categories."""
+    products = []
+    for sku, name, price in (("RLP-1", "Phone", "300.00"), ("RLP-2", "Case", "20.00")):
+        category = Category(name=f"{name}s", is_active=True)
+        db_session.add(category)
+        db_session.flush()
+        products.append(
+            Product(
+                sku=sku,
+                name=name,
+                category_id=category.id,
+                purchase_price=Decimal("1.00"),
+                first_sale_price=Decimal(price),
+                second_sale_price=Decimal(price),
+                third_sale_price=Decimal(price),
+                current_stock=10,
+                created_by=test_user.id,
+            )
+        )
+    db_session.add_all(products)
+    db_session.commit()
+    return products
+
+
+def _sale(db_session, user, products, number, payment_method="cash", **amounts):
+    """Create a sale of one phone and two cases ($340 before sale discount)."""
+    sale = Sale(
+        invoice_number=f"INV-RL-{number:05d}",
+        user_id=user.id,
+        subtotal=Decimal("340.00"),
+        total_amount=Decimal("340.00"),
+        paid_amount=Decimal("340.00"),
+        payment_method=payment_method,
+        payment_status="paid",
+        sale_date=NOW,
+        **amounts,
+    )
+    phone, case = products
+    sale.items.append(
+        SaleItem(
+            product_id=phone.id,
+            quantity=1,
+            unit_price=Decimal("300.00"),
+            total_price=Decimal("300.00"),
+        )
+    )
+    sale.items.append(
+        SaleItem(
+            product_id=case.id,
+            quantity=2,
+            unit_price=Decimal("20.00"),
+            total_price=Decimal("40.00"),
+        )
+    )
+    db_session.add(sale)
+    db_session.commit()
+    return sale
+
+
+def _by_product(db_session):
+    return {
+        row["label"]: row
+        for row in sales_rollup_crud.totals(
+            db_session, start=TODAY, end=TODAY, group_by="product"
+        )
+    }
+
+
+class TestSalesRollups:
+    """Test rollups follow sales as they are created and voided."""
+
+    def test_new_sales_are_rolled_up(self, db_session, test_user, products):
+        """Test sale lines are added with sale discount and tax shared out."""
+        _sale(db_session, test_user, products, 1)
+        _sale(
+            db_session,
+            test_user,
+            products,
+            2,
+            payment_method="card",
+            discount_amount=Decimal("34.00"),
+            tax_amount=Decimal("68.00"),
+        )
+
+        totals = _by_product(db_session)
+        assert list(totals) == ["Phone", "Case"]
+        phone, case = totals["Phone"], totals["Case"]
+        assert (phone["sales_lines"], phone["units"]) == (2, 2)
+        assert phone["revenue"] == Decimal("570.00")
+        assert phone["discount"] == Decimal("30.00")
+        assert phone["tax"] == Decimal("60.00")
+        assert (case["units"], case["revenue"]) == (4, Decimal("76.00"))
+
+        methods = sales_rollup_crud.totals(
+            db_session, start=TODAY, end=TODAY, group_by="payment_method"
+        )
+        assert [(row["key"], row["revenue"]) for row in methods] == [
+            ("cash", Decimal("340.00")),
+            ("card", Decimal("306.00")),
+        ]
+
+        heatmap = sales_rollup_crud.hourly_heatmap(db_session, start=TODAY, end=TODAY)
+        assert heatmap["sales_count"][TODAY.weekday()][HOUR] == 2
+        assert heatmap["revenue"][TODAY.weekday()][HOUR] == Decimal("646.00")
+
+    def test_voiding_removes_and_restoring_adds_back(
+        self, db_session, test_user, products
+    ):
+        """Test voided sales leave the rollups until restored."""
+        _sale(db_session, test_user, products, 1)
+        sale = _sale(db_session, test_user, products, 2)
+
+        sale.is_voided = True
+        db_session.commit()
+        assert _by_product(db_session)["Phone"]["units"] == 1
+        heatmap = sales_rollup_crud.hourly_heatmap(db_session, start=TODAY, end=TODAY)
+        assert heatmap["sales_count"][TODAY.weekday()][HOUR] == 1
+
+        sale.is_voided = False
+        db_session.commit()
+        assert _by_product(db_session)["Phone"]["units"] == 2
+
+    def test_items_added_to_existing_sale(self, db_session, test_user, products):
+        """Test a line added later counts once, with the sale counted once."""
+        sale = _sale(db_session, test_user, products, 1)
+        sale.items.append(
+            SaleItem(
+                product_id=products[1].id,
+                quantity=1,
+                unit_price=Decimal("20.00"),
+                total_price=Decimal("20.00"),
+            )
+        )
+        db_session.commit()
+
+        assert _by_product(db_session)["Case"]["units"] == 3
+        heatmap = sales_rollup_crud.hourly_heatmap(db_session, start=TODAY, end=TODAY)
+        assert heatmap["sales_count"][TODAY.weekday()][HOUR] == 1
+
+    def test_rebuild_matches_incremental_rollups(self, db_session, test_user, products):
+        """Test recomputing from the source tables gives the stored rollups."""
+        _sale(db_session, test_user, products, 1, discount_amount=Decimal("10.00"))
+        _sale(db_session, test_user, products, 2, tax_amount=Decimal("71.40"))
+        voided = _sale(db_session, test_user, products, 3, payment_method="card")
+        voided.is_voided = True
+        db_session.commit()
+
+        start, end = TODAY - timedelta(days=1), TODAY + timedelta(days=1)
+        stored = sales_rollup_crud.get_stored(db_session, start=start, end=end)
+        assert sales_rollup_crud.compute(db_session, start=start, end=end) == stored
+
+        sales_rollup_crud.rebuild(db_session, start=start, end=end)
+        db_session.commit()
+        assert sales_rollup_crud.get_stored(db_session, start=start, end=end) == stored
+
+    def test_category_trend(self, db_session, test_user, products):
+        """Test revenue per category is grouped by month."""
+        _sale(db_session, test_user, products, 1)
+
+        trend = sales_rollup_crud.category_trend(
+            db_session, start=TODAY, end=TODAY, period="month"
+        )
+
+        assert [(p["period"], p["category"], p["revenue"]) for p in trend] == [
+            (TODAY.replace(day=1), "Phones", Decimal("300.00")),
+            (TODAY.replace(day=1), "Cases", Decimal("40.00")),
+        ]
+
+
+class TestAnalyticsAPI:
+    """Test the analytics endpoints read the rollups."""
+
+    def _headers(self, client, user):
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": user.email, "password": "test_password"},
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def test_top_products_and_hourly(self, client, db_session, test_user, products):
+        """Test the endpoints return the rolled-up totals."""
+        _sale(db_session, test_user, products, 1)
+        headers = self._headers(client, test_user)
+
+        response = client.get("/api/v1/analytics/top-products", headers=headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [(p["label"], p["units"]) for p in data] == [("Phone", 1), ("Case", 2)]
+
+        response = client.get("/api/v1/analytics/hourly", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["sales_count"][TODAY.weekday()][HOUR] == 1
+
+    def test_invalid_requests_are_rejected(self, client, test_user):
+        """Test unknown groupings and reversed ranges fail with 400."""
+        headers = self._headers(client, test_user)
+
+        response = client.get(
+            "/api/v1/analytics/summary?group_by=color", headers=headers
+        )
+        assert response.status_code == 400
+        response = client.get(
+            f"/api/v1/analytics/summary?start={TODAY}&end={TODAY - timedelta(days=1)}",
+            headers=headers,
+        )
+        assert response.status_code == 400
+        assert client.get("/api/v1/analytics/hourly").status_code == 401
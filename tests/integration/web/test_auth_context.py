@@ -0,0 +1,59 @@
+"""Tests for the authentication context middleware."""
+
+import pytest
+from app.core import template_context
+from app.core.security import create_access_token
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def auth_client(client, test_user, db_engine, monkeypatch):
+    """Client with a valid access token whose middleware uses the test pool."""
+    monkeypatch.setattr(template_context, "SessionLocal", sessionmaker(bind=db_engine))
+    token = create_access_token({"sub": str(test_user.id)})
+    client.cookies.set("access_token", token)
+    return client
+
+
+def test_middleware_does_not_open_connections_per_request(auth_client, db_engine):
+    """Connections opened stay flat as the number of requests grows."""
+    connects = []
+
+    def on_connect(dbapi_connection, connection_record):
+        connects.append(connection_record)
+
+    event.listen(db_engine, "connect", on_connect)
+    try:
+        for _ in range(100):
+            response = auth_client.get("/admin/users")
+            assert response.status_code == 200
+    finally:
+        event.remove(db_engine, "connect", on_connect)
+
+    assert len(connects) <= db_engine.pool.size()
+
+
+def test_route_dependency_reuses_middleware_user(auth_client, db_engine):
+    """The user is looked up once per request, by the middleware only."""
+    user_queries = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            user_queries.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", on_execute)
+    try:
+        response = auth_client.get("/admin/users")
+    finally:
+        event.remove(db_engine, "before_cursor_execute", on_execute)
+
+    assert response.status_code == 200
+    assert len(user_queries) == 1
+
+
+def test_invalid_token_has_no_user_context(client):
+    """An invalid token leaves the template context anonymous."""
+    client.cookies.set("access_token", "not-a-jwt")
+    response = client.get("/admin/users")
+    assert response.status_code == 401
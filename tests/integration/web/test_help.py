@@ -0,0 +1,110 @@
+"""Tests for cached help-center documents and search."""
+
+import os
+
+import pytest
+from app.utils import help_docs
+from app.utils.help_docs import HelpDocumentCache, help_documents
+from fastapi import status
+
+
+@pytest.fixture
+def docs(tmp_path) -> HelpDocumentCache:
+    """Cache over two small documents in a temporary directory."""
+    (tmp_path / "caja.md").write_text(
+        "# Caja\n\nEl **cierre de caja** se hace al final del día.\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "garantias.md").write_text(
+        "# Garantías\n\nCada reparación entregada genera una garantía.\n",
+        encoding="utf-8",
+    )
+    return HelpDocumentCache(
+        docs_path=tmp_path,
+        documents={
+            "caja": ("caja.md", "Control de Caja"),
+            "garantias": ("garantias.md", None),
+            "falta": ("falta.md", None),
+        },
+    )
+
+
+class TestHelpDocumentCache:
+    """Test documents are rendered once per file version."""
+
+    def test_renders_once_until_file_changes(self, docs, tmp_path, monkeypatch):
+        """Test the Markdown converter only runs again after a file edit."""
+        calls = []
+        convert = help_docs.markdown.markdown
+
+        def counting(text, **kwargs):
+            calls.append(text)
+            return convert(text, **kwargs)
+
+        monkeypatch.setattr(help_docs.markdown, "markdown", counting)
+
+        first = docs.get("caja")
+        assert docs.get("caja") is first
+        assert "<strong>cierre de caja</strong>" in first.html
+        assert first.title == "Control de Caja"
+        assert len(calls) == 1
+
+        path = tmp_path / "caja.md"
+        path.write_text("# Caja\n\nNuevo texto.\n", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000_000))
+
+        assert "Nuevo texto" in docs.get("caja").html
+        assert len(calls) == 2
+
+    def test_unknown_and_missing_documents(self, docs):
+        """Test unknown slugs and missing files are not found."""
+        assert docs.get("nope") is None
+        assert docs.get("falta") is None
+        assert docs.warm() == 2
+
+    def test_search_ignores_accents_and_matches_prefixes(self, docs):
+        """Test every word must match, accents aside, the last as a prefix."""
+        results = docs.search("garantia")
+        assert [result.slug for result in results] == ["garantias"]
+        assert results[0].title == "Garantias"
+        assert "garantía" in results[0].snippet
+
+        assert [result.slug for result in docs.search("cierre CAJ")] == ["caja"]
+        assert docs.search("cierre garantia") == []
+        assert docs.search("  ") == []
+
+
+class TestHelpRoutes:
+    """Test help pages are served from the cache with validators."""
+
+    def test_document_revalidates_with_etag(self, client):
+        """Test repeated views get a 304 for an unchanged page."""
+        response = client.get("/ayuda/documento/caja")
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+
+        again = client.get("/ayuda/documento/caja", headers={"If-None-Match": etag})
+        assert again.status_code == status.HTTP_304_NOT_MODIFIED
+
+        dated = client.get(
+            "/ayuda/documento/caja", headers={"If-Modified-Since": last_modified}
+        )
+        assert dated.status_code == status.HTTP_304_NOT_MODIFIED
+
+        assert help_documents.get("caja").html in response.text
+
+    def test_unknown_document(self, client):
+        """Test unknown documents are a 404."""
+        response = client.get("/ayuda/documento/nope")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_search_page(self, client):
+        """Test the search returns matching documents as a partial."""
+        response = client.get(
+            "/ayuda/buscar", params={"q": "cierre caja"}, headers={"HX-Request": "1"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "/ayuda/documento/caja" in response.text
+        assert "<html" not in response.text
@@ -0,0 +1,58 @@
+"""Tests for the admin performance page."""
+
+import pytest
+from app.core import template_context
+from app.core.profiling import instrument_engine, performance_recorder
+from app.core.security import create_access_token
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def auth_client(client, test_user, db_engine, monkeypatch):
+    """Admin client whose requests are profiled against the test engine."""
+    monkeypatch.setattr(template_context, "SessionLocal", sessionmaker(bind=db_engine))
+    instrument_engine(db_engine)
+    performance_recorder.reset()
+    client.cookies.set("access_token", create_access_token({"sub": str(test_user.id)}))
+    yield client
+    performance_recorder.reset()
+
+
+def test_requests_report_server_timing(auth_client):
+    """Test page responses carry their query count and database time."""
+    response = auth_client.get("/admin/users")
+
+    assert response.status_code == 200
+    assert "db;dur=" in response.headers["server-timing"]
+
+    stats = {r.name: r for r in performance_recorder.routes()}
+    assert stats["GET /admin/users"].requests == 1
+    assert stats["GET /admin/users"].queries >= 1
+
+
+def test_performance_page_lists_routes(auth_client):
+    """Test the page shows the routes recorded so far, worst first."""
+    auth_client.get("/admin/users")
+
+    response = auth_client.get("/admin/performance", params={"order": "queries"})
+
+    assert response.status_code == 200
+    assert "/admin/users" in response.text
+
+
+def test_reset_clears_recorded_requests(auth_client):
+    """Test resetting forgets every recorded route."""
+    auth_client.get("/admin/users")
+
+    response = auth_client.post("/admin/performance/reset")
+
+    assert response.status_code == 200
+    names = [r.name for r in performance_recorder.routes()]
+    assert "GET /admin/users" not in names
+
+
+def test_performance_page_requires_admin(client):
+    """Test anonymous users cannot see the page."""
+    response = client.get("/admin/performance")
+
+    assert response.status_code == 401
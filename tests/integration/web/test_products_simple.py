@@ -5,6 +5,7 @@ from decimal import Decimal
 from unittest.mock import AsyncMock
 
 import pytest
+from app.crud.pagination import Page
 from app.models.product import Category
 from app.models.user import User
 from app.schemas.filters import ProductListItem, StockStatus
@@ -78,7 +79,7 @@ class TestProductWebRoutesSimple:
         """Test accessing products list page with mocked service."""
         # Mock the ProductService methods
         mock_get_product_list = AsyncMock(
-            return_value=(mock_products, len(mock_products))
+            return_value=Page(items=mock_products, total=len(mock_products))
         )
         mock_get_filter_options = AsyncMock(
             return_value={
@@ -119,7 +120,7 @@ class TestProductWebRoutesSimple:
 
         # Mock the service methods
         mock_get_product_list = AsyncMock(
-            return_value=(filtered_products, len(filtered_products))
+            return_value=Page(items=filtered_products, total=len(filtered_products))
         )
         mock_get_filter_options = AsyncMock(
             return_value={
@@ -150,7 +151,7 @@ class TestProductWebRoutesSimple:
         """Test product category filtering with mocked service."""
         # Mock the service methods
         mock_get_product_list = AsyncMock(
-            return_value=(mock_products, len(mock_products))
+            return_value=Page(items=mock_products, total=len(mock_products))
         )
         mock_get_filter_options = AsyncMock(
             return_value={
@@ -17,6 +17,7 @@ from app.services.dashboard_service import (
     dashboard_service,
 )
 from app.utils.timezone import get_local_now
+from sqlalchemy import event
 
 
 class TestDashboardService:
@@ -766,3 +767,61 @@ class TestDashboardService:
 
         assert stats["customer_debt_total"] == debt_amount
         assert stats["debt_alert"] is False
+
+    def test_get_dashboard_stats_uses_one_query_then_cache(
+        self, db_session, db_engine, test_repair_received
+    ):
+        """Verify a cold load runs one query and a warm load runs none."""
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            cold = dashboard_service.get_dashboard_stats(db_session)
+            cold_queries = len(statements)
+            warm = dashboard_service.get_dashboard_stats(db_session)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert cold_queries == 1
+        assert len(statements) == 1
+        assert warm == cold
+
+    def test_get_dashboard_stats_invalidated_by_writes(
+        self, db_session, test_repair_received
+    ):
+        """Verify committed repair status changes are visible immediately."""
+        assert (
+            dashboard_service.get_dashboard_stats(db_session)["repairs_received"] == 1
+        )
+
+        test_repair_received.status = "in_progress"
+        db_session.commit()
+
+        assert (
+            dashboard_service.get_dashboard_stats(db_session)["repairs_received"] == 0
+        )
+
+    def test_get_dashboard_stats_cache_expires(
+        self, db_session, test_repair_received, monkeypatch
+    ):
+        """Verify cached stats are reloaded after the TTL."""
+        clock = [1000.0]
+        monkeypatch.setattr(
+            "app.services.dashboard_service.time.monotonic", lambda: clock[0]
+        )
+        dashboard_service.get_dashboard_stats(db_session)
+        db_session.execute(
+            Repair.__table__.update().values(status="in_progress")
+        )  # Bypasses the ORM, so nothing invalidates the cache
+        db_session.commit()
+
+        assert (
+            dashboard_service.get_dashboard_stats(db_session)["repairs_received"] == 1
+        )
+        clock[0] += 60
+        assert (
+            dashboard_service.get_dashboard_stats(db_session)["repairs_received"] == 0
+        )
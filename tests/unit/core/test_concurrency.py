@@ -0,0 +1,72 @@
+"""Tests for dispatching blocking database work off the event loop."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from app.config import settings
+from app.core.concurrency import db_offload, run_in_db_thread
+
+
+@pytest.mark.asyncio
+class TestRunInDbThread:
+    """Test the database thread pool dispatch."""
+
+    async def test_returns_result(self):
+        """Test the function result is returned to the caller."""
+        result = await run_in_db_thread(lambda a, b=0: a + b, 2, b=3)
+
+        assert result == 5
+
+    async def test_propagates_exceptions(self):
+        """Test exceptions raised in the worker reach the caller."""
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await run_in_db_thread(fail)
+
+    async def test_blocking_work_does_not_stall_loop(self):
+        """Test a slow blocking call leaves the loop free for other requests."""
+        slow = asyncio.create_task(run_in_db_thread(time.sleep, 0.5))
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+
+        assert not slow.done()
+        assert elapsed < 0.4
+        await slow
+
+    async def test_concurrency_is_bounded(self, monkeypatch):
+        """Test no more threads than DB_THREAD_POOL_SIZE run at once."""
+        monkeypatch.setattr(settings, "DB_THREAD_POOL_SIZE", 2)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        await asyncio.gather(*(run_in_db_thread(work) for _ in range(6)))
+
+        assert peak[0] == 2
+
+    async def test_db_offload_runs_in_worker_thread(self):
+        """Test decorated functions become awaitables run off the loop thread."""
+        loop_thread = threading.get_ident()
+
+        @db_offload
+        def current_thread():
+            return threading.get_ident()
+
+        assert await current_thread() != loop_thread
@@ -0,0 +1,160 @@
+"""Tests for request profiling."""
+
+from app.core.profiling import (
+    PerformanceRecorder,
+    RequestProfile,
+    finish_profile,
+    get_current_profile,
+    instrument_engine,
+    start_profile,
+)
+from app.middleware.profiling import ProfilingMiddleware
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+
+def _profile(route: str, seconds: float, queries: int = 0) -> RequestProfile:
+    profile = RequestProfile(method="GET", path=route, route=route)
+    for index in range(queries):
+        profile.add_statement(seconds / 10, f"SELECT {index}")
+    profile.status_code = 200
+    profile.total_seconds = seconds
+    return profile
+
+
+class TestRequestProfile:
+    """Test statement accounting of a single request."""
+
+    def test_keeps_only_slowest_statements(self):
+        """Test every statement is counted but only the slowest are kept."""
+        profile = RequestProfile(method="GET", path="/", slow_statement_count=2)
+        for seconds in (0.1, 0.5, 0.2, 0.4):
+            profile.add_statement(seconds, f"SELECT {seconds}")
+
+        assert profile.query_count == 4
+        assert round(profile.db_seconds, 6) == 1.2
+        assert [s.statement for s in profile.slowest] == ["SELECT 0.5", "SELECT 0.4"]
+
+    def test_server_timing_splits_db_and_app_time(self):
+        """Test the header value reports statement time and the remainder."""
+        profile = RequestProfile(method="GET", path="/")
+        profile.add_statement(0.025, "SELECT 1")
+
+        assert profile.server_timing(0.1) == (
+            'db;dur=25.0;desc="1 queries", app;dur=75.0'
+        )
+
+
+class TestPerformanceRecorder:
+    """Test route totals and the bounded history."""
+
+    def test_routes_ordered_by_measure(self):
+        """Test routes sort worst first by the requested measure."""
+        recorder = PerformanceRecorder()
+        recorder.record(_profile("/slow", 0.9, queries=1))
+        recorder.record(_profile("/chatty", 0.2, queries=40))
+        recorder.record(_profile("/chatty", 0.2, queries=40))
+
+        assert [r.name for r in recorder.routes("total")] == [
+            "GET /slow",
+            "GET /chatty",
+        ]
+        assert recorder.routes("queries")[0].name == "GET /chatty"
+        assert recorder.routes("queries")[0].average_queries == 40
+        assert recorder.routes("average")[0].name == "GET /slow"
+
+    def test_history_is_bounded(self):
+        """Test only the most recent requests are kept."""
+        recorder = PerformanceRecorder(history_size=3)
+        for index in range(5):
+            recorder.record(_profile(f"/page/{index}", index / 10))
+
+        assert [p.route for p in recorder.recent()] == [
+            "/page/4",
+            "/page/3",
+            "/page/2",
+        ]
+        assert len(recorder.routes()) == 5
+
+    def test_errors_counted(self):
+        """Test 5xx responses and unfinished requests count as errors."""
+        recorder = PerformanceRecorder()
+        failed = _profile("/boom", 0.1)
+        failed.status_code = 500
+        unfinished = _profile("/boom", 0.1)
+        unfinished.status_code = None
+        recorder.record(failed)
+        recorder.record(unfinished)
+        recorder.record(_profile("/boom", 0.1))
+
+        assert recorder.routes()[0].errors == 2
+
+
+class TestStatementEvents:
+    """Test statements are attributed to the active request only."""
+
+    def test_statements_outside_a_request_ignored(self):
+        """Test statements run with and without an active profile."""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        instrument_engine(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            profile, token = start_profile("GET", "/")
+            try:
+                conn.execute(text("SELECT 2"))
+                conn.execute(text("SELECT 3"))
+                assert get_current_profile() is profile
+            finally:
+                finish_profile(token)
+            conn.execute(text("SELECT 4"))
+
+        assert get_current_profile() is None
+        assert profile.query_count == 2
+        assert profile.slowest[0].statement in ("SELECT 2", "SELECT 3")
+
+
+class TestProfilingMiddleware:
+    """Test requests are profiled under their route template."""
+
+    def test_records_route_template_and_server_timing(self):
+        """Test a sync endpoint's queries land on its route template."""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        recorder = PerformanceRecorder()
+        api = FastAPI()
+        api.add_middleware(ProfilingMiddleware, recorder=recorder, server_timing=True)
+
+        @api.get("/items/{item_id}")
+        def read_item(item_id: int):
+            with engine.connect() as conn:
+                for _ in range(3):
+                    conn.execute(text("SELECT 1"))
+            return {"id": item_id}
+
+        client = TestClient(api)
+        assert client.get("/items/1").status_code == 200
+        response = client.get("/items/2")
+
+        assert 'desc="3 queries"' in response.headers["server-timing"]
+        (stats,) = recorder.routes()
+        assert stats.name == "GET /items/{item_id}"
+        assert stats.requests == 2
+        assert stats.queries == 6
+
+    def test_unmatched_paths_share_one_entry(self):
+        """Test 404s do not create a route per path."""
+        recorder = PerformanceRecorder()
+        api = FastAPI()
+        api.add_middleware(ProfilingMiddleware, recorder=recorder, server_timing=False)
+
+        client = TestClient(api)
+        response = client.get("/missing/1")
+        client.get("/missing/2")
+
+        assert "server-timing" not in response.headers
+        (stats,) = recorder.routes()
+        assert stats.name == "GET (unmatched)"
+        assert stats.requests == 2
@@ -0,0 +1,125 @@
+"""Tests for the authenticated user identity cache."""
+
+from app.core.auth import AuthService
+from app.core.user_cache import UserIdentityCache, user_cache
+from app.core.web_auth import _get_request_user
+from app.models.user import User
+from sqlalchemy import event
+
+
+class _Request:
+    """Minimal request stand-in with an empty state."""
+
+    class state:  # noqa: N801
+        pass
+
+
+def _user(user_id: int = 1, role: str = "admin") -> User:
+    return User(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        full_name=f"User {user_id}",
+        role=role,
+        is_active=True,
+    )
+
+
+class TestUserIdentityCache:
+    """Test LRU and TTL behaviour."""
+
+    def test_get_returns_snapshot(self):
+        """Test a stored user is returned as a snapshot."""
+        cache = UserIdentityCache(max_size=10, ttl_seconds=60)
+        cache.set("1", _user(1, role="technician"))
+
+        snapshot = cache.get("1")
+
+        assert snapshot is not None
+        assert snapshot.id == 1
+        assert snapshot.role == "technician"
+
+    def test_expired_entries_are_dropped(self, monkeypatch):
+        """Test snapshots are not served after their TTL."""
+        clock = [1000.0]
+        monkeypatch.setattr("app.core.user_cache.time.monotonic", lambda: clock[0])
+        cache = UserIdentityCache(max_size=10, ttl_seconds=30)
+        cache.set("1", _user(1))
+
+        clock[0] += 31
+
+        assert cache.get("1") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache never grows beyond its maximum size."""
+        cache = UserIdentityCache(max_size=2, ttl_seconds=60)
+        cache.set("1", _user(1))
+        cache.set("2", _user(2))
+        cache.get("1")
+        cache.set("3", _user(3))
+
+        assert cache.get("1") is not None
+        assert cache.get("2") is None
+        assert cache.get("3") is not None
+
+    def test_zero_ttl_disables_cache(self):
+        """Test a zero TTL stores nothing."""
+        cache = UserIdentityCache(max_size=10, ttl_seconds=0)
+        cache.set("1", _user(1))
+
+        assert cache.get("1") is None
+
+
+class TestCachedUserLookup:
+    """Test user resolution through the cache."""
+
+    def test_second_lookup_does_not_query(self, db_session, test_user, db_engine):
+        """Test a cached user is rebuilt without a users query."""
+        user_queries = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            if "FROM users" in statement:
+                user_queries.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            first = _get_request_user(_Request(), db_session, test_user.id)
+            db_session.expunge_all()
+            second = _get_request_user(_Request(), db_session, test_user.id)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert len(user_queries) == 1
+        assert first.id == second.id == test_user.id
+        assert second.role == "admin"
+        assert second.full_name == "Test User"
+
+    def test_unloaded_fields_load_lazily(self, db_session, test_user):
+        """Test fields outside the snapshot are still available."""
+        _get_request_user(_Request(), db_session, test_user.id)
+        db_session.expunge_all()
+
+        user = _get_request_user(_Request(), db_session, test_user.id)
+
+        assert user.password_hash == test_user.password_hash
+
+    def test_deactivate_invalidates(self, db_session, test_user):
+        """Test deactivating a user drops its snapshot."""
+        _get_request_user(_Request(), db_session, test_user.id)
+        assert user_cache.get(str(test_user.id)) is not None
+
+        AuthService(db_session).deactivate_user(test_user)
+
+        assert user_cache.get(str(test_user.id)) is None
+
+    def test_role_update_invalidates(self, db_session, test_user):
+        """Test any update of the user row drops its snapshot."""
+        _get_request_user(_Request(), db_session, test_user.id)
+
+        test_user.role = "technician"
+        db_session.commit()
+
+        assert user_cache.get(str(test_user.id)) is None
+        db_session.expunge_all()
+        user = _get_request_user(_Request(), db_session, test_user.id)
+        assert user.role == "technician"
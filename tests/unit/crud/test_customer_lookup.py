@@ -0,0 +1,143 @@
+"""Tests for the customer type-ahead lookup."""
+
+import pytest
+from app.crud.customer import LOOKUP_MAX_RESULTS, customer_crud
+from app.crud.repair import repair_crud
+from app.models.customer import Customer
+from app.models.repair import Repair
+from app.schemas.repair import RepairSearchParams
+from app.utils.http_cache import with_etag
+from app.utils.phone import normalize_phone
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+
+
+@pytest.fixture
+def customers(db_session) -> list[Customer]:
+    """Create customers with formatted and plain phone numbers."""
+    customers = [
+        Customer(name="Ana Torres", phone="11-4455-6677"),
+        Customer(name="Mariana Lopez", phone="1122334455"),
+        Customer(name="Martin Ana", phone="3515551234", phone_secondary="1199887766"),
+        Customer(name="Anabel Ruiz", phone="2615550000", is_active=False),
+    ]
+    db_session.add_all(customers)
+    db_session.commit()
+    return customers
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+class TestCustomerLookup:
+    """Test prefix matching, ranking and bounds of the lookup."""
+
+    def test_name_prefix_ranks_before_word_prefix(self, db_session, customers):
+        """Test names starting with the term come before later-word matches."""
+        names = [c.name for c in customer_crud.lookup(db_session, "ana")]
+
+        assert names == ["Ana Torres", "Martin Ana"]
+
+    def test_phone_prefix_matches_raw_and_digits(self, db_session, customers):
+        """Test phone terms match formatted, plain and secondary phones."""
+        assert [c.name for c in customer_crud.lookup(db_session, "11-44")] == [
+            "Ana Torres"
+        ]
+        assert [c.name for c in customer_crud.lookup(db_session, "11")] == [
+            "Ana Torres",
+            "Mariana Lopez",
+            "Martin Ana",
+        ]
+
+    def test_phone_matches_any_format_and_ending(self, db_session, customers):
+        """Test phones match normalized, and by their last digits."""
+        ana = customer_crud.get_by_phone(db_session, "+54 9 11 4455 6677")
+        by_ending = customer_crud.lookup(db_session, "9887766")
+
+        assert ana.name == "Ana Torres"
+        assert [c.name for c in by_ending] == ["Martin Ana"]
+        assert customer_crud.get_by_phone(db_session, "4455-6677") is None
+
+    def test_results_are_bounded(self, db_session):
+        """Test the limit is applied and capped."""
+        db_session.add_all(
+            Customer(name=f"Cliente {index:02d}", phone=f"555{index:04d}")
+            for index in range(LOOKUP_MAX_RESULTS + 5)
+        )
+        db_session.commit()
+
+        assert len(customer_crud.lookup(db_session, "cliente", limit=3)) == 3
+        assert (
+            len(customer_crud.lookup(db_session, "cliente", limit=1000))
+            == LOOKUP_MAX_RESULTS
+        )
+        assert customer_crud.lookup(db_session, "  ") == []
+
+    def test_text_terms_do_not_match_phone_digits(self, db_session, customers):
+        """Test only phone-like search terms are compared with phones."""
+        names = [c.name for c in customer_crud.search(db_session, "11-44")]
+
+        assert names == ["Ana Torres"]
+        assert customer_crud.search(db_session, "iPhone 11") == []
+        assert customer_crud.search(db_session, "ana2233@mail.com") == []
+
+    def test_repair_search_by_model_ignores_phones(
+        self, db_session, customers, test_user
+    ):
+        """Test a device model search does not return repairs by phone digits."""
+        for number, (customer, model) in enumerate(
+            [(customers[0], "Galaxy A52"), (customers[2], "iPhone 11")], start=1
+        ):
+            db_session.add(
+                Repair(
+                    repair_number=f"REP-T-{number:05d}",
+                    customer_id=customer.id,
+                    device_type="Phone",
+                    device_brand="Apple" if model.startswith("i") else "Samsung",
+                    device_model=model,
+                    problem_description="Screen broken",
+                    received_by=test_user.id,
+                )
+            )
+        db_session.commit()
+
+        page = repair_crud.search_repairs(
+            db_session, params=RepairSearchParams(q="iPhone 11")
+        )
+
+        assert [r.device_model for r in page.items] == ["iPhone 11"]
+
+    def test_unchanged_response_revalidates_with_304(self):
+        """Test a matching If-None-Match gets an empty 304."""
+        first = with_etag(_request(), HTMLResponse("<option>Ana</option>"))
+        etag = first.headers["etag"]
+
+        repeat = with_etag(_request(etag), HTMLResponse("<option>Ana</option>"))
+        changed = with_etag(_request(etag), HTMLResponse("<option>Bea</option>"))
+
+        assert first.status_code == 200
+        assert repeat.status_code == 304
+        assert repeat.body == b""
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+
+@pytest.mark.parametrize(
+    ("phone", "expected"),
+    [
+        ("11 4455-6677", "1144556677"),
+        ("011 4455-6677", "1144556677"),
+        ("+54 9 11 4455-6677", "1144556677"),
+        ("0054 11 4455 6677", "1144556677"),
+        ("+1 (555) 010-9999", "15550109999"),
+        ("", None),
+        ("n/a", None),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    """Test phones reduce to the national number of the store's country."""
+    assert normalize_phone(phone, country_code="54") == expected
@@ -0,0 +1,194 @@
+"""Tests for the materialized daily register totals."""
+
+from decimal import Decimal
+
+import pytest
+from app.crud.cash_closing import cash_closing
+from app.crud.daily_register_totals import daily_register_totals
+from app.models.customer import Customer
+from app.models.daily_register_totals import DailyRegisterTotals
+from app.models.expense import Expense
+from app.models.payment import Payment, PaymentType
+from app.models.sale import Sale
+from app.utils.timezone import get_local_today, get_utc_now
+from sqlalchemy import event
+
+
+@pytest.fixture
+def customer(db_session) -> Customer:
+    """Create a customer."""
+    customer = Customer(name="Register Customer", phone="555-0101")
+    db_session.add(customer)
+    db_session.commit()
+    return customer
+
+
+def _sale(user_id, customer_id, total, method, paid=None, **kwargs) -> Sale:
+    return Sale(
+        invoice_number=f"INV-T-{method}-{total}-{kwargs.pop('suffix', '')}",
+        customer_id=customer_id,
+        user_id=user_id,
+        subtotal=Decimal(total),
+        total_amount=Decimal(total),
+        paid_amount=Decimal(total if paid is None else paid),
+        payment_method=method,
+        sale_date=get_utc_now(),
+        **kwargs,
+    )
+
+
+def _stored(db_session) -> DailyRegisterTotals:
+    db_session.expire_all()
+    return (
+        db_session.query(DailyRegisterTotals)
+        .filter_by(business_date=get_local_today())
+        .one()
+    )
+
+
+class TestDailyRegisterTotals:
+    """Test totals are maintained by writes to the source tables."""
+
+    def test_sales_update_totals(self, db_session, test_user, customer):
+        """Test new sales are added to the day's row."""
+        db_session.add(_sale(test_user.id, customer.id, "100.00", "cash"))
+        db_session.add(
+            _sale(test_user.id, customer.id, "50.00", "transfer", paid="20.00")
+        )
+        db_session.commit()
+
+        row = _stored(db_session)
+        assert row.total_sales == Decimal("150.00")
+        assert row.sales_count == 2
+        assert row.sales_cash == Decimal("100.00")
+        assert row.sales_transfer == Decimal("20.00")
+        assert row.sales_credit == Decimal("30.00")
+
+    def test_void_and_later_payment_move_totals(self, db_session, test_user, customer):
+        """Test updates to committed (expired) rows replace their contribution."""
+        voided = _sale(test_user.id, customer.id, "80.00", "cash", suffix="v")
+        credit = _sale(test_user.id, customer.id, "40.00", "cash", paid="0.00")
+        db_session.add_all([voided, credit])
+        db_session.commit()
+
+        voided.is_voided = True
+        credit.paid_amount = Decimal("40.00")
+        db_session.commit()
+
+        row = _stored(db_session)
+        assert row.total_sales == Decimal("40.00")
+        assert row.sales_count == 1
+        assert row.sales_cash == Decimal("40.00")
+        assert row.sales_credit == Decimal("0.00")
+
+    def test_debt_payments_and_expenses(
+        self, db_session, test_user, customer, test_expense_category
+    ):
+        """Test standalone payments and deleted expenses are reflected."""
+        db_session.add(
+            Payment(
+                customer_id=customer.id,
+                amount=Decimal("90.00"),
+                payment_method="mixed",
+                payment_type=PaymentType.payment,
+                receipt_number="PAY-T-1",
+                received_by_id=test_user.id,
+                cash_amount=Decimal("60.00"),
+                transfer_amount=Decimal("30.00"),
+            )
+        )
+        expense = Expense(
+            category_id=test_expense_category.id,
+            amount=Decimal("25.00"),
+            description="Cleaning",
+            expense_date=get_local_today(),
+            payment_method="cash",
+            created_by=test_user.id,
+        )
+        db_session.add(expense)
+        db_session.commit()
+
+        row = _stored(db_session)
+        assert row.debt_payments_cash == Decimal("60.00")
+        assert row.debt_payments_transfer == Decimal("30.00")
+        assert row.total_expenses == Decimal("25.00")
+        assert row.expenses_count == 1
+
+        db_session.delete(expense)
+        db_session.commit()
+
+        row = _stored(db_session)
+        assert row.total_expenses == Decimal("0.00")
+        assert row.expenses_count == 0
+
+    def test_first_write_seeds_from_source_tables(
+        self, db_session, test_user, customer
+    ):
+        """Test a day's first row includes activity recorded before it existed."""
+        db_session.add(_sale(test_user.id, customer.id, "70.00", "cash", suffix="a"))
+        db_session.commit()
+        db_session.query(DailyRegisterTotals).delete()
+        db_session.commit()
+
+        db_session.add(_sale(test_user.id, customer.id, "30.00", "cash", suffix="b"))
+        db_session.commit()
+
+        row = _stored(db_session)
+        assert row.total_sales == Decimal("100.00")
+        assert row.sales_count == 2
+
+    def test_rollback_discards_changes(self, db_session, test_user, customer):
+        """Test totals change in the same transaction as the source rows."""
+        db_session.add(_sale(test_user.id, customer.id, "10.00", "cash", suffix="a"))
+        db_session.commit()
+
+        db_session.add(_sale(test_user.id, customer.id, "99.00", "cash", suffix="b"))
+        db_session.flush()
+        db_session.rollback()
+
+        assert _stored(db_session).total_sales == Decimal("10.00")
+
+    def test_rebuild_matches_incremental_totals(self, db_session, test_user, customer):
+        """Test reconciling from the source tables gives the same totals."""
+        db_session.add(_sale(test_user.id, customer.id, "35.00", "credit", paid="0"))
+        db_session.add(
+            _sale(
+                test_user.id,
+                customer.id,
+                "60.00",
+                "mixed",
+                cash_amount=Decimal("20.00"),
+                card_amount=Decimal("40.00"),
+            )
+        )
+        db_session.commit()
+        incremental = daily_register_totals.get_totals(
+            db_session, business_date=get_local_today()
+        )
+
+        rebuilt = daily_register_totals.rebuild(
+            db_session, business_date=get_local_today()
+        )
+
+        assert rebuilt == incremental
+
+    def test_summary_reads_one_row(self, db_session, db_engine, test_user, customer):
+        """Test the daily summary no longer aggregates the source tables."""
+        db_session.add(_sale(test_user.id, customer.id, "12.00", "cash"))
+        db_session.commit()
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            summary = cash_closing.get_daily_summary(
+                db_session, target_date=get_local_today()
+            )
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert summary.total_sales == Decimal("12.00")
+        assert summary.sales_cash == Decimal("12.00")
+        assert not any("FROM sales" in statement for statement in statements)
@@ -0,0 +1,136 @@
+"""Tests for document number sequences."""
+
+import pytest
+from app.crud.document_sequence import document_sequence_crud
+from app.crud.payment import payment_crud
+from app.crud.sale import sale_crud
+from app.models.document_sequence import DocumentSequence
+from app.models.sale import Sale
+from app.utils.timezone import get_utc_now
+from sqlalchemy import event
+
+
+class TestDocumentSequenceCRUD:
+    """Test counter allocation."""
+
+    def test_numbers_are_consecutive(self, db_session):
+        """Test each call returns the next number."""
+        numbers = [
+            document_sequence_crud.next_number(db_session, "INV", period=2026)
+            for _ in range(3)
+        ]
+
+        assert numbers == [1, 2, 3]
+
+    def test_periods_are_independent(self, db_session):
+        """Test every year starts its own series."""
+        document_sequence_crud.next_number(db_session, "INV", period=2025)
+        document_sequence_crud.next_number(db_session, "INV", period=2025)
+
+        assert document_sequence_crud.next_number(db_session, "INV", period=2026) == 1
+
+    def test_seed_is_used_only_once(self, db_session):
+        """Test the seed continues existing numbering and is not called again."""
+        calls = []
+
+        def seed():
+            calls.append(1)
+            return 41
+
+        first = document_sequence_crud.next_number(db_session, "REP", seed=seed)
+        second = document_sequence_crud.next_number(db_session, "REP", seed=seed)
+
+        assert (first, second) == (42, 43)
+        assert len(calls) == 1
+
+    def test_allocate_block(self, db_session):
+        """Test a block reserves contiguous numbers in one step."""
+        block = document_sequence_crud.allocate_block(db_session, "INV", 50)
+        after = document_sequence_crud.next_number(db_session, "INV")
+
+        assert list(block) == list(range(1, 51))
+        assert after == 51
+
+    def test_allocate_block_rejects_empty(self, db_session):
+        """Test a block must hold at least one number."""
+        with pytest.raises(ValueError):
+            document_sequence_crud.allocate_block(db_session, "INV", 0)
+
+    def test_rollback_returns_number(self, db_session):
+        """Test a rolled back allocation leaves no gap."""
+        document_sequence_crud.next_number(db_session, "PAY")
+        db_session.commit()
+
+        document_sequence_crud.next_number(db_session, "PAY")
+        db_session.rollback()
+
+        assert document_sequence_crud.next_number(db_session, "PAY") == 2
+
+    def test_steady_state_is_one_statement(self, db_session, db_engine):
+        """Test allocating from an existing counter needs no scan."""
+        document_sequence_crud.next_number(db_session, "INV")
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            document_sequence_crud.next_number(db_session, "INV")
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert len(statements) == 1
+        assert statements[0].lstrip().startswith("UPDATE document_sequences")
+
+
+class TestDocumentNumbers:
+    """Test formatted numbers issued by the CRUD modules."""
+
+    def test_invoice_numbers_continue_existing_series(self, db_session, test_user):
+        """Test the first invoice after an upgrade follows the last one issued."""
+        year = get_utc_now().year
+        db_session.add(
+            Sale(
+                invoice_number=f"INV-{year}-00007",
+                user_id=test_user.id,
+                subtotal=0,
+                tax_amount=0,
+                total_amount=0,
+                payment_method="cash",
+            )
+        )
+        db_session.flush()
+
+        assert sale_crud.generate_invoice_number(db_session) == f"INV-{year}-00008"
+        assert sale_crud.reserve_invoice_numbers(db_session, 2) == [
+            f"INV-{year}-00009",
+            f"INV-{year}-00010",
+        ]
+
+    def test_seed_past_zero_padding(self, db_session, test_user):
+        """Test numbers wider than their padding are seeded numerically."""
+        year = get_utc_now().year
+        for number in ("99999", "100000", "100001"):
+            db_session.add(
+                Sale(
+                    invoice_number=f"INV-{year}-{number}",
+                    user_id=test_user.id,
+                    subtotal=0,
+                    tax_amount=0,
+                    total_amount=0,
+                    payment_method="cash",
+                )
+            )
+        db_session.flush()
+
+        assert sale_crud.generate_invoice_number(db_session) == f"INV-{year}-100002"
+
+    def test_receipt_numbers_are_unique(self, db_session):
+        """Test repeated receipt numbers never collide."""
+        year = get_utc_now().year
+        receipts = {payment_crud.generate_receipt_number(db_session) for _ in range(5)}
+
+        assert receipts == {f"PAY-{year}-{n:05d}" for n in range(1, 6)}
+        counter = db_session.query(DocumentSequence).filter_by(key="PAY").one()
+        assert counter.last_value == 5
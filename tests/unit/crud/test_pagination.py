@@ -0,0 +1,108 @@
+"""Tests for keyset (cursor) pagination."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from app.crud.pagination import InvalidCursorError, encode_cursor
+from app.crud.sale import sale_crud
+from app.models.sale import Sale
+from sqlalchemy import event
+
+START = datetime(2025, 3, 1, 10, 0)
+
+
+@pytest.fixture
+def sales(db_session, test_user) -> list[Sale]:
+    """Create 25 sales, several sharing the same sale date."""
+    sales = [
+        Sale(
+            invoice_number=f"INV-P-{index:03d}",
+            user_id=test_user.id,
+            subtotal=Decimal("10.00"),
+            total_amount=Decimal("10.00"),
+            paid_amount=Decimal("10.00"),
+            payment_method="cash",
+            payment_status="paid",
+            # Pairs of sales share a timestamp to exercise the ID tiebreak
+            sale_date=START + timedelta(minutes=index // 2),
+        )
+        for index in range(25)
+    ]
+    db_session.add_all(sales)
+    db_session.commit()
+    return sales
+
+
+def _expected_order(sales: list[Sale]) -> list[int]:
+    return [
+        sale.id
+        for sale in sorted(sales, key=lambda s: (s.sale_date, s.id), reverse=True)
+    ]
+
+
+class TestKeysetPagination:
+    """Test cursors walk lists without gaps, repeats or OFFSET."""
+
+    def test_walks_forward_and_back(self, db_session, sales):
+        """Test next and previous cursors cover every sale exactly once."""
+        pages = []
+        page = sale_crud.get_multi_with_filters(db_session, limit=10)
+        pages.append(page)
+        while page.next_cursor:
+            page = sale_crud.get_multi_with_filters(
+                db_session, limit=10, cursor=page.next_cursor
+            )
+            pages.append(page)
+
+        seen = [sale.id for page in pages for sale in page.items]
+        assert seen == _expected_order(sales)
+        assert [len(page.items) for page in pages] == [10, 10, 5]
+        assert pages[0].prev_cursor is None
+
+        back = sale_crud.get_multi_with_filters(
+            db_session, limit=10, cursor=pages[-1].prev_cursor
+        )
+        assert [sale.id for sale in back.items] == [sale.id for sale in pages[1].items]
+        assert back.next_cursor is not None
+
+        first = sale_crud.get_multi_with_filters(
+            db_session, limit=10, cursor=back.prev_cursor
+        )
+        assert [sale.id for sale in first.items] == [sale.id for sale in pages[0].items]
+        assert first.prev_cursor is None
+
+    def test_deep_pages_seek_on_sort_key(self, db_session, db_engine, sales):
+        """Test later pages seek on the sort key and skip the count."""
+        page = sale_crud.get_multi_with_filters(db_session, limit=5)
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            sale_crud.get_multi_with_filters(
+                db_session, limit=5, cursor=page.next_cursor
+            )
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        # SQLite always renders "LIMIT ? OFFSET ?", with offset 0 here
+        assert "(sales.sale_date, sales.id) < (?, ?)" in statements[0]
+        assert not any("count(" in statement for statement in statements)
+
+    def test_total_is_optional(self, db_session, sales):
+        """Test the total is only counted on request."""
+        assert sale_crud.get_multi_with_filters(db_session, limit=5).total is None
+        page = sale_crud.get_multi_with_filters(db_session, limit=5, with_total=True)
+        assert page.total == 25
+
+    def test_invalid_cursors_are_rejected(self, db_session, sales):
+        """Test garbage and cursors of another ordering raise an error."""
+        with pytest.raises(InvalidCursorError):
+            sale_crud.get_multi_with_filters(db_session, cursor="not-a-cursor")
+
+        other_sort = encode_cursor("products.name:asc", ("a", 1))
+        with pytest.raises(InvalidCursorError):
+            sale_crud.get_multi_with_filters(db_session, cursor=other_sort)
@@ -0,0 +1,128 @@
+"""Tests for the in-process product catalog snapshot."""
+
+from decimal import Decimal
+
+import pytest
+from app.crud.product_catalog import ProductCatalog, product_catalog
+from app.models.product import Category, Product
+from sqlalchemy import event
+
+
+@pytest.fixture
+def product(db_session, test_user) -> Product:
+    """Create a product with a barcode."""
+    category = Category(name="Chargers", is_active=True)
+    db_session.add(category)
+    db_session.flush()
+    product = Product(
+        sku="CAT-001",
+        name="Cargador USB-C",
+        barcode="7790000000099",
+        category_id=category.id,
+        purchase_price=Decimal("5.00"),
+        first_sale_price=Decimal("10.00"),
+        second_sale_price=Decimal("9.50"),
+        third_sale_price=Decimal("9.00"),
+        current_stock=8,
+        created_by=test_user.id,
+    )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+class TestProductCatalog:
+    """Test lookups are served from memory and invalidated on writes."""
+
+    def _count_statements(self, db_engine, lookup) -> int:
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            lookup()
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+        return len(statements)
+
+    def test_cached_lookups_skip_database(self, db_session, db_engine, product):
+        """Test repeated lookups by ID and code run no statements."""
+        record = product_catalog.get(db_session, product.id)
+        assert record.category_name == "Chargers"
+        assert record.first_sale_price == Decimal("10.00")
+        by_code = product_catalog.get_by_code(db_session, "7790000000099")
+        assert [found.id for found in by_code] == [product.id]
+
+        def lookup():
+            product_catalog.get(db_session, product.id)
+            product_catalog.get_by_code(db_session, "CAT-001")
+            product_catalog.get_by_code(db_session, "7790000000099")
+
+        self._count_statements(db_engine, lookup)
+        assert self._count_statements(db_engine, lookup) == 0
+
+    def test_commit_invalidates_product(self, db_session, product):
+        """Test committed price and stock changes are visible immediately."""
+        product_catalog.get(db_session, product.id)
+        version = product_catalog.version
+
+        product.first_sale_price = Decimal("12.00")
+        product.current_stock = 3
+        db_session.commit()
+
+        record = product_catalog.get(db_session, product.id)
+        assert product_catalog.version > version
+        assert record.first_sale_price == Decimal("12.00")
+        assert record.current_stock == 3
+
+    def test_uncommitted_writes_are_not_cached(self, db_session, product):
+        """Test rows read inside a writing transaction are not stored."""
+        product.name = "Draft name"
+        db_session.flush()
+
+        assert product_catalog.get(db_session, product.id).name == "Draft name"
+        db_session.rollback()
+
+        assert product_catalog.get(db_session, product.id).name == "Cargador USB-C"
+
+    def test_load_racing_invalidation_is_discarded(self, db_session, product):
+        """Test a load that overlaps an invalidation does not store its rows."""
+        catalog = ProductCatalog(max_size=10, ttl_seconds=60)
+        product_id = product.id
+
+        def invalidate_during_load(conn, cursor, statement, parameters, context, many):
+            catalog.invalidate([product_id])
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", invalidate_during_load)
+        try:
+            catalog.get(db_session, product_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", invalidate_during_load)
+
+        assert len(catalog) == 0
+
+    def test_size_and_ttl_limits(self, db_session, product, test_user):
+        """Test least recently used products are evicted and TTL 0 disables."""
+        other = Product(
+            sku="CAT-002",
+            name="Cable",
+            category_id=product.category_id,
+            purchase_price=Decimal("1.00"),
+            first_sale_price=Decimal("2.00"),
+            second_sale_price=Decimal("2.00"),
+            third_sale_price=Decimal("2.00"),
+            created_by=test_user.id,
+        )
+        db_session.add(other)
+        db_session.commit()
+
+        catalog = ProductCatalog(max_size=1, ttl_seconds=60)
+        catalog.get_many(db_session, [product.id, other.id])
+        assert len(catalog) == 1
+
+        disabled = ProductCatalog(max_size=10, ttl_seconds=0)
+        assert disabled.get(db_session, product.id) is not None
+        assert len(disabled) == 0
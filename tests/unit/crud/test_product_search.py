@@ -0,0 +1,116 @@
+"""Tests for the ranked product search."""
+
+from decimal import Decimal
+
+import pytest
+from app.crud.product_search import product_search, search_condition
+from app.models.product import Category, Product
+from sqlalchemy import event, select
+
+
+@pytest.fixture
+def products(db_session, test_user) -> dict[str, Product]:
+    """Create products sharing a brand, one of them inactive."""
+    category = Category(name="Accessories", is_active=True)
+    db_session.add(category)
+    db_session.flush()
+
+    specs = {
+        "funda": ("SKU-1", "Funda antigolpe Samsung", None),
+        "vidrio": ("SKU-2", "Vidrio templado Samsung Galaxy", None),
+        "cargador": ("SKU-3", "Samsung cargador rápido", "7791234567890"),
+        "cable": ("SKU-4", "Cable USB-C 1m", "7790000000001"),
+        "inactive": ("SKU-5", "Samsung auriculares", None),
+    }
+    products = {}
+    for key, (sku, name, barcode) in specs.items():
+        products[key] = Product(
+            sku=sku,
+            name=name,
+            barcode=barcode,
+            category_id=category.id,
+            purchase_price=Decimal("1.00"),
+            first_sale_price=Decimal("2.00"),
+            second_sale_price=Decimal("2.00"),
+            third_sale_price=Decimal("2.00"),
+            is_active=key != "inactive",
+            created_by=test_user.id,
+        )
+    db_session.add_all(products.values())
+    db_session.commit()
+    return products
+
+
+def _names(results) -> list[str]:
+    return [product.name for product in results]
+
+
+class TestProductSearch:
+    """Test matching, ranking and index refresh of product_search."""
+
+    def test_exact_barcode_uses_single_query(self, db_session, db_engine, products):
+        """Test a scanned barcode returns only its product in one statement."""
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", on_execute)
+        try:
+            results = product_search.search(db_session, "7791234567890")
+        finally:
+            event.remove(db_engine, "before_cursor_execute", on_execute)
+
+        assert [product.id for product in results] == [products["cargador"].id]
+        assert len(statements) == 1
+
+    def test_results_ranked_by_match_quality(self, db_session, products):
+        """Test name prefix, then word prefix, then substring; inactive hidden."""
+        results = product_search.search(db_session, "sams")
+
+        assert _names(results) == [
+            "Samsung cargador rápido",
+            "Funda antigolpe Samsung",
+            "Vidrio templado Samsung Galaxy",
+        ]
+
+        results = product_search.search(db_session, "amsung")
+        assert len(results) == 3
+
+    def test_words_in_any_order_and_accents(self, db_session, products):
+        """Test every word must match, in any order, ignoring accents."""
+        results = product_search.search(db_session, "rapido samsung")
+
+        assert _names(results) == ["Samsung cargador rápido"]
+
+    def test_misspelled_name_matches(self, db_session, products):
+        """Test similar names are returned when nothing contains the term."""
+        results = product_search.search(db_session, "cargadro rapido samsung")
+
+        assert products["cargador"].id in [product.id for product in results]
+
+    def test_limit(self, db_session, products):
+        """Test only the best matches are returned."""
+        results = product_search.search(db_session, "samsung", limit=1)
+
+        assert _names(results) == ["Samsung cargador rápido"]
+
+    def test_committed_changes_refresh_index(self, db_session, products):
+        """Test renamed and deactivated products are reindexed after commit."""
+        assert product_search.search(db_session, "funda")
+
+        products["funda"].name = "Protector pantalla"
+        products["cable"].is_active = False
+        db_session.commit()
+
+        assert product_search.search(db_session, "funda") == []
+        assert _names(product_search.search(db_session, "protector")) == [
+            "Protector pantalla"
+        ]
+        assert product_search.search(db_session, "cable") == []
+
+    def test_search_condition_escapes_wildcards(self, db_session, products):
+        """Test LIKE wildcards typed by the user match literally."""
+        query = select(Product.id).where(search_condition("%"))
+
+        assert db_session.scalars(query).all() == []
@@ -73,6 +73,23 @@ class TestCustomerModel:
         )
         assert customer2.display_phones == "2222222222 / 3333333333"
 
+    def test_normalized_phones_follow_writes(self, db_session):
+        """Test normalized phone copies are kept in sync on create and update."""
+        customer = Customer(name="John", phone="+54 9 11 4455-6677")
+        db_session.add(customer)
+        db_session.commit()
+
+        assert customer.phone_normalized == "1144556677"
+        assert customer.phone_secondary_normalized is None
+
+        customer.phone = "(0351) 555-1234"
+        customer.phone_secondary = "0054 261 555 0000"
+        db_session.commit()
+        db_session.refresh(customer)
+
+        assert customer.phone_normalized == "3515551234"
+        assert customer.phone_secondary_normalized == "2615550000"
+
     def test_search_string_property(self, db_session):
         """Test search_string property for search optimization."""
         customer = Customer(
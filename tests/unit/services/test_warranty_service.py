@@ -128,6 +128,25 @@ class TestWarrantyService:
         assert len(result.warranties) == 1
         assert result.warranties[0].warranty_number == test_warranty.warranty_number
 
+    def test_check_warranty_by_phone_requires_whole_number(
+        self,
+        db_session: Session,
+        test_warranty: Warranty,
+    ) -> None:
+        """Test phone checks match whole numbers only, not their ending."""
+        phone = test_warranty.repair.customer.phone
+
+        by_phone = warranty_service.check_warranty(
+            db_session, request=WarrantyCheckRequest(customer_phone=phone)
+        )
+        by_suffix = warranty_service.check_warranty(
+            db_session, request=WarrantyCheckRequest(customer_phone=phone[-4:])
+        )
+
+        assert [w.id for w in by_phone.warranties] == [test_warranty.id]
+        assert by_suffix.found is False
+        assert by_suffix.warranties == []
+
     def test_check_warranty_not_found(
         self,
         db_session: Session,
@@ -151,18 +170,19 @@ class TestWarrantyService:
         """Test searching warranties."""
         params = WarrantySearchParams(
             q=test_warranty.warranty_number,
-            page=1,
             page_size=20,
+            include_total=True,
         )
 
-        warranties, total = warranty_service.search_warranties(
+        page = warranty_service.search_warranties(
             db_session,
             params=params,
         )
 
-        assert total == 1
-        assert len(warranties) == 1
-        assert warranties[0].warranty_number == test_warranty.warranty_number
+        assert page.total == 1
+        assert len(page.items) == 1
+        assert page.items[0].warranty_number == test_warranty.warranty_number
+        assert page.next_cursor is None
 
     def test_create_warranty_claim(
         self,